@@ -0,0 +1,82 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time the cold start of a component task, i.e. import secretflow.component and get the
+definition of one component, with eager and lazy component discovery. Each round runs
+in a new python process.
+
+    python startup_benchmark.py --comp stats/table_statistics:1.0.0 --rounds 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_SCRIPT = '''
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import secretflow.component
+from secretflow.component.core import Registry
+
+imported = time.perf_counter()
+assert Registry.get_definition_by_id(sys.argv[1]) is not None
+end = time.perf_counter()
+modules = [m for m in sys.modules if m.startswith("secretflow.component.")]
+print(json.dumps({"import": imported - start, "total": end - start, "modules": len(modules)}))
+'''
+
+
+def run_once(comp_id: str, lazy: bool, cache_dir: str) -> dict:
+    env = dict(os.environ)
+    env["COMPONENT_LAZY_LOAD"] = "true" if lazy else "false"
+    env["COMPONENT_INDEX_CACHE_DIR"] = cache_dir
+    out = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, comp_id],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comp", default="stats/table_statistics:1.0.0")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # the first lazy run builds the index cache.
+        run_once(args.comp, True, cache_dir)
+        for lazy in [False, True]:
+            results = [run_once(args.comp, lazy, cache_dir) for _ in range(args.rounds)]
+            print(
+                f"{'lazy' if lazy else 'eager':<6}"
+                f" import: {statistics.median(r['import'] for r in results):.3f}s"
+                f" total: {statistics.median(r['total'] for r in results):.3f}s"
+                f" modules: {results[0]['modules']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time the masking of one participant of SecureAggregator in a round, with different
+numbers of parties and model sizes.
+
+- per-peer: one PCG64 mask per peer generated in the round, i.e. the former way.
+- net-mask: generate the Philox net mask of all peers, which is done in background
+  between rounds.
+- critical: add the precomputed net mask, which is the cost left in the round.
+
+    python mask_benchmark.py --parties 3 10 50 --sizes 100000 1000000 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from secretflow.security.aggregation.secure_aggregator import gen_net_mask
+
+
+def per_peer_mask(data: np.ndarray, rngs: dict, party: str) -> np.ndarray:
+    masked = data.copy()
+    for peer, rng in rngs.items():
+        mask = rng.integers(
+            low=np.iinfo(np.int64).min,
+            high=np.iinfo(np.int64).max,
+            size=masked.shape,
+        ).astype(masked.dtype)
+        if peer > party:
+            masked += mask
+        else:
+            masked -= mask
+    return masked
+
+
+def timeit(fn, rounds: int) -> float:
+    costs = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        costs.append(time.perf_counter() - start)
+    return min(costs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--parties", type=int, nargs="+", default=[3, 10, 50])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'parties':>8} {'size':>10} {'per-peer(s)':>12} {'net-mask(s)':>12}"
+        f" {'critical(s)':>12} {'speedup':>8}"
+    )
+    for parties in args.parties:
+        party = "party_0"
+        peers = [f"party_{i}" for i in range(1, parties)]
+        seeds = {peer: 1 << (64 + i) for i, peer in enumerate(peers)}
+        for size in args.sizes:
+            data = np.random.randint(0, 1 << 30, size=size, dtype=np.uint64)
+            rngs = {peer: np.random.default_rng(seeds[peer]) for peer in peers}
+            per_peer = timeit(lambda: per_peer_mask(data, rngs, party), args.rounds)
+            net_mask = timeit(lambda: gen_net_mask(party, seeds, 1, size), args.rounds)
+            mask = gen_net_mask(party, seeds, 1, size)
+            critical = timeit(lambda: np.add(data, mask), args.rounds)
+            print(
+                f"{parties:>8} {size:>10} {per_peer:>12.4f} {net_mask:>12.4f}"
+                f" {critical:>12.4f} {per_peer / critical:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -36,26 +36,84 @@ if sys.version_info.major == 3 and sys.version_info.minor == 8:
         exit(1)
 
 
-from . import component, data, device, kuscia, ml, preprocessing, security, utils
-from .device import (
-    HEU,
-    PYU,
-    SPU,
-    TEEU,
-    Device,
-    DeviceObject,
-    HEUObject,
-    PYUObject,
-    SPUObject,
-    init,
-    proxy,
-    reveal,
-    shutdown,
-    to,
-    wait,
-)
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING
+
 from .version import __version__  # type: ignore
 
+if TYPE_CHECKING:
+    from . import component, data, device, kuscia, ml, preprocessing, security, utils
+    from .device import (
+        HEU,
+        PYU,
+        SPU,
+        TEEU,
+        Device,
+        DeviceObject,
+        HEUObject,
+        PYUObject,
+        SPUObject,
+        init,
+        proxy,
+        reveal,
+        reveal_async,
+        shutdown,
+        to,
+        wait,
+        wait_async,
+    )
+
+# Submodules and device apis are imported on first access (PEP 562), so that
+# `import secretflow` does not load jax, spu, heu, ray, pandas etc. until they are used.
+_SUBMODULES = [
+    'component',
+    'data',
+    'device',
+    'kuscia',
+    'ml',
+    'preprocessing',
+    'security',
+    'utils',
+]
+_DEVICE_ATTRS = [
+    'HEU',
+    'PYU',
+    'SPU',
+    'TEEU',
+    'Device',
+    'DeviceObject',
+    'HEUObject',
+    'PYUObject',
+    'SPUObject',
+    'init',
+    'proxy',
+    'reveal',
+    'reveal_async',
+    'shutdown',
+    'to',
+    'wait',
+    'wait_async',
+]
+
+
+def __getattr__(name: str):
+    if name in _DEVICE_ATTRS:
+        value = getattr(importlib.import_module(f'{__name__}.device'), name)
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES or (
+        not name.startswith('_')
+        and importlib.util.find_spec(f'{__name__}.{name}') is not None
+    ):
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_DEVICE_ATTRS))
+
+
 __all__ = [
     'kuscia',
     'data',
@@ -76,8 +134,10 @@ __all__ = [
     'init',
     'proxy',
     'reveal',
+    'reveal_async',
     'shutdown',
     'to',
     'wait',
+    'wait_async',
     'component',
 ]
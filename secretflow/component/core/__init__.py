@@ -25,13 +25,21 @@ from .common.io import (
     ORCReadOptions,
     ORCWriteOptions,
     ORCWriter,
+    ParquetReader,
+    ParquetReadOptions,
+    ParquetWriteOptions,
+    ParquetWriter,
     ReadOptions,
     WriteOptions,
     convert_io,
+    new_reader,
+    new_writer,
     read_csv,
     read_orc,
+    read_parquet,
     write_csv,
     write_orc,
+    write_parquet,
 )
 from .common.types import (
     BaseEnum,
@@ -175,13 +183,21 @@ __all__ = [
     "ORCReadOptions",
     "ORCWriteOptions",
     "ORCWriter",
+    "ParquetReader",
+    "ParquetReadOptions",
+    "ParquetWriteOptions",
+    "ParquetWriter",
     "ReadOptions",
     "WriteOptions",
     "convert_io",
+    "new_reader",
+    "new_writer",
     "read_csv",
     "read_orc",
+    "read_parquet",
     "write_csv",
     "write_orc",
+    "write_parquet",
     "Plugin",
     "PluginManager",
     "ResourceType",
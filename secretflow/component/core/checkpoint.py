@@ -13,6 +13,7 @@
 # limitations under the License.
 
 
+import hashlib
 import logging
 import uuid
 
@@ -23,13 +24,149 @@ from secretflow.utils import secure_pickle as pickle
 from .storage import Storage
 
 
+def _read_manifest(storage: Storage, uri: str) -> list[dict] | None:
+    if not storage.exists(uri):
+        return None
+    with storage.get_reader(uri) as f:
+        manifest = pickle.load(f)
+    if not isinstance(manifest, list):
+        raise ValueError(f"invalid checkpoint manifest {uri}")
+    return manifest
+
+
+def _save_step(
+    party: str,
+    storage: Storage,
+    cp: bytes,
+    step_uri: str,
+    manifest_uri: str,
+    entry: dict,
+    keep_last: int,
+    *saved,
+):
+    # saved are the payload files of this party, they are ready before this runs.
+    # the step is written before it is recorded in the manifest.
+    with storage.get_writer(step_uri) as f:
+        f.write(cp)
+
+    try:
+        manifest = _read_manifest(storage, manifest_uri) or []
+    except Exception:
+        logging.exception(f"rebuild broken checkpoint manifest {manifest_uri}")
+        manifest = []
+    # steps after this one are stale, e.g. left by a previous run.
+    manifest = [e for e in manifest if e["step"] < entry["step"]]
+    manifest.append(entry)
+
+    expired = []
+    if keep_last > 0 and len(manifest) > keep_last:
+        expired = manifest[:-keep_last]
+        manifest = manifest[-keep_last:]
+
+    with storage.get_writer(manifest_uri) as f:
+        pickle.dump(manifest, f)
+
+    for e in expired:
+        uris = [e["uri"]] + [u for p, u in e["payload_refs"] if p == party]
+        for uri in uris:
+            try:
+                if storage.exists(uri):
+                    storage.remove(uri)
+            except Exception:
+                logging.exception(f"failed to remove expired checkpoint file {uri}")
+
+
 class Checkpoint:
-    def __init__(self, uri: str, args: dict, parties: list[str]) -> None:
+    '''
+    Checkpoints of each step are saved to uri_{step} by every party, and indexed by a
+    small manifest of each party at uri_manifest_{party}, which records the step, uuid, args hash
+    and the files of each step. Resume reads the manifests and only the chosen step.
+
+    Args:
+        keep_last: only keep the last keep_last steps, older steps and their payload
+            files are removed after a new step is saved. 0 (the default) keeps all steps.
+    '''
+
+    def __init__(
+        self, uri: str, args: dict, parties: list[str], keep_last: int = 0
+    ) -> None:
+        assert keep_last >= 0, f"keep_last should >= 0, got {keep_last}"
         self.uri = uri
         self.args = args
         self.parties = parties
+        self.keep_last = keep_last
+        self.args_hash = hashlib.sha256(pickle.dumps(args)).hexdigest()
+        self._pending = []
+
+    def _manifest_uri(self, party: str) -> str:
+        return f"{self.uri}_manifest_{party}"
+
+    def wait(self):
+        '''
+        wait until the last dumped step is saved.
+        '''
+        if self._pending:
+            pending, self._pending = self._pending, []
+            wait(pending)
 
     def load(self, storage: Storage) -> DistData:  # type: ignore
+        self.wait()
+
+        def _try_load_manifest(manifest_uri: str):
+            try:
+                return _read_manifest(storage, manifest_uri)
+            except:
+                return None
+
+        manifests = reveal(
+            [
+                PYU(party)(_try_load_manifest)(self._manifest_uri(party))
+                for party in self.parties
+            ]
+        )
+        if any(m is None for m in manifests):
+            logging.info(f"checkpoint manifest of {self.uri} not found on all parties")
+            return self._load_legacy(storage)
+
+        # the last step which every party has with the same uuid and args.
+        parties_steps = [{e["step"]: e for e in m} for m in manifests]
+        common_steps = set.intersection(*[set(s.keys()) for s in parties_steps])
+        logging.info(
+            f"try load checkpoint from {self.uri}, steps of each party: {[sorted(s.keys()) for s in parties_steps]}"
+        )
+        for step in sorted(common_steps, reverse=True):
+            entries = [s[step] for s in parties_steps]
+            if len(set([e["uuid"] for e in entries])) > 1:
+                logging.info(f"uuid miss match, checkpoint from step {step}")
+                continue
+            if not all([e["args_hash"] == self.args_hash for e in entries]):
+                logging.info(f"args miss match, checkpoint from step {step}")
+                continue
+
+            def _load_step(uri: str):
+                try:
+                    with storage.get_reader(uri) as f:
+                        return pickle.load(f)
+                except:
+                    return None
+
+            # the payload is the same on all parties, only read it once.
+            cp = reveal(PYU(self.parties[0])(_load_step)(entries[0]["uri"]))
+            if not isinstance(cp, dict) or cp.get("uuid") != entries[0]["uuid"]:
+                logging.info(f"broken checkpoint from step {step}")
+                continue
+            if cp["args"] != self.args:
+                logging.info(f"args miss match, checkpoint from step {step}")
+                continue
+
+            logging.info(f"found usable checkpoint from step {step}")
+            return cp["payload"]
+
+        # no usable checkpoint
+        logging.info(f"no usable checkpoint")
+        return None
+
+    def _load_legacy(self, storage: Storage) -> DistData:  # type: ignore
         def _try_load():
             check_points = []
             step = 0
@@ -87,7 +224,17 @@ class Checkpoint:
     def _step_uri(self, step: int):
         return f"{self.uri}_{step}"
 
-    def dump(self, storage: Storage, step: int, payload: DistData):  # type: ignore
+    def dump(self, storage: Storage, step: int, payload: DistData, saved: list = None):  # type: ignore
+        '''
+        save the step in background, the previous step is waited first so the manifest
+        is updated in order. Call wait() to make sure the step is saved.
+
+        Args:
+            saved: PYUObjects which are ready when the payload files are saved, e.g.
+                returned by Model.dump_async. The step of a party is recorded after
+                its payload files are saved.
+        '''
+        self.wait()
         parties = [dr.party for dr in payload.data_refs]
         check_point = dict()
         check_point["step"] = step
@@ -95,14 +242,28 @@ class Checkpoint:
         check_point["args"] = self.args
         check_point["payload"] = payload
 
-        check_point = pickle.dumps(check_point)
-
-        def _save(cp, storage, uri):
-            with storage.get_writer(uri) as f:
-                f.write(cp)
-
-        waits = []
-        for party in parties:
-            waits.append(PYU(party)(_save)(check_point, storage, self._step_uri(step)))
+        step_uri = self._step_uri(step)
+        cp = pickle.dumps(check_point)
 
-        wait(waits)
+        entry = {
+            "step": step,
+            "uuid": check_point["uuid"],
+            "args_hash": self.args_hash,
+            "uri": step_uri,
+            "payload_refs": [(dr.party, dr.uri) for dr in payload.data_refs],
+        }
+        saved = saved or []
+        for party in sorted(set(parties)):
+            party_saved = [o for o in saved if o.device.party == party]
+            self._pending.append(
+                PYU(party)(_save_step)(
+                    party,
+                    storage,
+                    cp,
+                    step_uri,
+                    self._manifest_uri(party),
+                    entry,
+                    self.keep_last,
+                    *party_saved,
+                )
+            )
@@ -24,6 +24,7 @@ import duckdb
 import pandas as pd
 import pyarrow as pa
 import pyarrow.orc as orc
+import pyarrow.parquet as pq
 
 DEFAULT_BATCH_SIZE = 50000
 
@@ -387,6 +388,226 @@ class ORCWriter(IWriter):
         self._buffer.close()
 
 
+@dataclass
+class ParquetReadOptions(ReadOptions):
+    '''
+    filters: predicates in disjunctive normal form like pyarrow.parquet, e.g.
+        [("age", ">", 18), ("city", "in", ["a", "b"])] or a list of such lists.
+        Row groups which can not match are skipped by their statistics,
+        then the remained rows are filtered exactly.
+    '''
+
+    batch_size: int = 0
+    filters: list = None
+
+
+_PARQUET_FILTER_OPS = {"=", "==", "!=", "<", "<=", ">", ">=", "in", "not in"}
+
+
+def _normalize_filters(filters: list) -> list[list[tuple]]:
+    if not filters:
+        return None
+    if isinstance(filters[0], tuple):
+        filters = [filters]
+    for conj in filters:
+        for col, op, _ in conj:
+            assert op in _PARQUET_FILTER_OPS, f"unsupported filter op<{op}> of {col}"
+    return [list(conj) for conj in filters]
+
+
+def _predicate_may_match(op: str, val, stats: pq.Statistics) -> bool:
+    if stats is None or not stats.has_min_max:
+        return True
+    lo, hi = stats.min, stats.max
+    try:
+        if op in ("=", "=="):
+            return lo <= val <= hi
+        elif op == "!=":
+            return not (lo == hi == val)
+        elif op == "<":
+            return lo < val
+        elif op == "<=":
+            return lo <= val
+        elif op == ">":
+            return hi > val
+        elif op == ">=":
+            return hi >= val
+        elif op == "in":
+            return any(lo <= v <= hi for v in val)
+    except TypeError:
+        # the statistics and the value are not comparable, keep the row group.
+        pass
+    return True
+
+
+def _row_group_may_match(rg: pq.RowGroupMetaData, filters: list[list[tuple]]) -> bool:
+    stats = {}
+    for i in range(rg.num_columns):
+        column = rg.column(i)
+        stats[column.path_in_schema] = column.statistics
+    return any(
+        all(_predicate_may_match(op, val, stats.get(col)) for col, op, val in conj)
+        for conj in filters
+    )
+
+
+class ParquetReader(BatchReader, IReader):
+    def __init__(
+        self,
+        source: str | io.BufferedIOBase | BufferedIO,
+        schema: pa.Schema = None,
+        options: ParquetReadOptions = None,
+    ) -> None:
+        if options is None:
+            options = ParquetReadOptions()
+        assert isinstance(options, ParquetReadOptions)
+
+        super().__init__(options.batch_size)
+        self._buffer = _to_buffered_io(source, "rb")
+        self._file = pq.ParquetFile(self._buffer.native)
+        self._schema = schema
+        self._columns = schema.names if schema else None
+
+        filters = _normalize_filters(options.filters)
+        self._filter = None
+        self._read_columns = self._columns
+        metadata = self._file.metadata
+        if filters is None:
+            self._row_groups = list(range(metadata.num_row_groups))
+        else:
+            self._filter = pq.filters_to_expression(filters)
+            self._row_groups = [
+                i
+                for i in range(metadata.num_row_groups)
+                if _row_group_may_match(metadata.row_group(i), filters)
+            ]
+            if self._columns is not None:
+                # columns only used by filters are read and dropped after filtering.
+                self._read_columns = list(self._columns)
+                for conj in filters:
+                    for col, _, _ in conj:
+                        if col not in self._read_columns:
+                            self._read_columns.append(col)
+        self._cur = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tbl, eof = self.read_next()
+        if eof:
+            raise StopIteration
+        return tbl
+
+    @property
+    def num_row_groups(self) -> int:
+        return self._file.metadata.num_row_groups
+
+    @property
+    def row_groups(self) -> list[int]:
+        '''row groups to be read after pruning by statistics'''
+        return self._row_groups
+
+    def _post_process(self, result: pa.Table) -> pa.Table:
+        if self._filter is not None:
+            result = result.filter(self._filter)
+        # sort by columns and reset schema
+        if self._schema:
+            result = result.select(self._columns).cast(self._schema)
+        return result
+
+    def read_all(self) -> pa.Table:
+        if self._filter is None and len(self._row_groups) == self.num_row_groups:
+            result = self._file.read(columns=self._read_columns)
+        else:
+            result = self._file.read_row_groups(
+                self._row_groups, columns=self._read_columns
+            )
+        return self._post_process(result)
+
+    def read_next(self) -> Tuple[pa.Table, bool]:
+        batches = self.read_next_batches()
+        if batches is None:
+            return None, True
+        result = pa.Table.from_batches(batches)
+        if self._schema:
+            result = result.select(self._columns).cast(self._schema)
+        return result, False
+
+    def read_next_block(self) -> pa.RecordBatch:
+        while self._cur < len(self._row_groups):
+            tbl = self._file.read_row_group(
+                self._row_groups[self._cur], columns=self._read_columns
+            )
+            self._cur += 1
+            if self._filter is not None:
+                tbl = tbl.filter(self._filter)
+                if self._columns is not None:
+                    tbl = tbl.select(self._columns)
+            if tbl.num_rows > 0:
+                return tbl.combine_chunks().to_batches()[0]
+        return None
+
+    def close(self) -> None:
+        self._file.close()
+        self._buffer.close()
+
+
+@dataclass
+class ParquetWriteOptions(WriteOptions):
+    row_group_size: int = 1024 * 1024
+    compression: str = "snappy"
+
+
+class ParquetWriter(IWriter):
+    def __init__(
+        self,
+        source: str | io.BufferedIOBase | BufferedIO,
+        schema: pa.Schema | None = None,
+        options: ParquetWriteOptions | None = None,
+    ) -> None:
+        if options is None:
+            options = ParquetWriteOptions()
+        assert isinstance(options, ParquetWriteOptions)
+        assert options.row_group_size > 0, f"invalid {options.row_group_size}"
+
+        self._buffer = _to_buffered_io(source, "wb")
+        self._options = options
+        self._writer: pq.ParquetWriter = None
+        if schema is not None:
+            self._init_writer(schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _init_writer(self, schema: pa.Schema):
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(
+                self._buffer.native, schema, compression=self._options.compression
+            )
+
+    def write(self, data: pa.Table | pa.RecordBatch) -> int:
+        if isinstance(data, pa.RecordBatch):
+            data = pa.Table.from_batches([data])
+        self._init_writer(data.schema)
+        self._writer.write_table(data, row_group_size=self._options.row_group_size)
+        return data.num_rows
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._buffer.close()
+
+
 def read_csv(
     source: str | io.BufferedIOBase | BufferedIO,
     schema: pa.Schema = None,
@@ -425,6 +646,56 @@ def write_orc(
         w.write(data)
 
 
+def read_parquet(
+    source: str | io.BufferedIOBase | BufferedIO,
+    schema: pa.Schema = None,
+    options: ParquetReadOptions = None,
+) -> pa.Table:
+    with ParquetReader(source, schema, options) as reader:
+        return reader.read_all()
+
+
+def write_parquet(
+    data: pa.Table,
+    source: str | io.BufferedIOBase | BufferedIO,
+    options: ParquetWriteOptions = None,
+):
+    with ParquetWriter(source, options=options) as w:
+        w.write(data)
+
+
+def new_reader(
+    format: str,
+    source: str | io.BufferedIOBase | BufferedIO,
+    schema: pa.Schema = None,
+    options: ReadOptions = None,
+) -> IReader:
+    if format == "csv":
+        return CSVReader(source, schema, options)
+    elif format == "orc":
+        return ORCReader(source, schema, options)
+    elif format == "parquet":
+        return ParquetReader(source, schema, options)
+    else:
+        raise ValueError(f"unsupport format {format}")
+
+
+def new_writer(
+    format: str,
+    source: str | io.BufferedIOBase | BufferedIO,
+    schema: pa.Schema = None,
+    options: WriteOptions = None,
+) -> IWriter:
+    if format == "csv":
+        return CSVWriter(source, schema, options)
+    elif format == "orc":
+        return ORCWriter(source, schema, options)
+    elif format == "parquet":
+        return ParquetWriter(source, schema, options)
+    else:
+        raise ValueError(f"unsupport format {format}")
+
+
 def convert_io(
     input_format: str,
     input_stream: str | io.BufferedIOBase | BufferedIO,
@@ -434,17 +705,8 @@ def convert_io(
     output_options: WriteOptions | None,
     schema: pa.Schema,
 ) -> int:
-    assert input_format in ["orc", "csv"]
-    assert output_format in ["orc", "csv"]
-    if input_format == "orc":
-        reader = ORCReader(input_stream, schema, input_options)
-    else:
-        reader = CSVReader(input_stream, schema, input_options)
-
-    if output_format == "orc":
-        writer = ORCWriter(output_stream, schema, output_options)
-    else:
-        writer = CSVWriter(output_stream, schema, output_options)
+    reader = new_reader(input_format, input_stream, schema, input_options)
+    writer = new_writer(output_format, output_stream, schema, output_options)
 
     num_rows = 0
     while True:
@@ -19,6 +19,7 @@ import os
 import pyarrow as pa
 import pyarrow.csv as csv
 import pyarrow.orc as orc
+import pyarrow.parquet as pq
 
 from ..dist_data.vtable import (
     VTableField,
@@ -63,6 +64,8 @@ class Mock(IConnector):
         w = storage.get_writer(output_uri)
         if output_format == VTableFormat.CSV:
             csv.write_csv(data, w)
+        elif output_format == VTableFormat.PARQUET:
+            pq.write_table(data, w)
         else:
             orc.write_table(data, w)
 
@@ -183,15 +183,17 @@ class Context:
         return SPU(cluster_def, spu_config["link_desc"])
 
     def load_table(
-        self, dd: DistData | VTable, columns: list[str] | None = None
+        self,
+        dd: DistData | VTable,
+        columns: list[str] | None = None,
+        filters: list | None = None,
     ) -> CompVDataFrame:
-        if columns:
-            if isinstance(dd, DistData):
-                dd = VTable.from_distdata(dd, columns)
-            else:
-                dd = dd.select(columns)
+        '''
+        only the columns are read if given, the others could be read later by CompVDataFrame.load_columns.
+        only the rows matching filters are read if given, see CompVDataFrame.load.
+        '''
         with self.trace_io():
-            return CompVDataFrame.load(self.storage, dd)
+            return CompVDataFrame.load(self.storage, dd, columns, filters)
 
     def load_model(
         self,
@@ -258,13 +260,16 @@ class Context:
         if not self.enable_checkpoint:
             return
         with self.trace_io():
-            payload = model.dump(self.storage, model_uri)
-            self._checkpoint.dump(self.storage, step, payload)
+            # the payload is saved in background, the step is recorded after it.
+            payload, saved = model.dump_async(self.storage, model_uri)
+            self._checkpoint.dump(self.storage, step, payload, saved)
 
     def update_progress(self, percent: float, infos: dict | None = None):
         if self._progressor is not None:
             self._progressor.update(percent, infos)
 
     def on_finish(self):
+        if self.enable_checkpoint:
+            self._checkpoint.wait()
         if self._progressor is not None:
             self._progressor.done()
@@ -40,7 +40,7 @@ from secretflow.spec.v1.data_pb2 import (
     VerticalTable,
 )
 
-from .common.io import IReader, IWriter
+from .common.io import IReader, IWriter, WriteOptions
 from .common.types import Output, TimeTracer
 from .dataframe_io import new_reader_proxy, new_writer_proxy
 from .dist_data.base import DistDataType, IDumper
@@ -158,6 +158,8 @@ class CompVDataFrame(IDumper):
     ) -> None:
         self.partitions = partitions
         self.system_info = system_info
+        # the storage, the whole table and the filters of a projected load, see load_columns.
+        self._source: Tuple[Storage, VTable, list] = None
 
     def data(self, pyu: PYU) -> PYUObject:
         if pyu not in self.partitions:
@@ -394,38 +396,128 @@ class CompVDataFrame(IDumper):
         return CompVDataFrame(out_partitions, system_info=self.system_info)
 
     @staticmethod
-    def load(storage: Storage, dd: DistData | VTable) -> "CompVDataFrame":
-        vtbl = dd if isinstance(dd, VTable) else VTable.from_distdata(dd)
+    def _read_partitions(
+        storage: Storage, vtbl: VTable, filters: list = None
+    ) -> dict[PYU, CompPartition]:
+        _check_filters(vtbl, filters)
         partitions = {}
         for party, p in vtbl.parties.items():
             pa_schema = p.schema.to_arrow()
             r = new_reader_proxy(
-                PYU(party), storage, p.format, p.uri, pa_schema, null_strs=p.null_strs
+                PYU(party),
+                storage,
+                p.format,
+                p.uri,
+                pa_schema,
+                null_strs=p.null_strs,
+                filters=filters,
             )
             data_obj = r.read_all()
-            p = CompPartition(data_obj)
             partitions[PYU(party)] = CompPartition(data_obj)
+        return partitions
+
+    @staticmethod
+    def load(
+        storage: Storage,
+        dd: DistData | VTable,
+        columns: list[str] | None = None,
+        filters: list | None = None,
+    ) -> "CompVDataFrame":
+        '''
+        load a table, only the columns are read if given, e.g. the feature and label
+        selections of a component. Other columns of the table could be read later by load_columns.
+        only the rows matching filters are read if given, see ParquetReadOptions,
+        row groups of an individual parquet table which can not match are skipped.
+        '''
+        vtbl = dd if isinstance(dd, VTable) else VTable.from_distdata(dd)
+        source = vtbl
+        if columns:
+            vtbl = vtbl.select(columns)
+        partitions = CompVDataFrame._read_partitions(storage, vtbl, filters)
         ret = CompVDataFrame(partitions=partitions, system_info=dd.system_info)
         if not math.prod(ret.shape):
             raise DataFormatError.empty_dataset(
                 f"empty dataset {ret.shape} is not allowed"
             )
+        if columns:
+            ret._source = (storage, source, filters)
         return ret
 
-    def dump(self, storage: Storage, uri: str, format: VTableFormat = VTableFormat.ORC) -> DistData:  # type: ignore
+    @property
+    def unloaded_columns(self) -> List[str]:
+        '''
+        columns of the source table which are not read by a projected load
+        '''
+        if self._source is None:
+            return []
+        loaded = set(self.columns)
+        return [c for c in self._source[1].columns if c not in loaded]
+
+    def load_columns(self, columns: list[str] | None = None) -> "CompVDataFrame":
+        '''
+        read the columns, all unloaded columns if None, of the source table of a projected load,
+        and return a new DataFrame with them. Columns of each party keep the order of the source table.
+        '''
+        if self._source is None:
+            raise CompEvalError(f"DataFrame is not loaded by projection")
+        storage, source, filters = self._source
+        unloaded = self.unloaded_columns
+        if columns is None:
+            columns = unloaded
+        else:
+            unknowns = set(columns).difference(unloaded)
+            if unknowns:
+                raise CompEvalError(f"columns {unknowns} are not unloaded columns")
+        if not columns:
+            return self
+
+        loaded = {pyu: p.columns for pyu, p in self.partitions.items()}
+        added_tbl = source.select(columns)
+        added = CompVDataFrame._read_partitions(storage, added_tbl, filters)
+
+        def _merge(left: pa.Table, right: pa.Table, names: list[str]) -> pa.Table:
+            if left is None:
+                return right.select(names)
+            for i in range(right.shape[1]):
+                left = left.append_column(right.field(i), right.column(i))
+            return left.select(names)
+
+        partitions = {}
+        for party, p in source.parties.items():
+            pyu = PYU(party)
+            if pyu not in added:
+                if pyu in self.partitions:
+                    partitions[pyu] = self.partitions[pyu]
+                continue
+            names = set(loaded.get(pyu, []))
+            names.update(added_tbl.parties[party].schema.names)
+            names = [n for n in p.schema.names if n in names]
+            left = self.partitions[pyu].data if pyu in self.partitions else None
+            partitions[pyu] = CompPartition(pyu(_merge)(left, added[pyu].data, names))
+
+        ret = CompVDataFrame(partitions, system_info=self.system_info)
+        ret._source = self._source
+        return ret
+
+    def dump(self, storage: Storage, uri: str, format: VTableFormat = VTableFormat.ORC, options: WriteOptions = None) -> DistData:  # type: ignore
+        '''
+        options: write options of the format, e.g. ParquetWriteOptions with row_group_size.
+        '''
         if not self.partitions:
             raise DataFormatError.empty_dataset("can not dump empty dataframe")
 
         closes = []
         lines = []
         for pyu, party in self.partitions.items():
-            w = new_writer_proxy(pyu, storage, format, uri, schema=party.schema)
+            w = new_writer_proxy(
+                pyu, storage, format, uri, schema=party.schema, options=options
+            )
             lines.append(w.write(party.data))
             closes.append(w.close())
         lines = reveal(lines)
         if len(set(lines)) != 1:
             raise DataFormatError.dataset_not_aligned(
-                f"DataFrame is not aligned, {lines}"
+                reason=f"DataFrame is not aligned, {lines}"
             )
         if lines[0] <= 0:
             raise DataFormatError.empty_dataset(
@@ -449,8 +541,10 @@ class CompVDataFrameReader:
         tracer: TimeTracer,
         dd: DistData | VTable,
         batch_size: int | None = None,
+        filters: list | None = None,
     ) -> None:
         vtbl = dd if isinstance(dd, VTable) else VTable.from_distdata(dd)
+        _check_filters(vtbl, filters)
         readers: dict[str, IReader] = {}
         for p in vtbl.parties.values():
             pyu = PYU(p.party)
@@ -463,6 +557,7 @@ class CompVDataFrameReader:
                 pa_schema,
                 null_strs=p.null_strs,
                 batch_size=batch_size,
+                filters=filters,
             )
             readers[pyu] = reader
         self._readers = readers
@@ -496,19 +591,27 @@ class CompVDataFrameReader:
         eofs = set(reveal(eofs))
         if len(eofs) != 1:
             raise DataFormatError.dataset_not_aligned(
-                f"DataFrame is not aligned, {eofs}"
+                reason=f"DataFrame is not aligned, {eofs}"
             )
         eof = next(iter(eofs)) == True
 
         if eof:
             return None
 
-        ret = CompVDataFrame(datas, system_info=self._system_info)
-        if not math.prod(ret.shape):
+        # each party should read the same rows in one batch.
+        shapes = reveal([p.device(lambda t: t.shape)(p.data) for p in datas.values()])
+        rows = {p.party: shape[0] for p, shape in zip(datas.keys(), shapes)}
+        if len(set(rows.values())) != 1:
+            raise DataFormatError.dataset_not_aligned(
+                reason=f"DataFrame is not aligned, rows of batch: {rows}"
+            )
+        shape = (shapes[0][0], sum([s[1] for s in shapes]))
+        if not math.prod(shape):
             raise DataFormatError.empty_dataset(
-                f"empty dataset {ret.shape} is not allowed"
+                reason=f"empty dataset {shape} is not allowed"
             )
-        return ret
+
+        return CompVDataFrame(datas, system_info=self._system_info)
 
     def close(self) -> None:
         for r in self._readers.values():
@@ -523,10 +626,12 @@ class CompVDataFrameWriter:
         tracer: TimeTracer,
         uri: str,
         format: VTableFormat = VTableFormat.ORC,
+        options: WriteOptions | None = None,
     ) -> None:
         self.line_count = 0
         self._uri = uri
         self._format = format
+        self._options = options
         self._tracer = tracer
         self._storage = storage
         self._writers: dict[PYU, IWriter] = None
@@ -549,7 +654,12 @@ class CompVDataFrameWriter:
         for pyu, obj in df.partitions.items():
             party = pyu.party
             w = new_writer_proxy(
-                pyu, self._storage, self._format, self._uri, schema=obj.schema
+                pyu,
+                self._storage,
+                self._format,
+                self._uri,
+                schema=obj.schema,
+                options=self._options,
             )
             self._schemas[party] = VTableSchema.from_arrow(obj.schema)
             self._writers[pyu] = w
@@ -566,7 +676,7 @@ class CompVDataFrameWriter:
         write_lines = reveal(write_lines)
         if len(set(write_lines)) != 1:
             raise DataFormatError.dataset_not_aligned(
-                f"DataFrame is not aligned, lines: {write_lines}"
+                reason=f"DataFrame is not aligned, lines: {write_lines}"
             )
         self.line_count += write_lines[0]
 
@@ -592,6 +702,21 @@ class CompVDataFrameWriter:
         out.data = self.dump()
 
 
+def _check_filters(vtbl: VTable, filters: list | None):
+    if not filters:
+        return
+    # parties of a vertical table would filter their rows independently.
+    if len(vtbl.parties) != 1:
+        raise NotSupportedError.not_supported_party_count(
+            reason=f"filters only support individual table, got {len(vtbl.parties)} parties"
+        )
+    for p in vtbl.parties.values():
+        if p.format != VTableFormat.PARQUET:
+            raise NotSupportedError.not_supported_file_format(
+                format=str(p.format), supported_format=str(VTableFormat.PARQUET)
+            )
+
+
 def _to_distdata_by_uri(
     schemas: dict[str, VTableSchema],
     uri: str,
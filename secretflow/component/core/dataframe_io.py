@@ -28,6 +28,10 @@ from .common.io import (
     ORCReadOptions,
     ORCWriteOptions,
     ORCWriter,
+    ParquetReader,
+    ParquetReadOptions,
+    ParquetWriteOptions,
+    ParquetWriter,
     WriteOptions,
 )
 from .storage import Storage
@@ -85,6 +89,36 @@ class ORCWriterProxy(ORCWriter):
         super().__init__(buffer, schema, options)
 
 
+@proxy(device_object_type=PYUObject)
+class ParquetReaderProxy(ParquetReader):
+    def __init__(
+        self,
+        storage: Storage,
+        uri: str,
+        schema: pa.Schema = None,
+        options: ParquetReadOptions = None,
+    ) -> None:
+        buffer = BufferedIO(storage.get_reader(uri), auto_closed=True)
+        super().__init__(buffer, schema, options)
+
+    def get_row_groups(self) -> list[int]:
+        '''row groups to be read after pruning by statistics'''
+        return self.row_groups
+
+
+@proxy(device_object_type=PYUObject)
+class ParquetWriterProxy(ParquetWriter):
+    def __init__(
+        self,
+        storage: Storage,
+        uri: str,
+        schema: pa.Schema = None,
+        options: ParquetWriteOptions = None,
+    ) -> None:
+        buffer = BufferedIO(storage.get_writer(uri), auto_closed=True)
+        super().__init__(buffer, schema, options)
+
+
 def new_reader_proxy(
     device: PYU,
     storage: Storage,
@@ -93,15 +127,24 @@ def new_reader_proxy(
     schema: pa.Schema,
     null_strs: list[str] = None,
     batch_size: int = None,
+    filters: list = None,
 ) -> IReader:
+    '''
+    filters: predicates of ParquetReadOptions, only parquet could skip row groups by them.
+    '''
     if batch_size is None:
         batch_size = 50000
+    if filters and format != "parquet":
+        raise ValueError(f"filters are not supported by format {format}")
     if format == "csv":
         options = CSVReadOptions(batch_size, null_strs)
         return CSVReaderProxy(storage, uri, schema, options, device=device)
     elif format == "orc":
         options = ORCReadOptions(batch_size)
         return ORCReaderProxy(storage, uri, schema, options, device=device)
+    elif format == "parquet":
+        options = ParquetReadOptions(batch_size, filters)
+        return ParquetReaderProxy(storage, uri, schema, options, device=device)
     else:
         raise ValueError(f"unsupport format {format}")
 
@@ -118,5 +161,7 @@ def new_writer_proxy(
         return CSVWriterProxy(storage, uri, schema, options, device=device)
     elif format == "orc":
         return ORCWriterProxy(storage, uri, schema, options, device=device)
+    elif format == "parquet":
+        return ParquetWriterProxy(storage, uri, schema, options, device=device)
     else:
         raise ValueError(f"unsupport format {format}")
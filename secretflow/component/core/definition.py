@@ -44,6 +44,7 @@ from .checkpoint import Checkpoint
 from .common.types import Input, Output, UnionGroup, UnionSelection
 from .component import Component
 from .dist_data.base import DistDataType
+from .envs import Envs, get_env
 from .utils import clean_text
 
 
@@ -1135,7 +1136,10 @@ class Definition:
                 kwargs[md.fullname] if md.fullname in kwargs else md.default
             )
 
-        return Checkpoint(checkpoint_uri, args, sorted(list(parties)))
+        keep_last = int(get_env(Envs.CHECKPOINT_KEEP_LAST, 0))
+        return Checkpoint(
+            checkpoint_uri, args, sorted(list(parties)), keep_last=keep_last
+        )
 
     def make_component(self, param: NodeEvalParam | dict, check_exist: bool = True) -> type[Component]:  # type: ignore
         if isinstance(param, NodeEvalParam):
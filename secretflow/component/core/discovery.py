@@ -14,20 +14,31 @@
 
 import ast
 import glob
+import hashlib
 import importlib
 import importlib.metadata
+import json
 import logging
 import os
+import re
 import sys
+import tempfile
 
+from .envs import Envs, get_bool_env, get_env
+from .registry import Registry
 
-def _check_module_usage(file_path: str) -> bool:
+# bump it if the format of cached index is changed.
+_INDEX_VERSION = 1
+
+_KIND_SKIP = "skip"  # not a component module
+_KIND_LAZY = "lazy"  # components are found by scanning, import on demand
+_KIND_EAGER = "eager"  # components cannot be found by scanning, import at loading
+
+
+def _check_module_usage(tree: ast.Module) -> bool:
     module_name = "secretflow.component.core"
-    with open(file_path, 'r', encoding='utf-8') as file:
-        file_content = file.read()
 
     has_parse_import = False
-    tree = ast.parse(file_content)
     for node in ast.walk(tree):
         if isinstance(node, ast.Import):
             has_parse_import = True
@@ -45,6 +56,141 @@ def _check_module_usage(file_path: str) -> bool:
     return False
 
 
+def _is_register_call(node: ast.expr) -> bool:
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id == "register"
+    if isinstance(func, ast.Attribute):
+        return func.attr == "register"
+    return False
+
+
+def _parse_register_call(node: ast.Call, cls_name: str) -> list[str] | None:
+    '''
+    return [domain, name, version] of register(domain, version, name, desc),
+    or None if any of them is not a literal.
+    '''
+    params = ["domain", "version", "name", "desc"]
+    args = {}
+    try:
+        for param, arg in zip(params, node.args):
+            args[param] = ast.literal_eval(arg)
+        for kw in node.keywords:
+            if kw.arg is None:
+                return None
+            if kw.arg in ("domain", "version", "name"):
+                args[kw.arg] = ast.literal_eval(kw.value)
+    except ValueError:
+        return None
+
+    domain, version = args.get("domain"), args.get("version")
+    name = args.get("name", "")
+    if not all(isinstance(v, str) for v in [domain, version, name]):
+        return None
+    if name == "":
+        # same as Definition
+        name = re.sub(r"(?<!^)(?=[A-Z])", "_", cls_name).lower()
+    return [domain, name, version]
+
+
+def _scan_component_file(file_path: str) -> dict:
+    with open(file_path, 'r', encoding='utf-8') as file:
+        tree = ast.parse(file.read())
+
+    if not _check_module_usage(tree):
+        return {"kind": _KIND_SKIP, "components": []}
+
+    decorators = set(
+        id(dec)
+        for cls in tree.body
+        if isinstance(cls, ast.ClassDef)
+        for dec in cls.decorator_list
+    )
+    for node in ast.walk(tree):
+        # register called in other ways, e.g. in functions, could only be found by import.
+        if _is_register_call(node) and id(node) not in decorators:
+            return {"kind": _KIND_EAGER, "components": []}
+
+    components = []
+    for cls in tree.body:
+        if not isinstance(cls, ast.ClassDef):
+            continue
+        for dec in cls.decorator_list:
+            if not _is_register_call(dec):
+                continue
+            comp = _parse_register_call(dec, cls.name)
+            if comp is None:
+                return {"kind": _KIND_EAGER, "components": []}
+            components.append(comp)
+
+    return {"kind": _KIND_LAZY, "components": components}
+
+
+def _index_cache_path(root_path: str) -> str:
+    cache_dir = get_env(
+        Envs.COMPONENT_INDEX_CACHE_DIR,
+        os.path.join(os.path.expanduser("~"), ".cache", "secretflow"),
+    )
+    digest = hashlib.sha256(root_path.encode()).hexdigest()
+    return os.path.join(cache_dir, f"component_index_{digest[:16]}.json")
+
+
+def _read_index_cache(cache_path: str) -> dict:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") == _INDEX_VERSION:
+            return cache["files"]
+    except Exception:
+        pass
+    return {}
+
+
+def _write_index_cache(cache_path: str, files: dict):
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'w', dir=cache_dir, delete=False, encoding='utf-8'
+        ) as f:
+            json.dump({"version": _INDEX_VERSION, "files": files}, f)
+        os.replace(f.name, cache_path)
+    except Exception as e:
+        # the index is only a cache, e.g. the home dir may be readonly.
+        logging.debug(f"write component index cache fail, {cache_path}, err={e}")
+
+
+def build_component_index(root_path: str, pyfiles: list[str]) -> dict[str, dict]:
+    '''
+    Scan the component files without importing them, and return the index of
+    relative path -> {"kind", "components": [[domain, name, version]], "mtime_ns", "size"}.
+    The index is cached at COMPONENT_INDEX_CACHE_DIR, and only changed files are scanned again,
+    so it could be prebuilt at build time, e.g. by importing secretflow.component once.
+    '''
+    cache_path = _index_cache_path(root_path)
+    cached = _read_index_cache(cache_path)
+    index = {}
+    for pyfile in pyfiles:
+        rel_path = os.path.relpath(pyfile, root_path)
+        st = os.stat(pyfile)
+        entry = cached.get(rel_path)
+        if (
+            entry is None
+            or entry["mtime_ns"] != st.st_mtime_ns
+            or entry["size"] != st.st_size
+        ):
+            entry = _scan_component_file(pyfile)
+            entry["mtime_ns"] = st.st_mtime_ns
+            entry["size"] = st.st_size
+        index[rel_path] = entry
+
+    if index != cached:
+        _write_index_cache(cache_path, index)
+    return index
+
+
 def load_component_modules(
     root_path: str,
     module_prefix: str = "",
@@ -52,6 +198,12 @@ def load_component_modules(
     ignore_keys: list[str] = [],
     ignore_root_files: bool = True,
 ):
+    '''
+    Find components under root_path. By default, components are found by an index of
+    register decorators, and their modules are imported on demand by Registry, so only
+    the module of the running component is imported. Set COMPONENT_LAZY_LOAD to false to
+    import all component modules here.
+    '''
     if root_path not in sys.path:
         sys.path.append(root_path)
 
@@ -71,27 +223,39 @@ def load_component_modules(
     else:
         root_dirs = [root_path]
 
+    pyfiles = []
     for dir_name in root_dirs:
         if dir_name.startswith("__"):  # ignore __pycache__
             continue
         pattern = os.path.join(root_path, dir_name, "**/*.py")
-        for pyfile in glob.glob(pattern, recursive=True):
+        for pyfile in sorted(glob.glob(pattern, recursive=True)):
             if pyfile.endswith("__init__.py") or is_ignore_file(pyfile):
                 continue
-            if not _check_module_usage(pyfile):
-                continue
+            pyfiles.append(pyfile)
+
+    lazy = get_bool_env(Envs.COMPONENT_LAZY_LOAD, True)
+    index = build_component_index(root_path, pyfiles)
+    for pyfile in pyfiles:
+        entry = index[os.path.relpath(pyfile, root_path)]
+        if entry["kind"] == _KIND_SKIP:
+            continue
+
+        module_name = (
+            os.path.relpath(pyfile, root_path)
+            .removesuffix(".py")
+            .replace(os.path.sep, ".")
+        )
+        if module_prefix:
+            module_name = f"{module_prefix}.{module_name}"
+
+        if lazy and entry["kind"] == _KIND_LAZY:
+            for domain, name, version in entry["components"]:
+                Registry.register_lazy(domain, name, version, module_name)
+            continue
 
-            module_name = (
-                os.path.relpath(pyfile, root_path)
-                .removesuffix(".py")
-                .replace(os.path.sep, ".")
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            raise ValueError(
+                f"import component fail, file={pyfile}, module={module_name}, err={e}"
             )
-            if module_prefix:
-                module_name = f"{module_prefix}.{module_name}"
-
-            try:
-                importlib.import_module(module_name)
-            except Exception as e:
-                raise ValueError(
-                    f"import component fail, file={pyfile}, module={module_name}, err={e}"
-                )
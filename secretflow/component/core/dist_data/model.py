@@ -17,7 +17,7 @@ import json
 from dataclasses import dataclass
 from typing import Any, Callable
 
-from secretflow.device.driver import PYU, SPU, DeviceObject, PYUObject, SPUObject, wait
+from secretflow.device import PYU, SPU, DeviceObject, PYUObject, SPUObject, wait
 from secretflow.error_system.exceptions import (
     CompEvalError,
     DataFormatError,
@@ -216,6 +216,17 @@ class Model(IDumper):
         )
 
     def dump(self, storage: Storage, output_uris: str) -> DistData:  # type: ignore
+        dd, saved = self.dump_async(storage, output_uris)
+        wait(saved)
+        return dd
+
+    def dump_async(self, storage: Storage, output_uris: str) -> tuple[DistData, list[PYUObject]]:  # type: ignore
+        '''
+        same as dump, but return without waiting for the objs to be saved.
+
+        Returns:
+            the DistData and PYUObjects which are ready when the files of its party are saved.
+        '''
         if output_uris == "":
             raise InvalidArgumentError(
                 f"output_uris cannot be empty when dumping Model"
@@ -228,6 +239,7 @@ class Model(IDumper):
         objs_uri = []
         objs_party = []
         saved_objs = []
+        saved = []
         for i, obj in enumerate(self.objs):
             if isinstance(obj, PYUObject):
                 device: PYU = obj.device
@@ -237,7 +249,7 @@ class Model(IDumper):
                     with comp_storage.get_writer(uri) as w:
                         pickle.dump(obj, w)
 
-                wait(device(dumps)(storage, uri, obj))
+                saved.append(device(dumps)(storage, uri, obj))
 
                 saved_obj = DeviceObjectCollection.DeviceObject(
                     type="pyu", data_ref_idxs=[len(objs_uri)]
@@ -249,9 +261,12 @@ class Model(IDumper):
                 device: SPU = obj.device
                 uris = [f"{output_uris}/{i}" for _ in device.actors]
 
-                device.dump(
-                    obj,
-                    [lambda uri=uri: storage.get_writer(uri) for uri in uris],
+                saved.extend(
+                    device.dump(
+                        obj,
+                        [lambda uri=uri: storage.get_writer(uri) for uri in uris],
+                        block=False,
+                    )
                 )
 
                 saved_obj = DeviceObjectCollection.DeviceObject(
@@ -288,4 +303,4 @@ class Model(IDumper):
             ],
         )
         dd.meta.Pack(meta)
-        return dd
+        return dd, saved
@@ -143,6 +143,7 @@ def is_same_type(t1: str, t2: str) -> bool:
 class VTableFormat(BaseEnum):
     CSV = "csv"
     ORC = "orc"
+    PARQUET = "parquet"
 
 
 class VTableFieldType(BaseEnum):
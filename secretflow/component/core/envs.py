@@ -24,6 +24,12 @@ class AutoNameEnum(Enum):
 @unique
 class Envs(AutoNameEnum):
     ENABLE_NN = auto()
+    S3_PART_SIZE = auto()
+    S3_CONCURRENCY = auto()
+    S3_PREFETCH_PARTS = auto()
+    CHECKPOINT_KEEP_LAST = auto()
+    COMPONENT_LAZY_LOAD = auto()
+    COMPONENT_INDEX_CACHE_DIR = auto()
 
 
 def get_env(name: Envs, default=None):
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 
+import importlib
+import logging
 from collections import defaultdict
 from typing import Iterable
 
@@ -24,6 +26,8 @@ from .definition import Definition
 _reg_defs_by_key: dict[str, Definition] = {}
 _reg_defs_by_cls: dict[str, Definition] = {}
 _reg_defs_by_pkg: dict[str, list[Definition]] = defaultdict(list)
+# key -> module of components which are not imported yet.
+_lazy_modules: dict[str, str] = {}
 
 
 def _parse_major(version: str) -> str:
@@ -43,6 +47,31 @@ def _gen_class_id(cls: Component | type[Component]) -> str:
     return f"{cls.__module__}:{cls.__qualname__}"
 
 
+def _import_lazy_module(module: str):
+    try:
+        importlib.import_module(module)
+    except Exception as e:
+        raise ValueError(f"import component fail, module={module}, err={e}")
+
+    # components of the module are registered by import, drop the rest if any.
+    for key in [k for k, m in _lazy_modules.items() if m == module]:
+        logging.warning(f"{key} is not registered by module {module}")
+        del _lazy_modules[key]
+
+
+def _load_lazy(key: str):
+    if key in _lazy_modules:
+        _import_lazy_module(_lazy_modules[key])
+
+
+def _load_all_lazy(root_pkg: str = None):
+    modules = set(_lazy_modules.values())
+    if root_pkg:
+        modules = [m for m in modules if m.split(".")[0] == root_pkg]
+    for module in sorted(modules):
+        _import_lazy_module(module)
+
+
 class Registry:
     @staticmethod
     def register(d: Definition):
@@ -53,10 +82,27 @@ class Registry:
         _reg_defs_by_key[key] = d
         _reg_defs_by_cls[class_id] = d
         _reg_defs_by_pkg[d.root_package].append(d)
+        _lazy_modules.pop(key, None)
+
+    @staticmethod
+    def register_lazy(domain: str, name: str, version: str, module: str):
+        '''
+        register a component by its module, which is imported when the component is used.
+        '''
+        key = _gen_reg_key(domain, name, version)
+        if key in _reg_defs_by_key:
+            if _reg_defs_by_key[key].component_cls.__module__ == module:
+                return
+            raise ValueError(f"{key} is already registered")
+        if _lazy_modules.get(key, module) != module:
+            raise ValueError(f"{key} is already registered by {_lazy_modules[key]}")
+        _lazy_modules[key] = module
 
     @staticmethod
     def unregister(domain: str, name: str, version: str) -> bool:
         key = _gen_reg_key(domain, name, version)
+        if _lazy_modules.pop(key, None) is not None:
+            return True
         if key not in _reg_defs_by_key:
             return False
         d = _reg_defs_by_key.pop(key)
@@ -68,27 +114,32 @@ class Registry:
     @staticmethod
     def get_definition(domain: str, name: str, version: str) -> Definition:
         key = _gen_reg_key(domain, name, version)
+        _load_lazy(key)
         return _reg_defs_by_key.get(key)
 
     @staticmethod
     def get_definitions(root_pkg: str = None) -> Iterable[Definition]:
         if root_pkg and root_pkg != "*":
+            _load_all_lazy(root_pkg)
             return _reg_defs_by_pkg.get(root_pkg, None)
 
+        _load_all_lazy()
         return _reg_defs_by_key.values()
 
     @staticmethod
     def get_definition_keys() -> Iterable[str]:
-        return _reg_defs_by_key.keys()
+        return [*_reg_defs_by_key.keys(), *_lazy_modules.keys()]
 
     @staticmethod
     def get_definition_by_key(key: str) -> Definition:
+        _load_lazy(key)
         return _reg_defs_by_key.get(key)
 
     @staticmethod
     def get_definition_by_id(id: str) -> Definition:
         prefix, version = id.split(":")
         key = f"{prefix}:{_parse_major(version)}"
+        _load_lazy(key)
         comp_def = _reg_defs_by_key.get(key)
         if comp_def and comp_def.version == version:
             return comp_def
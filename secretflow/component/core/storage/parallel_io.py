@@ -0,0 +1,327 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_CONCURRENCY = 8
+
+# fetch(start, end) returns the bytes in [start, end) of a remote object.
+RangeFetcher = Callable[[int, int], bytes]
+
+
+class ParallelRangeReader(io.BufferedIOBase):
+    """
+    A seekable reader of a remote object, which is split into parts and each part is
+    fetched by a range request in a thread pool. When the object is read sequentially,
+    the next prefetch_parts parts are requested ahead, so the readers (e.g. ORCReader,
+    CSVReader) are fed while the following parts are downloading.
+
+    Args:
+        fetch: fetch(start, end) returns the bytes in [start, end).
+        size: size of the object.
+        part_size: bytes of each range request.
+        concurrency: max concurrent range requests.
+        prefetch_parts: parts to read ahead, 0 disables read-ahead.
+    """
+
+    def __init__(
+        self,
+        fetch: RangeFetcher,
+        size: int,
+        part_size: int = DEFAULT_PART_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        prefetch_parts: int = DEFAULT_CONCURRENCY,
+    ) -> None:
+        assert part_size > 0, f"part_size should > 0, got {part_size}"
+        assert concurrency > 0, f"concurrency should > 0, got {concurrency}"
+        assert prefetch_parts >= 0, f"prefetch_parts should >= 0, got {prefetch_parts}"
+        super().__init__()
+        self._fetch = fetch
+        self._size = size
+        self._part_size = part_size
+        self._prefetch_parts = prefetch_parts
+        self._num_parts = (size + part_size - 1) // part_size
+        self._pos = 0
+        self._last_part = -1
+        self._parts: dict[int, Future] = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f"invalid whence {whence}")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _submit(self, idx: int):
+        if idx >= self._num_parts or idx in self._parts:
+            return
+        start = idx * self._part_size
+        end = min(start + self._part_size, self._size)
+        self._parts[idx] = self._executor.submit(self._fetch, start, end)
+
+    def _get_part(self, idx: int) -> bytes:
+        sequential = idx in (self._last_part, self._last_part + 1)
+        self._submit(idx)
+        window = range(idx + 1, idx + 1 + self._prefetch_parts) if sequential else []
+        for i in window:
+            self._submit(i)
+        # drop parts out of the window, e.g. parts already consumed.
+        for i in list(self._parts.keys()):
+            if i != idx and i not in window:
+                self._parts.pop(i).cancel()
+        self._last_part = idx
+        return self._parts[idx].result()
+
+    def read(self, size: int = -1) -> bytes:
+        if self.closed:
+            raise ValueError("read on closed reader")
+        end = (
+            self._size
+            if size is None or size < 0
+            else min(self._pos + size, self._size)
+        )
+        chunks = []
+        while self._pos < end:
+            idx = self._pos // self._part_size
+            part = self._get_part(idx)
+            offset = self._pos - idx * self._part_size
+            chunk = part[offset : offset + end - self._pos]
+            chunks.append(chunk)
+            self._pos += len(chunk)
+        return b"".join(chunks)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            for f in self._parts.values():
+                f.cancel()
+            self._parts.clear()
+            self._executor.shutdown(wait=False)
+        super().close()
+
+
+class MultipartUploader(ABC):
+    """
+    The remote side of a multipart upload, part numbers start from 1.
+    """
+
+    @abstractmethod
+    def create(self) -> str:
+        """start a multipart upload and return its id"""
+        pass
+
+    @abstractmethod
+    def upload_part(self, upload_id: str, part_number: int, data: bytes) -> str:
+        """upload a part and return its etag"""
+        pass
+
+    @abstractmethod
+    def complete(self, upload_id: str, etags: list[str]) -> None:
+        pass
+
+    @abstractmethod
+    def abort(self, upload_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def put(self, data: bytes) -> None:
+        """upload a small object in one request"""
+        pass
+
+
+class ParallelMultipartWriter(io.BufferedIOBase):
+    """
+    A writer which uploads every part_size bytes as a part of a multipart upload in a
+    thread pool. At most concurrency parts are buffered or in flight. An object smaller
+    than part_size is uploaded in one request when closed.
+    """
+
+    def __init__(
+        self,
+        uploader: MultipartUploader,
+        part_size: int = DEFAULT_PART_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> None:
+        assert part_size > 0, f"part_size should > 0, got {part_size}"
+        assert concurrency > 0, f"concurrency should > 0, got {concurrency}"
+        super().__init__()
+        self._uploader = uploader
+        self._part_size = part_size
+        self._concurrency = concurrency
+        self._buffer = bytearray()
+        self._written = 0
+        self._upload_id: str = None
+        self._inflight: deque[Future] = deque()
+        self._etags: list[str] = []
+        self._executor: ThreadPoolExecutor = None
+        self._aborted = False
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._written
+
+    def _submit(self, data: bytes):
+        if self._upload_id is None:
+            self._upload_id = self._uploader.create()
+            self._executor = ThreadPoolExecutor(max_workers=self._concurrency)
+        if len(self._inflight) >= self._concurrency:
+            self._etags.append(self._inflight.popleft().result())
+        part_number = len(self._etags) + len(self._inflight) + 1
+        self._inflight.append(
+            self._executor.submit(
+                self._uploader.upload_part, self._upload_id, part_number, data
+            )
+        )
+
+    def write(self, b) -> int:
+        if self.closed or self._aborted:
+            raise ValueError("write on closed or aborted writer")
+        self._buffer.extend(b)
+        while len(self._buffer) >= self._part_size:
+            try:
+                self._submit(bytes(self._buffer[: self._part_size]))
+            except Exception:
+                self._abort()
+                raise
+            del self._buffer[: self._part_size]
+        self._written += len(b)
+        return len(b)
+
+    def _abort(self):
+        self._aborted = True
+        if self._upload_id is not None:
+            for f in self._inflight:
+                f.cancel()
+            self._inflight.clear()
+            self._executor.shutdown(wait=True)
+            self._uploader.abort(self._upload_id)
+            self._upload_id = None
+
+    def _finish(self):
+        if self._upload_id is None:
+            self._uploader.put(bytes(self._buffer))
+            return
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+        while self._inflight:
+            self._etags.append(self._inflight.popleft().result())
+        self._uploader.complete(self._upload_id, self._etags)
+        self._executor.shutdown(wait=True)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            # nothing is uploaded after a failure.
+            if not self._aborted:
+                self._finish()
+            self._buffer = bytearray()
+        except Exception:
+            self._abort()
+            raise
+        finally:
+            super().close()
+
+
+def parallel_download(
+    fetch: RangeFetcher,
+    size: int,
+    local_path: str,
+    part_size: int = DEFAULT_PART_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> None:
+    """download parts of a remote object concurrently into local_path"""
+    dir_name = os.path.dirname(local_path)
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+
+    with open(local_path, "wb") as f:
+        f.truncate(size)
+        fd = f.fileno()
+
+        def _download(start: int):
+            data = fetch(start, min(start + part_size, size))
+            os.pwrite(fd, data, start)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(_download, s) for s in range(0, size, part_size)]
+            for future in futures:
+                future.result()
+
+
+def parallel_upload(
+    uploader: MultipartUploader,
+    local_path: str,
+    part_size: int = DEFAULT_PART_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> None:
+    """upload a local file by a multipart upload, parts are read and uploaded concurrently"""
+    size = os.path.getsize(local_path)
+    if size <= part_size:
+        with open(local_path, "rb") as f:
+            uploader.put(f.read())
+        return
+
+    upload_id = uploader.create()
+    try:
+        with open(local_path, "rb") as f:
+            fd = f.fileno()
+
+            def _upload(part_number: int) -> str:
+                data = os.pread(fd, part_size, (part_number - 1) * part_size)
+                return uploader.upload_part(upload_id, part_number, data)
+
+            num_parts = (size + part_size - 1) // part_size
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                etags = list(executor.map(_upload, range(1, num_parts + 1)))
+        uploader.complete(upload_id, etags)
+    except Exception:
+        uploader.abort(upload_id)
+        raise
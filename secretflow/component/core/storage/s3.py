@@ -21,16 +21,104 @@ from botocore import exceptions as s3_exceptions
 
 from secretflow.spec.v1.data_pb2 import StorageConfig
 
+from ..envs import Envs, get_env
 from .base import Storage, StorageType
+from .parallel_io import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_PART_SIZE,
+    MultipartUploader,
+    ParallelMultipartWriter,
+    ParallelRangeReader,
+    parallel_download,
+    parallel_upload,
+)
+
+# s3 requires parts except the last one of a multipart upload no less than 5MiB.
+S3_MIN_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+
+
+class _S3MultipartUploader(MultipartUploader):
+    def __init__(self, client: s3fs.S3FileSystem, full_path: str) -> None:
+        self._client = client
+        self._bucket, self._key, _ = client.split_path(full_path)
+
+    def create(self) -> str:
+        res = self._client.call_s3(
+            "create_multipart_upload", Bucket=self._bucket, Key=self._key
+        )
+        return res["UploadId"]
+
+    def upload_part(self, upload_id: str, part_number: int, data: bytes) -> str:
+        res = self._client.call_s3(
+            "upload_part",
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return res["ETag"]
+
+    def complete(self, upload_id: str, etags: list[str]) -> None:
+        parts = [{"PartNumber": i + 1, "ETag": e} for i, e in enumerate(etags)]
+        self._client.call_s3(
+            "complete_multipart_upload",
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+        self._client.invalidate_cache(self._bucket)
+
+    def abort(self, upload_id: str) -> None:
+        self._client.call_s3(
+            "abort_multipart_upload",
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=upload_id,
+        )
+
+    def put(self, data: bytes) -> None:
+        self._client.call_s3(
+            "put_object", Bucket=self._bucket, Key=self._key, Body=data
+        )
+        self._client.invalidate_cache(self._bucket)
 
 
 class S3Storage(Storage):
     """
     s3 storage, please refer to https://s3fs.readthedocs.io/en/latest/
+
+    Readers fetch parts of an object by concurrent range requests and read ahead
+    when read sequentially, writers and upload_file upload parts concurrently by
+    multipart uploads, download_file downloads parts concurrently.
+
+    Args:
+        part_size: bytes of each range request or uploaded part, env S3_PART_SIZE.
+        concurrency: max concurrent requests of a reader or writer, env S3_CONCURRENCY.
+        prefetch_parts: parts read ahead by readers, env S3_PREFETCH_PARTS, defaults to concurrency.
     """
 
-    def __init__(self, config: StorageConfig) -> None:
+    def __init__(
+        self,
+        config: StorageConfig,
+        part_size: int = None,
+        concurrency: int = None,
+        prefetch_parts: int = None,
+    ) -> None:
         super().__init__(config)
+        if part_size is None:
+            part_size = int(get_env(Envs.S3_PART_SIZE, DEFAULT_PART_SIZE))
+        if concurrency is None:
+            concurrency = int(get_env(Envs.S3_CONCURRENCY, DEFAULT_CONCURRENCY))
+        if prefetch_parts is None:
+            prefetch_parts = int(get_env(Envs.S3_PREFETCH_PARTS, concurrency))
+        assert part_size > 0, f"part_size should > 0, got {part_size}"
+        assert concurrency > 0, f"concurrency should > 0, got {concurrency}"
+        self._part_size = part_size
+        self._upload_part_size = max(part_size, S3_MIN_UPLOAD_PART_SIZE)
+        self._concurrency = concurrency
+        self._prefetch_parts = prefetch_parts
         assert config.type == "s3"
         s3_config: StorageConfig.S3Config = config.s3
 
@@ -98,11 +186,34 @@ class S3Storage(Storage):
             self._log_s3_error(e)
             raise
 
+    def _range_fetcher(self, full_path: str):
+        def _fetch(start: int, end: int) -> bytes:
+            return self._s3_client.cat_file(full_path, start=start, end=end)
+
+        return _fetch
+
     def get_reader(self, path: str) -> BufferedIOBase:
-        return self.open(path, "rb")
+        full_path = self.get_full_path(path)
+        try:
+            size = self._s3_client.size(full_path)
+        except Exception as e:
+            self._log_s3_error(e, full_path)
+            raise
+        return ParallelRangeReader(
+            self._range_fetcher(full_path),
+            size,
+            self._part_size,
+            self._concurrency,
+            self._prefetch_parts,
+        )
 
     def get_writer(self, path: str) -> BufferedIOBase:
-        return self.open(path, "wb")
+        full_path = self.get_full_path(path)
+        return ParallelMultipartWriter(
+            _S3MultipartUploader(self._s3_client, full_path),
+            self._upload_part_size,
+            self._concurrency,
+        )
 
     def open(self, path: str, mode: str) -> BufferedIOBase:
         full_path = self.get_full_path(path)
@@ -135,7 +246,14 @@ class S3Storage(Storage):
     def download_file(self, remote_path: str, local_path: str) -> None:
         full_remote_path = self.get_full_path(remote_path)
         try:
-            self._s3_client.download(full_remote_path, local_path)
+            size = self._s3_client.size(full_remote_path)
+            parallel_download(
+                self._range_fetcher(full_remote_path),
+                size,
+                local_path,
+                self._part_size,
+                self._concurrency,
+            )
         except Exception as e:
             self._log_s3_error(e, full_remote_path)
             raise
@@ -143,7 +261,12 @@ class S3Storage(Storage):
     def upload_file(self, local_path: str, remote_path: str) -> None:
         full_remote_fn = self.get_full_path(remote_path)
         try:
-            self._s3_client.upload(local_path, full_remote_fn)
+            parallel_upload(
+                _S3MultipartUploader(self._s3_client, full_remote_fn),
+                local_path,
+                self._upload_part_size,
+                self._concurrency,
+            )
         except Exception as e:
             self._log_s3_error(e)
             raise
@@ -22,7 +22,7 @@ import secretflow.compute as sc
 from secretflow.component.core import (
     BINNING_RULE_MAX,
     Component,
-    CompVDataFrame,
+    CompVDataFrameReader,
     Context,
     DistDataType,
     Output,
@@ -34,6 +34,7 @@ from secretflow.component.core import (
 from secretflow.device import PYU, PYUObject, reveal
 from secretflow.preprocessing.binning.vert_bin_substitution import apply_binning_rules
 from secretflow.spec.v1.data_pb2 import SystemInfo
+from secretflow.stats.core.quantile_sketch import sketches_edges, update_sketches
 
 from ..preprocessing import IRunner, PreprocessingMixin, build_schema
 
@@ -125,7 +126,7 @@ class VertBinningBase(PreprocessingMixin, Component):
         ctx: Context,
         out_ds: Output,
         out_rule: Output,
-        input_df: CompVDataFrame,
+        input_tbl: VTable,
         trans_tbl: VTable,
         rule_extras: dict[PYU, PYUObject],
     ):
@@ -134,7 +135,31 @@ class VertBinningBase(PreprocessingMixin, Component):
 
         extras = {pyu.party: obj for pyu, obj in rule_extras.items()}
         rule_model = self.fit(ctx, out_rule, trans_tbl, _fit, extras)
-        self.transform(ctx, out_ds, input_df, rule_model, streaming=False)
+        # binning rules are stateless, the whole input table is transformed batch by batch.
+        self.transform(ctx, out_ds, input_tbl, rule_model)
+
+    def build_split_edges(
+        self, ctx: Context, trans_tbl: VTable, bin_num: int, eps: float
+    ) -> dict[PYU, PYUObject]:
+        '''
+        equal frequency edges of number features at each party, from quantile sketches which are
+        built in one pass over batches of a reader and merged batch by batch, so only the sketches
+        are kept in memory, and only the edges are passed to binning workers.
+        '''
+        columns = {
+            PYU(party): [
+                f.name for f in p.schema.to_arrow() if not pa.types.is_string(f.type)
+            ]
+            for party, p in trans_tbl.parties.items()
+        }
+        sketches = {pyu: None for pyu in columns}
+        with CompVDataFrameReader(ctx.storage, ctx.tracer, trans_tbl) as reader:
+            for df in reader:
+                for pyu, p in df.partitions.items():
+                    sketches[pyu] = pyu(update_sketches)(
+                        sketches[pyu], p.data, columns[pyu], eps
+                    )
+        return {pyu: pyu(sketches_edges)(s, bin_num) for pyu, s in sketches.items()}
 
     def dump_report(
         self,
@@ -50,6 +50,12 @@ class VertBinning(VertBinningBase):
         default=10,
         bound_limit=Interval.closed(2, None),
     )
+    quantile_sketch_eps: float = Field.attr(
+        desc="Rank error of quantile sketches, built in one pass over batches of the input, which give "
+        "the split points of quantile binning, instead of sorting each feature. 0 means exact quantiles.",
+        default=0.0,
+        bound_limit=Interval.closed_open(0.0, 1.0),
+    )
     report_rules: bool = Field.attr(
         desc="Whether report binning rules.",
         default=False,
@@ -80,21 +86,28 @@ class VertBinning(VertBinningBase):
         input_tbl = VTable.from_distdata(self.input_ds)
         trans_tbl = input_tbl.select(self.feature_selects)
         trans_tbl.check_kinds(VTableFieldKind.FEATURE)
-        input_df = ctx.load_table(input_tbl)
+        split_edges = None
+        if self.binning_method == "quantile" and self.quantile_sketch_eps:
+            split_edges = self.build_split_edges(
+                ctx, trans_tbl, self.bin_num, self.quantile_sketch_eps
+            )
+        # only binning features are read here, the output is transformed by streaming.
+        input_df = ctx.load_table(input_tbl, columns=trans_tbl.columns)
         with ctx.trace_running():
             bining = VertBinningProcessor()
             bin_names = {
                 PYU(party): p.columns for party, p in trans_tbl.parties.items()
             }
             rules = bining.binning(
-                input_df[trans_tbl.columns],
+                input_df,
                 self.binning_method,
                 self.bin_num,
                 bin_names,
+                split_edges,
             )
 
         self.do_evaluate(
-            ctx, self.output_ds, self.output_rule, input_df, trans_tbl, rules
+            ctx, self.output_ds, self.output_rule, input_tbl, trans_tbl, rules
         )
 
         self.dump_report(
@@ -74,6 +74,13 @@ class VertWoeBinning(VertBinningBase):
         default=0.1,
         bound_limit=Interval.open_closed(0.0, 1.0),
     )
+    quantile_sketch_eps: float = Field.attr(
+        desc="Rank error of quantile sketches, built in one pass over batches of the input, which give "
+        "the split points of quantile binning and the initialization of ChiMerge, instead of sorting "
+        "each feature. 0 means exact quantiles.",
+        default=0.0,
+        bound_limit=Interval.closed_open(0.0, 1.0),
+    )
     report_rules: bool = Field.attr(
         desc="Whether report binning rules.",
         default=False,
@@ -122,14 +129,29 @@ class VertWoeBinning(VertBinningBase):
                 f"unsupported secure_device_type {self.secure_device_type}"
             )
 
-        input_df = ctx.load_table(input_tbl)
+        split_edges = None
+        if self.binning_method != "eq_range" and self.quantile_sketch_eps:
+            split_edges = self.build_split_edges(
+                ctx,
+                trans_tbl,
+                (
+                    self.bin_num
+                    if self.binning_method == "quantile"
+                    else self.chimerge_init_bins
+                ),
+                self.quantile_sketch_eps,
+            )
+        # only binning features and label are read here, the output is transformed by streaming.
+        input_df = ctx.load_table(
+            input_tbl, columns=self.feature_selects + [self.label]
+        )
         with ctx.trace_running():
             binning = VertWoeBinningProcessor(secure_device)
             bin_names = {
                 PYU(party): p.columns for party, p in trans_tbl.parties.items()
             }
             rules = binning.binning(
-                input_df[self.feature_selects + [self.label]],
+                input_df,
                 self.binning_method,
                 self.bin_num,
                 bin_names,
@@ -138,10 +160,11 @@ class VertWoeBinning(VertBinningBase):
                 self.chimerge_init_bins,
                 self.chimerge_target_bins,
                 self.chimerge_target_pvalue,
+                split_edges=split_edges,
             )
 
         self.do_evaluate(
-            ctx, self.output_ds, self.output_rule, input_df, trans_tbl, rules
+            ctx, self.output_ds, self.output_rule, input_tbl, trans_tbl, rules
         )
 
         self.dump_report(
@@ -284,27 +284,30 @@ class PreprocessingMixin:
 
         def apply(df: CompVDataFrame) -> CompVDataFrame:
             out_df = CompVDataFrame({}, input.system_info)
+            out_errs = []
             for pyu, p in df.partitions.items():
                 if pyu.party in rule_objs:
                     out_data, out_err = pyu(_transform)(p.data, rule_objs[pyu.party])
-                    err = reveal(out_err)
-                    if err is not None:
-                        raise err
+                    out_errs.append(out_err)
                 else:
                     out_data = p.obj
                 out_df.set_data(out_data)
+            # parties transform the batch concurrently.
+            for err in reveal(out_errs):
+                if err is not None:
+                    raise err
             return out_df
 
         if streaming:
+            # stateless rules are applied batch by batch, the memory usage is bounded by batch size.
             assert not isinstance(input, CompVDataFrame)
             reader = CompVDataFrameReader(ctx.storage, ctx.tracer, input)
             writer = CompVDataFrameWriter(ctx.storage, ctx.tracer, output.uri)
-            for df in reader:
-                with ctx.trace_running():
-                    out_df = apply(df)
-                writer.write(out_df)
-            reader.close()
-            writer.close()
+            with reader, writer:
+                for df in reader:
+                    with ctx.trace_running():
+                        out_df = apply(df)
+                    writer.write(out_df)
             writer.dump_to(output)
         else:
             df = input if isinstance(input, CompVDataFrame) else ctx.load_table(input)
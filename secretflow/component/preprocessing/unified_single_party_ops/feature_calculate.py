@@ -274,9 +274,10 @@ class FeatureCalculate(PreprocessingMixin, Component):
         input_tbl = VTable.from_distdata(self.input_ds)
         trans_tbl = input_tbl.select(self.features)
         if need_extras:
-            df = ctx.load_table(input_tbl)
+            # statistics need the features only, the other columns are read before transform.
+            df = ctx.load_table(input_tbl, columns=self.features)
             extras = self.get_feature_infos(df[self.features])
-            input_df = df
+            input_df = df.load_columns()
         else:
             extras = None
             input_df = input_tbl
@@ -193,7 +193,8 @@ class OnehotEncode(PreprocessingMixin, Component):
 
         in_tbl = VTable.from_distdata(self.input_ds)
         tran_tbl = in_tbl.select(self.features)
-        df = ctx.load_table(in_tbl)
+        # fit on the features only, the other columns are read before transform.
+        df = ctx.load_table(in_tbl, columns=self.features)
 
         rule: dict[str, PYUObject] = {}
         for pyu, p in df.partitions.items():
@@ -209,7 +210,7 @@ class OnehotEncode(PreprocessingMixin, Component):
             return out
 
         model = self.fit(ctx, self.output_rule, tran_tbl, _fit_model, rule)
-        self.transform(ctx, self.output_ds, df, model, streaming=False)
+        self.transform(ctx, self.output_ds, df.load_columns(), model, streaming=False)
         self.dump_report(rule)
 
     def dump_report(self, dist_rules_obj: dict[str, PYUObject]):
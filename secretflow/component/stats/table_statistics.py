@@ -15,6 +15,7 @@
 
 from secretflow.component.core import (
     Component,
+    CompVDataFrameReader,
     Context,
     DistDataType,
     Field,
@@ -25,7 +26,10 @@ from secretflow.component.core import (
     VTable,
     register,
 )
-from secretflow.stats.table_statistics import table_statistics
+from secretflow.stats.table_statistics import (
+    table_statistics,
+    table_statistics_from_batches,
+)
 
 
 @register(domain="stats", version="1.0.0")
@@ -71,6 +75,13 @@ class TableStatistics(Component):
         desc="perform statistics on these columns",
         limit=Interval.closed(1, None),
     )
+    quantile_sketch_eps: float = Field.attr(
+        desc="Rank error of quantile sketches which approximate q1, q2 and q3 in a single pass, "
+        "instead of sorting each column, the input is read batch by batch then. "
+        "0 means exact quantiles.",
+        default=0.0,
+        bound_limit=Interval.closed_open(0.0, 1.0),
+    )
 
     input_ds: Input = Field.input(
         desc="Input table.",
@@ -82,12 +93,26 @@ class TableStatistics(Component):
     )
 
     def evaluate(self, ctx: Context):
-        input_df = ctx.load_table(self.input_ds, columns=self.features).to_pandas(
-            check_null=False
-        )
-
-        with ctx.tracer.trace_running():
-            stat = table_statistics(input_df)
+        if self.quantile_sketch_eps > 0:
+            # sketches need no whole column, so the input is never fully loaded.
+            in_tbl = VTable.from_distdata(self.input_ds, columns=self.features)
+            with ctx.tracer.trace_running(), CompVDataFrameReader(
+                ctx.storage, ctx.tracer, in_tbl
+            ) as reader:
+                stat = table_statistics_from_batches(
+                    (
+                        {pyu: p.data for pyu, p in df.partitions.items()}
+                        for df in reader
+                    ),
+                    self.features,
+                    self.quantile_sketch_eps,
+                )
+        else:
+            input_df = ctx.load_table(self.input_ds, columns=self.features).to_pandas(
+                check_null=False
+            )
+            with ctx.tracer.trace_running():
+                stat = table_statistics(input_df)
 
         stat_tbl = Reporter.build_table(stat.astype(str), index=stat.index.tolist())
         r = Reporter(name="table statistics", system_info=self.input_ds.system_info)
@@ -30,6 +30,183 @@ class _TracerType(Enum):
     ARROW = 2
 
 
+_TB_COLUMN = compute_trace_pb2.ExtendFunctionName.Name(compute_trace_pb2.EFN_TB_COLUMN)
+_TB_ADD_COLUMN = compute_trace_pb2.ExtendFunctionName.Name(
+    compute_trace_pb2.EFN_TB_ADD_COLUMN
+)
+_TB_REMOVE_COLUMN = compute_trace_pb2.ExtendFunctionName.Name(
+    compute_trace_pb2.EFN_TB_REMOVE_COLUMN
+)
+_TB_SET_COLUMN = compute_trace_pb2.ExtendFunctionName.Name(
+    compute_trace_pb2.EFN_TB_SET_COLUMN
+)
+
+# rows of each slice of input table in TraceRunner.run
+DEFAULT_RUN_BATCH_SIZE = 128 * 1024
+
+# where a column comes from: ("input", col index), ("node", node index) or ("value", py obj)
+_Source = Tuple[str, Any]
+
+
+def _freeze(v: Any) -> Any:
+    """hashable form of plain python args, raise TypeError for others"""
+    if v is None or isinstance(v, (bool, int, float, str, bytes, np.generic)):
+        return (type(v), v)
+    if isinstance(v, (list, tuple)):
+        return (type(v), tuple(_freeze(i) for i in v))
+    if isinstance(v, dict):
+        return (dict, tuple(sorted((k, _freeze(i)) for k, i in v.items())))
+    raise TypeError(f"unhashable arg {type(v)}")
+
+
+class _PlanNode:
+    def __init__(self, t: _Tracer, inputs: List[_Source]):
+        self.operate = t.operate
+        self.func = getattr(pc, t.operate)
+        self.inputs = inputs
+        self.py_args = t.py_args
+        # options are deserialized once instead of in each call.
+        self.py_kwargs = t._get_py_kwargs()
+
+
+class _TracePlan:
+    """
+    The flattened dag rewritten to a list of compute nodes over columns of input table.
+
+    Table ops are resolved when planning, so intermediate tables are never built and
+    a column selected from a table refers to the node (or input column) directly.
+    Nodes which compute the same function on the same inputs are merged, and nodes
+    not used by the output columns (e.g. columns removed later) are dropped.
+    """
+
+    def __init__(self, dag: List[_Tracer]) -> None:
+        table_sources: Dict[_Tracer, List[_Source]] = {
+            dag[0]: [("input", i) for i in range(len(dag[0].output_schema))]
+        }
+        array_sources: Dict[_Tracer, _Source] = {}
+        nodes: List[_PlanNode] = []
+        cse: Dict[Any, _Source] = {}
+
+        for t in dag[1:]:
+            if t.operate == _TB_COLUMN:
+                array_sources[t] = table_sources[t.inputs[0]][t.inputs[1]]
+            elif t.operate == _TB_ADD_COLUMN:
+                sources = list(table_sources[t.inputs[0]])
+                sources.insert(t.inputs[1], array_sources[t.inputs[3]])
+                table_sources[t] = sources
+            elif t.operate == _TB_REMOVE_COLUMN:
+                sources = list(table_sources[t.inputs[0]])
+                sources.pop(t.inputs[1])
+                table_sources[t] = sources
+            elif t.operate == _TB_SET_COLUMN:
+                sources = list(table_sources[t.inputs[0]])
+                sources[t.inputs[1]] = array_sources[t.inputs[3]]
+                table_sources[t] = sources
+            else:
+                inputs = [
+                    array_sources[i] if isinstance(i, _Tracer) else ("value", i)
+                    for i in t.inputs
+                ]
+                key = self._cse_key(t, inputs)
+                if key is not None and key in cse:
+                    array_sources[t] = cse[key]
+                    continue
+                source = ("node", len(nodes))
+                nodes.append(_PlanNode(t, inputs))
+                array_sources[t] = source
+                if key is not None:
+                    cse[key] = source
+
+        outputs = table_sources[dag[-1]]
+        assert len(outputs) == len(dag[-1].output_schema)
+
+        # dead node elimination, nodes only depend on earlier nodes.
+        used = [False] * len(nodes)
+        for kind, v in outputs:
+            if kind == "node":
+                used[v] = True
+        for idx in reversed(range(len(nodes))):
+            if not used[idx]:
+                continue
+            for kind, v in nodes[idx].inputs:
+                if kind == "node":
+                    used[v] = True
+
+        remap = {}
+        for idx, n in enumerate(nodes):
+            if used[idx]:
+                remap[idx] = len(remap)
+
+        def _remap(s: _Source) -> _Source:
+            return ("node", remap[s[1]]) if s[0] == "node" else s
+
+        self.nodes: List[_PlanNode] = []
+        for idx, n in enumerate(nodes):
+            if used[idx]:
+                n.inputs = [_remap(s) for s in n.inputs]
+                self.nodes.append(n)
+        self.outputs: List[_Source] = [_remap(s) for s in outputs]
+        self.output_schema: pa.Schema = dag[-1].output_schema
+
+        # results are released after their last use, except the output columns.
+        last_use = {}
+        for idx, n in enumerate(self.nodes):
+            for kind, v in n.inputs:
+                if kind == "node":
+                    last_use[v] = idx
+        for kind, v in self.outputs:
+            if kind == "node":
+                last_use.pop(v, None)
+        self.releases: List[List[int]] = [[] for _ in self.nodes]
+        for v, idx in last_use.items():
+            self.releases[idx].append(v)
+
+    @staticmethod
+    def _cse_key(t: _Tracer, inputs: List[_Source]):
+        def _input_key(s: _Source):
+            return (s[0], type(s[1]), s[1]) if s[0] == "value" else s
+
+        try:
+            if t.options is not None:
+                # option args and kwargs are all serialized in options.
+                args, kwargs = None, None
+            else:
+                args = _freeze(list(t.py_args or []))
+                kwargs = _freeze(dict(t.py_kwargs or {}))
+            return (
+                t.operate,
+                tuple(_input_key(s) for s in inputs),
+                t.options,
+                args,
+                kwargs,
+            )
+        except TypeError:
+            return None
+
+    def run(self, table: pa.Table) -> pa.Table:
+        results: List[Any] = [None] * len(self.nodes)
+
+        def _get(s: _Source):
+            kind, v = s
+            if kind == "input":
+                return table.column(v)
+            elif kind == "node":
+                return results[v]
+            else:
+                return v
+
+        for idx, n in enumerate(self.nodes):
+            py_inputs = [_get(s) for s in n.inputs]
+            py_inputs.extend(n.py_args)
+            results[idx] = n.func(*py_inputs, **n.py_kwargs)
+            for r in self.releases[idx]:
+                results[r] = None
+
+        return pa.Table.from_arrays(
+            [_get(s) for s in self.outputs], schema=self.output_schema
+        )
+
+
 class TraceRunner:
     def __init__(self, dag: List[_Tracer]) -> None:
         assert dag[0].output_type is _TracerType.TABLE
@@ -44,28 +221,13 @@ class TraceRunner:
             self.input_features = [self.input_features]
 
         self.dag: List[_Tracer] = dag
-        if len(self.dag) == 1:
-            # nothing to do
-            return
+        self._plan: _TracePlan = None
 
-        self.ref_count = defaultdict(int)
-        for t in self.dag:
-            if t.inputs is None:
-                continue
-            for i in t.inputs:
-                if isinstance(i, _Tracer):
-                    self.ref_count[i] += 1
-        assert len(self.ref_count) > 0
-
-    def _get_input(self, t: _Tracer):
-        assert t in self.run_ref_count
-        assert t in self.output_map
-        assert self.run_ref_count[t] > 0
-        self.run_ref_count[t] -= 1
-        ret = self.output_map[t]
-        if self.run_ref_count[t] == 0:
-            del self.output_map[t]
-        return ret
+    def __getstate__(self):
+        # the plan is rebuilt from dag after unpickled.
+        state = self.__dict__.copy()
+        state.pop("_plan", None)
+        return state
 
     def get_input_features(self):
         return self.input_features
@@ -78,8 +240,15 @@ class TraceRunner:
     def column_changes(self) -> Tuple[List, List, List]:
         return self.dag[-1].column_changes()
 
-    def run(self, in_table: pa.Table) -> pa.Table:
+    def run(
+        self, in_table: pa.Table, batch_size: int = DEFAULT_RUN_BATCH_SIZE
+    ) -> pa.Table:
+        """
+        replay the dag on in_table, the input table is computed slice by slice, so only
+        the intermediate arrays of one slice are kept in memory.
+        """
         assert isinstance(in_table, pa.Table)
+        assert batch_size > 0, f"batch_size should > 0, got {batch_size}"
 
         if len(self.dag) == 1:
             # nothing to do
@@ -89,75 +258,18 @@ class TraceRunner:
             in_table.schema == self.dag[0].output_schema
         ), f"{in_table.schema} != {self.dag[0].output_schema}"
 
-        self.run_ref_count = self.ref_count.copy()
-        self.output_map = dict()
-        self.output_map[self.dag[0]] = in_table
-
-        for t in self.dag[1:]:
-            assert t not in self.output_map
-
-            if t.operate == compute_trace_pb2.ExtendFunctionName.Name(
-                compute_trace_pb2.EFN_TB_COLUMN
-            ):
-                assert len(t.inputs) == 2
-                assert isinstance(t.inputs[0], _Tracer)
-                input_table = self._get_input(t.inputs[0])
-                assert isinstance(input_table, pa.Table)
-                self.output_map[t] = input_table.column(t.inputs[1])
-            elif t.operate == compute_trace_pb2.ExtendFunctionName.Name(
-                compute_trace_pb2.EFN_TB_ADD_COLUMN
-            ):
-                assert len(t.inputs) == 4
-                assert isinstance(t.inputs[0], _Tracer)
-                assert isinstance(t.inputs[3], _Tracer)
-                input_table = self._get_input(t.inputs[0])
-                input_array = self._get_input(t.inputs[3])
-                assert isinstance(input_table, pa.Table)
-                assert isinstance(input_array, pa.ChunkedArray)
-                self.output_map[t] = input_table.add_column(
-                    t.inputs[1], t.inputs[2], input_array
-                )
-            elif t.operate == compute_trace_pb2.ExtendFunctionName.Name(
-                compute_trace_pb2.EFN_TB_REMOVE_COLUMN
-            ):
-                assert len(t.inputs) == 2
-                assert isinstance(t.inputs[0], _Tracer)
-                input_table = self._get_input(t.inputs[0])
-                assert isinstance(input_table, pa.Table)
-                self.output_map[t] = input_table.remove_column(t.inputs[1])
-            elif t.operate == compute_trace_pb2.ExtendFunctionName.Name(
-                compute_trace_pb2.EFN_TB_SET_COLUMN
-            ):
-                assert len(t.inputs) == 4
-                assert isinstance(t.inputs[0], _Tracer)
-                assert isinstance(t.inputs[3], _Tracer)
-                input_table = self._get_input(t.inputs[0])
-                input_array = self._get_input(t.inputs[3])
-                assert isinstance(input_table, pa.Table)
-                assert isinstance(input_array, pa.ChunkedArray)
-                self.output_map[t] = input_table.set_column(
-                    t.inputs[1], t.inputs[2], input_array
-                )
-            else:
-                py_func = getattr(pc, t.operate)
-                py_inputs = []
-                for i in t.inputs:
-                    if isinstance(i, _Tracer):
-                        array = self._get_input(i)
-                        assert isinstance(array, pa.ChunkedArray), f"got {type(array)}"
-                        py_inputs.append(array)
-                    else:
-                        py_inputs.append(i)
-                py_inputs.extend(t.py_args)
-                py_kwargs = t._get_py_kwargs()
+        if getattr(self, "_plan", None) is None:
+            self._plan = _TracePlan(self.dag)
 
-                array = py_func(*py_inputs, **py_kwargs)
-                self.output_map[t] = array
+        if in_table.num_rows <= batch_size:
+            return self._plan.run(in_table)
 
-        assert len(self.output_map) == 1
-        assert self.dag[-1] in self.output_map
-        ret_table = self.output_map.pop(self.dag[-1])
-        assert isinstance(ret_table, pa.Table)
+        # all traced functions are element-wise, see compute.py
+        ret_tables = [
+            self._plan.run(in_table.slice(offset, batch_size))
+            for offset in range(0, in_table.num_rows, batch_size)
+        ]
+        ret_table = pa.concat_tables(ret_tables)
         assert ret_table.schema == self.dag[-1].output_schema
 
         return ret_table
@@ -385,6 +385,10 @@ class PartitionAgent(PartitionAgentBase):
             self.working_objects[cur_idx] = data
             return cur_idx
 
+    def reduce_func(self, idx: AgentIndex, func: Callable, **kwargs):
+        working_object = self.working_objects[idx]
+        return func(working_object.get_data(), **kwargs)
+
     def to_pandas(self, idx: AgentIndex) -> AgentIndex:
         """
         Convert myself to pandas type.
@@ -334,6 +334,21 @@ class PartitionAgentBase:
         """
         pass
 
+    @abstractmethod
+    def reduce_func(self, idx: AgentIndex, func: Callable, **kwargs) -> PYUObject:
+        """
+        Apply a reduction function inside the dataframe actor and return its result directly.
+        Unlike apply_func, the result is not kept as a new working object, so it can be any type
+        like a pd.Series or a small summary pd.DataFrame.
+        Args:
+            idx: the agent index to indicate which data to apply func.
+            func: any function, with first argument must be dataframe itself.
+            kwargs: the kwargs of func.
+        Returns:
+            The result of func.
+        """
+        pass
+
     @abstractmethod
     def to_pandas(self, idx: AgentIndex) -> PYUObject:
         """
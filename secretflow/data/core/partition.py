@@ -348,6 +348,10 @@ class Partition(DataFrameBase):
                 ]
             )
 
+    def reduce_func(self, func: Callable, **kwargs) -> PYUObject:
+        """Apply func on the data of this partition and return the result without keeping it."""
+        return self.part_agent.reduce_func(self.agent_idx, func, **kwargs)
+
     def to_pandas(self) -> 'Partition':
         if self.backend == "pandas":
             return self
@@ -12,7 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .device import *
-from .driver import init, reveal, shutdown, to, wait, with_device
-from .kernels import *
+import importlib
+
+from . import global_state
+from .device import PYU, Device, DeviceObject, DeviceType, PYUObject, register
+from .driver import (
+    init,
+    reveal,
+    reveal_async,
+    shutdown,
+    to,
+    wait,
+    wait_async,
+    with_device,
+)
 from .proxy import proxy, _cls_wrapper
+
+
+def __getattr__(name: str):
+    # other devices, e.g. HEU, SPU, are imported on first access.
+    if name == 'psi_df':
+        return importlib.import_module(f'{__name__}.kernels.spu').psi_df
+    if not name.startswith('_'):
+        value = getattr(importlib.import_module(f'{__name__}.device'), name, None)
+        if value is not None:
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
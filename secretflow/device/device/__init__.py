@@ -12,11 +12,46 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .base import Device, DeviceObject
-from .heu import HEU, heu_from_base_config
-from .heu_object import HEUObject
 from .pyu import PYU, PYUObject
 from .register import DeviceType, register
-from .spu import SPU, SPUIO, SPUCompilerNumReturnsPolicy, SPUObject, SPUValueMeta
-from .teeu import TEEU, TEEUData, TEEUObject
-from .type_traits import spu_fxp_precision, spu_fxp_size
+
+if TYPE_CHECKING:
+    from .heu import HEU, heu_from_base_config
+    from .heu_object import HEUObject
+    from .spu import SPU, SPUIO, SPUCompilerNumReturnsPolicy, SPUObject, SPUValueMeta
+    from .teeu import TEEU, TEEUData, TEEUObject
+    from .type_traits import spu_fxp_precision, spu_fxp_size
+
+# HEU/SPU/TEEU depend on heu, spu and pandas, so they are imported on first access.
+_LAZY_ATTRS = {
+    'HEU': 'heu',
+    'heu_from_base_config': 'heu',
+    'HEUObject': 'heu_object',
+    'SPU': 'spu',
+    'SPUIO': 'spu',
+    'SPUCompilerNumReturnsPolicy': 'spu',
+    'SPUObject': 'spu',
+    'SPUValueMeta': 'spu',
+    'TEEU': 'teeu',
+    'TEEUData': 'teeu',
+    'TEEUObject': 'teeu',
+    'spu_fxp_precision': 'type_traits',
+    'spu_fxp_size': 'type_traits',
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f'.{_LAZY_ATTRS[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import shutil
+import tempfile
 from dataclasses import dataclass
 from functools import reduce
 from pathlib import Path
@@ -58,6 +61,39 @@ class HEUMoveConfig:
     """file path to record audit log"""
 
 
+# number of dense subgroup maps built at a time from group ids.
+_SUBGROUP_CHUNK_SIZE = 32
+
+
+class SpilledArray:
+    """A HEU array saved as files of row blocks, see HEUActor.spill.
+
+    Only the paths are pickled, block i is loaded by array[start:end] with
+    start = i * block_rows, so only one block is held in memory at a time.
+    """
+
+    def __init__(self, dir: str, rows: int, block_rows: int):
+        self.dir = dir
+        self.rows = rows
+        self.block_rows = block_rows
+
+    def _path(self, index: int) -> str:
+        return os.path.join(self.dir, f'{index}.blk')
+
+    def __getitem__(self, key: slice):
+        start, end, step = key.indices(self.rows)
+        assert (
+            step == 1
+            and start % self.block_rows == 0
+            and end == min(start + self.block_rows, self.rows)
+        ), f"only a whole block could be read, got {key}"
+        with open(self._path(start // self.block_rows), 'rb') as f:
+            return pickle.load(f)
+
+    def remove(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
 def process_data(item):
     item = jax.tree_util.tree_map(
         lambda x: get_obj_ref(x),
@@ -194,13 +230,19 @@ class HEUActor:
         )
 
     def batch_feature_wise_bucket_sum(
-        self, data, subgroup_map, order_map, bucket_num, cumsum=False
+        self, data, subgroup_map, order_map, bucket_num, cumsum=False, block_rows=None
     ):
-        """sum of data on selected elements"""
-        assert isinstance(
-            data, (hnp.PlaintextArray, hnp.CiphertextArray)
+        """sum of data on selected elements
+
+        If block_rows is not None, sums are computed block by block of rows, and
+        order_map may be any array-like whose row blocks order_map[start:end]
+        are np.ndarray, e.g. an order map stored out of core. data could be a
+        SpilledArray of the same block_rows then.
+        """
+        assert isinstance(data, (hnp.PlaintextArray, hnp.CiphertextArray)) or (
+            block_rows is not None and isinstance(data, SpilledArray)
         ), f"data must be hnp.ndarray type, real type={type(data)}"
-        assert (
+        assert isinstance(data, SpilledArray) or (
             data.size > 0
         ), f"You cannot select sum an empty ndarray, data.shape={data.rows}x{data.cols}"
 
@@ -211,7 +253,7 @@ class HEUActor:
             type(subgroup_map), subgroup_map
         )
         order_map = jax.tree_util.tree_map(process_data, order_map)
-        assert isinstance(
+        assert block_rows is not None or isinstance(
             order_map, np.ndarray
         ), "item must be a np.ndarray, but now item is {}, value {}".format(
             type(order_map), order_map
@@ -222,9 +264,107 @@ class HEUActor:
         ), "item must be a int, but now item is {}, value {}".format(
             type(bucket_num), bucket_num
         )
-        return self.evaluator.batch_feature_wise_bucket_sum(
-            data, subgroup_map, order_map, bucket_num, cumsum
+        if block_rows is None:
+            return self.evaluator.batch_feature_wise_bucket_sum(
+                data, subgroup_map, order_map, bucket_num, cumsum
+            )
+        return self._blocked_batch_feature_wise_bucket_sum(
+            data,
+            lambda start, end: [s[:, start:end] for s in subgroup_map],
+            order_map,
+            bucket_num,
+            cumsum,
+            block_rows,
+        )
+
+    def batch_feature_wise_bucket_sum_by_group_ids(
+        self,
+        data,
+        group_ids,
+        groups,
+        order_map,
+        bucket_num,
+        cumsum=False,
+        block_rows=None,
+    ):
+        """sum of data on selected elements, elements of each subgroup are given by
+        a group id vector instead of a dense subgroup map.
+
+        Dense subgroup maps are only built here, a chunk of groups at a time.
+        """
+        group_ids = process_data(group_ids)
+        assert isinstance(
+            group_ids, np.ndarray
+        ), "group_ids must be a np.ndarray, but now is {}, value {}".format(
+            type(group_ids), group_ids
+        )
+        groups = list(process_data(groups))
+        group_ids = group_ids.reshape(1, -1)
+        result = []
+        for start in range(0, len(groups), _SUBGROUP_CHUNK_SIZE):
+            chunk = groups[start : start + _SUBGROUP_CHUNK_SIZE]
+            if block_rows is None:
+                subgroup_map = [(group_ids == group).astype(np.int8) for group in chunk]
+                result.extend(
+                    self.batch_feature_wise_bucket_sum(
+                        data, subgroup_map, order_map, bucket_num, cumsum
+                    )
+                )
+            else:
+                result.extend(
+                    self._blocked_batch_feature_wise_bucket_sum(
+                        data,
+                        lambda begin, end, chunk=chunk: [
+                            (group_ids[:, begin:end] == group).astype(np.int8)
+                            for group in chunk
+                        ],
+                        process_data(order_map),
+                        process_data(bucket_num),
+                        cumsum,
+                        block_rows,
+                    )
+                )
+        return result
+
+    def _blocked_batch_feature_wise_bucket_sum(
+        self, data, subgroup_map_of_block, order_map, bucket_num, cumsum, block_rows
+    ):
+        # bucket sums are additive over rows, so add up the sums of blocks.
+        result = None
+        rows = order_map.shape[0]
+        for start in range(0, rows, block_rows):
+            end = min(start + block_rows, rows)
+            sums = self.evaluator.batch_feature_wise_bucket_sum(
+                data[start:end],
+                subgroup_map_of_block(start, end),
+                np.ascontiguousarray(order_map[start:end]),
+                bucket_num,
+                cumsum,
+            )
+            result = (
+                sums
+                if result is None
+                else [self.evaluator.add(x, y) for x, y in zip(result, sums)]
+            )
+        return result
+
+    def spill(self, data, dir: str, block_rows: int) -> SpilledArray:
+        """Save data as files of row blocks under dir."""
+        assert isinstance(
+            data, (hnp.PlaintextArray, hnp.CiphertextArray)
+        ), f"data must be hnp.ndarray type, real type={type(data)}"
+        os.makedirs(dir, exist_ok=True)
+        spilled = SpilledArray(
+            tempfile.mkdtemp(prefix='heu_blocks_', dir=dir), data.rows, block_rows
         )
+        for start in range(0, data.rows, block_rows):
+            end = min(start + block_rows, data.rows)
+            with open(spilled._path(start // block_rows), 'wb') as f:
+                pickle.dump(data[start:end], f)
+        return spilled
+
+    def remove_spilled(self, data: SpilledArray):
+        data.remove()
 
     def encode(self, data: np.ndarray, edr=None):
         """encode cleartext to plaintext
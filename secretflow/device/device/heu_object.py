@@ -126,6 +126,25 @@ class HEUObject(DeviceObject):
         """Dump ciphertext into files."""
         self.device.get_participant(self.location).dump.remote(self.data, path)
 
+    def spill(self, dir: str, block_rows: int):
+        """Save data as files of row blocks under dir of the location party, the
+        returned HEUObject could only be used in bucket sums of the same block_rows.
+        """
+        return HEUObject(
+            self.device,
+            self.device.get_participant(self.location).spill.remote(
+                self.data, dir, block_rows
+            ),
+            self.location,
+            self.is_plain,
+        )
+
+    def remove_spilled(self):
+        """Remove the files of a HEUObject returned by spill."""
+        sfd.get(
+            self.device.get_participant(self.location).remove_spilled.remote(self.data)
+        )
+
     def select_sum(self, item):
         """
         Sum of HEUObject selected elements
@@ -190,6 +209,7 @@ class HEUObject(DeviceObject):
         order_map: Union[PYUObject, np.ndarray],
         bucket_num: int,
         cumsum=False,
+        block_rows: int = None,
     ) -> List["HEUObject"]:
         """Calculate a list o bucket sum arrays.
         A bucket sum array has dim 2 and shape (feature_num * bucket_sum, self.col_num).
@@ -199,6 +219,8 @@ class HEUObject(DeviceObject):
             order_map (Union[PYUObject, np.ndarray]): shape (self.row_num, feature_num). map[i,j] = k means element i, feature j is in bucket k.
             bucket_num (int): how many bucket to split each feature into.
             cumsum (bool, optional): whether calculate the cumulative sums or individual sums. Defaults to False.
+            block_rows (int, optional): if not None, sums are computed block by block of rows,
+                then order_map could be stored out of core. Defaults to None.
 
         Return:
             a list of bucket sum array in HEUObject.
@@ -218,7 +240,52 @@ class HEUObject(DeviceObject):
             self.device.get_participant(
                 self.location
             ).batch_feature_wise_bucket_sum.remote(
-                self.data, subgroup_map, order_map, bucket_num, cumsum
+                self.data, subgroup_map, order_map, bucket_num, cumsum, block_rows
+            ),
+            self.location,
+            self.is_plain,
+        )
+
+    def batch_feature_wise_bucket_sum_by_group_ids(
+        self,
+        group_ids: Union[PYUObject, np.ndarray],
+        groups: Union[PYUObject, List[int]],
+        order_map: Union[PYUObject, np.ndarray],
+        bucket_num: int,
+        cumsum=False,
+        block_rows: int = None,
+    ) -> List["HEUObject"]:
+        """Same as batch_feature_wise_bucket_sum, but subsets of elements are given
+        by a group id vector, which is much smaller than dense subgroup maps.
+
+        Args:
+            group_ids (Union[PYUObject, np.ndarray]): shape (self.row_num,), group id of each element.
+            groups (Union[PYUObject, List[int]]): group ids of the subsets to sum.
+            order_map (Union[PYUObject, np.ndarray]): shape (self.row_num, feature_num). map[i,j] = k means element i, feature j is in bucket k.
+            bucket_num (int): how many bucket to split each feature into.
+            cumsum (bool, optional): whether calculate the cumulative sums or individual sums. Defaults to False.
+            block_rows (int, optional): if not None, sums are computed block by block of rows. Defaults to None.
+
+        Return:
+            a list of bucket sum array in HEUObject, one for each group in groups.
+        """
+
+        def process_data(x):
+            res = x
+            if isinstance(x, PYUObject):
+                res = x.data
+            return res
+
+        group_ids = process_data(group_ids)
+        groups = process_data(groups)
+        order_map = process_data(order_map)
+        bucket_num = process_data(bucket_num)
+        return HEUObject(
+            self.device,
+            self.device.get_participant(
+                self.location
+            ).batch_feature_wise_bucket_sum_by_group_ids.remote(
+                self.data, group_ids, groups, order_map, bucket_num, cumsum, block_rows
             ),
             self.location,
             self.is_plain,
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
 from enum import IntEnum
 from typing import Callable
 
@@ -75,11 +76,19 @@ class Registrar:
         Returns:
             Kernel execution result.
         """
+        if name not in self._ops[device_type]:
+            _load_kernels(device_type)
         if name not in self._ops[device_type]:
             raise KeyError(f'device: {device_type}, op: {name} not registered')
         return self._ops[device_type][name](*args, **kwargs)
 
 
+def _load_kernels(device_type: DeviceType):
+    """Kernels of each device type are registered by importing
+    secretflow.device.kernels.{device type}, which is done on the first dispatch."""
+    importlib.import_module(f'secretflow.device.kernels.{device_type.name.lower()}')
+
+
 _registrar = Registrar()
 
 
@@ -52,8 +52,9 @@ from secretflow.utils.progress import ProgressData
 
 from ._utils import get_fn_code_name
 from .base import Device, DeviceObject, DeviceType
-from .pyu import PYUObject
+from .pyu import PYU, PYUObject
 from .register import dispatch
+from .spu_compile_cache import compile_cache_key, get_compile_cache
 from .type_traits import spu_datatype_to_heu, spu_fxp_size
 
 _LINK_DESC_NAMES = [
@@ -1378,6 +1379,19 @@ def _spu_compile(fn, copts, fn_name, *meta_args, **meta_kwargs):
 
     jax.tree_util.tree_map(_get_input_metadata, (meta_args, meta_kwargs))
 
+    cache = get_compile_cache()
+    cache_key = (
+        compile_cache_key(fn, copts, meta_args, meta_kwargs) if cache.enabled else None
+    )
+    if cache_key is not None:
+        entry = cache.get(cache_key)
+        if entry is not None:
+            executable_bytes, output_tree = entry
+            executable = spu_pb2.ExecutableProto()
+            executable.ParseFromString(executable_bytes)
+            executable.name = fn_name
+            return executable, output_tree
+
     try:
         global _spu_compile_lock
         # The current version of cachetools used by spu compile is not thread-safe
@@ -1399,10 +1413,24 @@ def _spu_compile(fn, copts, fn_name, *meta_args, **meta_kwargs):
     except Exception as e:
         raise InternalError.worker_crashed_error(f"{e}")
 
+    if cache_key is not None:
+        cache.put(cache_key, (executable.SerializeToString(), output_tree))
+
     executable.name = fn_name
     return executable, output_tree
 
 
+class SPUCompiler:
+    """Compiles SPU functions of a SPU device in one process, so the compile cache
+    of this process is reused and its stats could be read."""
+
+    def compile(self, fn, copts, fn_name, *meta_args, **meta_kwargs):
+        return _spu_compile(fn, copts, fn_name, *meta_args, **meta_kwargs)
+
+    def compile_cache_stats(self) -> Dict[str, int]:
+        return get_compile_cache().stats()
+
+
 class SPU(Device):
     def __init__(
         self,
@@ -1524,6 +1552,12 @@ class SPU(Device):
                     self.id,
                 )
             )
+        # it's ok to choose any party to compile, here we choose party 0.
+        self.compiler = (
+            sfd.remote(SPUCompiler)
+            .party(self.cluster_def['nodes'][0]['party'])
+            .remote()
+        )
 
     def reset(self):
         """Reset spu to clear corrupted internal state, for test only"""
@@ -1534,6 +1568,7 @@ class SPU(Device):
     def shutdown(self):
         for actor in self.actors.values():
             sfd.kill(actor)
+        sfd.kill(self.compiler)
 
     def _place_arguments(self, *args, **kwargs):
         def place(obj):
@@ -1550,11 +1585,20 @@ class SPU(Device):
 
         return jax.tree_util.tree_map(place, (args, kwargs))
 
-    def dump(self, obj: SPUObject, paths: List[Union[str, Callable]]):
+    def dump(
+        self, obj: SPUObject, paths: List[Union[str, Callable]], block: bool = True
+    ):
+        """Dump the shares of obj, one path for each party.
+
+        If block is False, return without waiting, the returned PYUObjects of each
+        party are ready when the shares of the party are saved.
+        """
         assert obj.device == self, "obj must be owned by this device."
         ret = []
         for i, actor in enumerate(self.actors.values()):
             ret.append(actor.dump.remote(obj.meta, obj.shares_name[i], paths[i]))
+        if not block:
+            return [PYUObject(PYU(party), r) for party, r in zip(self.actors, ret)]
         sfd.get(ret)
 
     def load(self, paths: List[Union[str, Callable]]) -> SPUObject:
@@ -1591,19 +1635,9 @@ class SPU(Device):
             num_returns = user_specified_num_returns
             meta_args = list(meta_args)
 
-            def compile_fn(*args, **kwargs):
-                return _spu_compile(*args, **kwargs)
-
             fn_name = get_fn_code_name(func)
-            compile_fn.__name__ = f"spu_compile({fn_name})"
-
-            # it's ok to choose any party to compile,
-            # here we choose party 0.
-            executable, out_shape = (
-                sfd.remote(compile_fn)
-                .party(self.cluster_def['nodes'][0]['party'])
-                .options(num_returns=2)
-                .remote(fn, copts, fn_name, *meta_args, **meta_kwargs)
+            executable, out_shape = self.compiler.compile.options(num_returns=2).remote(
+                fn, copts, fn_name, *meta_args, **meta_kwargs
             )
 
             if num_returns_policy == SPUCompilerNumReturnsPolicy.FROM_COMPILER:
@@ -1656,6 +1690,10 @@ class SPU(Device):
 
         return wrapper
 
+    def compile_cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters of the compile cache of the compiler."""
+        return sfd.get(self.compiler.compile_cache_stats.remote())
+
     def infeed_shares(
         self,
         io_info: FED_OBJECT_TYPES,
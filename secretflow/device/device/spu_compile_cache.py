@@ -0,0 +1,298 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content-addressed cache of SPU executables.
+
+The same jitted function with the same abstract inputs always compiles to the
+same SPU executable, so the compiled result is cached under a key made of:
+
+1. the function content (code, constants, closure, defaults, partial-bound
+   static args and the functions and values it references from its globals),
+2. the abstract input metadata (pytree structure, shape, dtype and visibility),
+3. the serialized ``CompilerOptions``,
+4. the secretflow, spu and jax versions.
+
+The cache has an in-memory LRU tier and an optional on-disk tier which could be
+shared across jobs. They are configured with environment variables:
+
+- ``SF_SPU_COMPILE_CACHE_SIZE``: capacity of the memory tier, 0 disables caching.
+- ``SF_SPU_COMPILE_CACHE_DIR``: directory of the disk tier, disabled if empty.
+  Files in this directory are unpickled, so it must only be writable by trusted users.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import tempfile
+import types
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import cloudpickle
+import jax
+import numpy as np
+import spu
+
+from secretflow.version import __version__ as sf_version
+
+SPU_COMPILE_CACHE_SIZE_ENV = 'SF_SPU_COMPILE_CACHE_SIZE'
+SPU_COMPILE_CACHE_DIR_ENV = 'SF_SPU_COMPILE_CACHE_DIR'
+
+_DEFAULT_CAPACITY = 128
+
+_SIMPLE_TYPES = (bool, int, float, complex, str, bytes, type(None))
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _update_code(h, code: types.CodeType):
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code(h, const)
+        else:
+            h.update(repr(const).encode())
+
+
+def _referenced_names(code: types.CodeType):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _referenced_names(const)
+    return names
+
+
+def _update_value(h, value: Any, visited: set):
+    if isinstance(value, _SIMPLE_TYPES):
+        h.update(repr(value).encode())
+    elif isinstance(value, np.ndarray):
+        h.update(f'ndarray{value.dtype.str}{value.shape}'.encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(f'{type(value).__name__}{len(value)}'.encode())
+        for v in value:
+            _update_value(h, v, visited)
+    elif isinstance(value, dict):
+        h.update(f'dict{len(value)}'.encode())
+        for k in sorted(value, key=repr):
+            h.update(repr(k).encode())
+            _update_value(h, value[k], visited)
+    elif callable(value):
+        _update_fn(h, value, visited)
+    else:
+        try:
+            h.update(cloudpickle.dumps(value))
+        except Exception as e:
+            raise _Uncacheable(f'{type(value)} is not hashable: {e}')
+
+
+def _update_fn(h, fn: Callable, visited: set):
+    if id(fn) in visited:
+        return
+    visited.add(id(fn))
+
+    if isinstance(fn, functools.partial):
+        h.update(b'partial')
+        _update_fn(h, fn.func, visited)
+        _update_value(h, fn.args, visited)
+        _update_value(h, fn.keywords, visited)
+    elif inspect.ismethod(fn):
+        h.update(b'method')
+        _update_fn(h, fn.__func__, visited)
+        _update_value(h, fn.__self__, visited)
+    elif isinstance(fn, types.FunctionType):
+        code = fn.__code__
+        h.update(f'{fn.__module__}.{fn.__qualname__}'.encode())
+        _update_code(h, code)
+        _update_value(h, fn.__defaults__, visited)
+        _update_value(h, fn.__kwdefaults__, visited)
+        if fn.__closure__:
+            _update_value(h, [c.cell_contents for c in fn.__closure__], visited)
+        # functions and values referenced from globals are part of the function
+        # content, otherwise a change of a helper or a module level constant would
+        # hit stale executables on disk.
+        fn_globals = fn.__globals__
+        for name in sorted(_referenced_names(code)):
+            if name not in fn_globals:
+                continue
+            value = fn_globals[name]
+            h.update(name.encode())
+            if isinstance(value, types.ModuleType):
+                h.update(f'module{value.__name__}'.encode())
+            else:
+                _update_value(h, value, visited)
+    elif isinstance(fn, (types.BuiltinFunctionType, type)):
+        h.update(f'{fn.__module__}.{fn.__qualname__}'.encode())
+    else:
+        # jitted functions and other callable objects.
+        wrapped = getattr(fn, '__wrapped__', None)
+        if wrapped is not None:
+            _update_fn(h, wrapped, visited)
+        else:
+            _update_value(h, cloudpickle.dumps(fn), visited)
+
+
+def _update_meta(h, meta_args, meta_kwargs):
+    leaves, tree = jax.tree_util.tree_flatten((meta_args, meta_kwargs))
+    h.update(str(tree).encode())
+    for leaf in leaves:
+        shape = getattr(leaf, 'shape', None)
+        dtype = getattr(leaf, 'dtype', None)
+        vtype = getattr(leaf, 'vtype', None)
+        if shape is None or dtype is None or vtype is None:
+            raise _Uncacheable(f'unexpected compile input {type(leaf)}')
+        h.update(f'{tuple(shape)}{np.dtype(dtype).str}{int(vtype)}'.encode())
+
+
+def compile_cache_key(
+    fn: Callable, copts: spu.spu_pb2.CompilerOptions, meta_args, meta_kwargs
+) -> Optional[str]:
+    """Get the cache key of a compilation, None if fn could not be cached."""
+    h = hashlib.sha256()
+    h.update(f'secretflow{sf_version}spu{spu.__version__}jax{jax.__version__}'.encode())
+    try:
+        _update_fn(h, fn, set())
+        _update_meta(h, meta_args, meta_kwargs)
+    except Exception as e:
+        logging.debug(f'skip spu compile cache: {e}')
+        return None
+    h.update(copts.SerializeToString(deterministic=True))
+    return h.hexdigest()
+
+
+class SPUCompileCache:
+    def __init__(self, capacity: int = _DEFAULT_CAPACITY, cache_dir: str = None):
+        """A LRU cache of SPU executables with an optional disk tier.
+
+        Args:
+            capacity: max number of executables kept in memory, 0 disables the cache.
+            cache_dir: Optional. Directory to persist executables.
+        """
+        self.capacity = capacity
+        self.cache_dir = cache_dir
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.spuexec')
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[bytes, Any]]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logging.warning(f'failed to load spu compile cache {path}: {e}')
+            return None
+
+    def _dump_to_disk(self, key: str, entry: Tuple[bytes, Any]):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to a temp file then rename, so concurrent jobs never see
+            # a partial file.
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f)
+            os.replace(tmp_path, self._disk_path(key))
+        except Exception as e:
+            logging.warning(f'failed to dump spu compile cache: {e}')
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Any]]:
+        """Get the (serialized executable, output tree) of key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._load_from_disk(key)
+        with self._lock:
+            if entry is not None:
+                self.disk_hits += 1
+                self._put_memory(key, entry)
+            else:
+                self.misses += 1
+        return entry
+
+    def _put_memory(self, key: str, entry: Tuple[bytes, Any]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def put(self, key: str, entry: Tuple[bytes, Any]):
+        with self._lock:
+            self._put_memory(key, entry)
+        self._dump_to_disk(key, entry)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'capacity': self.capacity,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+
+_compile_cache: Optional[SPUCompileCache] = None
+_compile_cache_lock = Lock()
+
+
+def get_compile_cache() -> SPUCompileCache:
+    """Get the process-wide SPU compile cache."""
+    global _compile_cache
+    with _compile_cache_lock:
+        if _compile_cache is None:
+            _compile_cache = SPUCompileCache(
+                int(os.environ.get(SPU_COMPILE_CACHE_SIZE_ENV, _DEFAULT_CAPACITY)),
+                os.environ.get(SPU_COMPILE_CACHE_DIR_ENV) or None,
+            )
+        return _compile_cache
+
+
+def set_compile_cache(cache: SPUCompileCache):
+    """Replace the process-wide SPU compile cache."""
+    global _compile_cache
+    with _compile_cache_lock:
+        _compile_cache = cache
@@ -27,18 +27,7 @@ from secretflow.utils.errors import InvalidArgumentError
 from secretflow.utils.logging import set_logging_level
 from secretflow.distributed.ray_op import assert_is_fed_obj
 
-from .device import (
-    HEU,
-    PYU,
-    SPU,
-    SPUIO,
-    Device,
-    DeviceObject,
-    HEUObject,
-    PYUObject,
-    SPUObject,
-    TEEUObject,
-)
+from .device import PYU, Device, DeviceObject, DeviceType, PYUObject
 
 
 def with_device(
@@ -91,14 +80,18 @@ def to(device: Device, data: Any):
     if isinstance(device, PYU):
         return device(lambda x: x)(data)
 
-    if isinstance(device, SPU):
+    if not isinstance(device, Device):
+        raise ValueError(f'Unknown device {device}')
+
+    # HEU and SPU are checked by device type, so they are not imported for PYU only.
+    if device.device_type == DeviceType.SPU:
         raise ValueError(
             "You cannot put data to SPU directly, "
             "try put it to PYU and then move to SPU"
         )
 
     # TODO(@xibin.wxb): support HEU conversion.
-    if isinstance(device, HEU):
+    if device.device_type == DeviceType.HEU:
         raise ValueError(
             "You cannot put data to HEU directly, "
             "try put it to PYU and then move to HEU"
@@ -127,41 +120,81 @@ def reveal(func_or_object, heu_encoder=None):
             return reveal(func_or_object(*arg, **kwargs))
 
         return wrapper
-    all_object_refs = []
     flatten_val, tree = jax.tree_util.tree_flatten(func_or_object)
-    all_spu_chunks_count = []
-    spu_chunks_idx = 0
+    all_object_refs, all_spu_chunks_count = _reveal_refs(flatten_val, heu_encoder)
+    all_object = sfd.get(all_object_refs)
+    return jax.tree_util.tree_unflatten(
+        tree, _reveal_values(flatten_val, all_object, all_spu_chunks_count)
+    )
+
+
+async def reveal_async(func_or_object, heu_encoder=None):
+    """Coroutine version of `reveal`, which waits for data without blocking the
+    event loop of caller.
+
+    NOTE: Use this function with extreme caution, as it may cause privacy leaks.
+
+    Args:
+        func_or_object: Any Python objects which contains Device objects.
+        heu_encoder: Can be heu Encoder or EncoderParams.
+            This is used to replace the default encoder from config
 
+    Examples:
+        >>> async def main():
+        >>>     x, y = await asyncio.gather(sf.reveal_async(a), sf.reveal_async(b))
+        >>> asyncio.run(main())
+    """
+    flatten_val, tree = jax.tree_util.tree_flatten(func_or_object)
+    all_object_refs, all_spu_chunks_count = _reveal_refs(flatten_val, heu_encoder)
+    all_object = await sfd.get_async(all_object_refs)
+    return jax.tree_util.tree_unflatten(
+        tree, _reveal_values(flatten_val, all_object, all_spu_chunks_count)
+    )
+
+
+def _reveal_refs(flatten_val: List, heu_encoder=None) -> Tuple[List, List[int]]:
+    all_object_refs = []
+    all_spu_chunks_count = []
     for x in flatten_val:
-        if isinstance(x, PYUObject):
+        if not isinstance(x, DeviceObject):
+            continue
+        if x.device_type == DeviceType.PYU:
             all_object_refs.append(x.data)
-        elif isinstance(x, HEUObject):
+        elif x.device_type == DeviceType.HEU:
             if x.is_plain:
                 ref = x.device.get_participant(x.location).decode.remote(x.data)
             else:
                 ref = x.device.sk_keeper.decrypt_and_decode.remote(x.data, heu_encoder)
             all_object_refs.append(ref)
-        elif isinstance(x, SPUObject):
+        elif x.device_type == DeviceType.SPU:
             xsn = x.shares_name[0]
             assert_is_fed_obj(xsn)
             info, shares_chunk = x.device.outfeed_shares(x.shares_name)
             all_spu_chunks_count.append(len(shares_chunk))
             all_object_refs.append(info)
             all_object_refs.extend([s for s in shares_chunk])
-        elif isinstance(x, TEEUObject):
+        elif x.device_type == DeviceType.TEEU:
             all_object_refs.append(x.data)
             logging.debug(f'Getting teeu data from TEEU {x.device.party}.')
+    return all_object_refs, all_spu_chunks_count
 
-    cur_idx = 0
-    all_object = sfd.get(all_object_refs)
 
+def _reveal_values(
+    flatten_val: List, all_object: List, all_spu_chunks_count: List[int]
+) -> List:
+    cur_idx = 0
+    spu_chunks_idx = 0
     new_flatten_val = []
     for x in flatten_val:
-        if isinstance(x, (PYUObject, HEUObject, TEEUObject)):
+        if not isinstance(x, DeviceObject):
+            new_flatten_val.append(x)
+        elif x.device_type in (DeviceType.PYU, DeviceType.HEU, DeviceType.TEEU):
             new_flatten_val.append(all_object[cur_idx])
             cur_idx += 1
 
-        elif isinstance(x, SPUObject):
+        elif x.device_type == DeviceType.SPU:
+            from .device.spu import SPUIO
+
             io = SPUIO(x.device.conf, x.device.world_size)
             io_info = all_object[cur_idx]
             cur_idx += 1
@@ -174,7 +207,7 @@ def reveal(func_or_object, heu_encoder=None):
         else:
             new_flatten_val.append(x)
 
-    return jax.tree_util.tree_unflatten(tree, new_flatten_val)
+    return new_flatten_val
 
 
 def wait(objects: Any):
@@ -201,12 +234,33 @@ def wait(objects: Any):
     objs = [
         x
         for x in jax.tree_util.tree_leaves(objects)
-        if isinstance(x, (PYUObject, SPUObject, TEEUObject))
+        if isinstance(x, DeviceObject)
+        and x.device_type in (DeviceType.PYU, DeviceType.SPU, DeviceType.TEEU)
     ]
 
     reveal([o.device(lambda o: None)(o) for o in objs])
 
 
+async def wait_async(objects: Any):
+    """Coroutine version of `wait`.
+
+    Args:
+        objects: struct of device objects.
+    """
+
+    if sfd.in_ic_mode():
+        return
+
+    objs = [
+        x
+        for x in jax.tree_util.tree_leaves(objects)
+        if isinstance(x, DeviceObject)
+        and x.device_type in (DeviceType.PYU, DeviceType.SPU, DeviceType.TEEU)
+    ]
+
+    await reveal_async([o.device(lambda o: None)(o) for o in objs])
+
+
 def init(
     parties: Union[str, List[str]] = None,
     ray_mode: bool = True,
@@ -226,6 +280,7 @@ def init(
     party_key_pair: Dict[str, Dict] = None,
     tee_simulation: bool = False,
     debug_mode=False,
+    fed_runtime: str = 'thread',
     **kwargs,
 ):
     """Initialize the execution environment of SF.
@@ -420,6 +475,13 @@ def init(
                     synchronous mode to facilitate debugging.and will use PYU to simulate SPU device
                     ONLY DEBUG!
 
+        fed_runtime: works only in production mode without ray, the execution model
+            of the fed runtime. The default value is 'thread', which sends, receives
+            and waits for inputs of tasks in thread pools. With 'asyncio', they are
+            coroutines on an event loop, and threads are used to run tasks only,
+            which scales better with many concurrent objects. Objects could be
+            awaited by `sf.reveal_async` and `sf.wait_async` in both runtimes.
+
         **kwargs: see :py:meth:`ray.init` parameters.
     """
     set_logging_level(logging_level)
@@ -501,6 +563,7 @@ def init(
             cross_silo_comm_backend=cross_silo_comm_backend,
             logging_level=logging_level,
             job_name=job_name,
+            fed_runtime=fed_runtime,
         )
 
 
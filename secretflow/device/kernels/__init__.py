@@ -12,5 +12,5 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from . import heu, pyu, spu
-from .spu import psi_df
+# Kernels of a device type are imported on the first dispatch of this device type,
+# see secretflow.device.device.register.dispatch.
@@ -13,30 +13,21 @@
 # limitations under the License.
 
 
+from __future__ import annotations
+
 import logging
 import secrets
-from typing import Any, Callable, List, Union
-
-from spu import Visibility
+from typing import TYPE_CHECKING, Any, Callable, List, Union
 
 import secretflow.distributed as sfd
-from secretflow.device import (
-    HEU,
-    PYU,
-    SPU,
-    SPUIO,
-    TEEU,
-    DeviceType,
-    HEUObject,
-    PYUObject,
-    SPUObject,
-    TEEUData,
-    TEEUObject,
-    global_state,
-    wait,
-)
+from secretflow.device import PYU, DeviceType, PYUObject, global_state, wait
 from secretflow.device.device.base import register_to
-from secretflow.device.device.heu import HEUMoveConfig
+
+# other devices are imported by the kernels which use them, so PYU kernels do not
+# import spu, heu etc.
+if TYPE_CHECKING:
+    from secretflow.device import HEU, SPU, TEEU, SPUObject
+    from secretflow.device.device.heu import HEUMoveConfig
 
 
 @register_to(DeviceType.PYU, DeviceType.PYU)
@@ -59,6 +50,10 @@ def pyu_to_spu(self: PYUObject, spu: SPU, spu_vis: str = 'secret') -> SPUObject:
     Returns:
         the transferred SPUObject.
     """
+    from spu import Visibility
+
+    from secretflow.device import SPU, SPUIO, SPUObject
+
     assert isinstance(spu, SPU), f'Expect an SPU but got {type(spu)}'
     assert spu_vis in ('secret', 'public'), f'vis must be public or secret'
 
@@ -91,6 +86,9 @@ def pyu_to_spu(self: PYUObject, spu: SPU, spu_vis: str = 'secret') -> SPUObject:
 
 @register_to(DeviceType.PYU, DeviceType.HEU)
 def pyu_to_heu(self: PYUObject, heu: HEU, config: HEUMoveConfig = None):
+    from secretflow.device import HEU, HEUObject
+    from secretflow.device.device.heu import HEUMoveConfig
+
     assert isinstance(heu, HEU), f'Expect an HEU but got {type(heu)}'
     if config is None:
         config = HEUMoveConfig()
@@ -126,6 +124,8 @@ def pyu_to_teeu(
     Returns:
         A TEEUObject whose underlying data is ciphertext.
     """
+    from secretflow.device import TEEU, TEEUData, TEEUObject
+
     assert isinstance(teeu, TEEU), f'Expect a TEEU but got {type(teeu)}'
     logging.debug(
         f'Transfer PYU object from {self.device.party} to TEEU of {teeu.party}.'
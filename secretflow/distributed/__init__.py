@@ -18,6 +18,7 @@ from .primitive import (
     init,
     active_sf_cluster,
     get,
+    get_async,
     get_cluster_available_resources,
     get_current_cluster_idx,
     get_distribution_mode,
@@ -33,6 +34,7 @@ __all__ = [
     'FED_OBJECT_TYPES',
     'init',
     'get',
+    'get_async',
     'kill',
     'remote',
     'shutdown',
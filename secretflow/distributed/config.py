@@ -13,11 +13,13 @@
 # limitations under the License.
 
 import pathlib
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 
-from secretflow.device import global_state
 from secretflow.utils.errors import InvalidArgumentError
 
+if TYPE_CHECKING:
+    from secretflow.device import global_state
+
 
 def get_cluster_config(cluster_config: Dict):
     if not cluster_config:
@@ -45,7 +47,10 @@ def get_cluster_config(cluster_config: Dict):
 
 def parse_tls_config(
     tls_config: Dict[str, str], party: str
-) -> Dict[str, global_state.PartyCert]:
+) -> Dict[str, 'global_state.PartyCert']:
+    # secretflow.device depends on secretflow.distributed, so it is imported here.
+    from secretflow.device import global_state
+
     party_certs = {}
     if set(tls_config) != set(('cert', 'key', 'ca_cert')):
         raise InvalidArgumentError(
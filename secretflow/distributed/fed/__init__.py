@@ -19,6 +19,7 @@ from .api import (
     FedRemoteError,
     FedRemoteFunction,
     get,
+    get_async,
     init,
     remote,
     shutdown,
@@ -30,6 +31,7 @@ __all__ = [
     FedRemoteError,
     FedRemoteFunction,
     get,
+    get_async,
     init,
     remote,
     shutdown,
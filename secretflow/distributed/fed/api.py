@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import copy
 import functools
 import inspect
@@ -26,6 +27,7 @@ from .actor import FedActorHandle
 from .call_holder import FedCallHolder
 from .exception import FedRemoteError, main_thread_assert
 from .global_context import (
+    FED_RUNTIMES,
     clear_global_context,
     get_global_context,
     init_global_context,
@@ -172,6 +174,10 @@ def init(
         'Invalid cross_silo_comm_backend, '
         f'{CROSS_SILO_COMM_BACKENDS} are available now.'
     )
+    runtime = (config.pop('runtime', None) or 'thread').lower()
+    assert (
+        runtime in FED_RUNTIMES
+    ), f'Invalid fed runtime {runtime}, {FED_RUNTIMES} are available now.'
     if job_name is None:
         job_name = "_unspecified_name_"
     if comm_backend == 'brpc_link':
@@ -191,7 +197,7 @@ def init(
 
     signal.signal(signal.SIGINT, _signal_handler)
     proxy.start()
-    init_global_context(job_name, party, proxy, addresses)
+    init_global_context(job_name, party, proxy, addresses, runtime)
 
 
 def _shutdown(intended, on_error):
@@ -277,6 +283,52 @@ def get(objects: Any):
     """
 
     main_thread_assert()
+    flattened_args, tree, indexes = _schedule_get(objects)
+
+    try:
+        for i in indexes:
+            flattened_args[i] = copy.deepcopy(flattened_args[i].get_object())
+    except FedRemoteError as e:
+        logger.warning(
+            "Encounter RemoteError happend in other parties"
+            f", error message: {e._cause}"
+        )
+        raise
+    except Exception as e:
+        get_global_context().set_local_exception(e)
+        raise
+
+    return tree_unflatten(tree, flattened_args)
+
+
+async def get_async(objects: Any):
+    """
+    Coroutine version of `get`, which waits for the data without blocking
+    the event loop of caller.
+    """
+
+    main_thread_assert()
+    flattened_args, tree, indexes = _schedule_get(objects)
+
+    try:
+        values = await asyncio.gather(*(flattened_args[i] for i in indexes))
+        for i, value in zip(indexes, values):
+            flattened_args[i] = copy.deepcopy(value)
+    except FedRemoteError as e:
+        logger.warning(
+            "Encounter RemoteError happend in other parties"
+            f", error message: {e._cause}"
+        )
+        raise
+    except Exception as e:
+        get_global_context().set_local_exception(e)
+        raise
+
+    return tree_unflatten(tree, flattened_args)
+
+
+def _schedule_get(objects: Any):
+    """Send or recv the FedObjects in objects for get."""
     addresses = get_global_context().get_addresses()
     current_party = get_global_context().get_party()
     flattened_args, tree = tree_flatten(objects)
@@ -302,17 +354,4 @@ def get(objects: Any):
             # data from the location party of the fed_object.
             get_global_context().recv(fed_object)
 
-    try:
-        for i in indexes:
-            flattened_args[i] = copy.deepcopy(flattened_args[i].get_object())
-    except FedRemoteError as e:
-        logger.warning(
-            "Encounter RemoteError happend in other parties"
-            f", error message: {e._cause}"
-        )
-        raise
-    except Exception as e:
-        get_global_context().set_local_exception(e)
-        raise
-
-    return tree_unflatten(tree, flattened_args)
+    return flattened_args, tree, indexes
@@ -44,15 +44,19 @@ class FedCallHolder:
         return self
 
     def recv_dependencies(self, *args, **kwargs):
+        """Recv inputs from other parties and return all FedObject inputs."""
         flattened_args, _ = tree_flatten((args, kwargs))
+        deps = []
         for arg in flattened_args:
             if isinstance(arg, FedObject):
+                deps.append(arg)
                 if arg.get_party() != get_global_context().get_party():
                     logger.debug(
                         f'Try recv {self._task_msg} input '
                         f'seq id {arg.get_seq_id()}, from {arg.get_party()}'
                     )
                     get_global_context().recv(arg)
+        return deps
 
     def resolve_dependencies(self, *args, **kwargs):
         logger.debug(f'{self._task_msg} wait for inputs')
@@ -82,7 +86,7 @@ class FedCallHolder:
 
         if self._party == self._node_party:
             logger.debug(f'Try submit {self._task_msg}')
-            self.recv_dependencies(*args, **kwargs)
+            deps = self.recv_dependencies(*args, **kwargs)
 
             def _task():
                 resolved = self.resolve_dependencies(*args, **kwargs)
@@ -95,7 +99,7 @@ class FedCallHolder:
                     logger.exception(f"{self._task_msg} throw exception")
                     raise
 
-            future = get_global_context().submit_task(_task)
+            future = get_global_context().submit_task(_task, deps)
             if num_returns == 1:
                 ret = FedObject(
                     get_global_context().get_party(),
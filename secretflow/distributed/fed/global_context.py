@@ -12,14 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import contextlib
 import gc
 import logging
 import os
 import signal
 import threading
 from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
 from queue import Queue
-from typing import Callable, Dict
+from typing import Callable, Dict, List, Set
 
 from .exception import FedLocalError, FedRemoteError, main_thread_assert
 from .object import FedFuture, FedObject
@@ -27,6 +30,8 @@ from .proxy import SenderReceiverProxy
 
 logger = logging.getLogger(__name__)
 
+FED_RUNTIMES = ['thread', 'asyncio']
+
 
 class GlobalContext:
     def __init__(
@@ -114,8 +119,9 @@ class GlobalContext:
         self._task_count += 1
         return self._task_count
 
-    def submit_task(self, fn: Callable, *args, **kwargs) -> Future:
-        return self._task_executor.submit(fn, *args, **kwargs)
+    def submit_task(self, fn: Callable, deps: List[FedObject] = None) -> Future:
+        """Submit a task, fn resolves its FedObject inputs deps by itself."""
+        return self._task_executor.submit(fn)
 
     def acquire_shutdown_flag(self) -> bool:
         with self._lock:
@@ -150,31 +156,15 @@ class GlobalContext:
             fed_obj.mark_send(target_party)
 
         seq_id = fed_obj.get_seq_id()
-
-        def _send():
-            local_err = None
-            try:
-                logger.debug(f"Send try get_data from {fed_obj}")
-                obj = fed_obj.get_object()
-                logger.debug(f"Send done get_data from {fed_obj}")
-            except FedRemoteError:
-                raise
-            except Exception as e:
-                logger.exception(f"Local runtime error")
-                local_err = FedLocalError(e)
-                obj = FedRemoteError(self.get_party(), e)
-            logger.debug(f"try send obj for {fed_obj} to {target_party}")
-            self._proxy.send(target_party, obj, seq_id)
-            logger.debug(f"done send obj for {fed_obj} to {target_party}")
-            if local_err:
-                raise local_err
-
         logger.debug(f"try submit send task for {fed_obj} to {target_party}")
-        send_future = self._send_executor.submit(_send)
+        send_future = self._submit_send(target_party, fed_obj, seq_id)
 
         def _send_check():
             try:
-                send_future.result()
+                sent = send_future.result()
+                if isinstance(sent, Future):
+                    # the data is sent in a batch, wait for the batch.
+                    sent.result()
                 return True
             except FedRemoteError as e:
                 logger.exception(f"FedRemoteError on seq id {seq_id}")
@@ -190,38 +180,53 @@ class GlobalContext:
 
         self._clean_queue.put(_send_check)
 
+    def _submit_send(self, target_party: str, fed_obj: FedObject, seq_id: int):
+        def _send():
+            local_err = None
+            try:
+                logger.debug(f"Send try get_data from {fed_obj}")
+                obj = fed_obj.get_object()
+                logger.debug(f"Send done get_data from {fed_obj}")
+            except FedRemoteError:
+                raise
+            except Exception as e:
+                logger.exception(f"Local runtime error")
+                local_err = FedLocalError(e)
+                obj = FedRemoteError(self.get_party(), e)
+            logger.debug(f"try send obj for {fed_obj} to {target_party}")
+            sent = self._proxy.send(target_party, obj, seq_id)
+            logger.debug(f"done send obj for {fed_obj} to {target_party}")
+            if local_err:
+                raise local_err
+            return sent
+
+        return self._send_executor.submit(_send)
+
     def recv(self, fed_obj: FedObject) -> FedObject:
         main_thread_assert()
         if fed_obj.has_object():
             return fed_obj
 
-        src_party = fed_obj.get_party()
-        seq_id = fed_obj.get_seq_id()
+        logger.debug(f"try submit recv task for {fed_obj}")
+        future = self._submit_recv(fed_obj.get_party(), fed_obj.get_seq_id())
+        fed_obj.set_object(FedFuture(future))
+        return fed_obj
 
+    def _submit_recv(self, src_party: str, seq_id: int) -> Future:
         def _recv():
             logger.debug(f"Try recv from {src_party} with seq id {seq_id}")
             data = self._proxy.recv(src_party, seq_id)
             logger.debug(f"Done recv from {src_party} with seq id {seq_id}")
             return data
 
-        logger.debug(f"try submit recv task for {fed_obj}")
-        future = self._recv_executor.submit(_recv)
-        fed_obj.set_object(FedFuture(future))
-        return fed_obj
+        return self._recv_executor.submit(_recv)
 
     def stop(self, wait_for_sending=True, on_error=False):
         main_thread_assert()
         logger.info(
             f"Try stop context, wait_for_sending {wait_for_sending}, on_error {on_error}"
         )
-        self._task_executor.shutdown(wait=not on_error, cancel_futures=on_error)
-        logger.info("task_executor stopped")
-        self._recv_executor.shutdown(wait=not on_error, cancel_futures=on_error)
-        logger.info("recv_executor stopped")
-        self._send_executor.shutdown(
-            wait=wait_for_sending, cancel_futures=not wait_for_sending
-        )
-        logger.info("send_executor stopped")
+        self._stop_executors(wait_for_sending, on_error)
 
         if not wait_for_sending or on_error:
             self._clean_stopped = True
@@ -236,6 +241,130 @@ class GlobalContext:
 
         logger.info("Context stopped")
 
+    def _stop_executors(self, wait_for_sending: bool, on_error: bool):
+        self._task_executor.shutdown(wait=not on_error, cancel_futures=on_error)
+        logger.info("task_executor stopped")
+        self._recv_executor.shutdown(wait=not on_error, cancel_futures=on_error)
+        logger.info("recv_executor stopped")
+        self._send_executor.shutdown(
+            wait=wait_for_sending, cancel_futures=not wait_for_sending
+        )
+        logger.info("send_executor stopped")
+
+
+class AsyncGlobalContext(GlobalContext):
+    def __init__(
+        self,
+        job_name: str,
+        current_party: str,
+        proxy: SenderReceiverProxy,
+        addresses: Dict,
+    ) -> None:
+        """Context of the asyncio fed runtime.
+
+        Sends, receives and the waiting for inputs of tasks are coroutines on an
+        event loop running in a background thread, so pending FedObjects don't
+        occupy any thread. The task executor only runs the tasks themselves.
+        """
+        super().__init__(job_name, current_party, proxy, addresses)
+        self._loop = asyncio.new_event_loop()
+        # proxies without native coroutines run their blocking calls here.
+        self._loop.set_default_executor(
+            ThreadPoolExecutor(thread_name_prefix='sf_fed_io')
+        )
+        concurrent = proxy.concurrent()
+        self._send_limit = (
+            contextlib.nullcontext() if concurrent else asyncio.Semaphore(1)
+        )
+        self._recv_limit = (
+            contextlib.nullcontext() if concurrent else asyncio.Semaphore(1)
+        )
+        self._pending_tasks: Set[Future] = set()
+        self._pending_sends: Set[Future] = set()
+        self._pending_recvs: Set[Future] = set()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name='sf_fed_event_loop', daemon=True
+        )
+        self._loop_thread.start()
+
+    def _schedule(self, coro, pending: Set[Future]) -> Future:
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        with self._lock:
+            pending.add(future)
+
+        def _done(f):
+            with self._lock:
+                pending.discard(f)
+
+        future.add_done_callback(_done)
+        return future
+
+    def submit_task(self, fn: Callable, deps: List[FedObject] = None) -> Future:
+        """Submit a task which runs in the task executor once deps are ready."""
+
+        async def _task():
+            if deps:
+                await asyncio.gather(*deps)
+            return await self._loop.run_in_executor(self._task_executor, fn)
+
+        return self._schedule(_task(), self._pending_tasks)
+
+    def _submit_send(self, target_party: str, fed_obj: FedObject, seq_id: int):
+        async def _send():
+            local_err = None
+            try:
+                logger.debug(f"Send try get_data from {fed_obj}")
+                obj = await fed_obj
+                logger.debug(f"Send done get_data from {fed_obj}")
+            except FedRemoteError:
+                raise
+            except Exception as e:
+                logger.exception(f"Local runtime error")
+                local_err = FedLocalError(e)
+                obj = FedRemoteError(self.get_party(), e)
+            logger.debug(f"try send obj for {fed_obj} to {target_party}")
+            async with self._send_limit:
+                await self._proxy.async_send(target_party, obj, seq_id)
+            logger.debug(f"done send obj for {fed_obj} to {target_party}")
+            if local_err:
+                raise local_err
+
+        return self._schedule(_send(), self._pending_sends)
+
+    def _submit_recv(self, src_party: str, seq_id: int) -> Future:
+        async def _recv():
+            logger.debug(f"Try recv from {src_party} with seq id {seq_id}")
+            async with self._recv_limit:
+                data = await self._proxy.async_recv(src_party, seq_id)
+            logger.debug(f"Done recv from {src_party} with seq id {seq_id}")
+            return data
+
+        return self._schedule(_recv(), self._pending_recvs)
+
+    def _drain(self, pending: Set[Future], cancel: bool):
+        with self._lock:
+            futures = list(pending)
+        if cancel:
+            for future in futures:
+                future.cancel()
+        else:
+            wait_futures(futures)
+
+    def _stop_executors(self, wait_for_sending: bool, on_error: bool):
+        self._drain(self._pending_tasks, cancel=on_error)
+        self._task_executor.shutdown(wait=not on_error, cancel_futures=on_error)
+        logger.info("tasks stopped")
+        self._drain(self._pending_recvs, cancel=on_error)
+        logger.info("recvs stopped")
+        self._drain(self._pending_sends, cancel=not wait_for_sending)
+        logger.info("sends stopped")
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.run_until_complete(self._loop.shutdown_default_executor())
+        self._loop.close()
+        logger.info("event loop stopped")
+
 
 _global_context: GlobalContext = None
 
@@ -245,11 +374,13 @@ def init_global_context(
     current_party: str,
     proxy: SenderReceiverProxy,
     addresses: Dict,
+    runtime: str = 'thread',
 ) -> None:
     main_thread_assert()
     global _global_context
     if _global_context is None:
-        _global_context = GlobalContext(
+        context_cls = AsyncGlobalContext if runtime == 'asyncio' else GlobalContext
+        _global_context = context_cls(
             job_name,
             current_party,
             proxy,
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import logging
 from concurrent.futures import Future, TimeoutError
 from dataclasses import dataclass
@@ -41,6 +42,27 @@ class FedFuture:
                 logging.warning(f"get obj interrupted by {exception}")
                 raise exception
 
+        return self._select(future_result)
+
+    async def get_async(self) -> Any:
+        future = asyncio.wrap_future(self.future)
+        while True:
+            done, _ = await asyncio.wait([future], timeout=2)
+            if done:
+                future_result = future.result()
+                break
+
+            # check global exception
+            from secretflow.distributed.fed.global_context import get_global_context
+
+            exception = get_global_context().get_last_exception()
+            if exception:
+                logging.warning(f"get obj interrupted by {exception}")
+                raise exception
+
+        return self._select(future_result)
+
+    def _select(self, future_result: Any) -> Any:
         if self.num_returns == 1:
             return future_result
         else:
@@ -113,10 +135,30 @@ class FedObject:
     def get_object(self) -> Any:
         assert self._has_object
         with self._lock:
-            if isinstance(self._object, FedFuture):
-                self._object = self._object.get()
+            obj = self._object
+        if isinstance(obj, FedFuture):
+            # wait without holding the lock, which is also taken by the event
+            # loop of the asyncio runtime.
+            obj = self._resolve(obj, obj.get())
+        return obj
+
+    async def get_object_async(self) -> Any:
+        assert self._has_object
+        with self._lock:
+            obj = self._object
+        if isinstance(obj, FedFuture):
+            obj = self._resolve(obj, await obj.get_async())
+        return obj
+
+    def _resolve(self, future: FedFuture, result: Any) -> Any:
+        with self._lock:
+            if self._object is future:
+                self._object = result
             return self._object
 
+    def __await__(self):
+        return self.get_object_async().__await__()
+
     def has_object(self) -> bool:
         return self._has_object
 
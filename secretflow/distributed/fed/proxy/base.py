@@ -14,9 +14,13 @@
 from __future__ import annotations
 
 import abc
+import asyncio
 import json
+from concurrent.futures import Future
 from dataclasses import dataclass, fields
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
+
+from .codec import MessageCodec
 
 
 @dataclass
@@ -60,6 +64,19 @@ class CrossSiloMessageConfig:
         use_global_proxy:
             Whether using the global proxy actor or create new proxy actor for current
             job.
+        compression:
+            The codec to compress cross-silo messages, one of none/zlib/lz4/zstd.
+            lz4 and zstd require the `lz4` and `zstandard` packages. Parties
+            negotiate the codec at start, and fall back to none if the peer could
+            not decode it. It's none by default.
+        compression_level:
+            The compression level of the codec. If None, a fast level is used.
+        compression_threshold_bytes:
+            Buffers smaller than this are not compressed. It's 4096 by default.
+        compression_min_ratio:
+            If the compressed size / raw size of a buffer is larger than this, the
+            raw buffer is sent instead and compression to the peer is paused for a
+            while. It's 0.9 by default.
     """
 
     proxy_max_restarts: Optional[int] = None
@@ -73,6 +90,10 @@ class CrossSiloMessageConfig:
     max_concurrency: Optional[int] = None
     expose_error_trace: Optional[bool] = False
     use_global_proxy: Optional[bool] = True
+    compression: Optional[str] = None
+    compression_level: Optional[int] = None
+    compression_threshold_bytes: Optional[int] = None
+    compression_min_ratio: Optional[float] = None
 
     def __json__(self):
         return json.dumps(self.__dict__)
@@ -114,6 +135,19 @@ class SenderReceiverProxy(abc.ABC):
         self._party = self_party
         self._tls_config = tls_config
         self._proxy_config = proxy_config
+        if proxy_config is not None:
+            self._codec = MessageCodec(
+                proxy_config.compression,
+                proxy_config.compression_level,
+                proxy_config.compression_threshold_bytes,
+                proxy_config.compression_min_ratio,
+            )
+        else:
+            self._codec = MessageCodec()
+
+    def codec_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-peer count of messages and bytes before/after compression."""
+        return self._codec.stats()
 
     @abc.abstractmethod
     def start(self) -> None:
@@ -126,10 +160,31 @@ class SenderReceiverProxy(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def send(self, dest_party: str, data: Any, seq_id: Optional[int]) -> bool:
-        """Send data with seq_id to dest_party"""
+    def send(
+        self, dest_party: str, data: Any, seq_id: Optional[int]
+    ) -> Union[bool, Future]:
+        """Send data with seq_id to dest_party
+
+        Returns True, or a future which is done when the data is sent if the
+        proxy sends it asynchronously, e.g. in a batch.
+        """
         pass
 
+    async def async_recv(self, src_party: str, seq_id: Optional[int]) -> Any:
+        """Coroutine version of recv, runs recv in the default executor of loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.recv, src_party, seq_id)
+
+    async def async_send(
+        self, dest_party: str, data: Any, seq_id: Optional[int]
+    ) -> bool:
+        """Coroutine version of send, runs send in the default executor of loop"""
+        loop = asyncio.get_running_loop()
+        sent = await loop.run_in_executor(None, self.send, dest_party, data, seq_id)
+        if isinstance(sent, Future):
+            sent = await asyncio.wrap_future(sent)
+        return sent
+
     @abc.abstractmethod
     def stop(self) -> None:
         """Stop recv proxy service"""
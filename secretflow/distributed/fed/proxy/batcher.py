@@ -0,0 +1,129 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    def __init__(self, deadline: float) -> None:
+        self.deadline = deadline
+        self.items: List[Any] = []
+        self.futures: List[Future] = []
+        self.nbytes = 0
+
+
+class SendBatcher:
+    def __init__(
+        self,
+        flush: Callable[[str, List[Any]], None],
+        max_delay_ms: int,
+        max_bytes: int,
+        max_count: int,
+    ) -> None:
+        """Coalesce small messages to the same destination into batches.
+
+        A batch is flushed when it's older than max_delay_ms, or it reaches
+        max_bytes or max_count.
+
+        Args:
+            flush: flush(dest, items) sends a batch of items to dest.
+            max_delay_ms: max delay of a message in batch.
+            max_bytes: max total bytes of a batch.
+            max_count: max number of messages of a batch.
+        """
+        self._flush = flush
+        self._max_delay = max_delay_ms / 1000
+        self._max_bytes = max_bytes
+        self._max_count = max_count
+
+        self._cond = threading.Condition()
+        self._pending: Dict[str, _Batch] = {}
+        self._stopped = False
+        self._flush_executor = ThreadPoolExecutor(thread_name_prefix='send_batcher')
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _is_full(self, batch: _Batch) -> bool:
+        return len(batch.items) >= self._max_count or batch.nbytes >= self._max_bytes
+
+    def submit(self, dest: str, item: Any, nbytes: int) -> Future:
+        """Add a message to the batch of dest.
+
+        Returns:
+            A future which is done when the batch is flushed.
+        """
+        future = Future()
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError('SendBatcher is stopped.')
+            batch = self._pending.get(dest)
+            if batch is not None and batch.nbytes + nbytes > self._max_bytes:
+                self._flush_async(dest, self._pending.pop(dest))
+                batch = None
+            if batch is None:
+                batch = _Batch(time.monotonic() + self._max_delay)
+                self._pending[dest] = batch
+            batch.items.append(item)
+            batch.futures.append(future)
+            batch.nbytes += nbytes
+            if self._is_full(batch):
+                self._flush_async(dest, self._pending.pop(dest))
+            else:
+                self._cond.notify()
+        return future
+
+    def _flush_async(self, dest: str, batch: _Batch):
+        def _flush():
+            try:
+                logger.debug(f'Flush {len(batch.items)} messages to {dest}')
+                self._flush(dest, batch.items)
+            except Exception as e:
+                for future in batch.futures:
+                    future.set_exception(e)
+            else:
+                for future in batch.futures:
+                    future.set_result(True)
+
+        self._flush_executor.submit(_flush)
+
+    def _run(self):
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                for dest in [d for d, b in self._pending.items() if b.deadline <= now]:
+                    self._flush_async(dest, self._pending.pop(dest))
+                timeout = min(
+                    (b.deadline for b in self._pending.values()), default=None
+                )
+                if timeout is not None:
+                    timeout = max(timeout - time.monotonic(), 0)
+                self._cond.wait(timeout)
+
+    def stop(self):
+        """Flush all pending batches and wait for them."""
+        with self._cond:
+            if self._stopped:
+                return
+            self._stopped = True
+            for dest in list(self._pending):
+                self._flush_async(dest, self._pending.pop(dest))
+            self._cond.notify()
+        self._thread.join()
+        self._flush_executor.shutdown(wait=True)
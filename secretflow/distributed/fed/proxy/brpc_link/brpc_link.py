@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import logging
+import threading
+import time
 from dataclasses import dataclass
 from typing import Dict, Optional
 
@@ -21,10 +23,13 @@ import spu.libspu.link as link
 from secretflow.utils import secure_pickle
 
 from ...exception import FedRemoteError
+from .. import codec
 from ..base import CrossSiloMessageConfig, SenderReceiverProxy
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_NEGOTIATE_TIMEOUT_MS = 10 * 1000
+
 
 @dataclass
 class BrpcLinkCrossSiloMessageConfig(CrossSiloMessageConfig):
@@ -39,6 +44,9 @@ class BrpcLinkCrossSiloMessageConfig(CrossSiloMessageConfig):
     brpc_retry_count: Optional[int] = None
     brpc_retry_interval_ms: Optional[int] = None
     brpc_aggressive_retry: Optional[bool] = None
+    # how long start() waits for the compression handshakes of peers, messages to a
+    # peer are not compressed until its handshake arrives.
+    compression_negotiate_timeout_ms: Optional[int] = None
 
     def dump_to_link_desc(self, link_desc: link.Desc):
         if self.timeout_in_ms is not None:
@@ -115,8 +123,15 @@ class BrpcLinkProxy(SenderReceiverProxy):
         if isinstance(proxy_config, BrpcLinkCrossSiloMessageConfig):
             proxy_config.dump_to_link_desc(desc)
         self._desc = desc
+        self._negotiate_timeout_ms = (
+            proxy_config.compression_negotiate_timeout_ms
+            if isinstance(proxy_config, BrpcLinkCrossSiloMessageConfig)
+            and proxy_config.compression_negotiate_timeout_ms is not None
+            else _DEFAULT_NEGOTIATE_TIMEOUT_MS
+        )
 
         self._all_data = {}
+        self._handshake_threads: Dict[str, threading.Thread] = {}
 
     def concurrent(self):
         return False
@@ -129,11 +144,57 @@ class BrpcLinkProxy(SenderReceiverProxy):
             raise RuntimeError(
                 f'Failed to listen on {self._addresses[self._party]} as exception:\n{e}'
             )
+        if self._codec.enabled:
+            self._negotiate()
+
+    def _negotiate(self):
+        # NOTE: the handshake must be the first message of each link, so all
+        # parties should enable compression together when using brpc_link.
+        msg_bytes = secure_pickle.dumps(
+            {'codecs': codec.available_codecs(), 'job': self._job_name}
+        )
+        for party, rank in self._parties_rank.items():
+            if party != self._party:
+                self._linker.send_async(rank, msg_bytes)
+
+        # the first message of each peer is received in background, so a peer which
+        # never sends the handshake could not block start(). recv() of the peer
+        # joins the thread before receiving from the link.
+        for party, rank in self._parties_rank.items():
+            if party == self._party:
+                continue
+            thread = threading.Thread(
+                target=self._recv_handshake, args=(party, rank), daemon=True
+            )
+            thread.start()
+            self._handshake_threads[party] = thread
+        deadline = time.monotonic() + self._negotiate_timeout_ms / 1000
+        for party, thread in self._handshake_threads.items():
+            thread.join(max(deadline - time.monotonic(), 0))
+            if thread.is_alive():
+                logger.warning(
+                    f'No compression handshake from {party} in '
+                    f'{self._negotiate_timeout_ms}ms, messages to {party} are not '
+                    'compressed until it arrives.'
+                )
+
+    def _recv_handshake(self, party, rank):
+        try:
+            msg = self._loads_msg(self._linker.recv(rank))
+        except Exception:
+            logger.exception(f'Failed to receive compression handshake from {party}.')
+            return
+        if 'codecs' not in msg:
+            # peer doesn't enable compression, keep its data.
+            self._codec.negotiate(party, [])
+        self._put_msg(party, msg)
 
     def send(self, dest_party, data, seq_id):
         msg_bytes = secure_pickle.dumps(
             {'seq_id': seq_id, 'payload': data, 'job': self._job_name}
         )
+        if self._codec.peer_codec(dest_party) != codec.CODEC_NONE:
+            msg_bytes = self._codec.encode(dest_party, msg_bytes)
         self._linker.send_async(self._parties_rank[dest_party], msg_bytes)
 
         return True
@@ -157,29 +218,41 @@ class BrpcLinkProxy(SenderReceiverProxy):
                 raise data
             return data
 
-        def _recv_data():
-            msg = self._linker.recv(rank)
-            msg = secure_pickle.loads(
-                msg, filter_type=secure_pickle.FilterType.BLACKLIST
-            )
-            seq_id = msg['seq_id']
-            data = msg['payload']
-            job_name = msg['job']
-            logger.debug(f'Received data for seq id {seq_id} from {src_party}.')
-            if job_name == self._job_name:
-                # Avoid bug in unittest, not for production environment.
-                # In the unit test, we will repeatedly create and destroy SF clusters.
-                # The creation and destruction speeds of different parties are inconsistent.
-                # In order to prevent the subsequent cluster receiving data from the previous cluster,
-                # ignore data with different name.
-                self._all_data[seq_id] = data
-
+        handshake_thread = self._handshake_threads.pop(src_party, None)
+        if handshake_thread is not None:
+            handshake_thread.join()
         while True:
             if seq_id in self._all_data:
                 return _pop_data()
-            _recv_data()
+            self._put_msg(src_party, self._loads_msg(self._linker.recv(rank)))
+
+    def _loads_msg(self, msg_bytes):
+        if codec.is_frame(msg_bytes):
+            msg_bytes = codec.decode(msg_bytes)
+        return secure_pickle.loads(
+            msg_bytes, filter_type=secure_pickle.FilterType.BLACKLIST
+        )
+
+    def _put_msg(self, src_party, msg):
+        if 'codecs' in msg:
+            # handshake of a peer which enables compression.
+            self._codec.negotiate(src_party, msg['codecs'])
+            return
+        seq_id = msg['seq_id']
+        data = msg['payload']
+        job_name = msg['job']
+        logger.debug(f'Received data for seq id {seq_id} from {src_party}.')
+        if job_name == self._job_name:
+            # Avoid bug in unittest, not for production environment.
+            # In the unit test, we will repeatedly create and destroy SF clusters.
+            # The creation and destruction speeds of different parties are inconsistent.
+            # In order to prevent the subsequent cluster receiving data from the previous cluster,
+            # ignore data with different name.
+            self._all_data[seq_id] = data
 
     def stop(self):
+        if self._codec.enabled:
+            self._codec.log_stats()
         if self._linker:
             self._linker.stop_link()
             self._linker = None
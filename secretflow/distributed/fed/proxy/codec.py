@@ -0,0 +1,282 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compression codecs of cross-silo messages.
+
+An encoded buffer is a self-describing frame:
+
+    magic (1B) | codec id (1B) | shuffle item size (1B) | raw size (8B) | body
+
+so the receiver could always decode it no matter which codec the sender picked.
+Parties only negotiate which codecs the receiver is able to decode.
+"""
+
+import logging
+import struct
+import threading
+import zlib
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CODEC_NONE = 'none'
+
+# pickled bytes always start with the PROTO opcode b'\x80'.
+_FRAME_MAGIC = 0xFC
+_FRAME_HEADER = struct.Struct('<BBBQ')
+
+_DEFAULT_THRESHOLD_BYTES = 4096
+_DEFAULT_MIN_RATIO = 0.9
+# skip compression for the next messages to a peer if its data is incompressible.
+_ADAPTIVE_SKIP_MESSAGES = 16
+
+
+class _Codec:
+    def __init__(
+        self,
+        name: str,
+        codec_id: int,
+        compress: Callable[[bytes, Optional[int]], bytes],
+        decompress: Callable[[bytes, int], bytes],
+    ) -> None:
+        self.name = name
+        self.codec_id = codec_id
+        self.compress = compress
+        self.decompress = decompress
+
+
+def _load_codecs() -> Dict[str, _Codec]:
+    codecs = {
+        CODEC_NONE: _Codec(CODEC_NONE, 0, lambda d, _: d, lambda d, _: d),
+        'zlib': _Codec(
+            'zlib',
+            1,
+            lambda d, level: zlib.compress(d, 1 if level is None else level),
+            lambda d, _: zlib.decompress(d),
+        ),
+    }
+    try:
+        import lz4.frame as lz4_frame
+
+        codecs['lz4'] = _Codec(
+            'lz4',
+            2,
+            lambda d, level: lz4_frame.compress(
+                d, compression_level=0 if level is None else level
+            ),
+            lambda d, _: lz4_frame.decompress(d),
+        )
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        codecs['zstd'] = _Codec(
+            'zstd',
+            3,
+            lambda d, level: zstandard.ZstdCompressor(
+                level=3 if level is None else level
+            ).compress(d),
+            lambda d, raw_size: zstandard.ZstdDecompressor().decompress(
+                d, max_output_size=raw_size
+            ),
+        )
+    except ImportError:
+        pass
+    return codecs
+
+
+_CODECS = _load_codecs()
+_CODECS_BY_ID = {c.codec_id: c for c in _CODECS.values()}
+
+
+def available_codecs() -> List[str]:
+    """Names of codecs which are installed in this process."""
+    return list(_CODECS)
+
+
+def _shuffle(data: memoryview, itemsize: int) -> bytes:
+    # group the k-th bytes of all items together, which makes numeric arrays
+    # much more compressible.
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, itemsize: int) -> bytearray:
+    out = bytearray(len(data))
+    np.frombuffer(out, dtype=np.uint8).reshape(-1, itemsize)[:] = (
+        np.frombuffer(data, dtype=np.uint8).reshape(itemsize, -1).T
+    )
+    return out
+
+
+def is_frame(data: Union[bytes, bytearray, memoryview]) -> bool:
+    return len(data) >= _FRAME_HEADER.size and data[0] == _FRAME_MAGIC
+
+
+def decode(frame: Union[bytes, bytearray, memoryview]) -> Union[bytearray, memoryview]:
+    """Decode a frame produced by `MessageCodec.encode`.
+
+    Decompressed data is returned as a writable bytearray, so numpy arrays
+    unpickled from it are writable too.
+    """
+    magic, codec_id, itemsize, raw_size = _FRAME_HEADER.unpack_from(frame)
+    if magic != _FRAME_MAGIC:
+        raise ValueError('Invalid frame of cross-silo message.')
+    if codec_id not in _CODECS_BY_ID:
+        raise ValueError(f'Unsupported codec id {codec_id} of cross-silo message.')
+    body = memoryview(frame)[_FRAME_HEADER.size :]
+    data = _CODECS_BY_ID[codec_id].decompress(body, raw_size)
+    if itemsize > 1:
+        data = _unshuffle(data, itemsize)
+    elif codec_id != _CODECS[CODEC_NONE].codec_id:
+        data = bytearray(data)
+    if len(data) != raw_size:
+        raise ValueError(
+            f'Size mismatch of cross-silo message, expected {raw_size}, got {len(data)}.'
+        )
+    return data
+
+
+class MessageCodec:
+    def __init__(
+        self,
+        codec: Optional[str] = None,
+        level: Optional[int] = None,
+        threshold_bytes: Optional[int] = None,
+        min_ratio: Optional[float] = None,
+    ) -> None:
+        """Compress cross-silo messages and record the per-peer traffic.
+
+        Args:
+            codec: The preferred codec, one of none/zlib/lz4/zstd.
+            level: Optional. The compression level of codec.
+            threshold_bytes: Buffers smaller than this are not compressed.
+            min_ratio: If compressed size / raw size is larger than this, the raw
+                buffer is sent instead and compression to the peer is skipped
+                for the next few messages.
+        """
+        codec = (codec or CODEC_NONE).lower()
+        if codec not in _CODECS:
+            raise ValueError(
+                f'Codec {codec} is not available, available codecs are '
+                f'{available_codecs()}. lz4 and zstd require the `lz4` and '
+                f'`zstandard` packages.'
+            )
+        self._codec = codec
+        self._level = level
+        self._threshold_bytes = (
+            _DEFAULT_THRESHOLD_BYTES if threshold_bytes is None else threshold_bytes
+        )
+        self._min_ratio = _DEFAULT_MIN_RATIO if min_ratio is None else min_ratio
+
+        self._lock = threading.Lock()
+        self._peer_codecs: Dict[str, str] = {}
+        self._peer_skips: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._codec != CODEC_NONE
+
+    def negotiate(self, peer: str, peer_codecs: List[str]) -> str:
+        """Pick the codec to send to peer, which must be decodable by peer."""
+        codec = self._codec if self._codec in peer_codecs else CODEC_NONE
+        if codec != self._codec:
+            logger.warning(
+                f'Codec {self._codec} is not supported by {peer}, '
+                f'which supports {peer_codecs}. Messages are not compressed.'
+            )
+        with self._lock:
+            self._peer_codecs[peer] = codec
+        logger.info(f'Use codec {codec} for messages to {peer}.')
+        return codec
+
+    def peer_codec(self, peer: str) -> str:
+        with self._lock:
+            return self._peer_codecs.get(peer, CODEC_NONE)
+
+    def _pick(self, peer: str, size: int) -> _Codec:
+        with self._lock:
+            codec = self._peer_codecs.get(peer, CODEC_NONE)
+            if codec == CODEC_NONE or size < self._threshold_bytes:
+                return _CODECS[CODEC_NONE]
+            if self._peer_skips.get(peer, 0) > 0:
+                self._peer_skips[peer] -= 1
+                return _CODECS[CODEC_NONE]
+            return _CODECS[codec]
+
+    def _record(self, peer: str, before: int, after: int):
+        with self._lock:
+            stats = self._stats.setdefault(
+                peer, {'messages': 0, 'bytes_before': 0, 'bytes_after': 0}
+            )
+            stats['messages'] += 1
+            stats['bytes_before'] += before
+            stats['bytes_after'] += after
+
+    def encode(
+        self, peer: str, data: Union[bytes, memoryview], itemsize: int = 1
+    ) -> bytes:
+        """Encode a buffer to peer into a frame.
+
+        Args:
+            peer: the receiver.
+            data: the buffer.
+            itemsize: item size of data if it's a numeric array, its bytes are
+                shuffled by item before compressed.
+        """
+        data = memoryview(data).cast('B')
+        raw_size = data.nbytes
+        codec = self._pick(peer, raw_size)
+        body = data
+        if codec.name != CODEC_NONE:
+            if 1 < itemsize < 256 and raw_size % itemsize == 0:
+                body = _shuffle(data, itemsize)
+            else:
+                itemsize = 1
+            compressed = codec.compress(body, self._level)
+            if len(compressed) > raw_size * self._min_ratio:
+                logger.debug(
+                    f'Incompressible message to {peer}, ratio '
+                    f'{len(compressed) / max(raw_size, 1):.2f}, skip compression.'
+                )
+                with self._lock:
+                    self._peer_skips[peer] = _ADAPTIVE_SKIP_MESSAGES
+                codec, body = _CODECS[CODEC_NONE], data
+            else:
+                body = compressed
+        if codec.name == CODEC_NONE:
+            itemsize = 1
+
+        frame = (
+            _FRAME_HEADER.pack(_FRAME_MAGIC, codec.codec_id, itemsize, raw_size) + body
+        )
+        self._record(peer, raw_size, len(frame))
+        return frame
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-peer count of messages and bytes before/after encoding."""
+        with self._lock:
+            return {peer: dict(stats) for peer, stats in self._stats.items()}
+
+    def log_stats(self):
+        for peer, stats in self.stats().items():
+            saved = stats['bytes_before'] - stats['bytes_after']
+            logger.info(
+                f'Sent {stats["messages"]} buffers to {peer} with codec '
+                f'{self.peer_codec(peer)}, {stats["bytes_before"]} bytes before '
+                f'encoding, {stats["bytes_after"]} bytes after, saved {saved} bytes.'
+            )
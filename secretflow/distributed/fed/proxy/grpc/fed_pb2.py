@@ -13,7 +13,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n/secretflow/distributed/fed/proxy/grpc/fed.proto\"D\n\x12SfFedProxySendData\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0e\n\x06seq_id\x18\x02 \x01(\x03\x12\x10\n\x08job_name\x18\x03 \x01(\t\":\n\x1aSfFedProxySendDataResponse\x12\x0c\n\x04\x63ode\x18\x01 \x01(\x05\x12\x0e\n\x06result\x18\x02 \x01(\t2L\n\nSfFedProxy\x12>\n\x08SendData\x12\x13.SfFedProxySendData\x1a\x1b.SfFedProxySendDataResponse\"\x00\x42\x03\x80\x01\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n/secretflow/distributed/fed/proxy/grpc/fed.proto\"h\n\x12SfFedProxySendData\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0e\n\x06seq_id\x18\x02 \x01(\x03\x12\x10\n\x08job_name\x18\x03 \x01(\t\x12\x0f\n\x07\x65ncoded\x18\x04 \x01(\x08\x12\x11\n\tsrc_party\x18\x05 \x01(\t\"b\n\x17SfFedProxySendDataBatch\x12\x10\n\x08job_name\x18\x01 \x01(\t\x12\"\n\x05items\x18\x02 \x03(\x0b\x32\x13.SfFedProxySendData\x12\x11\n\tsrc_party\x18\x03 \x01(\t\"\x83\x01\n\x17SfFedProxySendDataChunk\x12\x0e\n\x06seq_id\x18\x01 \x01(\x03\x12\x10\n\x08job_name\x18\x02 \x01(\t\x12\x14\n\x0c\x62uffer_sizes\x18\x03 \x03(\x03\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\x0c\x12\x0f\n\x07\x65ncoded\x18\x05 \x01(\x08\x12\x11\n\tsrc_party\x18\x06 \x01(\t\":\n\x1aSfFedProxySendDataResponse\x12\x0c\n\x04\x63ode\x18\x01 \x01(\x05\x12\x0e\n\x06result\x18\x02 \x01(\t\"M\n\x1aSfFedProxyNegotiateRequest\x12\x10\n\x08job_name\x18\x01 \x01(\t\x12\r\n\x05party\x18\x02 \x01(\t\x12\x0e\n\x06\x63odecs\x18\x03 \x03(\t\"K\n\x1bSfFedProxyNegotiateResponse\x12\x0c\n\x04\x63ode\x18\x01 \x01(\x05\x12\x0e\n\x06result\x18\x02 \x01(\t\x12\x0e\n\x06\x63odecs\x18\x03 \x03(\t2\xad\x02\n\nSfFedProxy\x12>\n\x08SendData\x12\x13.SfFedProxySendData\x1a\x1b.SfFedProxySendDataResponse\"\x00\x12K\n\x0eSendDataStream\x12\x18.SfFedProxySendDataChunk\x1a\x1b.SfFedProxySendDataResponse\"\x00(\x01\x12H\n\tNegotiate\x12\x1b.SfFedProxyNegotiateRequest\x1a\x1c.SfFedProxyNegotiateResponse\"\x00\x12H\n\rSendDataBatch\x12\x18.SfFedProxySendDataBatch\x1a\x1b.SfFedProxySendDataResponse\"\x00\x42\x03\x80\x01\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -23,9 +23,17 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   DESCRIPTOR._options = None
   DESCRIPTOR._serialized_options = b'\200\001\001'
   _globals['_SFFEDPROXYSENDDATA']._serialized_start=51
-  _globals['_SFFEDPROXYSENDDATA']._serialized_end=119
-  _globals['_SFFEDPROXYSENDDATARESPONSE']._serialized_start=121
-  _globals['_SFFEDPROXYSENDDATARESPONSE']._serialized_end=179
-  _globals['_SFFEDPROXY']._serialized_start=181
-  _globals['_SFFEDPROXY']._serialized_end=257
+  _globals['_SFFEDPROXYSENDDATA']._serialized_end=155
+  _globals['_SFFEDPROXYSENDDATABATCH']._serialized_start=157
+  _globals['_SFFEDPROXYSENDDATABATCH']._serialized_end=255
+  _globals['_SFFEDPROXYSENDDATACHUNK']._serialized_start=258
+  _globals['_SFFEDPROXYSENDDATACHUNK']._serialized_end=389
+  _globals['_SFFEDPROXYSENDDATARESPONSE']._serialized_start=391
+  _globals['_SFFEDPROXYSENDDATARESPONSE']._serialized_end=449
+  _globals['_SFFEDPROXYNEGOTIATEREQUEST']._serialized_start=451
+  _globals['_SFFEDPROXYNEGOTIATEREQUEST']._serialized_end=528
+  _globals['_SFFEDPROXYNEGOTIATERESPONSE']._serialized_start=530
+  _globals['_SFFEDPROXYNEGOTIATERESPONSE']._serialized_end=605
+  _globals['_SFFEDPROXY']._serialized_start=608
+  _globals['_SFFEDPROXY']._serialized_end=909
 # @@protoc_insertion_point(module_scope)
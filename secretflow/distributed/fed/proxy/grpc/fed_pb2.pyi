@@ -1,18 +1,49 @@
+from google.protobuf.internal import containers as _containers
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
-from typing import ClassVar as _ClassVar, Optional as _Optional
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
 class SfFedProxySendData(_message.Message):
-    __slots__ = ["data", "seq_id", "job_name"]
+    __slots__ = ["data", "seq_id", "job_name", "encoded", "src_party"]
     DATA_FIELD_NUMBER: _ClassVar[int]
     SEQ_ID_FIELD_NUMBER: _ClassVar[int]
     JOB_NAME_FIELD_NUMBER: _ClassVar[int]
+    ENCODED_FIELD_NUMBER: _ClassVar[int]
+    SRC_PARTY_FIELD_NUMBER: _ClassVar[int]
     data: bytes
     seq_id: int
     job_name: str
-    def __init__(self, data: _Optional[bytes] = ..., seq_id: _Optional[int] = ..., job_name: _Optional[str] = ...) -> None: ...
+    encoded: bool
+    src_party: str
+    def __init__(self, data: _Optional[bytes] = ..., seq_id: _Optional[int] = ..., job_name: _Optional[str] = ..., encoded: bool = ..., src_party: _Optional[str] = ...) -> None: ...
+
+class SfFedProxySendDataBatch(_message.Message):
+    __slots__ = ["job_name", "items", "src_party"]
+    JOB_NAME_FIELD_NUMBER: _ClassVar[int]
+    ITEMS_FIELD_NUMBER: _ClassVar[int]
+    SRC_PARTY_FIELD_NUMBER: _ClassVar[int]
+    job_name: str
+    items: _containers.RepeatedCompositeFieldContainer[SfFedProxySendData]
+    src_party: str
+    def __init__(self, job_name: _Optional[str] = ..., items: _Optional[_Iterable[_Union[SfFedProxySendData, _Mapping]]] = ..., src_party: _Optional[str] = ...) -> None: ...
+
+class SfFedProxySendDataChunk(_message.Message):
+    __slots__ = ["seq_id", "job_name", "buffer_sizes", "data", "encoded", "src_party"]
+    SEQ_ID_FIELD_NUMBER: _ClassVar[int]
+    JOB_NAME_FIELD_NUMBER: _ClassVar[int]
+    BUFFER_SIZES_FIELD_NUMBER: _ClassVar[int]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    ENCODED_FIELD_NUMBER: _ClassVar[int]
+    SRC_PARTY_FIELD_NUMBER: _ClassVar[int]
+    seq_id: int
+    job_name: str
+    buffer_sizes: _containers.RepeatedScalarFieldContainer[int]
+    data: bytes
+    encoded: bool
+    src_party: str
+    def __init__(self, seq_id: _Optional[int] = ..., job_name: _Optional[str] = ..., buffer_sizes: _Optional[_Iterable[int]] = ..., data: _Optional[bytes] = ..., encoded: bool = ..., src_party: _Optional[str] = ...) -> None: ...
 
 class SfFedProxySendDataResponse(_message.Message):
     __slots__ = ["code", "result"]
@@ -21,3 +52,23 @@ class SfFedProxySendDataResponse(_message.Message):
     code: int
     result: str
     def __init__(self, code: _Optional[int] = ..., result: _Optional[str] = ...) -> None: ...
+
+class SfFedProxyNegotiateRequest(_message.Message):
+    __slots__ = ["job_name", "party", "codecs"]
+    JOB_NAME_FIELD_NUMBER: _ClassVar[int]
+    PARTY_FIELD_NUMBER: _ClassVar[int]
+    CODECS_FIELD_NUMBER: _ClassVar[int]
+    job_name: str
+    party: str
+    codecs: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, job_name: _Optional[str] = ..., party: _Optional[str] = ..., codecs: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class SfFedProxyNegotiateResponse(_message.Message):
+    __slots__ = ["code", "result", "codecs"]
+    CODE_FIELD_NUMBER: _ClassVar[int]
+    RESULT_FIELD_NUMBER: _ClassVar[int]
+    CODECS_FIELD_NUMBER: _ClassVar[int]
+    code: int
+    result: str
+    codecs: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, code: _Optional[int] = ..., result: _Optional[str] = ..., codecs: _Optional[_Iterable[str]] = ...) -> None: ...
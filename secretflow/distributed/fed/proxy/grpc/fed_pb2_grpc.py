@@ -19,6 +19,21 @@ class SfFedProxyStub(object):
                 request_serializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendData.SerializeToString,
                 response_deserializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataResponse.FromString,
                 )
+        self.SendDataStream = channel.stream_unary(
+                '/SfFedProxy/SendDataStream',
+                request_serializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataChunk.SerializeToString,
+                response_deserializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataResponse.FromString,
+                )
+        self.Negotiate = channel.unary_unary(
+                '/SfFedProxy/Negotiate',
+                request_serializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxyNegotiateRequest.SerializeToString,
+                response_deserializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxyNegotiateResponse.FromString,
+                )
+        self.SendDataBatch = channel.unary_unary(
+                '/SfFedProxy/SendDataBatch',
+                request_serializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataBatch.SerializeToString,
+                response_deserializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataResponse.FromString,
+                )
 
 
 class SfFedProxyServicer(object):
@@ -30,6 +45,24 @@ class SfFedProxyServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SendDataStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Negotiate(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SendDataBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_SfFedProxyServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -38,6 +71,21 @@ def add_SfFedProxyServicer_to_server(servicer, server):
                     request_deserializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendData.FromString,
                     response_serializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataResponse.SerializeToString,
             ),
+            'SendDataStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.SendDataStream,
+                    request_deserializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataChunk.FromString,
+                    response_serializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataResponse.SerializeToString,
+            ),
+            'Negotiate': grpc.unary_unary_rpc_method_handler(
+                    servicer.Negotiate,
+                    request_deserializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxyNegotiateRequest.FromString,
+                    response_serializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxyNegotiateResponse.SerializeToString,
+            ),
+            'SendDataBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.SendDataBatch,
+                    request_deserializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataBatch.FromString,
+                    response_serializer=secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'SfFedProxy', rpc_method_handlers)
@@ -64,3 +112,54 @@ class SfFedProxy(object):
             secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SendDataStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/SfFedProxy/SendDataStream',
+            secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataChunk.SerializeToString,
+            secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Negotiate(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/SfFedProxy/Negotiate',
+            secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxyNegotiateRequest.SerializeToString,
+            secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxyNegotiateResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SendDataBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/SfFedProxy/SendDataBatch',
+            secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataBatch.SerializeToString,
+            secretflow_dot_distributed_dot_fed_dot_proxy_dot_grpc_dot_fed__pb2.SfFedProxySendDataResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -12,20 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import copy
 import json
 import logging
+import pickle
 import threading
-from concurrent.futures import ThreadPoolExecutor
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import grpc
 
 from secretflow.utils import secure_pickle
 
 from ...exception import FedRemoteError
+from .. import codec
 from ..base import CrossSiloMessageConfig, SenderReceiverProxy
+from ..batcher import SendBatcher
+from ..receive_buffer import BufferTier, ReceiveBuffer
 from . import fed_pb2, fed_pb2_grpc
 
 logger = logging.getLogger(__name__)
@@ -44,6 +50,18 @@ _DEFAULT_GRPC_RETRY_POLICY = {
 _DEFAULT_GRPC_MAX_SEND_MESSAGE_LENGTH = 500 * 1024 * 1024
 _DEFAULT_GRPC_MAX_RECEIVE_MESSAGE_LENGTH = 500 * 1024 * 1024
 
+# Messages larger than this are sent by the streaming rpc.
+_DEFAULT_STREAM_THRESHOLD_BYTES = 32 * 1024 * 1024
+_DEFAULT_STREAM_CHUNK_SIZE_BYTES = 4 * 1024 * 1024
+_DEFAULT_BATCH_MAX_BYTES = 1024 * 1024
+_DEFAULT_BATCH_MAX_COUNT = 64
+# The response code when the receive buffer is full, senders should retry later.
+_BUSY_CODE = 429
+_BUSY_INITIAL_BACKOFF_S = 0.05
+_BUSY_MAX_BACKOFF_S = 2
+# Buffers (e.g. numpy arrays) larger than this are pickled out-of-band.
+_MIN_OUT_OF_BAND_BUFFER_BYTES = 1024 * 1024
+
 _DEFAULT_GRPC_CHANNEL_OPTIONS = {
     'grpc.enable_retries': 1,
     'grpc.so_reuseport': 0,
@@ -127,10 +145,45 @@ class GrpcCrossSiloMessageConfig(CrossSiloMessageConfig):
                     ('grpc.enable_retries', 1),
                     ('grpc.max_send_message_length', 50 * 1024 * 1024)
                 ]
+        stream_threshold_bytes:
+            Messages larger than this, or containing buffers (e.g. numpy arrays)
+            of at least 1 MB, are sent by the client-streaming rpc in chunks, so
+            they are not limited by `messages_max_size_in_bytes`. The large buffers
+            are pickled out-of-band with pickle protocol 5, so they are not copied
+            into the pickled bytes. It's 32 MB by default.
+        stream_chunk_size_bytes:
+            The chunk size of the streaming rpc. It's 4 MB by default.
+        batch_max_delay_ms:
+            If set, small messages to the same party are coalesced into one rpc,
+            each message waits at most this delay before sent. Batching is
+            disabled by default.
+        batch_max_bytes:
+            The max total bytes of a batch, messages larger than this are not
+            batched. It's 1 MB by default.
+        batch_max_count:
+            The max number of messages of a batch. It's 64 by default.
+        recv_buffer_memory_bytes:
+            The memory budget of received but not yet consumed messages. If None,
+            the buffer is unbounded.
+        recv_buffer_spill_bytes:
+            The disk budget of received messages exceeding the memory budget,
+            which are spilled to files and memory-mapped lazily when consumed.
+            If both budgets are exhausted, senders are told to back off and retry
+            until `timeout_in_ms`. Spilling is disabled by default.
+        recv_buffer_spill_dir:
+            The directory of spill files, the system temp directory by default.
     """
 
     grpc_channel_options: Optional[List] = None
     grpc_retry_policy: Optional[Dict[str, str]] = None
+    stream_threshold_bytes: Optional[int] = _DEFAULT_STREAM_THRESHOLD_BYTES
+    stream_chunk_size_bytes: Optional[int] = _DEFAULT_STREAM_CHUNK_SIZE_BYTES
+    batch_max_delay_ms: Optional[int] = None
+    batch_max_bytes: Optional[int] = _DEFAULT_BATCH_MAX_BYTES
+    batch_max_count: Optional[int] = _DEFAULT_BATCH_MAX_COUNT
+    recv_buffer_memory_bytes: Optional[int] = None
+    recv_buffer_spill_bytes: Optional[int] = None
+    recv_buffer_spill_dir: Optional[str] = None
 
 
 def parse_grpc_options(proxy_config: CrossSiloMessageConfig):
@@ -202,6 +255,96 @@ def _load_cert_config(cert_config):
     )
 
 
+def _dumps_out_of_band(data) -> Tuple[bytes, List[memoryview], List[int]]:
+    """Pickle data with protocol 5, large buffers are kept out-of-band without copy.
+
+    Returns:
+        The pickled bytes, the out-of-band buffers and their item sizes.
+    """
+    buffers = []
+    itemsizes = []
+
+    def _buffer_callback(buf: pickle.PickleBuffer):
+        raw = buf.raw()
+        if raw.nbytes < _MIN_OUT_OF_BAND_BUFFER_BYTES:
+            # a true value means in-band.
+            return True
+        buffers.append(raw)
+        itemsizes.append(memoryview(buf).itemsize)
+        return False
+
+    pickled = secure_pickle.dumps(data, protocol=5, buffer_callback=_buffer_callback)
+    return pickled, buffers, itemsizes
+
+
+def _iter_stream_chunks(
+    seq_id: int,
+    job_name: str,
+    buffers: List[Union[bytes, memoryview]],
+    chunk_size: int,
+    encoded: bool = False,
+    src_party: str = '',
+) -> Iterator[fed_pb2.SfFedProxySendDataChunk]:
+    buffers = [memoryview(buf) for buf in buffers]
+    yield fed_pb2.SfFedProxySendDataChunk(
+        seq_id=seq_id,
+        job_name=job_name,
+        buffer_sizes=[buf.nbytes for buf in buffers],
+        encoded=encoded,
+        src_party=src_party,
+    )
+    for buf in buffers:
+        for start in range(0, buf.nbytes, chunk_size):
+            # only one chunk is copied at a time.
+            yield fed_pb2.SfFedProxySendDataChunk(
+                data=buf[start : start + chunk_size].tobytes()
+            )
+
+
+def _write_stream_chunks(
+    f: BinaryIO, nbytes: int, chunks: Iterator[fed_pb2.SfFedProxySendDataChunk]
+):
+    """Write chunks to a spill file."""
+    written = 0
+    for chunk in chunks:
+        written += len(chunk.data)
+        if written > nbytes:
+            raise ValueError('Received more data than declared buffer sizes.')
+        f.write(chunk.data)
+    if written != nbytes:
+        raise ValueError('Received less data than declared buffer sizes.')
+
+
+def _assemble_stream_chunks(
+    buffer_sizes: List[int], chunks: Iterator[fed_pb2.SfFedProxySendDataChunk]
+) -> List[bytearray]:
+    """Copy chunks into preallocated buffers."""
+    buffers = [bytearray(size) for size in buffer_sizes]
+    views = [memoryview(buf) for buf in buffers if len(buf)]
+    idx, offset = 0, 0
+    for chunk in chunks:
+        data = memoryview(chunk.data)
+        pos = 0
+        while pos < len(data):
+            if idx >= len(views):
+                raise ValueError('Received more data than declared buffer sizes.')
+            size = min(len(data) - pos, len(views[idx]) - offset)
+            views[idx][offset : offset + size] = data[pos : pos + size]
+            pos += size
+            offset += size
+            if offset == len(views[idx]):
+                idx += 1
+                offset = 0
+    if idx != len(views):
+        raise ValueError('Received less data than declared buffer sizes.')
+    return buffers
+
+
+def _set_ready(ready: asyncio.Future):
+    if not ready.done():
+        ready.set_result(None)
+
+
 class GrpcProxy(SenderReceiverProxy, fed_pb2_grpc.SfFedProxyServicer):
     def __init__(
         self,
@@ -223,12 +366,22 @@ class GrpcProxy(SenderReceiverProxy, fed_pb2_grpc.SfFedProxyServicer):
         self._stubs: Dict[str, fed_pb2_grpc.SfFedProxyStub] = {}
 
         self._lock = threading.Lock()
-        self._all_data: Dict[int, bytes] = {}
+        self._recv_buffer = ReceiveBuffer(
+            self._proxy_config.recv_buffer_memory_bytes,
+            self._proxy_config.recv_buffer_spill_bytes,
+            self._proxy_config.recv_buffer_spill_dir,
+        )
         self._data_events: Dict[int, threading.Event] = {}
-
-    # from grpc base
-    def SendData(self, request: fed_pb2.SfFedProxySendData, _):
-        job_name = request.job_name
+        # seq ids which async_recv is waiting for, and the loop of waiter.
+        self._async_waiters: Dict[
+            int, Tuple[asyncio.AbstractEventLoop, asyncio.Future]
+        ] = {}
+        # seq ids which recv is waiting for.
+        self._waiting_seq_ids = set()
+        self._negotiations: Dict[str, Future] = {}
+        self._batcher: Optional[SendBatcher] = None
+
+    def _check_job_name(self, job_name: str):
         if job_name != self._job_name:
             logger.warning(
                 f"Receive data from job {job_name}, ignore it. "
@@ -239,19 +392,116 @@ class GrpcProxy(SenderReceiverProxy, fed_pb2_grpc.SfFedProxyServicer):
                 code=417,
                 result=f"JobName mis-match, expected {self._job_name}, got {job_name}.",
             )
-        seq_id = request.seq_id
-        logger.debug(f'Received a grpc data request seq id {seq_id}')
+        return None
 
+    def _reserve(self, seq_ids: List[int], nbytes: int) -> Optional[BufferTier]:
+        with self._lock:
+            force = any(seq_id in self._waiting_seq_ids for seq_id in seq_ids)
+        return self._recv_buffer.reserve(nbytes, force)
+
+    def _busy_response(self, src_party: str, seq_ids: List[int]):
+        logger.debug(f'Receive buffer is full, refuse seq ids {seq_ids} of {src_party}')
+        return fed_pb2.SfFedProxySendDataResponse(
+            code=_BUSY_CODE, result="Receive buffer is full, retry later."
+        )
+
+    def _notify_data(self, seq_id: int):
         with self._lock:
-            self._all_data[seq_id] = request.data
             if seq_id not in self._data_events:
                 self._data_events[seq_id] = threading.Event()
             event = self._data_events[seq_id]
+            # set under lock, so async_recv either sees it or is notified.
+            event.set()
+            waiter = self._async_waiters.pop(seq_id, None)
 
-        event.set()
+        if waiter is not None:
+            loop, ready = waiter
+            loop.call_soon_threadsafe(_set_ready, ready)
         logger.debug(f"Event set for seq id {seq_id}")
+
+    def _put_requests(
+        self, src_party: str, requests: List[fed_pb2.SfFedProxySendData]
+    ) -> fed_pb2.SfFedProxySendDataResponse:
+        seq_ids = [request.seq_id for request in requests]
+        nbytes = sum(len(request.data) for request in requests)
+        tier = self._reserve(seq_ids, nbytes)
+        if tier is None:
+            return self._busy_response(src_party, seq_ids)
+        for request in requests:
+            # the reservation is split into requests.
+            self._recv_buffer.put(
+                request.seq_id, src_party, tier, [request.data], request.encoded
+            )
+            self._notify_data(request.seq_id)
         return fed_pb2.SfFedProxySendDataResponse(code=200, result="OK")
 
+    # from grpc base
+    def SendData(self, request: fed_pb2.SfFedProxySendData, _):
+        error = self._check_job_name(request.job_name)
+        if error is not None:
+            return error
+        logger.debug(f'Received a grpc data request seq id {request.seq_id}')
+        return self._put_requests(request.src_party, [request])
+
+    # from grpc base
+    def SendDataBatch(self, request: fed_pb2.SfFedProxySendDataBatch, _):
+        error = self._check_job_name(request.job_name)
+        if error is not None:
+            return error
+        logger.debug(f'Received a grpc data batch of {len(request.items)} requests')
+        return self._put_requests(request.src_party, list(request.items))
+
+    # from grpc base
+    def SendDataStream(
+        self, request_iterator: Iterator[fed_pb2.SfFedProxySendDataChunk], _
+    ):
+        header = next(request_iterator)
+        error = self._check_job_name(header.job_name)
+        if error is not None:
+            return error
+        seq_id = header.seq_id
+        buffer_sizes = list(header.buffer_sizes)
+        nbytes = sum(buffer_sizes)
+        logger.debug(f'Received a grpc data stream seq id {seq_id}, size {nbytes}')
+        tier = self._reserve([seq_id], nbytes)
+        if tier is None:
+            return self._busy_response(header.src_party, [seq_id])
+        try:
+            if tier == BufferTier.MEMORY:
+                buffers = _assemble_stream_chunks(buffer_sizes, request_iterator)
+                self._recv_buffer.put(
+                    seq_id, header.src_party, tier, buffers, header.encoded
+                )
+            else:
+                path, f = self._recv_buffer.open_spill_file()
+                with f:
+                    _write_stream_chunks(f, nbytes, request_iterator)
+                self._recv_buffer.put_spilled(
+                    seq_id, header.src_party, path, buffer_sizes, header.encoded
+                )
+        except ValueError as e:
+            self._recv_buffer.release(tier, nbytes)
+            logger.warning(f'Invalid data stream seq id {seq_id}: {e}')
+            return fed_pb2.SfFedProxySendDataResponse(code=400, result=str(e))
+        self._notify_data(seq_id)
+        return fed_pb2.SfFedProxySendDataResponse(code=200, result="OK")
+
+    def buffer_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-peer gauges of received but not yet consumed messages."""
+        return self._recv_buffer.stats()
+
+    # from grpc base
+    def Negotiate(self, request: fed_pb2.SfFedProxyNegotiateRequest, _):
+        error = self._check_job_name(request.job_name)
+        if error is not None:
+            return fed_pb2.SfFedProxyNegotiateResponse(
+                code=error.code, result=error.result
+            )
+        logger.debug(f'{request.party} could decode codecs {request.codecs}')
+        return fed_pb2.SfFedProxyNegotiateResponse(
+            code=200, result="OK", codecs=codec.available_codecs()
+        )
+
     # from proxy base
     def concurrent(self):
         return True
@@ -304,14 +554,65 @@ class GrpcProxy(SenderReceiverProxy, fed_pb2_grpc.SfFedProxyServicer):
             stub = fed_pb2_grpc.SfFedProxyStub(channel)
             self._stubs[dest_party] = stub
 
+    def _negotiate(self, dest_party: str) -> str:
+        request = fed_pb2.SfFedProxyNegotiateRequest(
+            job_name=self._job_name,
+            party=self._party,
+            codecs=codec.available_codecs(),
+        )
+        try:
+            response = self._stubs[dest_party].Negotiate(
+                request,
+                metadata=self._grpc_metadata,
+                timeout=self._proxy_config.timeout_in_ms / 1000,
+                wait_for_ready=True,
+            )
+        except grpc.RpcError as e:
+            logger.warning(f'Failed to negotiate codec with {dest_party}: {e}')
+            return self._codec.negotiate(dest_party, [])
+        if response.code != 200:
+            logger.warning(
+                f'Failed to negotiate codec with {dest_party}: {response.result}'
+            )
+            return self._codec.negotiate(dest_party, [])
+        return self._codec.negotiate(dest_party, list(response.codecs))
+
     def start(self):
         self._start_server()
         self._init_channel()
+        if self._codec.enabled:
+            # negotiate in background, the first message to each peer waits for it.
+            executor = ThreadPoolExecutor(thread_name_prefix='grpc_negotiate')
+            for dest_party in self._addresses:
+                if dest_party != self._party:
+                    self._negotiations[dest_party] = executor.submit(
+                        self._negotiate, dest_party
+                    )
+            executor.shutdown(wait=False)
+        if self._proxy_config.batch_max_delay_ms:
+            self._batcher = SendBatcher(
+                self._send_batch,
+                self._proxy_config.batch_max_delay_ms,
+                self._proxy_config.batch_max_bytes or _DEFAULT_BATCH_MAX_BYTES,
+                self._proxy_config.batch_max_count or _DEFAULT_BATCH_MAX_COUNT,
+            )
+
+    def _encode_to(self, dest_party: str) -> bool:
+        negotiation = self._negotiations.get(dest_party)
+        if negotiation is None:
+            return False
+        return negotiation.result() != codec.CODEC_NONE
 
     def stop(self):
+        if self._batcher:
+            self._batcher.stop()
+            self._batcher = None
+        if self._codec.enabled:
+            self._codec.log_stats()
         if self._server:
             self._server.stop(grace=None).wait()
             self._server = None
+        self._recv_buffer.close()
 
     def recv(self, src_party, seq_id):
         data_log_msg = f"data seq_id {seq_id} from {src_party}"
@@ -321,14 +622,48 @@ class GrpcProxy(SenderReceiverProxy, fed_pb2_grpc.SfFedProxyServicer):
             if seq_id not in self._data_events:
                 self._data_events[seq_id] = threading.Event()
             event = self._data_events[seq_id]
+            self._waiting_seq_ids.add(seq_id)
         event.wait()
         logger.debug(f"Waited {data_log_msg}.")
+        return self._take(src_party, seq_id)
 
+    async def async_recv(self, src_party, seq_id):
+        """Wait for data without occupying a thread."""
+        data_log_msg = f"data seq_id {seq_id} from {src_party}"
+        logger.debug(f"Getting {data_log_msg} asynchronously")
+
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
         with self._lock:
-            data = self._all_data.pop(seq_id)
-            self._data_events.pop(seq_id)
+            if seq_id not in self._data_events:
+                self._data_events[seq_id] = threading.Event()
+            self._waiting_seq_ids.add(seq_id)
+            if self._data_events[seq_id].is_set():
+                ready.set_result(None)
+            else:
+                self._async_waiters[seq_id] = (loop, ready)
+        try:
+            await ready
+        finally:
+            with self._lock:
+                self._async_waiters.pop(seq_id, None)
+        logger.debug(f"Waited {data_log_msg}.")
+        # decoding and unpickling may be cpu-bound.
+        return await loop.run_in_executor(None, self._take, src_party, seq_id)
 
-        data = secure_pickle.loads(data, filter_type=secure_pickle.FilterType.BLACKLIST)
+    def _take(self, src_party, seq_id):
+        with self._lock:
+            self._data_events.pop(seq_id)
+            self._waiting_seq_ids.discard(seq_id)
+        buffers, encoded = self._recv_buffer.pop(seq_id)
+        if encoded:
+            buffers = [codec.decode(buf) for buf in buffers]
+
+        data = secure_pickle.loads(
+            buffers[0],
+            buffers=buffers[1:],
+            filter_type=secure_pickle.FilterType.BLACKLIST,
+        )
         if isinstance(data, FedRemoteError):
             logger.error(
                 f"Receiving exception: {type(data)}, {data} from {src_party}, "
@@ -340,20 +675,90 @@ class GrpcProxy(SenderReceiverProxy, fed_pb2_grpc.SfFedProxyServicer):
             raise data
         return data
 
-    def send(self, dest_party, data, seq_id):
+    def send(self, dest_party, data, seq_id) -> Union[bool, Future]:
         timeout = self._proxy_config.timeout_in_ms / 1000
-        data = secure_pickle.dumps(data)
-        request = fed_pb2.SfFedProxySendData(
-            data=data, seq_id=seq_id, job_name=self._job_name
-        )
-        response = self._stubs[dest_party].SendData(
-            request, metadata=self._grpc_metadata, timeout=timeout
+        pickled, buffers, itemsizes = _dumps_out_of_band(data)
+        total_size = len(pickled) + sum(buf.nbytes for buf in buffers)
+        stream_threshold = (
+            self._proxy_config.stream_threshold_bytes or _DEFAULT_STREAM_THRESHOLD_BYTES
         )
+        encoded = self._encode_to(dest_party)
+        if encoded:
+            pickled = self._codec.encode(dest_party, pickled)
+            buffers = [
+                self._codec.encode(dest_party, buf, itemsize)
+                for buf, itemsize in zip(buffers, itemsizes)
+            ]
+        batch_max_bytes = self._proxy_config.batch_max_bytes or _DEFAULT_BATCH_MAX_BYTES
+        if (
+            self._batcher is not None
+            and not buffers
+            and len(pickled) <= batch_max_bytes
+        ):
+            item = fed_pb2.SfFedProxySendData(
+                data=pickled, seq_id=seq_id, encoded=encoded
+            )
+            # do not block the sender, or no other message could join the batch.
+            # errors are raised to the caller by the future.
+            return self._batcher.submit(dest_party, item, len(pickled))
+        if not buffers and total_size <= stream_threshold:
+            request = fed_pb2.SfFedProxySendData(
+                data=pickled,
+                seq_id=seq_id,
+                job_name=self._job_name,
+                encoded=encoded,
+                src_party=self._party,
+            )
+            response = self._call_with_backoff(
+                lambda: self._stubs[dest_party].SendData(
+                    request, metadata=self._grpc_metadata, timeout=timeout
+                )
+            )
+        else:
+            logger.debug(
+                f'Send seq id {seq_id} to {dest_party} by stream, '
+                f'size {total_size}, out-of-band buffers {len(buffers)}'
+            )
+            buffers = [pickled] + buffers
+            chunk_size = (
+                self._proxy_config.stream_chunk_size_bytes
+                or _DEFAULT_STREAM_CHUNK_SIZE_BYTES
+            )
+            response = self._call_with_backoff(
+                lambda: self._stubs[dest_party].SendDataStream(
+                    _iter_stream_chunks(
+                        seq_id,
+                        self._job_name,
+                        buffers,
+                        chunk_size,
+                        encoded,
+                        self._party,
+                    ),
+                    metadata=self._grpc_metadata,
+                    timeout=timeout,
+                )
+            )
         logger.debug(
             f'Received data response from {dest_party} seq id {seq_id}, '
             f'code: {response.code}, result: {response.result}.'
         )
+        self._check_response(response)
+        return True
 
+    def _call_with_backoff(
+        self, call: Callable[[], fed_pb2.SfFedProxySendDataResponse]
+    ) -> fed_pb2.SfFedProxySendDataResponse:
+        """Call and retry with exponential backoff while the receiver is busy."""
+        deadline = time.monotonic() + self._proxy_config.timeout_in_ms / 1000
+        backoff = _BUSY_INITIAL_BACKOFF_S
+        while True:
+            response = call()
+            if response.code != _BUSY_CODE or time.monotonic() + backoff > deadline:
+                return response
+            time.sleep(backoff)
+            backoff = min(backoff * 2, _BUSY_MAX_BACKOFF_S)
+
+    def _check_response(self, response: fed_pb2.SfFedProxySendDataResponse):
         if 400 <= response.code < 500:
             logger.warning(
                 f"Request was successfully sent but got error response, "
@@ -361,4 +766,29 @@ class GrpcProxy(SenderReceiverProxy, fed_pb2_grpc.SfFedProxyServicer):
             )
             raise RuntimeError(response.result)
 
-        return True
+    def _send_batch(self, dest_party: str, items: List[fed_pb2.SfFedProxySendData]):
+        timeout = self._proxy_config.timeout_in_ms / 1000
+        if len(items) == 1:
+            request = items[0]
+            request.job_name = self._job_name
+            request.src_party = self._party
+            response = self._call_with_backoff(
+                lambda: self._stubs[dest_party].SendData(
+                    request, metadata=self._grpc_metadata, timeout=timeout
+                )
+            )
+        else:
+            request = fed_pb2.SfFedProxySendDataBatch(
+                job_name=self._job_name, items=items, src_party=self._party
+            )
+            response = self._call_with_backoff(
+                lambda: self._stubs[dest_party].SendDataBatch(
+                    request, metadata=self._grpc_metadata, timeout=timeout
+                )
+            )
+        logger.debug(
+            f'Received data batch response from {dest_party}, '
+            f'seq ids {[item.seq_id for item in items]}, '
+            f'code: {response.code}, result: {response.result}.'
+        )
+        self._check_response(response)
@@ -0,0 +1,221 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from enum import Enum, unique
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@unique
+class BufferTier(Enum):
+    MEMORY = 'memory'
+    DISK = 'disk'
+
+
+@dataclass
+class _Entry:
+    src_party: str
+    tier: BufferTier
+    nbytes: int
+    encoded: bool
+    # buffers of memory tier.
+    buffers: Optional[List[bytes]] = None
+    # spill file and sizes of buffers in it of disk tier.
+    path: Optional[str] = None
+    sizes: Optional[List[int]] = None
+
+
+class ReceiveBuffer:
+    def __init__(
+        self,
+        memory_budget_bytes: Optional[int] = None,
+        spill_budget_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        """Buffer of received but not yet consumed messages.
+
+        Messages are kept in memory within memory_budget_bytes, and spilled to
+        files under spill_dir within spill_budget_bytes. The spilled messages
+        are memory-mapped lazily when popped. If both tiers are full, the
+        sender should be told to retry later.
+
+        Args:
+            memory_budget_bytes: Optional. The memory budget, None means unbounded.
+            spill_budget_bytes: Optional. The disk budget, None or 0 disables spilling.
+            spill_dir: Optional. The parent directory of spill files, the system
+                temp directory by default.
+        """
+        self._memory_budget = memory_budget_bytes
+        self._spill_budget = spill_budget_bytes or 0
+        self._spill_parent_dir = spill_dir
+        self._spill_dir = None
+
+        self._lock = threading.Lock()
+        self._entries: Dict[int, _Entry] = {}
+        self._memory_bytes = 0
+        self._spilled_bytes = 0
+
+    def _tier_of(self, nbytes: int, force: bool) -> Optional[BufferTier]:
+        if (
+            self._memory_budget is None
+            or self._memory_bytes + nbytes <= self._memory_budget
+        ):
+            return BufferTier.MEMORY
+        if self._spill_budget and self._spilled_bytes + nbytes <= self._spill_budget:
+            return BufferTier.DISK
+        if force:
+            # never refuse a message which is being waited for, otherwise the
+            # receiver may deadlock.
+            return BufferTier.DISK if self._spill_budget else BufferTier.MEMORY
+        return None
+
+    def reserve(self, nbytes: int, force: bool = False) -> Optional[BufferTier]:
+        """Reserve space of nbytes.
+
+        Args:
+            nbytes: size of the message.
+            force: reserve even if both tiers are full.
+
+        Returns:
+            The tier to put the message, None if both tiers are full.
+        """
+        with self._lock:
+            tier = self._tier_of(nbytes, force)
+            if tier == BufferTier.MEMORY:
+                self._memory_bytes += nbytes
+            elif tier == BufferTier.DISK:
+                self._spilled_bytes += nbytes
+            return tier
+
+    def release(self, tier: BufferTier, nbytes: int):
+        """Release a reservation which is not put."""
+        with self._lock:
+            self._release(tier, nbytes)
+
+    def _release(self, tier: BufferTier, nbytes: int):
+        if tier == BufferTier.MEMORY:
+            self._memory_bytes -= nbytes
+        else:
+            self._spilled_bytes -= nbytes
+
+    def open_spill_file(self) -> Tuple[str, BinaryIO]:
+        with self._lock:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(
+                    prefix='sf_fed_recv_', dir=self._spill_parent_dir
+                )
+        fd, path = tempfile.mkstemp(dir=self._spill_dir)
+        return path, os.fdopen(fd, 'wb')
+
+    def put(
+        self,
+        seq_id: int,
+        src_party: str,
+        tier: BufferTier,
+        buffers: List[bytes],
+        encoded: bool,
+    ):
+        """Put a reserved message."""
+        nbytes = sum(len(buf) for buf in buffers)
+        if tier == BufferTier.MEMORY:
+            entry = _Entry(src_party, tier, nbytes, encoded, buffers=buffers)
+        else:
+            path, f = self.open_spill_file()
+            with f:
+                for buf in buffers:
+                    f.write(buf)
+            entry = _Entry(
+                src_party,
+                tier,
+                nbytes,
+                encoded,
+                path=path,
+                sizes=[len(buf) for buf in buffers],
+            )
+            logger.debug(f'Spilled seq id {seq_id} of {nbytes} bytes to {path}')
+        with self._lock:
+            self._entries[seq_id] = entry
+
+    def put_spilled(
+        self,
+        seq_id: int,
+        src_party: str,
+        path: str,
+        sizes: List[int],
+        encoded: bool,
+    ):
+        """Put a reserved message which is written to a spill file already."""
+        entry = _Entry(
+            src_party, BufferTier.DISK, sum(sizes), encoded, path=path, sizes=sizes
+        )
+        with self._lock:
+            self._entries[seq_id] = entry
+
+    def pop(self, seq_id: int) -> Tuple[List[bytes], bool]:
+        """Pop a message.
+
+        Returns:
+            The buffers and whether they are encoded. Buffers of spilled
+            messages are copy-on-write memory maps of the spill file.
+        """
+        with self._lock:
+            entry = self._entries.pop(seq_id)
+            self._release(entry.tier, entry.nbytes)
+        if entry.tier == BufferTier.MEMORY:
+            return entry.buffers, entry.encoded
+
+        buffers = []
+        with open(entry.path, 'rb') as f:
+            if entry.nbytes:
+                view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+            offset = 0
+            for size in entry.sizes:
+                buffers.append(view[offset : offset + size] if size else bytearray())
+                offset += size
+        # the mapping is still valid after the file is removed.
+        os.remove(entry.path)
+        return buffers, entry.encoded
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-peer gauges of buffered messages and bytes."""
+        stats = {}
+        with self._lock:
+            for entry in self._entries.values():
+                peer = stats.setdefault(
+                    entry.src_party,
+                    {'messages': 0, 'memory_bytes': 0, 'spilled_bytes': 0},
+                )
+                peer['messages'] += 1
+                if entry.tier == BufferTier.MEMORY:
+                    peer['memory_bytes'] += entry.nbytes
+                else:
+                    peer['spilled_bytes'] += entry.nbytes
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+            self._spilled_bytes = 0
+            if self._spill_dir is not None:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
@@ -94,6 +94,16 @@ class SFOpContext:
     ):
         return self._strategy.get(object_refs)
 
+    async def get_async(
+        self,
+        object_refs: Union[
+            FED_OBJECT_TYPES,
+            List[FED_OBJECT_TYPES],
+            Union[object, List[object]],
+        ],
+    ):
+        return await self._strategy.get_async(object_refs)
+
     def kill(self, actor, *, no_restart=True):
         return self._strategy.kill(actor, no_restart=no_restart)
 
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import logging
 import multiprocessing
 from abc import ABC, abstractmethod
@@ -43,6 +44,18 @@ class SFOpStrategy(ABC):
     ):
         pass
 
+    async def get_async(
+        self,
+        object_refs: Union[
+            FED_OBJECT_TYPES,
+            List[FED_OBJECT_TYPES],
+            Union[object, List[object]],
+        ],
+    ):
+        # get blocks, run it in the executor to not block the event loop.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get, object_refs)
+
     @abstractmethod
     def kill(self, actor, *, no_restart=True):
         pass
@@ -99,6 +112,7 @@ class ProdStrategy(SFOpStrategy):
         cross_silo_comm_backend,
         logging_level,
         job_name,
+        fed_runtime,
     ):
         self_party, all_parties = get_cluster_config(cluster_config)
         if tls_config:
@@ -109,6 +123,7 @@ class ProdStrategy(SFOpStrategy):
             'cross_silo_comm': cross_silo_comm_options,
             'barrier_on_initializing': enable_waiting_for_other_parties_ready,
             'cross_silo_comm_backend': cross_silo_comm_backend,
+            'runtime': fed_runtime,
         }
 
         addresses = {}
@@ -136,6 +151,7 @@ class ProdStrategy(SFOpStrategy):
         cross_silo_comm_backend = kwargs.pop("cross_silo_comm_backend", "grpc")
         logging_level = kwargs.pop("logging_level", "info")
         job_name = kwargs.pop("job_name", None)
+        fed_runtime = kwargs.pop("fed_runtime", "thread")
         self._init_sf_fed(
             cluster_config,
             tls_config,
@@ -144,6 +160,7 @@ class ProdStrategy(SFOpStrategy):
             cross_silo_comm_backend,
             logging_level,
             job_name,
+            fed_runtime,
         )
 
     def remote(self, *args, **kwargs):
@@ -159,6 +176,16 @@ class ProdStrategy(SFOpStrategy):
     ):
         return sf_fed.get(object_refs)
 
+    async def get_async(
+        self,
+        object_refs: Union[
+            FED_OBJECT_TYPES,
+            List[FED_OBJECT_TYPES],
+            Union[object, List[object]],
+        ],
+    ):
+        return await sf_fed.get_async(object_refs)
+
     def kill(self, actor, *, no_restart=True):
         pass
 
@@ -61,6 +61,16 @@ def get(
     return _sf_op_context.get(object_refs)
 
 
+async def get_async(
+    object_refs: Union[
+        FED_OBJECT_TYPES,
+        List[FED_OBJECT_TYPES],
+        Union[object, List[object]],
+    ]
+):
+    return await _sf_op_context.get_async(object_refs)
+
+
 def kill(actor, *, no_restart=True):
     return _sf_op_context.kill(actor, no_restart=no_restart)
 
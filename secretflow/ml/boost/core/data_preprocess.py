@@ -60,7 +60,6 @@ def validate(
     dataset, label
 ) -> Tuple[FedNdarray, Tuple[int, int], PYUObject, Tuple[int, int]]:
     x, x_shape = prepare_dataset(dataset)
-    y, y_shape = prepare_dataset(label)
     assert len(x_shape) == 2, "only support 2D-array on dtrain"
 
     data_check_task = [
@@ -78,17 +77,24 @@ def validate(
     for device in to_remove_devices:
         x.partitions.pop(device)
 
+    y, y_shape = validate_label(label)
+    assert y_shape[0] == x_shape[0], "dtrain & label are not aligned"
+    wait(data_check_task)
+    return x, x_shape, y, y_shape
+
+
+def validate_label(label) -> Tuple[PYUObject, Tuple[int, int]]:
+    """check label and get it as a PYUObject of shape (samples, 1)."""
+    y, y_shape = prepare_dataset(label)
     assert len(y_shape) == 1 or y_shape[1] == 1, "label only support one label col"
     samples = y_shape[0]
-    assert samples == x_shape[0], "dtrain & label are not aligned"
     assert len(y.partitions) == 1, "label only support one partition"
     # get y as a PYUObject
     y = list(y.partitions.values())[0]
     y = y.device(lambda y: y.reshape(-1, 1, order='F'))(y)
     y_shape = (samples, 1)
     assert samples > 0, "cannot have empty samples"
-    wait(data_check_task)
-    return x, x_shape, y, y_shape
+    return y, y_shape
 
 
 def validate_tweedie_label(y: PYUObject):
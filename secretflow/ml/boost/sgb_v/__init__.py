@@ -15,6 +15,7 @@
 from .core.params import SGBParams, get_classic_lightGBM_params, get_classic_XGB_params
 from .factory import SGBFactory as Sgb
 from .model import SgbModel
+from .row_blocks import RowBlocks, VTableRowBlocks
 
 __all__ = [
     'SgbModel',
@@ -22,4 +23,6 @@ __all__ = [
     'get_classic_lightGBM_params',
     'get_classic_XGB_params',
     'SGBParams',
+    'RowBlocks',
+    'VTableRowBlocks',
 ]
@@ -11,18 +11,24 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Dict
+from typing import Dict, List
 
 import numpy as np
 
-from secretflow.device import PYU, PYUObject, reveal
+from secretflow.device import PYU, PYUObject, reveal, wait
 
 from ...core.pure_numpy_ops.node_select import (
     packbits_node_selects,
     unpack_node_select_lists,
 )
-from ..pure_numpy_ops.pred import predict_tree_weight
+from ..pure_numpy_ops.pred import (
+    PREDICT_BLOCK_ROWS,
+    PREDICT_MAX_INFLIGHT,
+    predict_tree_weight,
+    predict_trees_weight_from_bitsets,
+)
 from .split_tree import from_dict as split_tree_from_dict
+from .split_tree import predict_leaf_bitsets
 
 
 class DistributedTree:
@@ -67,17 +73,33 @@ class DistributedTree:
         Returns:
             PYUObject: _description_
         """
-        assert self.label_holder is not None, "label holder must exist"
         assert len(self.split_tree_dict) > 0, "number of split tree must be not empty"
+        return self.predict_with_leaf_selects(
+            {
+                pyu: pyu(lambda split_tree, x: split_tree.predict_leaf_select(x))(
+                    split_tree, x[pyu].data
+                )
+                for pyu, split_tree in self.split_tree_dict.items()
+                if pyu in x
+            }
+        )
+
+    def predict_with_leaf_selects(
+        self, leaf_selects: Dict[PYU, PYUObject]
+    ) -> PYUObject:
+        """predict using leaf selects of split trees, e.g. computed from order maps in training.
+
+        Args:
+            leaf_selects (Dict[PYU, PYUObject]): {party: leaf selects of party's split tree}
+
+        Returns:
+            PYUObject: predict at label holder.
+        """
+        assert self.label_holder is not None, "label holder must exist"
 
         shape = None
         weight_selects = list()
-        for pyu, split_tree in self.split_tree_dict.items():
-            if pyu not in x:
-                continue
-            s = pyu(lambda split_tree, x: split_tree.predict_leaf_select(x))(
-                split_tree, x[pyu].data
-            )
+        for pyu, s in leaf_selects.items():
             if self.enable_packbits and pyu == self.label_holder:
                 shape = pyu(lambda x: x[0].shape)(s)
             if self.enable_packbits:
@@ -142,3 +164,65 @@ def from_dict(tree_content: Dict) -> DistributedTree:
     dt.leaf_weight = dt.label_holder(np.array)(tree_content['leaf_weight'])
     dt.partition_column_counts = tree_content['partition_column_counts']
     return dt
+
+
+def predict_trees(
+    trees: List[DistributedTree],
+    x: Dict[PYU, PYUObject],
+    block_rows: int = PREDICT_BLOCK_ROWS,
+    max_inflight: int = PREDICT_MAX_INFLIGHT,
+) -> PYUObject:
+    """predict using all trees at once, returns the sum of tree predicts.
+    Rows are predicted block by block. For each block, each party evaluates all its
+    split trees in one task and sends packed leaf selects, then label holder combines
+    them for all trees. At most max_inflight blocks are sent before their preds are done.
+
+    Args:
+        trees (List[DistributedTree]): trees with the same label holder.
+        x (Dict[PYU, PYUObject]): partitions of FedNdarray. {party: party's partition}
+        block_rows (int): rows of a block, bounds the memory of leaf selects.
+        max_inflight (int): max blocks in flight.
+
+    Returns:
+        PYUObject: sum of tree predicts at label holder.
+    """
+    assert len(trees) > 0, "number of trees must be not empty"
+    assert block_rows > 0, f"block_rows should > 0, got {block_rows}"
+    assert max_inflight > 0, f"max_inflight should > 0, got {max_inflight}"
+    label_holder = trees[0].label_holder
+    assert label_holder is not None, "label holder must exist"
+
+    split_trees_each_party = {}
+    for i, tree in enumerate(trees):
+        assert tree.label_holder == label_holder, "trees must share the label holder"
+        for pyu, split_tree in tree.split_tree_dict.items():
+            if pyu not in x:
+                continue
+            split_trees, tree_indices = split_trees_each_party.setdefault(pyu, ([], []))
+            split_trees.append(split_tree)
+            tree_indices.append(i)
+
+    assert len(x) > 0, "x must be not empty"
+    pyu, data = next(iter(x.items()))
+    samples = reveal(pyu(lambda d: len(d))(data.data))
+    weights = [tree.leaf_weight for tree in trees]
+
+    preds = []
+    for start in range(0, max(samples, 1), block_rows):
+        end = min(start + block_rows, samples)
+        if len(preds) >= max_inflight:
+            # bounds the bitsets held by label holder.
+            wait([preds[-max_inflight]])
+        bitsets_each_party = []
+        tree_indices_each_party = []
+        for pyu, (split_trees, tree_indices) in split_trees_each_party.items():
+            bitsets = pyu(predict_leaf_bitsets)(split_trees, x[pyu].data, start, end)
+            bitsets_each_party.append(bitsets.to(label_holder))
+            tree_indices_each_party.append(tree_indices)
+        preds.append(
+            label_holder(predict_trees_weight_from_bitsets)(
+                bitsets_each_party, tree_indices_each_party, weights, end - start
+            )
+        )
+
+    return label_holder(lambda *preds: np.concatenate(preds, axis=0))(*preds)
@@ -109,6 +109,24 @@ def from_dict(dict: Dict) -> SplitTree:
     return s
 
 
+def predict_leaf_bitsets(
+    split_trees: List[SplitTree], x: np.ndarray, start: int, end: int
+) -> List[np.ndarray]:
+    """
+    compute leaf nodes' sample selects of split trees in packed bits,
+    only for rows [start, end) of x.
+
+    Return:
+        packed leaf selects of each tree, with shape (end - start, ceil(leaves / 8)).
+    """
+    x = x if isinstance(x, np.ndarray) else np.array(x)
+    x = x[start:end]
+    return [
+        np.packbits(split_tree.predict_leaf_select(x), axis=1)
+        for split_tree in split_trees
+    ]
+
+
 def is_left_node(node_index: int) -> bool:
     """judge if a node is left node or right node from index
     root is view as left.
@@ -110,6 +110,22 @@ class SGBParams:
         default: level-wise
     'enable_packbits': bool. if true, turn on packbits transmission.
         default: False
+    'out_of_core_dir': str. if not empty, each party stores its order map as a memory-mapped
+        file under this local directory, and bucket sums are computed block by block.
+        default: ''
+    'out_of_core_block_rows': int. number of rows of a block when training out of core.
+        default: 262144
+        range: [1, 2**31 - 1]
+    'bucket_sum_cache_max_nodes': int. maximum number of nodes whose encrypted bucket sums are cached
+        by each party, so that the bucket sums of the larger child are derived by subtracting
+        the smaller child from its parent. Least recently used nodes are evicted beyond it,
+        and both children of an evicted node are computed directly. 0 means no limit.
+        default: 0
+        range: [0, 2**31 - 1]
+    'enable_node_id_vector': bool. if true, samples are tracked by a single node id vector
+        instead of one 0/1 select per node, which reduces the per level memory and transmission
+        from O(nodes * samples) to O(samples). Only effective if tree growing method is level-wise.
+        default: False
     'eval_metric': str. evaluation metric name, must be one of 'roc_auc', 'tweedie_deviance', 'tweedie_nll', 'mse' or 'rmse'.
         'tweedie_nll' means tweedie negative log likelihood.
         Note if objective is not logistic, auc may not work.
@@ -166,6 +182,10 @@ class SGBParams:
     base_score: float = 0.0
     tree_growing_method: TreeGrowingMethod = TreeGrowingMethod.LEVEL
     enable_packbits: bool = False
+    enable_node_id_vector: bool = False
+    out_of_core_dir: str = ''
+    out_of_core_block_rows: int = 262144
+    bucket_sum_cache_max_nodes: int = 0
 
     # callback params
     eval_metric: str = 'roc_auc'
@@ -224,6 +244,8 @@ numeric_params_range = {
     'stopping_tolerance': (0, np.inf, True, False),
     'tweedie_variance_power': (1, 2, False, False),
     'base_score': (-10, 10, True, True),
+    'out_of_core_block_rows': (1, 2**31 - 1, True, True),
+    'bucket_sum_cache_max_nodes': (0, 2**31 - 1, True, True),
 }
 
 categorical_params_options = {
@@ -44,6 +44,27 @@ def compute_weight_from_node_select(
     return compute_weight(g_sum, h_sum, reg_lambda, learning_rate)
 
 
+def compute_weight_from_node_ids(
+    node_ids: np.ndarray,
+    node_indices: List[int],
+    g: np.ndarray,
+    h: np.ndarray,
+    reg_lambda: float,
+    learning_rate: float,
+) -> np.ndarray:
+    """compute weights of nodes, every sample must be in one of node_indices."""
+    node_indices = np.asarray(node_indices)
+    order = np.argsort(node_indices)
+    positions = order[np.searchsorted(node_indices[order], node_ids)]
+    node_num = node_indices.size
+    g_sum = np.bincount(positions, weights=g.reshape(-1), minlength=node_num)
+    h_sum = np.bincount(positions, weights=h.reshape(-1), minlength=node_num)
+
+    return compute_weight(
+        g_sum.reshape(-1, 1), h_sum.reshape(-1, 1), reg_lambda, learning_rate
+    )
+
+
 def compute_weight(
     G: float, H: float, reg_lambda: float, learning_rate: float
 ) -> np.ndarray:
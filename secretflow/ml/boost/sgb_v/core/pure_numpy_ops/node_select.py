@@ -73,11 +73,95 @@ def get_child_select(
     return childs_s, node_indices, pruned_s, pruned_node_indices
 
 
+def root_node_ids(samples: int) -> np.ndarray:
+    """all samples are in the root node 0."""
+    return np.zeros(samples, dtype=np.int32)
+
+
+def partition_by_node_ids(
+    node_ids: np.ndarray, node_indices: List[int]
+) -> List[np.ndarray]:
+    """
+    group sample indices by node ids.
+
+    Args:
+        node_ids: np.ndarray. shape (n_samples,), node index of each sample.
+        node_indices: List[int]. nodes to group samples for.
+
+    Returns:
+        sorted sample indices of each node in node_indices.
+    """
+    order = np.argsort(node_ids, kind='stable')
+    sorted_ids = node_ids[order]
+    node_indices = np.asarray(node_indices, dtype=node_ids.dtype)
+    starts = np.searchsorted(sorted_ids, node_indices, side='left')
+    ends = np.searchsorted(sorted_ids, node_indices, side='right')
+    return [order[start:end] for start, end in zip(starts, ends)]
+
+
+def get_child_node_ids(
+    node_ids: np.ndarray,
+    lchild_masks: List[np.ndarray],
+    gain_is_cost_effective: List[bool],
+    split_node_indices: List[int],
+) -> Tuple[np.ndarray, List[int], List[int]]:
+    """
+    compute the next level's node ids of samples, and node indices
+
+    Args:
+        node_ids: np.ndarray. shape (n_samples,), node index of each sample.
+        lchild_masks: party wise 0/1 masks with shape (n_samples,).
+            1 indicates the sample goes to the left child of a node split by the party.
+        gain_is_cost_effective: List[bool]. indicate whether node should be split.
+        split_node_indices: List[int]. node indices at the current level.
+
+    Returns:
+        node ids of samples for the next level, samples in pruned nodes keep their ids.
+        node indices for the next level
+        node indices for the pruned nodes
+    """
+    node_indices = []
+    pruned_node_indices = []
+    split_indices = []
+    for node_index, gain in zip(split_node_indices, gain_is_cost_effective):
+        if not gain:
+            pruned_node_indices.append(node_index)
+            continue
+        split_indices.append(node_index)
+        l_index = 2 * node_index + 1
+        node_indices.extend([l_index, l_index + 1])
+
+    if len(split_indices) == 0:
+        return node_ids, node_indices, pruned_node_indices
+
+    # each node is split by exactly one party, masks of others are 0 at its samples.
+    is_left = np.zeros(node_ids.shape, dtype=bool)
+    for mask in lchild_masks:
+        is_left |= mask.astype(bool).reshape(node_ids.shape)
+    in_split = np.isin(node_ids, split_indices)
+    child_ids = 2 * node_ids + 2 - is_left
+    return (
+        np.where(in_split, child_ids, node_ids).astype(node_ids.dtype),
+        node_indices,
+        pruned_node_indices,
+    )
+
+
 # TODO(zoupeicheng.zpc): These functions are experimental.
 # improve efficiency of packing and unpacks by parallelization or other encoding method
 # currently it is slow
 
 
+def pick_by_node_indices(
+    node_selects: List[np.ndarray],
+    node_indices: List[int],
+    picked_node_indices: List[int],
+) -> List[np.ndarray]:
+    """pick the sample selects of picked_node_indices from node_selects of node_indices."""
+    positions = {node_index: i for i, node_index in enumerate(node_indices)}
+    return [node_selects[positions[node_index]] for node_index in picked_node_indices]
+
+
 def packbits_node_selects(node_selects: List[np.ndarray]) -> List[np.ndarray]:
     return [np.packbits(node_select) for node_select in node_selects]
 
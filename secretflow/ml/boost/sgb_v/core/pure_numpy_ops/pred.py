@@ -17,6 +17,11 @@ from typing import List
 
 import numpy as np
 
+# rows of a block in batched prediction, bounds the memory of leaf selects.
+PREDICT_BLOCK_ROWS = 65536
+# blocks in flight in batched prediction.
+PREDICT_MAX_INFLIGHT = 2
+
 
 def init_pred(base: float, samples: int) -> np.ndarray:
     shape = (samples, 1)
@@ -47,3 +52,37 @@ def predict_tree_weight(selects: List[np.ndarray], weights: np.ndarray) -> np.nd
         select.shape[1] == weights.shape[0]
     ), f"select {select.shape}, weights {weights.shape}"
     return np.matmul(select, weights).reshape((select.shape[0]), 1)
+
+
+def predict_trees_weight_from_bitsets(
+    bitsets_each_party: List[List[np.ndarray]],
+    tree_indices_each_party: List[List[int]],
+    weights: List[np.ndarray],
+    samples: int,
+) -> np.ndarray:
+    """
+    get sum of preds of all trees for a block of samples.
+
+    Args:
+        bitsets_each_party: party wise. packed leaf selects of the trees known by the party,
+            each with shape (samples, ceil(leaves / 8)).
+        tree_indices_each_party: party wise. which trees the bitsets belong to.
+        weights: leaf weights of each tree.
+        samples: number of samples in the block.
+
+    Return:
+        pred
+    """
+    bitsets_each_tree = [[] for _ in weights]
+    for bitsets, tree_indices in zip(bitsets_each_party, tree_indices_each_party):
+        for bitset, tree_index in zip(bitsets, tree_indices):
+            bitsets_each_tree[tree_index].append(bitset)
+    pred = np.zeros((samples, 1))
+    for bitsets, weight in zip(bitsets_each_tree, weights):
+        # get final leaf selects based on collective information,
+        # a tree without any bitset selects all leaves.
+        all_leaves = np.packbits(np.ones((samples, weight.shape[0]), np.uint8), axis=1)
+        bitset = reduce(np.bitwise_and, bitsets, all_leaves)
+        select = np.unpackbits(bitset, axis=1, count=weight.shape[0])
+        pred += np.matmul(select, weight).reshape(-1, 1)
+    return pred
@@ -15,7 +15,7 @@
 import copy
 import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Sequence, Tuple, Union
 
 import numpy as np
@@ -39,6 +39,7 @@ from secretflow.ml.boost.sgb_v.checkpoint import (
 from secretflow.ml.boost.sgb_v.core.params import default_params
 
 from ...model import SgbModel
+from ...row_blocks import RowBlocks
 from ..components import DataPreprocessor, ModelBuilder, OrderMapManager, TreeTrainer
 from ..components.component import (
     Composite,
@@ -53,9 +54,9 @@ from ..sgb_actor import SGBActor
 
 @dataclass
 class GlobalOrdermapBoosterComponents:
-    preprocessor: DataPreprocessor = DataPreprocessor()
-    order_map_manager: OrderMapManager = OrderMapManager()
-    model_builder: ModelBuilder = ModelBuilder()
+    preprocessor: DataPreprocessor = field(default_factory=DataPreprocessor)
+    order_map_manager: OrderMapManager = field(default_factory=OrderMapManager)
+    model_builder: ModelBuilder = field(default_factory=ModelBuilder)
 
 
 @dataclass
@@ -133,7 +134,7 @@ class GlobalOrdermapBooster(Composite, CallBackCompatibleModel):
 
     def fit(
         self,
-        dataset: Union[FedNdarray, VDataFrame],
+        dataset: Union[FedNdarray, VDataFrame, RowBlocks],
         label: Union[FedNdarray, VDataFrame],
         callbacks: List[TrainingCallback] = [],
         eval_sets: List[Tuple[VData, VData, str]] = [],
@@ -155,7 +156,24 @@ class GlobalOrdermapBooster(Composite, CallBackCompatibleModel):
             eval_sets
         ), f"Each data_name in evals must be unique, got {data_names}"
         self.eval_predict_cache = {data_name: None for data_name in data_names}
-        if sfd.in_ic_mode():
+        blocks = dataset if isinstance(dataset, RowBlocks) else None
+        if blocks is not None:
+            assert not sfd.in_ic_mode(), "row blocks are not supported in ic mode"
+            assert (
+                checkpoint_data is None
+            ), "checkpoint is not supported when dataset is read by row blocks"
+            assert (
+                len(eval_sets) == 0
+            ), "eval sets are not supported when dataset is read by row blocks"
+            x = None
+            y, y_shape, sample_weight_object = (
+                self.components.preprocessor.validate_label(
+                    label, sample_weight=sample_weight
+                )
+            )
+            sample_num = y_shape[0]
+            workers = blocks.devices
+        elif sfd.in_ic_mode():
             x = dataset
             y = list(label.partitions.values())[0]
             sample_weight_object = (
@@ -172,8 +190,10 @@ class GlobalOrdermapBooster(Composite, CallBackCompatibleModel):
                 )
             )
             sample_num = x_shape[0]
+        if blocks is None:
+            workers = [*x.partitions.keys()]
         # set devices
-        devices = Devices(y.device, [*x.partitions.keys()], self.heu)
+        devices = Devices(y.device, workers, self.heu)
         self.devices = devices
         actors = [SGBActor(device=device) for device in devices.workers]
         if not label_have_feature(devices):
@@ -193,7 +213,14 @@ class GlobalOrdermapBooster(Composite, CallBackCompatibleModel):
 
         pred = self.components.model_builder.init_pred(sample_num, checkpoint_model, x)
         logging.debug("pred initialized.")
-        self.components.order_map_manager.build_order_map(x)
+        if blocks is None:
+            self.components.order_map_manager.build_order_map(x)
+        else:
+            # x is never fully resident, order maps take its place in training.
+            x = self.components.order_map_manager.build_order_map_from_blocks(blocks)
+            assert (
+                x.shape[0] == sample_num
+            ), f"dtrain & label are not aligned, {x.shape[0]} != {sample_num}"
         logging.debug("ordermap built.")
         self.components.model_builder.init_model(checkpoint_model)
         logging.debug("model initialized.")
@@ -233,8 +260,14 @@ class GlobalOrdermapBooster(Composite, CallBackCompatibleModel):
             cur_tree_num = self.components.model_builder.get_tree_num()
 
             if cur_tree_num < self.params.num_boost_round:
+                if blocks is None:
+                    tree_pred = tree.predict(x.partitions)
+                else:
+                    tree_pred = tree.predict_with_leaf_selects(
+                        self.components.order_map_manager.predict_leaf_selects(tree)
+                    )
                 pred = y.device(lambda x, y: x + np.array(y, order='F'))(
-                    pred, tree.predict(x.partitions)
+                    pred, tree_pred
                 )
                 wait([pred])
             else:
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from .bucket_sum_calculator import BucketSumCalculator
-from .cache import LevelWiseCache
+from .cache import NodeWiseCache
 from .data_preprocessor import DataPreprocessor
 from .gradient_encryptor import GradientEncryptor
 from .leaf_manager import LeafManager
@@ -37,7 +37,7 @@ __all__ = [
     'LossComputer',
     'TreeTrainer',
     'NodeSelector',
-    'LevelWiseCache',
+    'NodeWiseCache',
     'Shuffler',
     'BucketSumCalculator',
     'SplitFinder',
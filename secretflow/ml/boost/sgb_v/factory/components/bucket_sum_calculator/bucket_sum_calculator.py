@@ -14,7 +14,7 @@
 
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 
 from secretflow.data import FedNdarray
 from secretflow.device import PYU, HEUObject, PYUObject
@@ -25,9 +25,10 @@ from ....core.pure_numpy_ops.bucket_sum import regroup_bucket_sums
 from ....core.pure_numpy_ops.grad import split_GH
 from ....core.pure_numpy_ops.node_select import (
     packbits_node_selects,
+    pick_by_node_indices,
     unpackbits_node_selects,
 )
-from ..cache.level_wise_cache import LevelWiseCache
+from ..cache.node_wise_bucket_sum_cache import NodeWiseCache
 from ..component import (
     Composite,
     Devices,
@@ -55,7 +56,7 @@ class BucketSumCalculatorParams:
 
 @dataclass
 class BucketSumCalculatorComponents:
-    level_wise_cache: LevelWiseCache = LevelWiseCache()
+    node_wise_cache: NodeWiseCache = NodeWiseCache()
 
 
 class BucketSumCalculator(Composite):
@@ -67,14 +68,17 @@ class BucketSumCalculator(Composite):
     def show_params(self):
         print_params(self.logging_params)
         print_params(self.params)
+        self.components.node_wise_cache.show_params()
 
     def set_params(self, params: dict):
         LoggingTools.logging_params_from_dict(params, self.logging_params)
         set_params_from_dict(self.params, params)
+        self.components.node_wise_cache.set_params(params)
 
     def get_params(self, params: dict):
         LoggingTools.logging_params_write_dict(params, self.logging_params)
         set_dict_from_params(self.params, params)
+        self.components.node_wise_cache.get_params(params)
 
     def set_devices(self, devices: Devices):
         super().set_devices(devices)
@@ -95,47 +99,123 @@ class BucketSumCalculator(Composite):
         shuffler: Shuffler,
         encrypted_gh_dict: Dict[PYU, HEUObject],
         children_split_node_selects: PYUObject,  # inner type is List[np.array]
-        is_lefts: List[bool],
+        selected_children_node_indices: List[int],
+        children_node_indices: List[int],
         order_map_sub: FedNdarray,
         bucket_num: int,
         bucket_lists: List[PYUObject],
         gradient_encryptor: GradientEncryptor,
-        node_num: int,
         node_select_shape: Tuple[int, int],
+        block_rows: int = None,
     ) -> Tuple[PYUObject, PYUObject]:
-        bucket_sums_list = [[] for _ in range(self.party_num)]
-        bucket_num_plus_one = bucket_num + 1
-        shuffler.reset_shuffle_masks()
-        self.components.level_wise_cache.reset_level_caches()
+        """calculate bucket sums of all nodes in the level.
+
+        Only the selected child (the one with fewer samples) of each pair is computed directly,
+        the other one is derived from the cached bucket sums of the parent,
+        unless the parent has been evicted from the cache.
+        """
+        computed_node_indices = self.components.node_wise_cache.nodes_to_compute(
+            selected_children_node_indices
+        )
+        computed_node_selects = self.label_holder(pick_by_node_indices)(
+            children_split_node_selects, children_node_indices, computed_node_indices
+        )
         enable = self.params.enable_packbits
         if enable:
-            children_split_node_selects_bits = self.label_holder(packbits_node_selects)(
-                children_split_node_selects
+            computed_node_selects_bits = self.label_holder(packbits_node_selects)(
+                computed_node_selects
             )
-        for i, worker in enumerate(self.workers):
-            if worker == self.label_holder and self.params.label_holder_feature_only:
-                effective_index = i
-            if worker != self.label_holder and self.params.label_holder_feature_only:
-                continue
 
+        def worker_bucket_sums(worker: PYU) -> HEUObject:
             if enable:
-                children_split_node_selects_worker = worker(unpackbits_node_selects)(
-                    children_split_node_selects_bits.to(worker),
+                computed_node_selects_worker = worker(unpackbits_node_selects)(
+                    computed_node_selects_bits.to(worker),
                     node_select_shape,
                 )
             else:
-                children_split_node_selects_worker = children_split_node_selects
+                computed_node_selects_worker = computed_node_selects
+
+            return encrypted_gh_dict[worker].batch_feature_wise_bucket_sum(
+                computed_node_selects_worker,
+                order_map_sub.partitions[worker],
+                bucket_num + 1,
+                True,
+                block_rows,
+            )
+
+        return self._calculate_level_nodes_GH(
+            shuffler,
+            worker_bucket_sums,
+            computed_node_indices,
+            children_node_indices,
+            bucket_lists,
+            gradient_encryptor,
+        )
+
+    @LoggingTools.enable_logging
+    def calculate_bucket_sum_level_wise_by_node_ids(
+        self,
+        shuffler: Shuffler,
+        encrypted_gh_dict: Dict[PYU, HEUObject],
+        node_ids: PYUObject,  # inner type is np.ndarray
+        selected_children_node_indices: List[int],
+        children_node_indices: List[int],
+        order_map_sub: FedNdarray,
+        bucket_num: int,
+        bucket_lists: List[PYUObject],
+        gradient_encryptor: GradientEncryptor,
+        block_rows: int = None,
+    ) -> Tuple[PYUObject, PYUObject]:
+        """same as calculate_bucket_sum_level_wise,
+        but samples of nodes are given by the node id vector of samples."""
+        computed_node_indices = self.components.node_wise_cache.nodes_to_compute(
+            selected_children_node_indices
+        )
 
-            bucket_sums = encrypted_gh_dict[worker].batch_feature_wise_bucket_sum(
-                children_split_node_selects_worker,
+        def worker_bucket_sums(worker: PYU) -> HEUObject:
+            return encrypted_gh_dict[worker].batch_feature_wise_bucket_sum_by_group_ids(
+                node_ids.to(worker),
+                computed_node_indices,
                 order_map_sub.partitions[worker],
-                bucket_num_plus_one,
+                bucket_num + 1,
                 True,
+                block_rows,
             )
-            self.components.level_wise_cache.collect_level_node_GH(
-                worker, bucket_sums, is_lefts
+
+        return self._calculate_level_nodes_GH(
+            shuffler,
+            worker_bucket_sums,
+            computed_node_indices,
+            children_node_indices,
+            bucket_lists,
+            gradient_encryptor,
+        )
+
+    def _calculate_level_nodes_GH(
+        self,
+        shuffler: Shuffler,
+        worker_bucket_sums: Callable[[PYU], HEUObject],
+        computed_node_indices: List[int],
+        children_node_indices: List[int],
+        bucket_lists: List[PYUObject],
+        gradient_encryptor: GradientEncryptor,
+    ) -> Tuple[PYUObject, PYUObject]:
+        bucket_sums_list = [[] for _ in range(self.party_num)]
+        node_num = len(children_node_indices)
+        shuffler.reset_shuffle_masks()
+        for i, worker in enumerate(self.workers):
+            if worker == self.label_holder and self.params.label_holder_feature_only:
+                effective_index = i
+            if worker != self.label_holder and self.params.label_holder_feature_only:
+                continue
+
+            bucket_sums = worker_bucket_sums(worker)
+            self.components.node_wise_cache.batch_collect_node_bucket_sums(
+                worker, computed_node_indices, bucket_sums
+            )
+            bucket_sums = self.components.node_wise_cache.batch_get_node_bucket_sum(
+                worker, children_node_indices
             )
-            bucket_sums = self.components.level_wise_cache.get_level_nodes_GH(worker)
             bucket_sums = [
                 bucket_sum[shuffler.create_shuffle_mask(i, j, bucket_lists[i])]
                 for j, bucket_sum in enumerate(bucket_sums)
@@ -164,10 +244,22 @@ class BucketSumCalculator(Composite):
         )(bucket_sums_list, node_num)
         return level_nodes_G, level_nodes_H
 
-    def update_level_cache(self, is_last_level, gain_is_cost_effective):
-        self.components.level_wise_cache.update_level_cache(
-            is_last_level, gain_is_cost_effective
-        )
+    def update_level_cache(
+        self,
+        is_last_level: bool,
+        children_node_indices: List[int],
+        gain_is_cost_effective: List[bool],
+    ):
+        # nodes of the last level or pruned nodes will never be split.
+        if is_last_level:
+            self.components.node_wise_cache.reset()
+            return
+        for node_index, gain_effective in zip(
+            children_node_indices, gain_is_cost_effective
+        ):
+            if not gain_effective:
+                self.components.node_wise_cache.reset_node(node_index)
+        self.components.node_wise_cache.evict()
 
     def reset_cache(self):
-        self.components.level_wise_cache.reset()
+        self.components.node_wise_cache.reset()
@@ -24,6 +24,7 @@ from ....core.pure_numpy_ops.bucket_sum import regroup_bucket_sums
 from ....core.pure_numpy_ops.grad import split_GH
 from ....core.pure_numpy_ops.node_select import (
     packbits_node_selects,
+    pick_by_node_indices,
     unpackbits_node_selects,
 )
 from ..cache.node_wise_bucket_sum_cache import NodeWiseCache
@@ -66,14 +67,17 @@ class LeafWiseBucketSumCalculator(Composite):
     def show_params(self):
         print_params(self.logging_params)
         print_params(self.params)
+        self.components.node_wise_cache.show_params()
 
     def set_params(self, params: dict):
         LoggingTools.logging_params_from_dict(params, self.logging_params)
         set_params_from_dict(self.params, params)
+        self.components.node_wise_cache.set_params(params)
 
     def get_params(self, params: dict):
         LoggingTools.logging_params_write_dict(params, self.logging_params)
         set_dict_from_params(self.params, params)
+        self.components.node_wise_cache.get_params(params)
 
     def set_devices(self, devices: Devices):
         super().set_devices(devices)
@@ -102,12 +106,27 @@ class LeafWiseBucketSumCalculator(Composite):
         gradient_encryptor: GradientEncryptor,
         node_num: int,
         node_select_shape: Tuple[int, int],
+        block_rows: int = None,
     ) -> Tuple[PYUObject, PYUObject]:
+        """calculate bucket sums of all children.
+
+        Only the selected child (the one with fewer samples) of each pair is computed directly,
+        the other one is derived from the cached bucket sums of the parent,
+        unless the parent has been evicted from the cache.
+        """
         bucket_sums_list = [[] for _ in range(self.party_num)]
         bucket_num_plus_one = bucket_num + 1
+        computed_node_indices = self.components.node_wise_cache.nodes_to_compute(
+            selected_children_node_indices
+        )
+        computed_node_selects = self.label_holder(pick_by_node_indices)(
+            children_split_node_selects,
+            all_children_node_indices,
+            computed_node_indices,
+        )
         if self.params.enable_packbits:
-            children_split_node_selects_bits = self.label_holder(packbits_node_selects)(
-                children_split_node_selects
+            computed_node_selects_bits = self.label_holder(packbits_node_selects)(
+                computed_node_selects
             )
 
         for i, worker in enumerate(self.workers):
@@ -117,22 +136,23 @@ class LeafWiseBucketSumCalculator(Composite):
                 continue
 
             if self.params.enable_packbits:
-                children_split_node_selects_worker = worker(unpackbits_node_selects)(
-                    children_split_node_selects_bits.to(worker),
+                computed_node_selects_worker = worker(unpackbits_node_selects)(
+                    computed_node_selects_bits.to(worker),
                     node_select_shape,
                 )
             else:
-                children_split_node_selects_worker = children_split_node_selects
+                computed_node_selects_worker = computed_node_selects
 
             bucket_sums = encrypted_gh_dict[worker].batch_feature_wise_bucket_sum(
-                children_split_node_selects_worker,
+                computed_node_selects_worker,
                 order_map_sub.partitions[worker],
                 bucket_num_plus_one,
                 True,
+                block_rows,
             )
 
             self.components.node_wise_cache.batch_collect_node_bucket_sums(
-                worker, selected_children_node_indices, bucket_sums
+                worker, computed_node_indices, bucket_sums
             )
             bucket_sums = self.components.node_wise_cache.batch_get_node_bucket_sum(
                 worker, all_children_node_indices
@@ -169,6 +189,7 @@ class LeafWiseBucketSumCalculator(Composite):
         for node_index, gain_effective in zip(all_node_indices, gain_is_cost_effective):
             if not gain_effective:
                 self.components.node_wise_cache.reset_node(node_index)
+        self.components.node_wise_cache.evict()
 
     def reset_cache(self):
         self.components.node_wise_cache.reset()
@@ -12,6 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .level_wise_cache import LevelWiseCache
+from .node_wise_bucket_sum_cache import NodeWiseCache
 
-__all__ = ['LevelWiseCache']
+__all__ = ['NodeWiseCache']
@@ -27,6 +27,17 @@ class NodeCache:
         if node_index in self.cache:
             self.cache.pop(node_index)
 
+    def has_node(self, node_index) -> bool:
+        return node_index in self.cache
+
+    def evict(self, max_nodes: int):
+        """Evict least recently used nodes until at most max_nodes nodes are cached.
+        max_nodes <= 0 means no limit."""
+        if max_nodes <= 0:
+            return
+        while len(self.cache) > max_nodes:
+            self.cache.pop(next(iter(self.cache)))
+
     def collect_node_bucket_sum(self, node_index: int, bucket_sum: int):
         """Collect one node's bucket sum.
         If its parent exist, calculate and cache the bucket sum for another child, and parent cache removed.
@@ -48,4 +59,9 @@ class NodeCache:
             self.collect_node_bucket_sum(node_index, bucket_sum)
 
     def get_node(self, node_index):
-        return self.cache.get(node_index)
+        if node_index not in self.cache:
+            return None
+        # move to the end, the most recently used.
+        bucket_sum = self.cache.pop(node_index)
+        self.cache[node_index] = bucket_sum
+        return bucket_sum
@@ -12,30 +12,51 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from dataclasses import dataclass
 from typing import List, Union
 
 from secretflow.device import PYU, HEUObject, PYUObject
 from secretflow.ml.boost.sgb_v.factory.sgb_actor import SGBActor
 
-from ..component import Component, Devices
+from ..component import (
+    Component,
+    Devices,
+    print_params,
+    set_dict_from_params,
+    set_params_from_dict,
+)
 from .node_bucket_sum_cache_internal import NodeCache
 
 
+@dataclass
+class NodeWiseCacheParams:
+    """
+    'bucket_sum_cache_max_nodes': int. maximum number of nodes whose encrypted bucket sums are cached
+        by each party. Least recently used nodes are evicted beyond it,
+        and both children of an evicted node are computed directly. 0 means no limit.
+        default: 0
+        range: [0, 2**31 - 1]
+    """
+
+    bucket_sum_cache_max_nodes: int = 0
+
+
 # consists of worker bucket sum caches (HEUObject or PYUObject)
 # and a single label holder's split info caches
 class NodeWiseCache(Component):
     def __init__(self):
         self.worker_caches = {}
         self.workers = []
+        self.params = NodeWiseCacheParams()
 
     def show_params(self):
-        return
+        print_params(self.params)
 
-    def set_params(self, _: dict):
-        return
+    def set_params(self, params: dict):
+        set_params_from_dict(self.params, params)
 
-    def get_params(self, _: dict):
-        return
+    def get_params(self, params: dict):
+        set_dict_from_params(self.params, params)
 
     def set_devices(self, devices: Devices):
         self.workers = devices.workers
@@ -55,6 +76,35 @@ class NodeWiseCache(Component):
         for device in self.worker_caches:
             self.worker_caches[device].reset_node(node_index)
 
+    def evict(self):
+        for device in self.worker_caches:
+            self.worker_caches[device].evict(self.params.bucket_sum_cache_max_nodes)
+
+    def _is_cached(self, node_index: int) -> bool:
+        # workers doing bucket sums always collect the same nodes, others collect none.
+        return any(cache.has_node(node_index) for cache in self.worker_caches.values())
+
+    def nodes_to_compute(self, selected_node_indices: List[int]) -> List[int]:
+        """Decide which children's bucket sums are computed directly.
+
+        Args:
+            selected_node_indices: List[int]. the child with fewer samples of each pair of children.
+
+        Returns:
+            the selected child of a pair if its parent is cached,
+            the other child will be its parent minus the selected one.
+            Otherwise both children of the pair.
+        """
+        result = []
+        for node_index in selected_node_indices:
+            if node_index == 0 or self._is_cached((node_index - 1) // 2):
+                result.append(node_index)
+            else:
+                # sibling of a left child 2x+1 is 2x+2, and vice versa.
+                sibling = node_index + 1 if node_index % 2 == 1 else node_index - 1
+                result.extend(sorted([node_index, sibling]))
+        return result
+
     def collect_node_bucket_sum(
         self, device: PYU, node_index: int, bucket_sum: Union[HEUObject, PYUObject]
     ):
@@ -18,6 +18,7 @@ from secretflow.data import FedNdarray
 from secretflow.device import PYUObject
 from secretflow.ml.boost.core.data_preprocess import (
     validate,
+    validate_label,
     validate_sample_weight,
     validate_tweedie_label,
 )
@@ -73,3 +74,13 @@ class DataPreprocessor(Component):
             validate_tweedie_label(y)
         w = validate_sample_weight(sample_weight, y_shape=y_shape)
         return x, x_shape, y, y_shape, w
+
+    def validate_label(
+        self, label, sample_weight=None
+    ) -> Tuple[PYUObject, Tuple[int, int], Union[None, PYUObject]]:
+        """validate label only, when the dataset is read block by block."""
+        y, y_shape = validate_label(label)
+        if self.params.objective == RegType.Tweedie:
+            validate_tweedie_label(y)
+        w = validate_sample_weight(sample_weight, y_shape=y_shape)
+        return y, y_shape, w
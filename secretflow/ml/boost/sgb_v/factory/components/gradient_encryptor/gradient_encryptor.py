@@ -67,6 +67,7 @@ class GradientEncryptor(Component):
         self.params = GradientEncryptorParams()
         self.logging_params = LoggingParams()
         self.gh_encoder = define_encoder(self.params)
+        self.spilled = []
 
     def show_params(self):
         print_params(self.params)
@@ -85,7 +86,7 @@ class GradientEncryptor(Component):
         return
 
     def del_actors(self):
-        return
+        self.remove_spilled()
 
     def get_params(self, params: dict):
         params['fixed_point_parameter'] = self.params.fixed_point_parameter
@@ -137,6 +138,27 @@ class GradientEncryptor(Component):
             }
         return cache
 
+    @LoggingTools.enable_logging
+    def spill_cache(
+        self, cache: Dict[PYU, HEUObject], out_of_core_dir: str, block_rows: int
+    ) -> Dict[PYU, HEUObject]:
+        """Save the cached gh of workers as files of row blocks under out_of_core_dir,
+        so bucket sums out of core only load the gh of one block at a time.
+        Files of the previous cache are removed."""
+        self.remove_spilled()
+        spilled_cache = {}
+        for worker, gh in cache.items():
+            if isinstance(gh, HEUObject):
+                gh = gh.spill(out_of_core_dir, block_rows)
+                self.spilled.append(gh)
+            spilled_cache[worker] = gh
+        return spilled_cache
+
+    def remove_spilled(self):
+        for gh in self.spilled:
+            gh.remove_spilled()
+        self.spilled = []
+
     def get_move_config(self, pyu):
         return move_config(pyu, self.gh_encoder)
 
@@ -17,7 +17,10 @@ from typing import List
 
 import numpy as np
 
-from ....core.pure_numpy_ops.boost import compute_weight_from_node_select
+from ....core.pure_numpy_ops.boost import (
+    compute_weight_from_node_ids,
+    compute_weight_from_node_select,
+)
 
 # handle order map building for one party
 
@@ -46,3 +49,8 @@ class LeafActor:
     def compute_leaf_weights(self, reg_lambda, lr, g, h):
         s = np.concatenate(self.leaf_node_selects, axis=0)
         return compute_weight_from_node_select(s, g, h, reg_lambda, lr)
+
+    def compute_leaf_weights_from_node_ids(self, reg_lambda, lr, g, h, node_ids):
+        return compute_weight_from_node_ids(
+            node_ids, self.leaf_node_indices, g, h, reg_lambda, lr
+        )
@@ -97,3 +97,17 @@ class LeafManager(Component):
             g,
             h,
         )
+
+    def compute_leaf_weights_from_node_ids(self, g, h, node_ids):
+        """compute leaf weights, every sample is in the leaf given by node_ids."""
+        reg_lambda = self.params.reg_lambda
+        lr = self.params.learning_rate
+        return self.leaf_actor.invoke_class_method(
+            'LeafActor',
+            'compute_leaf_weights_from_node_ids',
+            reg_lambda,
+            lr,
+            g,
+            h,
+            node_ids,
+        )
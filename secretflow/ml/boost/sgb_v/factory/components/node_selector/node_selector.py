@@ -17,7 +17,12 @@ import numpy as np
 
 from secretflow.device import PYUObject
 
-from ....core.pure_numpy_ops.node_select import get_child_select, root_select
+from ....core.pure_numpy_ops.node_select import (
+    get_child_node_ids,
+    get_child_select,
+    root_node_ids,
+    root_select,
+)
 from ..component import Component, Devices
 
 
@@ -46,6 +51,9 @@ class NodeSelector(Component):
     def root_select(self, sample_num):
         return root_select(samples=sample_num)
 
+    def root_node_ids(self, sample_num: int) -> PYUObject:
+        return self.label_holder(root_node_ids)(sample_num)
+
     def is_list_empty(self, any_list: Union[PYUObject, List]) -> PYUObject:
         return self.label_holder(lambda any_list: len(any_list) == 0)(any_list)
 
@@ -129,6 +137,42 @@ class NodeSelector(Component):
             pruned_node_indices,
         )
 
+    def pick_children_node_ids(
+        self, node_ids: PYUObject, node_indices: Union[List[int], PYUObject]
+    ) -> Tuple[PYUObject, PYUObject, PYUObject]:
+        return self.label_holder(pick_children_node_ids, num_returns=3)(
+            node_ids, node_indices
+        )
+
+    def get_child_node_ids(
+        self,
+        node_ids: PYUObject,
+        lchild_masks: List[PYUObject],
+        gain_is_cost_effective: List[bool],
+        split_node_indices: Union[List[int], PYUObject],
+    ) -> Tuple[PYUObject, PYUObject, PYUObject]:
+        """
+        compute the next level's node ids of samples.
+
+        Args:
+            node_ids: PYUObject. np.ndarray at label holder, node index of each sample.
+            lchild_masks: List[PYUObject]. party wise 0/1 masks of samples going to the left child
+                of nodes split by the party.
+            gain_is_cost_effective: List[bool]. indicate whether node should be split.
+            split_node_indices: List[int]. node indices at the current level.
+
+        Return:
+            node ids of samples in next tree level.
+            node indices for the next level
+            node_indices for pruned nodes
+        """
+        return self.label_holder(get_child_node_ids, num_returns=3)(
+            node_ids,
+            [mask.to(self.label_holder) for mask in lchild_masks],
+            gain_is_cost_effective,
+            split_node_indices,
+        )
+
 
 def pick_children_node_ss(
     node_select_list: PYUObject,
@@ -168,3 +212,33 @@ def pick_children_node_ss(
                 build_child_node_select_list(is_lefts, node_select_list, i)
             )
     return children_nodes_s, is_lefts, node_num
+
+
+def pick_children_node_ids(
+    node_ids: np.ndarray, node_indices: List[int]
+) -> Tuple[List[int], List[bool], int]:
+    """
+    pick left/right children based on number of samples at each node.
+    Args:
+        node_ids: np.ndarray. node index of each sample.
+        node_indices: List[int]. node indices of the level, in a [l_child, r_child, ...] fasion.
+    Returns:
+        children_node_indices: List[int].
+        is_lefts: List[bool].
+        node_num: int. len of node_indices.
+    """
+    ids, counts = np.unique(node_ids, return_counts=True)
+    sample_nums = dict(zip(ids.tolist(), counts.tolist()))
+    sums = [sample_nums.get(node_index, 0) for node_index in node_indices]
+
+    node_num = len(node_indices)
+    if node_num == 1:
+        is_lefts = [True]
+    else:
+        is_lefts = [sums[i] <= sums[i + 1] for i in range(node_num) if i % 2 == 0]
+    children_node_indices = [
+        node_indices[i] if is_lefts[i // 2] else node_indices[i + 1]
+        for i in range(node_num)
+        if i % 2 == 0
+    ]
+    return children_node_indices, is_lefts, node_num
@@ -0,0 +1,144 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from typing import Tuple, Union
+
+import numpy as np
+
+Index = Union[slice, np.ndarray, list]
+
+
+def _compose(
+    base: Union[None, np.ndarray], key: Index, size: int
+) -> Union[None, np.ndarray]:
+    """Compose the selection key on base, which selects from size items.
+
+    None means all items are selected in order.
+    """
+    if isinstance(key, slice):
+        if key == slice(None):
+            return base
+        if base is None:
+            return np.arange(*key.indices(size))
+        return base[key]
+    key = np.asarray(key)
+    if key.dtype == np.bool_:
+        assert key.shape == (
+            size if base is None else base.size,
+        ), f"boolean index of shape {key.shape} mismatch with {size} items"
+        key = np.flatnonzero(key)
+    return key if base is None else base[key]
+
+
+class BinMatrix:
+    """A bin matrix (order map) stored in a memory-mapped file on local disk.
+
+    Indexing follows numpy for the access patterns of sgb:
+        m[start:end:step]: rows of a block, read into memory.
+        m[rows, feature]: a single column, read into memory.
+        m[rows, cols]: a lazy view which selects rows and cols, nothing is read.
+
+    Only the file path and the selection are pickled, so it is cheap to send
+    a BinMatrix to other processes of the same party, e.g. HEU actors.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        shape: Tuple[int, int],
+        dtype=np.int8,
+        rows: Union[None, np.ndarray] = None,
+        cols: Union[None, np.ndarray] = None,
+    ):
+        self.path = path
+        self.full_shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.rows = rows
+        self.cols = cols
+        self._mm = None
+
+    @classmethod
+    def create(cls, dir: str, shape: Tuple[int, int], dtype=np.int8) -> 'BinMatrix':
+        fd, path = tempfile.mkstemp(dir=dir, suffix='.bin')
+        os.close(fd)
+        # column major, so both columns and blocks of rows are read sequentially.
+        np.memmap(path, dtype=dtype, mode='w+', shape=tuple(shape), order='F').flush()
+        return cls(path, shape, dtype)
+
+    def _memmap(self) -> np.memmap:
+        if self._mm is None:
+            self._mm = np.memmap(
+                self.path, dtype=self.dtype, mode='r', shape=self.full_shape, order='F'
+            )
+        return self._mm
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_mm'] = None
+        return state
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (
+            self.full_shape[0] if self.rows is None else self.rows.size,
+            self.full_shape[1] if self.cols is None else self.cols.size,
+        )
+
+    def set_column(self, col: int, values: np.ndarray):
+        mm = np.memmap(
+            self.path, dtype=self.dtype, mode='r+', shape=self.full_shape, order='F'
+        )
+        mm[:, col] = values
+        mm.flush()
+        self._mm = None
+
+    def set_rows(self, start: int, values: np.ndarray):
+        mm = np.memmap(
+            self.path, dtype=self.dtype, mode='r+', shape=self.full_shape, order='F'
+        )
+        mm[start : start + values.shape[0]] = values
+        mm.flush()
+        self._mm = None
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            mm = self._memmap()
+            if self.rows is None and key.step in (None, 1):
+                rows = slice(*key.indices(self.full_shape[0]))
+            else:
+                rows = _compose(self.rows, key, self.full_shape[0])
+            block = mm[rows] if self.cols is None else mm[rows][:, self.cols]
+            return np.ascontiguousarray(block)
+
+        rows, cols = key
+        if isinstance(cols, (int, np.integer)):
+            col = cols if self.cols is None else self.cols[cols]
+            column = np.asarray(self._memmap()[:, col])
+            rows = _compose(self.rows, rows, self.full_shape[0])
+            return column if rows is None else column[rows]
+
+        return BinMatrix(
+            self.path,
+            self.full_shape,
+            self.dtype,
+            _compose(self.rows, rows, self.full_shape[0]),
+            _compose(self.cols, cols, self.full_shape[1]),
+        )
+
+    def remove(self):
+        self._mm = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
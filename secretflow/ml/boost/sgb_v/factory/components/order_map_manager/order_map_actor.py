@@ -13,10 +13,17 @@
 # limitations under the License.
 
 
+import shutil
+import tempfile
 from typing import List, Tuple, Union
 
 import numpy as np
 
+from secretflow.ml.boost.core.data_preprocess import data_checks
+
+from ....core.distributed_tree.split_tree import SplitTree
+from ....core.pure_numpy_ops.node_select import partition_by_node_ids
+from .bin_matrix import BinMatrix
 from .order_map_context import OrderMapContext
 
 
@@ -25,6 +32,7 @@ class OrderMapActor:
     def __init__(self, idx: int) -> None:
         self.idx = idx
         self.ordermap_context = OrderMapContext()
+        self.out_of_core_dir = None
 
     def build_order_map(self, x: np.ndarray, buckets: int, seed: int) -> np.ndarray:
         """
@@ -35,6 +43,69 @@ class OrderMapActor:
         self.ordermap_context.build_maps(x, buckets)
         return self.ordermap_context.get_order_map()
 
+    def begin_order_map(
+        self, shape: Tuple[int, int], buckets: int, seed: int, out_of_core_dir: str
+    ):
+        """
+        Set up global context, the order map is stored as a memory-mapped file under
+        out_of_core_dir and built from chunks of columns by add_columns.
+        """
+        np.random.seed(seed)
+        self.out_of_core_dir = tempfile.mkdtemp(
+            prefix='sgb_order_map_', dir=out_of_core_dir
+        )
+        self.ordermap_context.begin_maps(shape, buckets, self.out_of_core_dir)
+
+    def add_columns(self, x: np.ndarray, start: int):
+        """Bin columns [start, start + x.shape[1]) of this partition."""
+        self.ordermap_context.add_columns(x, start)
+
+    def begin_sketches(self, buckets: int, seed: int):
+        """
+        Set up global context, the order map is built from blocks of rows,
+        which are added by update_sketches and then by add_rows.
+        """
+        np.random.seed(seed)
+        self.ordermap_context.begin_sketches(buckets)
+
+    def update_sketches(self, x: np.ndarray, worker: str):
+        data_checks(x, worker)
+        self.ordermap_context.update_sketches(x)
+
+    def begin_rows(self, out_of_core_dir: str) -> Tuple[int, int]:
+        """Compute split points, returns the shape of order map.
+        If out_of_core_dir is not empty, the order map is stored as a memory-mapped file under it.
+        """
+        if out_of_core_dir:
+            self.out_of_core_dir = tempfile.mkdtemp(
+                prefix='sgb_order_map_', dir=out_of_core_dir
+            )
+        self.ordermap_context.begin_rows(self.out_of_core_dir)
+        return self.ordermap_context.get_order_map_shape()
+
+    def add_rows(self, x: np.ndarray):
+        self.ordermap_context.add_rows(x)
+
+    def end_rows(self) -> Union[np.ndarray, BinMatrix]:
+        self.ordermap_context.end_rows()
+        return self.ordermap_context.get_order_map()
+
+    def predict_leaf_select(
+        self, split_tree: SplitTree, block_rows: Union[int, None] = None
+    ) -> np.ndarray:
+        """Leaf selects of the split tree on training samples, computed from the order map."""
+        return self.ordermap_context.predict_leaf_select(split_tree, block_rows)
+
+    def get_order_map(self) -> Union[np.ndarray, BinMatrix]:
+        return self.ordermap_context.get_order_map()
+
+    def release(self):
+        """Remove the order map files if it's stored out of core."""
+        self.ordermap_context.release()
+        if self.out_of_core_dir is not None:
+            shutil.rmtree(self.out_of_core_dir, ignore_errors=True)
+            self.out_of_core_dir = None
+
     def get_features(self) -> int:
         """Get the number of features at this partition"""
         return self.ordermap_context.get_features()
@@ -109,3 +180,47 @@ class OrderMapActor:
                 <= split_point_index
             )
         return candidate.astype(np.uint8).reshape(1, length)
+
+    def compute_left_child_mask(
+        self,
+        split_feature_buckets: List[Union[None, Tuple[int, int]]],
+        node_ids: np.ndarray,
+        node_indices: List[int],
+        sampled_indices: Union[List[int], None] = None,
+    ) -> np.ndarray:
+        """Compute which samples go to the left child of the nodes split on this party's features.
+
+        Args:
+            split_feature_buckets (List[Union[None, Tuple[int, int]]]): (feature, split_point_index)
+                of each node in node_indices, None if the node is not split by this party.
+            node_ids (np.ndarray): node index of each sample.
+            node_indices (List[int]): nodes to split.
+            sampled_indices (Union[List[int], None], optional): samples in original node.
+                Defaults to None. None means all.
+
+        Returns:
+            np.ndarray: a 0/1 mask array, shape (sample number,).
+                1 means in left child of a node split by this party, 0 otherwise.
+        """
+        order_map = self.ordermap_context.get_order_map()
+        mask = np.zeros(node_ids.size, dtype=np.uint8)
+        split_nodes = [
+            (node_index, split_feature_bucket)
+            for node_index, split_feature_bucket in zip(
+                node_indices, split_feature_buckets
+            )
+            if split_feature_bucket is not None
+        ]
+        if len(split_nodes) == 0:
+            return mask
+        samples_of_nodes = partition_by_node_ids(
+            node_ids, [node_index for node_index, _ in split_nodes]
+        )
+        if sampled_indices is not None:
+            sampled_indices = np.asarray(sampled_indices)
+        for samples, (_, (feature, split_point_index)) in zip(
+            samples_of_nodes, split_nodes
+        ):
+            rows = samples if sampled_indices is None else sampled_indices[samples]
+            mask[samples] = order_map[rows, feature] <= split_point_index
+        return mask
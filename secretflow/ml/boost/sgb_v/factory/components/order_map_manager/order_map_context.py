@@ -13,11 +13,18 @@
 # limitations under the License.
 
 
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import numpy as np
+from heu import numpy as hnp
 
 from secretflow.ml.boost.core.order_map_tools import qcut
+from secretflow.stats.core.quantile_sketch import QuantileSketch
+
+from .bin_matrix import BinMatrix
+
+# rank error of the sketches is 1 / (buckets * _SKETCH_EPS_RATIO).
+_SKETCH_EPS_RATIO = 10
 
 
 # Deal with order map context of a single partition
@@ -30,6 +37,9 @@ class OrderMapContext:
         self.feature_buckets = None
         self.features = None
         self.buckets = None
+        self.sketches = None
+        self.categories = None
+        self.rows = 0
 
     def _qcut(self, x: np.ndarray) -> Tuple[np.ndarray, List]:
         return qcut(x, self.buckets)
@@ -40,33 +50,172 @@ class OrderMapContext:
 
         Args:
             x: dataset from this partition.
+            buckets: max number of buckets of each feature.
 
         Return:
             leaf nodes' selects
         """
+        self.begin_maps(x.shape, buckets)
+        self.add_columns(x, 0)
+
+    def begin_maps(
+        self,
+        shape: Tuple[int, int],
+        buckets: int,
+        out_of_core_dir: Union[str, None] = None,
+    ) -> None:
+        """
+        prepare to build maps column by column, see add_columns.
+
+        Args:
+            shape: shape of dataset from this partition.
+            buckets: max number of buckets of each feature.
+            out_of_core_dir: if not None, order map is stored as a memory-mapped file under it.
+        """
         # order_map: record sample belong to which bucket of all features.
-        self.order_map = np.empty((x.shape[0], x.shape[1]), dtype=np.int8, order='F')
+        if out_of_core_dir is None:
+            self.order_map = np.empty(shape, dtype=np.int8, order='F')
+        else:
+            self.order_map = BinMatrix.create(out_of_core_dir, shape, np.int8)
         # split_points: bucket split points for all features.
         self.split_points = []
         # feature_buckets: how many buckets in each feature.
         self.feature_buckets = []
         # features: how many features in dataset.
-        self.features = x.shape[1]
+        self.features = shape[1]
         self.buckets = buckets
+        self.order_map_shape = self.order_map.shape
 
-        for f in range(x.shape[1]):
-            bins, split_point = self._qcut(x[:, f])
-            self.order_map[:, f] = bins
-            total_buckets = len(split_point)
-            while total_buckets <= self.buckets:
-                total_buckets += 1
-                split_point.append(float('inf'))
-            self.feature_buckets.append(total_buckets)
-            self.split_points.append(split_point)
+    def add_columns(self, x: np.ndarray, start: int) -> None:
+        """
+        split columns [start, start + x.shape[1]) of dataset into buckets,
+        columns must be added in order.
+        """
+        assert start == len(
+            self.split_points
+        ), f"columns must be added in order, expect {len(self.split_points)}, got {start}"
+        for i in range(x.shape[1]):
+            bins, split_point = self._qcut(x[:, i])
+            if isinstance(self.order_map, BinMatrix):
+                self.order_map.set_column(start + i, bins)
+            else:
+                self.order_map[:, start + i] = bins
+            self._append_split_point(split_point)
+
+    def _append_split_point(self, split_point: List[float]) -> None:
+        total_buckets = len(split_point)
+        while total_buckets <= self.buckets:
+            total_buckets += 1
+            split_point.append(float('inf'))
+        self.feature_buckets.append(total_buckets)
+        self.split_points.append(split_point)
+
+    def begin_sketches(self, buckets: int) -> None:
+        """
+        prepare to build maps from blocks of rows, the dataset is read twice:
+        blocks are added to sketches by update_sketches first, then binned by add_rows.
+        """
+        self.buckets = buckets
+        self.sketches = None
+        self.categories = None
+        self.rows = 0
+
+    def update_sketches(self, x: np.ndarray) -> None:
+        """add a block of rows to the sketch of each feature."""
+        if self.sketches is None:
+            eps = 1 / (self.buckets * _SKETCH_EPS_RATIO)
+            # seeded by column, so the split points are deterministic.
+            self.sketches = [QuantileSketch(eps, seed=i) for i in range(x.shape[1])]
+            self.categories = [set() for _ in range(x.shape[1])]
+        assert x.shape[1] == len(
+            self.sketches
+        ), f"blocks should have {len(self.sketches)} features, got {x.shape[1]}"
+        for i, sketch in enumerate(self.sketches):
+            sketch.update(x[:, i])
+            # distinct values are tracked until there are more than buckets.
+            if self.categories[i] is not None:
+                self.categories[i].update(np.unique(x[:, i]).tolist())
+                if len(self.categories[i]) > self.buckets:
+                    self.categories[i] = None
+        self.rows += x.shape[0]
+
+    def begin_rows(self, out_of_core_dir: Union[str, None] = None) -> None:
+        """
+        compute split points from sketches like qcut, and prepare to bin blocks of rows by add_rows.
 
-        self.order_map_shape = self.order_map.shape
+        Split points are the quantiles of sketches. If fewer distinct quantiles
+        than buckets are found, the distinct values are used as split points
+        if there are at most buckets of them, like skew_dist_split_points_search.
+        """
+        assert self.sketches is not None, "no rows are added to sketches"
+        sketches, categories, buckets = self.sketches, self.categories, self.buckets
+        self.begin_maps((self.rows, len(sketches)), buckets, out_of_core_dir)
+        quantiles = [i / buckets for i in range(1, buckets + 1, 1)]
+        for sketch, category in zip(sketches, categories):
+            split_point = np.unique(sketch.quantile(quantiles))
+            if len(split_point) < buckets and category is not None:
+                split_point = sorted(category)[1:]
+            self._append_split_point(list(map(float, split_point)))
+        self.sketches = None
+        self.categories = None
+        self.rows = 0
+
+    def add_rows(self, x: np.ndarray) -> None:
+        """bin a block of rows, blocks must be added in the order of update_sketches."""
+        end = self.rows + x.shape[0]
+        assert (
+            end <= self.order_map_shape[0]
+        ), f"more rows are added than sketched, {end} > {self.order_map_shape[0]}"
+        bins = np.empty(x.shape, dtype=np.int8, order='F')
+        for i in range(x.shape[1]):
+            # split points are padded by inf, which are on the right of all values.
+            bins[:, i] = np.digitize(x[:, i], self.split_points[i])
+        if isinstance(self.order_map, BinMatrix):
+            self.order_map.set_rows(self.rows, bins)
+        else:
+            self.order_map[self.rows : end] = bins
+        self.rows = end
+
+    def end_rows(self) -> None:
+        assert (
+            self.rows == self.order_map_shape[0]
+        ), f"rows are not aligned, sketched {self.order_map_shape[0]}, binned {self.rows}"
+
+    def predict_leaf_select(
+        self, split_tree, block_rows: Union[int, None] = None
+    ) -> np.ndarray:
+        """
+        leaf selects of split tree trained on this partition, computed from the order map
+        block by block, so the dataset is not needed.
 
-    def get_order_map(self) -> np.ndarray:
+        Args:
+            split_tree: SplitTree trained on this partition.
+            block_rows: rows of a block, None means all rows at once.
+        """
+        # x < split_points[f][k] is the same as order_map[:, f] <= k.
+        split_values = [
+            (
+                float(np.searchsorted(self.split_points[f], v, side='left')) + 0.5
+                if f != -1
+                else v
+            )
+            for f, v in zip(split_tree.split_features, split_tree.split_values)
+        ]
+        rows = self.order_map_shape[0]
+        block_rows = block_rows or max(rows, 1)
+        selects = [
+            hnp.tree_predict_with_indices(
+                self.order_map[start : start + block_rows].astype(np.float64),
+                split_tree.split_features,
+                split_values,
+                split_tree.split_indices,
+                split_tree.leaf_indices,
+            )
+            for start in range(0, rows, block_rows)
+        ]
+        return np.concatenate(selects, axis=0)
+
+    def get_order_map(self) -> Union[np.ndarray, BinMatrix]:
         return self.order_map
 
     def get_features(self) -> int:
@@ -83,3 +232,8 @@ class OrderMapContext:
 
     def get_order_map_shape(self) -> Tuple[int, int]:
         return self.order_map_shape
+
+    def release(self) -> None:
+        if isinstance(self.order_map, BinMatrix):
+            self.order_map.remove()
+        self.order_map = None
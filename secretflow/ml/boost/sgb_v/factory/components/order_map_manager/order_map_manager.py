@@ -14,17 +14,24 @@
 
 import math
 from dataclasses import dataclass
-from typing import Dict, List, Union
+from typing import Callable, Dict, List, Union
+
+import numpy as np
 
 from secretflow.data import FedNdarray, PartitionWay
-from secretflow.device import PYUObject
+from secretflow.device import PYU, PYUObject, reveal, wait
 from secretflow.ml.boost.sgb_v.core.params import default_params
 from secretflow.ml.boost.sgb_v.factory.sgb_actor import SGBActor
+from secretflow.ml.boost.sgb_v.row_blocks import RowBlocks
 
+from ....core.distributed_tree.distributed_tree import DistributedTree
 from ..component import Component, Devices, print_params
 from ..logging import LoggingParams, LoggingTools
 from .order_map_actor import OrderMapActor
 
+# chunks of columns in flight when building order map out of core.
+_MAX_INFLIGHT_CHUNKS = 2
+
 
 @dataclass
 class OrderMapBuilderParams:
@@ -35,10 +42,20 @@ class OrderMapBuilderParams:
 
     'seed': Pseudorandom number generator seed.
         default: 1212
+
+    'out_of_core_dir': str. if not empty, each party stores its order map as a memory-mapped
+        file under this local directory, and bucket sums are computed block by block.
+        default: ''
+
+    'out_of_core_block_rows': int. number of rows of a block when training out of core.
+        default: 262144
+        range: [1, 2**31 - 1]
     """
 
     sketch_eps: float = default_params.sketch_eps
     seed: int = default_params.seed
+    out_of_core_dir: str = default_params.out_of_core_dir
+    out_of_core_block_rows: int = default_params.out_of_core_block_rows
 
 
 class OrderMapManager(Component):
@@ -60,12 +77,18 @@ class OrderMapManager(Component):
             self.buckets = eps_inverse(self.params.sketch_eps)
         if 'seed' in params:
             self.params.seed = params['seed']
+        if 'out_of_core_dir' in params:
+            self.params.out_of_core_dir = params['out_of_core_dir']
+        if 'out_of_core_block_rows' in params:
+            self.params.out_of_core_block_rows = params['out_of_core_block_rows']
 
         LoggingTools.logging_params_from_dict(params, self.logging_params)
 
     def get_params(self, params: dict):
         params['sketch_eps'] = self.params.sketch_eps
         params['seed'] = self.params.seed
+        params['out_of_core_dir'] = self.params.out_of_core_dir
+        params['out_of_core_block_rows'] = self.params.out_of_core_block_rows
 
         LoggingTools.logging_params_write_dict(params, self.logging_params)
 
@@ -82,14 +105,23 @@ class OrderMapManager(Component):
             actor.register_class('OrderMapActor', OrderMapActor, i)
 
     def del_actors(self):
+        for actor in self.order_map_actors:
+            actor.invoke_class_method('OrderMapActor', 'release')
         del self.order_map_actors
 
     @LoggingTools.enable_logging
     def build_order_map(self, x: FedNdarray) -> FedNdarray:
         # we assumed x's devices match when setting up devices.
         buckets, seed = self.buckets, self.params.seed
-        self.order_map = FedNdarray(
-            {
+        if self.params.out_of_core_dir:
+            partitions = {
+                order_map_actor.device: self._build_order_map_out_of_core(
+                    order_map_actor, x.partitions[order_map_actor.device]
+                )
+                for order_map_actor in self.order_map_actors
+            }
+        else:
+            partitions = {
                 order_map_actor.device: order_map_actor.invoke_class_method(
                     'OrderMapActor',
                     'build_order_map',
@@ -98,14 +130,122 @@ class OrderMapManager(Component):
                     seed,
                 )
                 for order_map_actor in self.order_map_actors
-            },
-            partition_way=PartitionWay.VERTICAL,
+            }
+        self.order_map = FedNdarray(partitions, partition_way=PartitionWay.VERTICAL)
+        return self.order_map
+
+    def _build_order_map_out_of_core(
+        self, order_map_actor: SGBActor, x: PYUObject
+    ) -> PYUObject:
+        """the actor receives x in chunks of columns, so x is never copied to the actor
+        as a whole. A chunk has about max(rows, out_of_core_block_rows) values."""
+        pyu = x.device
+        rows, cols = reveal(pyu(lambda x: x.shape)(x))
+        order_map_actor.invoke_class_method(
+            'OrderMapActor',
+            'begin_order_map',
+            (rows, cols),
+            self.buckets,
+            self.params.seed,
+            self.params.out_of_core_dir,
+        )
+        chunk_cols = max(self.params.out_of_core_block_rows // max(rows, 1), 1)
+        pending = []
+        for start in range(0, cols, chunk_cols):
+            if len(pending) >= _MAX_INFLIGHT_CHUNKS:
+                wait(pending.pop(0))
+            chunk = pyu(lambda x, start, end: np.array(x[:, start:end], order='F'))(
+                x, start, min(start + chunk_cols, cols)
+            )
+            pending.append(
+                order_map_actor.invoke_class_method(
+                    'OrderMapActor', 'add_columns', chunk.data, start
+                )
+            )
+        return order_map_actor.invoke_class_method('OrderMapActor', 'get_order_map')
+
+    @LoggingTools.enable_logging
+    def build_order_map_from_blocks(self, blocks: RowBlocks) -> FedNdarray:
+        """build order map from blocks of rows, so the dataset is never fully resident.
+        blocks are read twice, once for split points and once for bins.
+        """
+        for order_map_actor in self.order_map_actors:
+            order_map_actor.invoke_class_method(
+                'OrderMapActor', 'begin_sketches', self.buckets, self.params.seed
+            )
+        self._add_blocks(
+            blocks,
+            lambda actor, block: actor.invoke_class_method(
+                'OrderMapActor', 'update_sketches', block.data, actor.device.party
+            ),
+        )
+        wait(
+            [
+                order_map_actor.invoke_class_method(
+                    'OrderMapActor', 'begin_rows', self.params.out_of_core_dir
+                )
+                for order_map_actor in self.order_map_actors
+            ]
+        )
+        self._add_blocks(
+            blocks,
+            lambda actor, block: actor.invoke_class_method(
+                'OrderMapActor', 'add_rows', block.data
+            ),
         )
+        partitions = {
+            order_map_actor.device: order_map_actor.invoke_class_method(
+                'OrderMapActor', 'end_rows'
+            )
+            for order_map_actor in self.order_map_actors
+        }
+        self.order_map = FedNdarray(partitions, partition_way=PartitionWay.VERTICAL)
         return self.order_map
 
+    def _add_blocks(
+        self,
+        blocks: RowBlocks,
+        add: Callable[[SGBActor, PYUObject], PYUObject],
+    ):
+        """one pass over blocks, at most _MAX_INFLIGHT_CHUNKS blocks are in flight."""
+        pending = []
+        for block in blocks:
+            if len(pending) >= _MAX_INFLIGHT_CHUNKS:
+                wait(pending.pop(0))
+            pending.append(
+                [
+                    add(order_map_actor, block[order_map_actor.device])
+                    for order_map_actor in self.order_map_actors
+                ]
+            )
+        wait([task for tasks in pending for task in tasks])
+
+    def predict_leaf_selects(self, tree: DistributedTree) -> Dict[PYU, PYUObject]:
+        """leaf selects of each party's split tree on training samples, computed from order maps."""
+        return {
+            order_map_actor.device: order_map_actor.invoke_class_method(
+                'OrderMapActor',
+                'predict_leaf_select',
+                tree.split_tree_dict[order_map_actor.device],
+                self.get_block_rows(),
+            )
+            for order_map_actor in self.order_map_actors
+            if order_map_actor.device in tree.split_tree_dict
+        }
+
     def get_order_map(self) -> FedNdarray:
         return self.order_map
 
+    def get_out_of_core_dir(self) -> Union[str, None]:
+        """local directory of out of core files, None if order map is in memory."""
+        return self.params.out_of_core_dir or None
+
+    def get_block_rows(self) -> Union[int, None]:
+        """rows of a block in bucket sums, None if order map is in memory."""
+        if self.params.out_of_core_dir:
+            return self.params.out_of_core_block_rows
+        return None
+
     def get_feature_buckets(self) -> List[PYUObject]:
         return [
             order_map_actor.invoke_class_method('OrderMapActor', 'get_feature_buckets')
@@ -162,6 +302,31 @@ class OrderMapManager(Component):
             )
         ]
 
+    def compute_left_child_masks_each_party(
+        self,
+        split_feature_buckets_each_party: List[PYUObject],
+        node_ids: PYUObject,
+        node_indices: Union[List[int], PYUObject],
+        sampled_indices: Union[List[int], None] = None,
+    ) -> List[PYUObject]:
+        return [
+            actor.invoke_class_method(
+                'OrderMapActor',
+                'compute_left_child_mask',
+                queries,
+                node_ids.to(actor.device),
+                (
+                    node_indices.to(actor.device)
+                    if isinstance(node_indices, PYUObject)
+                    else node_indices
+                ),
+                sampled_indices,
+            )
+            for actor, queries in zip(
+                self.order_map_actors, split_feature_buckets_each_party
+            )
+        ]
+
 
 def eps_inverse(eps):
     return math.ceil(1.0 / eps)
@@ -97,13 +97,14 @@ class SplitTreeActor:
         self,
         split_features: List[Tuple[int, int]],
         split_points: List[float],
-        left_child_selects: List[np.ndarray],
+        left_child_selects: Union[List[np.ndarray], None],
         gain_is_cost_effective: List[bool],
         gains: List[float],
         node_indices: List[int],
     ):
         """
         record split info and generate next level's left children select.
+        only record split info if left_child_selects is None.
         """
         lchild_selects = []
         for key, s in enumerate(split_points):
@@ -115,10 +116,14 @@ class SplitTreeActor:
                 self.tree.insert_split_node(
                     split_features[key][0], s, node_indices[key], gains[key]
                 )
+                if left_child_selects is None:
+                    continue
                 # lchild' select
                 lchild_selects.append(left_child_selects[key])
             else:
                 self.tree.insert_split_node(-1, float("inf"), node_indices[key], 0)
+                if left_child_selects is None:
+                    continue
                 lchild_selects.append(np.array([], dtype=np.uint8))
 
         return lchild_selects
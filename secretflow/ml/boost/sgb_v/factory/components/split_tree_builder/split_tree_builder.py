@@ -142,7 +142,7 @@ class SplitTreeBuilder(Component):
         self,
         split_features: List[PYUObject],
         split_points: List[PYUObject],
-        left_child_selects: List[PYUObject],
+        left_child_selects: Union[List[PYUObject], None],
         gain_is_cost_effective: List[bool],
         gains: List[float],
         node_indices: Union[List[int], PYUObject],
@@ -153,13 +153,14 @@ class SplitTreeBuilder(Component):
         Args:
             split_features (List[PYUObject]): party wise. each PYUObject is List[Tuple[int, int]]. len = node indices length.
             split_points (List[PYUObject]): : party wise. each PYUObject is List[float]. len = node indices length.
-            left_child_selects (List[PYUObject]):  party wise. each PYUObject is List[np.ndarray]
+            left_child_selects (Union[List[PYUObject], None]):  party wise. each PYUObject is List[np.ndarray].
+                None if samples are tracked by node ids, then only split points are inserted.
             gain_is_cost_effective (List[bool]): if gain is cost effective
             gains(List[float]): gains for the new split nodes.
             node_indices (Union[List[int], PYUObject]): node indices.
 
         Returns:
-            left_child_selects: left child selects for the new split nodes.
+            left_child_selects: left child selects for the new split nodes, None if left_child_selects is None.
         """
         lchild_selects = []
         label_holder = self.label_holder
@@ -179,16 +180,20 @@ class SplitTreeBuilder(Component):
                 'do_split_list_wise',
                 split_features[i],
                 split_points[i],
-                left_child_selects[i],
+                left_child_selects[i] if left_child_selects is not None else None,
                 gain_is_cost_effective,
                 gains,
                 split_node_indices_here,
             )
+            if left_child_selects is None:
+                continue
             if enable:
                 selects_in_bits = worker(packbits_node_selects)(selects)
                 lchild_selects.append(selects_in_bits.to(self.label_holder))
             else:
                 lchild_selects.append(selects.to(self.label_holder))
+        if left_child_selects is None:
+            return None
         if enable:
             lchild_selects = label_holder(unpack_node_select_lists)(
                 lchild_selects, select_shape
@@ -160,6 +160,7 @@ class LeafWiseTreeTrainer(TreeTrainer):
 
         self.order_map_sub = order_map_sub
         self.bucket_num = order_map_manager.buckets
+        self.block_rows = order_map_manager.get_block_rows()
 
         self.node_select_shape = (
             1,
@@ -191,6 +192,13 @@ class LeafWiseTreeTrainer(TreeTrainer):
         self.encrypted_gh_dict = self.components.gradient_encryptor.cache_to_workers(
             encrypted_gh, gh
         )
+        if self.block_rows is not None:
+            # gh is read block by block with the order map.
+            self.encrypted_gh_dict = self.components.gradient_encryptor.spill_cache(
+                self.encrypted_gh_dict,
+                order_map_manager.get_out_of_core_dir(),
+                self.block_rows,
+            )
         logging.debug("g h encrypted.")
 
     @LoggingTools.enable_logging
@@ -272,7 +280,7 @@ class LeafWiseTreeTrainer(TreeTrainer):
 
         # pick only one node to calculate bucket sum.
         (
-            selected_node_selects,
+            _,
             is_lefts,
             node_num,
         ) = self.components.node_selector.pick_children_node_ss(new_split_node_selects)
@@ -295,13 +303,14 @@ class LeafWiseTreeTrainer(TreeTrainer):
             self.encrypted_gh_dict,
             selected_children_node_indices,
             new_split_node_indices,
-            selected_node_selects,
+            new_split_node_selects,
             self.order_map_sub,
             self.bucket_num,
             self.bucket_lists,
             self.components.gradient_encryptor,
             node_num,
             self.node_select_shape,
+            self.block_rows,
         )
         level_nodes_G, level_nodes_H = self.components.loss_computer.reverse_scale_gh(
             level_nodes_G, level_nodes_H
@@ -58,9 +58,13 @@ class LevelWiseTreeTrainerParams:
     'max_depth': int, maximum depth of a tree.
             default: 5
             range: [1, 16]
+    'enable_node_id_vector': bool. if true, track samples by a single node id vector
+            instead of one 0/1 select per node.
+            default: False
     """
 
     max_depth: int = default_params.max_depth
+    enable_node_id_vector: bool = default_params.enable_node_id_vector
 
 
 class LevelWiseTreeTrainer(TreeTrainer):
@@ -93,11 +97,14 @@ class LevelWiseTreeTrainer(TreeTrainer):
 
     def _get_trainer_params(self, params: dict):
         params['max_depth'] = self.params.max_depth
+        params['enable_node_id_vector'] = self.params.enable_node_id_vector
         LoggingTools.logging_params_write_dict(params, self.logging_params)
 
     def _set_trainer_params(self, params: dict):
         if 'max_depth' in params:
             self.params.max_depth = params['max_depth']
+        if 'enable_node_id_vector' in params:
+            self.params.enable_node_id_vector = params['enable_node_id_vector']
         LoggingTools.logging_params_from_dict(params, self.logging_params)
 
     def train_tree_context_setup(
@@ -159,6 +166,7 @@ class LevelWiseTreeTrainer(TreeTrainer):
         )
 
         self.bucket_num = order_map_manager.buckets
+        self.block_rows = order_map_manager.get_block_rows()
         logging.debug("sub sampled (per tree).")
 
         # compute g, h and encryption
@@ -183,6 +191,13 @@ class LevelWiseTreeTrainer(TreeTrainer):
         self.encrypted_gh_dict = self.components.gradient_encryptor.cache_to_workers(
             encrypted_gh, gh
         )
+        if self.block_rows is not None:
+            # gh is read block by block with the order map.
+            self.encrypted_gh_dict = self.components.gradient_encryptor.spill_cache(
+                self.encrypted_gh_dict,
+                order_map_manager.get_out_of_core_dir(),
+                self.block_rows,
+            )
         logging.debug("g h encrypted.")
 
     @LoggingTools.enable_logging
@@ -201,6 +216,10 @@ class LevelWiseTreeTrainer(TreeTrainer):
         logging.info("begin train tree.")
         row_num = self.node_select_shape[1]
         g, h = self.g, self.h
+        if self.params.enable_node_id_vector:
+            return self._train_tree_by_node_ids(
+                row_num, cur_tree_num, order_map_manager
+            )
         root_select = self.components.node_selector.root_select(row_num)
 
         # level wise train begins
@@ -226,6 +245,9 @@ class LevelWiseTreeTrainer(TreeTrainer):
             split_node_selects, split_node_indices
         )
         weight = self.components.leaf_manager.compute_leaf_weights(g, h)
+        return self._build_distributed_tree(weight)
+
+    def _build_distributed_tree(self, weight: PYUObject) -> DistributedTree:
         leaf_node_indices = self.components.leaf_manager.get_leaf_indices()
         tree = DistributedTree()
         tree.set_enable_packbits(
@@ -237,6 +259,33 @@ class LevelWiseTreeTrainer(TreeTrainer):
         tree.set_leaf_weight(self.label_holder, weight)
         return tree
 
+    def _train_tree_by_node_ids(
+        self, row_num: int, cur_tree_num: int, order_map_manager: OrderMapManager
+    ) -> DistributedTree:
+        """level wise training, but samples are tracked by a node id vector
+        at label holder instead of one select per node."""
+        node_ids = self.components.node_selector.root_node_ids(row_num)
+        split_node_indices = [0]
+        for level in range(self.params.max_depth):
+            logging.debug(f"training level {level}.")
+            node_ids, split_node_indices = self._train_level_by_node_ids(
+                node_ids,
+                split_node_indices,
+                level,
+                cur_tree_num,
+                order_map_manager,
+            )
+            if reveal(self.components.node_selector.is_list_empty(split_node_indices)):
+                # pruned all nodes
+                break
+
+        # samples still in split nodes of the last level are in leaves now.
+        self.components.leaf_manager.extend_leaves([], split_node_indices)
+        weight = self.components.leaf_manager.compute_leaf_weights_from_node_ids(
+            self.g, self.h, node_ids
+        )
+        return self._build_distributed_tree(weight)
+
     @LoggingTools.enable_logging
     def _train_level(
         self,
@@ -247,29 +296,17 @@ class LevelWiseTreeTrainer(TreeTrainer):
         order_map_manager: OrderMapManager,
     ) -> Tuple[PYUObject, PYUObject, PYUObject, PYUObject]:
         last_level = level == (self.params.max_depth - 1)
+        # all parties knows the shape of tree, and which nodes in them, so this is fine.
+        split_node_indices = reveal(split_node_indices)
 
         (label_holder_split_buckets, gains, gain_is_cost_effective) = (
             self._find_best_split_bucket(
-                split_node_selects, last_level, tree_num, level
+                split_node_selects, split_node_indices, last_level, tree_num, level
             )
         )
 
-        # split not in party will be marked as -1
-        split_buckets_viewed_each_party = (
-            self.components.split_tree_builder.split_bucket_to_partition(
-                label_holder_split_buckets
-            )
-        )
-        # -1 will retains
-        unmasked_split_buckets_viewed_each_party = (
-            self.components.shuffler.unshuffle_split_buckets(
-                split_buckets_viewed_each_party
-            )
-        )
-        split_feature_buckets_each_party = (
-            self.components.split_tree_builder.get_split_feature_list_wise_each_party(
-                unmasked_split_buckets_viewed_each_party
-            )
+        split_feature_buckets_each_party = self._get_split_feature_buckets_each_party(
+            label_holder_split_buckets
         )
         left_selects_each_party = (
             order_map_manager.batch_compute_left_child_selects_each_party(
@@ -300,9 +337,109 @@ class LevelWiseTreeTrainer(TreeTrainer):
         self.components.leaf_manager.extend_leaves(pruned_s, pruned_node_indices)
         return childs_s, split_node_indices
 
+    @LoggingTools.enable_logging
+    def _train_level_by_node_ids(
+        self,
+        node_ids: PYUObject,
+        split_node_indices: Union[List[int], PYUObject],
+        level: int,
+        tree_num: int,
+        order_map_manager: OrderMapManager,
+    ) -> Tuple[PYUObject, PYUObject]:
+        last_level = level == (self.params.max_depth - 1)
+        split_node_indices = reveal(split_node_indices)
+
+        # only compute the gradient sums of left or right children node. (choose fewer ones)
+        (
+            selected_children_node_indices,
+            _,
+            _,
+        ) = self.components.node_selector.pick_children_node_ids(
+            node_ids, split_node_indices
+        )
+        selected_children_node_indices = reveal(selected_children_node_indices)
+        (
+            level_nodes_G,
+            level_nodes_H,
+        ) = self.components.bucket_sum_calculator.calculate_bucket_sum_level_wise_by_node_ids(
+            self.components.shuffler,
+            self.encrypted_gh_dict,
+            node_ids,
+            selected_children_node_indices,
+            split_node_indices,
+            self.order_map_sub,
+            self.bucket_num,
+            self.bucket_lists,
+            self.components.gradient_encryptor,
+            self.block_rows,
+        )
+        (label_holder_split_buckets, gains, gain_is_cost_effective) = (
+            self._find_best_split_bucket_from_GH(
+                level_nodes_G,
+                level_nodes_H,
+                split_node_indices,
+                last_level,
+                tree_num,
+                level,
+            )
+        )
+
+        split_feature_buckets_each_party = self._get_split_feature_buckets_each_party(
+            label_holder_split_buckets
+        )
+        left_masks_each_party = order_map_manager.compute_left_child_masks_each_party(
+            split_feature_buckets_each_party,
+            node_ids,
+            split_node_indices,
+            self.row_choices,
+        )
+        split_points = order_map_manager.batch_query_split_points_each_party(
+            split_feature_buckets_each_party
+        )
+        self.components.split_tree_builder.do_split_list_wise_each_party(
+            split_feature_buckets_each_party,
+            split_points,
+            None,
+            gain_is_cost_effective,
+            gains,
+            split_node_indices,
+            self.node_select_shape,
+        )
+        (
+            node_ids,
+            split_node_indices,
+            pruned_node_indices,
+        ) = self.components.node_selector.get_child_node_ids(
+            node_ids, left_masks_each_party, gain_is_cost_effective, split_node_indices
+        )
+        self.components.leaf_manager.extend_leaves([], pruned_node_indices)
+        return node_ids, split_node_indices
+
+    def _get_split_feature_buckets_each_party(
+        self, label_holder_split_buckets: PYUObject
+    ) -> List[PYUObject]:
+        # split not in party will be marked as -1
+        split_buckets_viewed_each_party = (
+            self.components.split_tree_builder.split_bucket_to_partition(
+                label_holder_split_buckets
+            )
+        )
+        # -1 will retains
+        unmasked_split_buckets_viewed_each_party = (
+            self.components.shuffler.unshuffle_split_buckets(
+                split_buckets_viewed_each_party
+            )
+        )
+        return (
+            self.components.split_tree_builder.get_split_feature_list_wise_each_party(
+                unmasked_split_buckets_viewed_each_party
+            )
+        )
+
     def _find_best_split_bucket(
         self,
         split_node_selects: PYUObject,
+        split_node_indices: List[int],
         is_last_level: bool,
         tree_num: int,
         level: int,
@@ -313,6 +450,7 @@ class LevelWiseTreeTrainer(TreeTrainer):
 
         Args:
             split_node_selects: PYUObject. List[np.ndarray] at label_holder. Sample select indexes of each node from same tree level.
+            split_node_indices: List[int]. node indices of the tree level.
             last_level: bool. if this split is last level, next level is leaf nodes.
             tree_num: int. which tree is training
             level: int. which level is training
@@ -324,13 +462,16 @@ class LevelWiseTreeTrainer(TreeTrainer):
         """
 
         # only compute the gradient sums of left or right children node. (choose fewer ones)
-        (
-            children_split_node_selects,
-            is_lefts,
-            node_num,
-        ) = self.components.node_selector.pick_children_node_ss(split_node_selects)
+        (_, is_lefts, _) = self.components.node_selector.pick_children_node_ss(
+            split_node_selects
+        )
         # all parties knows the shape of tree, and which nodes in them, so this is fine.
         is_lefts = reveal(is_lefts)
+        selected_children_node_indices = reveal(
+            self.components.node_selector.get_child_indices(
+                split_node_indices, is_lefts
+            )
+        )
 
         (
             level_nodes_G,
@@ -338,15 +479,34 @@ class LevelWiseTreeTrainer(TreeTrainer):
         ) = self.components.bucket_sum_calculator.calculate_bucket_sum_level_wise(
             self.components.shuffler,
             self.encrypted_gh_dict,
-            children_split_node_selects,
-            is_lefts,
+            split_node_selects,
+            selected_children_node_indices,
+            split_node_indices,
             self.order_map_sub,
             self.bucket_num,
             self.bucket_lists,
             self.components.gradient_encryptor,
-            node_num,
             self.node_select_shape,
+            self.block_rows,
+        )
+        return self._find_best_split_bucket_from_GH(
+            level_nodes_G,
+            level_nodes_H,
+            split_node_indices,
+            is_last_level,
+            tree_num,
+            level,
         )
+
+    def _find_best_split_bucket_from_GH(
+        self,
+        level_nodes_G: PYUObject,
+        level_nodes_H: PYUObject,
+        split_node_indices: List[int],
+        is_last_level: bool,
+        tree_num: int,
+        level: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
         level_nodes_G, level_nodes_H = self.components.loss_computer.reverse_scale_gh(
             level_nodes_G, level_nodes_H
         )
@@ -368,7 +528,7 @@ class LevelWiseTreeTrainer(TreeTrainer):
         gains = reveal(gains)
 
         self.components.bucket_sum_calculator.update_level_cache(
-            is_last_level, gain_is_cost_effective
+            is_last_level, split_node_indices, gain_is_cost_effective
         )
 
         return split_buckets, gains, gain_is_cost_effective
@@ -39,6 +39,7 @@ from secretflow.ml.boost.sgb_v.factory.components.component import set_params_fr
 from secretflow.ml.boost.sgb_v.factory.components.logging import logging_params_names
 
 from ..model import SgbModel
+from ..row_blocks import RowBlocks
 from .booster import GlobalOrdermapBooster
 from .components import LeafWiseTreeTrainer, LevelWiseTreeTrainer
 
@@ -163,7 +164,7 @@ class SGBFactory:
 
     def fit(
         self,
-        dataset: Union[FedNdarray, VDataFrame],
+        dataset: Union[FedNdarray, VDataFrame, RowBlocks],
         label: Union[FedNdarray, VDataFrame],
         data_name: str = None,
         checkpoint_data: SGBCheckpointData = None,
@@ -183,6 +184,9 @@ class SGBFactory:
                 (dataset, label, "whole"),
             ]
         if self.factory_params.enable_early_stop:
+            assert not isinstance(
+                dataset, RowBlocks
+            ), "early stop is not supported when dataset is read by row blocks"
             train_data, val_data = train_test_split(
                 dataset,
                 test_size=self.factory_params.validation_fraction,
@@ -234,7 +238,7 @@ class SGBFactory:
     def train(
         self,
         params: dict,
-        dtrain: Union[FedNdarray, VDataFrame],
+        dtrain: Union[FedNdarray, VDataFrame, RowBlocks],
         label: Union[FedNdarray, VDataFrame],
         checkpoint_data: SGBCheckpointData = None,
         dump_function: Callable = None,
@@ -244,7 +248,9 @@ class SGBFactory:
 
         Args:
             params (dict): sgb parameters
-            dtrain (Union[FedNdarray, VDataFrame]): dataset excludes the label, must be aligned vertically
+            dtrain (Union[FedNdarray, VDataFrame, RowBlocks]): dataset excludes the label, must be aligned vertically.
+                RowBlocks are read block by block, so the dataset is never fully resident on any party,
+                checkpoint and evaluation are not supported then.
             label (Union[FedNdarray, VDataFrame]): label data, must be aligned vertically with the dtrain
             checkpoint_data (SGBCheckpointData, optional): checkpoint data used for continued training. Defaults to None.
             dump_function (Callable, optional): the dump function must accept 3 args:
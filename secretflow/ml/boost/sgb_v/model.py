@@ -27,6 +27,7 @@ from secretflow.ml.boost.core.data_preprocess import prepare_dataset
 
 from .core.distributed_tree.distributed_tree import DistributedTree
 from .core.distributed_tree.distributed_tree import from_dict as dt_from_dict
+from .core.distributed_tree.distributed_tree import predict_trees
 from .core.params import RegType
 from .core.pure_numpy_ops.pred import sigmoid
 
@@ -68,13 +69,8 @@ class SgbModel:
         if len(self.trees) == 0:
             return None
 
-        pred = 0
         x, _ = prepare_dataset(dtrain)
-        x = x.partitions
-
-        for tree in self.trees:
-            pred = self.label_holder(lambda x, y: jnp.add(x, y))(tree.predict(x), pred)
-
+        pred = predict_trees(self.trees, x.partitions)
         pred = self.label_holder(lambda x, y: jnp.add(x, y).reshape(-1, 1))(
             pred, self.base
         )
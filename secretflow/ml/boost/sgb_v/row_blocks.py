@@ -0,0 +1,75 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pyarrow as pa
+
+from secretflow.device import PYU, PYUObject
+
+
+class RowBlocks(abc.ABC):
+    """A vertically partitioned dataset which is read block by block of rows,
+    so the features are never fully resident on any party.
+
+    Each iteration is a new pass over the dataset, sgb reads it twice when
+    building the order map: once for the split points and once for the bins.
+    """
+
+    @property
+    @abc.abstractmethod
+    def devices(self) -> List[PYU]:
+        """parties holding the features."""
+
+    @abc.abstractmethod
+    def __iter__(self) -> Iterator[Dict[PYU, PYUObject]]:
+        """yields aligned row blocks, {party: 2-D np.ndarray of the rows at party}."""
+
+
+def _table_to_array(t: pa.Table) -> np.ndarray:
+    return t.to_pandas().to_numpy(dtype=np.float64)
+
+
+class VTableRowBlocks(RowBlocks):
+    """Row blocks of a VTable read by CompVDataFrameReader.
+
+    Args:
+        storage: storage of the table.
+        vtable: the table, select the feature columns before, e.g. by VTable.select.
+        batch_size: rows of a block.
+    """
+
+    def __init__(self, storage, vtable, batch_size: int = 262144):
+        assert batch_size > 0, f"batch_size should > 0, got {batch_size}"
+        self.storage = storage
+        self.vtable = vtable
+        self.batch_size = batch_size
+
+    @property
+    def devices(self) -> List[PYU]:
+        return [PYU(p.party) for p in self.vtable.parties.values()]
+
+    def __iter__(self) -> Iterator[Dict[PYU, PYUObject]]:
+        from secretflow.component.core import CompVDataFrameReader
+
+        with CompVDataFrameReader(
+            self.storage, None, self.vtable, self.batch_size
+        ) as reader:
+            for df in reader:
+                yield {
+                    pyu: pyu(_table_to_array)(p.data)
+                    for pyu, p in df.partitions.items()
+                }
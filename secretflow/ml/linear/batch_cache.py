@@ -0,0 +1,128 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from enum import Enum, unique
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+import spu
+
+from secretflow.device import SPU
+from secretflow.device.device.type_traits import spu_fxp_size
+
+
+@unique
+class BatchCachePolicy(Enum):
+    # pin the first batches which fit in the budget, the others are shared again on
+    # every use. batches are used in the same order in every epoch, so evicting
+    # e.g. the least recently used batches would miss all batches once the data
+    # exceeds the budget.
+    KEEP_FIRST = 'keep_first'
+    # never cache, every batch is shared again on every use.
+    RECOMPUTE = 'recompute'
+
+
+SUPPORTED_BATCH_CACHE_POLICIES = [p.value for p in BatchCachePolicy]
+
+
+def spu_share_bytes(spu_device: SPU, elements: int) -> int:
+    """Estimated bytes of the shares of elements held by each party of spu."""
+    shares = 2 if spu_device.conf.protocol == spu.spu_pb2.ABY3 else 1
+    return elements * spu_fxp_size(spu_device.conf.field) * shares
+
+
+def drop_spu_cached_var(spu_device: SPU, batch: Tuple):
+    """Drop the spu cached var of x, the first item of a cached batch."""
+    spu_device(lambda x: spu.experimental.drop_cached_var(x))(batch[0])
+
+
+class SPUBatchCache:
+    """Cache of infeed batches shared to spu, bounded by the bytes of shares.
+
+    Batches which are not cached could still be prefetched by hold, which are
+    kept until the next get of them only.
+
+    Args:
+        policy: one of 'keep_first' or 'recompute'.
+        max_bytes: budget of the estimated share bytes per party, 0 means no limit.
+        on_evict: called with the evicted value, e.g. to drop spu cached vars.
+    """
+
+    def __init__(
+        self,
+        policy: str = 'keep_first',
+        max_bytes: int = 0,
+        on_evict: Callable[[Any], None] = None,
+    ):
+        assert (
+            policy in SUPPORTED_BATCH_CACHE_POLICIES
+        ), f"batch cache policy should be one of {SUPPORTED_BATCH_CACHE_POLICIES}, got {policy}"
+        assert max_bytes >= 0, f"max_bytes should >= 0, got {max_bytes}"
+        self.policy = BatchCachePolicy(policy)
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.cache: Dict[Hashable, Tuple[Any, int]] = {}
+        self.held: Dict[Hashable, Any] = {}
+        self.cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.cache or key in self.held
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def get(self, key: Hashable) -> Any:
+        if key in self.cache:
+            self.hits += 1
+            return self.cache[key][0]
+        self.misses += 1
+        # a prefetched batch is used once.
+        return self.held.pop(key, None)
+
+    def will_cache(self, nbytes: int) -> bool:
+        """Whether a new batch of nbytes would be kept by put."""
+        if self.policy == BatchCachePolicy.RECOMPUTE:
+            return False
+        return self.max_bytes == 0 or self.cached_bytes + nbytes <= self.max_bytes
+
+    def put(self, key: Hashable, value: Any, nbytes: int) -> bool:
+        """Cache value if the policy and budget allow, return whether it is cached."""
+        if key in self.cache or not self.will_cache(nbytes):
+            return False
+        self.cache[key] = (value, nbytes)
+        self.cached_bytes += nbytes
+        return True
+
+    def hold(self, key: Hashable, value: Any):
+        """Keep a prefetched batch which is not cached until its next get."""
+        self.held[key] = value
+
+    def values(self) -> List[Any]:
+        return [value for value, _ in self.cache.values()]
+
+    def clear(self):
+        self.held.clear()
+        for value, _ in self.cache.values():
+            if self.on_evict is not None:
+                self.on_evict(value)
+        self.cache.clear()
+        self.cached_bytes = 0
+
+    def report(self, name: str = 'batch cache'):
+        logging.info(
+            f"{name}: {len(self.cache)} batches, {self.cached_bytes} share bytes cached per party, "
+            f"{self.hits} hits, {self.misses} misses."
+        )
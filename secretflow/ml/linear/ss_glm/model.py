@@ -15,6 +15,7 @@
 import logging
 import math
 import time
+from functools import partial
 from typing import Callable, Dict, List, NoReturn, Tuple, Union
 
 import jax.numpy as jnp
@@ -28,6 +29,7 @@ from secretflow.data.vertical import VDataFrame
 from secretflow.device import PYU, SPU, PYUObject, SPUObject, wait
 from secretflow.device.driver import reveal
 
+from ..batch_cache import SPUBatchCache, drop_spu_cached_var, spu_share_bytes
 from .core import Distribution, Linker, get_dist, get_link
 from .core.distribution import DistributionBernoulli
 from .metrics import BETTER_DEF, IMPROVE_DEF, SUPPORTED_METRICS, deviance
@@ -558,7 +560,9 @@ class SSGLM:
     def _to_spu(self, d: FedNdarray):
         return [d.partitions[pyu].to(self.spu) for pyu in d.partitions]
 
-    def _build_batch_cache(self, infeed_step: int, cache_name: str = "train"):
+    def _build_batch_cache(
+        self, infeed_step: int, cache_name: str = "train", prefetch: bool = False
+    ):
         if cache_name == "train":
             x = self.x
             y = self.y
@@ -574,8 +578,19 @@ class SSGLM:
         else:
             raise NotImplementedError("only train/val cache supported")
 
-        if infeed_step in self.batch_cache[cache_name]:
-            return self.batch_cache[cache_name][infeed_step]
+        if prefetch and (cache_name, infeed_step) in self.batch_cache:
+            return None
+        cached = self.batch_cache.get((cache_name, infeed_step))
+        if cached is not None:
+            return cached
+
+        rows = min(
+            self.infeed_batch_size, samples - infeed_step * self.infeed_batch_size
+        )
+        # x padded with ones, y, offset and weight.
+        columns = self.num_feat + 2 + (offset is not None) + (weight is not None)
+        nbytes = spu_share_bytes(self.spu, rows * columns)
+        will_cache = self.batch_cache.will_cache(nbytes)
 
         x = self._next_infeed_batch(x, infeed_step, samples)
         y = self._next_infeed_batch(y, infeed_step, samples)
@@ -586,7 +601,8 @@ class SSGLM:
             self._to_spu(x),
             axis=1,
             pad_ones=True,
-            enable_spu_cache=self.enable_spu_cache,
+            # batches shared again on every use are not worth a spu cached var.
+            enable_spu_cache=self.enable_spu_cache and will_cache,
         )
         spu_y = self._to_spu(y)[0]
 
@@ -602,8 +618,24 @@ class SSGLM:
         else:
             spu_w = None
 
-        self.batch_cache[cache_name][infeed_step] = (spu_x, spu_y, spu_o, spu_w)
-        return spu_x, spu_y, spu_o, spu_w
+        batch = (spu_x, spu_y, spu_o, spu_w)
+        if will_cache:
+            self.batch_cache.put((cache_name, infeed_step), batch, nbytes)
+        elif prefetch:
+            # not cached, but still infeed ahead and used once.
+            self.batch_cache.hold((cache_name, infeed_step), batch)
+        return batch
+
+    def _prefetch_batch_cache(
+        self, infeed_step: int, infeed_total_batch: int, cache_name: str = "train"
+    ):
+        """Start slicing and sharing the next infeed_prefetch_depth batches,
+        so they are infeed while spu is computing the current batch."""
+        last_step = min(
+            infeed_step + self.infeed_prefetch_depth, infeed_total_batch - 1
+        )
+        for step in range(infeed_step + 1, last_step + 1):
+            self._build_batch_cache(step, cache_name, prefetch=True)
 
     def _get_sgd_learning_rate(self, epoch_idx: int):
         if self.decay_rate is not None:
@@ -654,6 +686,7 @@ class SSGLM:
                     dist=self.dist,
                     enable_spu_cache=self.enable_spu_cache,
                 )
+                self._prefetch_batch_cache(infeed_step, self.infeed_total_batch)
                 wait([new_J, new_XTWZ])
                 if infeed_step == 0:
                     J = new_J
@@ -689,6 +722,7 @@ class SSGLM:
                     spu_w,
                     sgd_lr,
                 )
+                self._prefetch_batch_cache(infeed_step, self.infeed_total_batch)
 
         return spu_model
 
@@ -781,6 +815,9 @@ class SSGLM:
                         dist=dist,
                     )
                     metric = self.spu(lambda x, y: x + y)(metric, metric_)
+                    self._prefetch_batch_cache(
+                        infeed_step, infeed_total_batch, dataset_type
+                    )
                     wait(metric)
         # in all other cases, metric can be calculated by y device
         else:
@@ -932,6 +969,9 @@ class SSGLM:
         l2_lambda: float = None,
         # 10w * 100d
         infeed_batch_size_limit: int = 8000000,
+        infeed_prefetch_depth: int = 1,
+        batch_cache_policy: str = 'keep_first',
+        batch_cache_max_bytes: int = 0,
         fraction_of_validation_set: float = 0.2,
         stopping_metric: str = 'deviance',
         stopping_rounds: int = 0,
@@ -965,9 +1005,19 @@ class SSGLM:
             random_state,
         )
 
+        assert (
+            infeed_prefetch_depth >= 0
+        ), f"infeed_prefetch_depth should >= 0, got {infeed_prefetch_depth}"
+        self.infeed_prefetch_depth = infeed_prefetch_depth
+
         self.spu_w = None
 
-        self.batch_cache = {"train": {}, "val": {}}
+        self.batch_cache = SPUBatchCache(
+            batch_cache_policy,
+            batch_cache_max_bytes,
+            # not a bound method, which would be a reference cycle with the model.
+            partial(drop_spu_cached_var, self.spu) if self.enable_spu_cache else None,
+        )
         if report_metric:
             self.train_metric_history = []
 
@@ -1005,12 +1055,8 @@ class SSGLM:
             if epoch_callback:
                 self._epoch_callback(epoch_idx, epoch_callback)
 
-        if self.enable_spu_cache:
-            for n in self.batch_cache.values():
-                for s in n.values():
-                    wait(self.spu(lambda x: spu.experimental.drop_cached_var(x))(s[0]))
-
-        self.batch_cache = {"train": {}, "val": {}}
+        self.batch_cache.report()
+        self.batch_cache.clear()
 
     def fit_irls(
         self,
@@ -1026,6 +1072,9 @@ class SSGLM:
         l2_lambda: float = None,
         # 10w * 100d
         infeed_batch_size_limit: int = 8000000,
+        infeed_prefetch_depth: int = 1,
+        batch_cache_policy: str = 'keep_first',
+        batch_cache_max_bytes: int = 0,
         fraction_of_validation_set: float = 0.2,
         random_state: int = 1212,
         stopping_metric: str = 'deviance',
@@ -1071,6 +1120,13 @@ class SSGLM:
                 run a few rounds of irls training as the initialization of w, 0 disable.
             l2_lambda: float, default=None
                 the coefficient of L2 regularization loss is 1/2 * l2_lambda. It needs to be greater than 0.
+            infeed_prefetch_depth: int, default=1. how many following infeed batches are sliced and shared to spu
+                while spu is computing the current batch. 0 disable.
+            batch_cache_policy: str, default='keep_first'. how infeed batches shared to spu are cached between epochs,
+                'keep_first' pins the first batches within batch_cache_max_bytes, the others are shared again
+                on every use and still prefetched,
+                'recompute' shares batches again on every use.
+            batch_cache_max_bytes: int, default=0. budget of the estimated share bytes cached by each spu party, 0 means no limit.
             fraction_of_validation_set : float, default=0.2.
             random_state: int, default=1212. random state for validation split.
             stopping_metric: float, default='deviance'. must be one of deviance, weight, AUC, RMSE, MSE.
@@ -1093,6 +1149,9 @@ class SSGLM:
             scale=scale,
             l2_lambda=l2_lambda,
             infeed_batch_size_limit=infeed_batch_size_limit,
+            infeed_prefetch_depth=infeed_prefetch_depth,
+            batch_cache_policy=batch_cache_policy,
+            batch_cache_max_bytes=batch_cache_max_bytes,
             fraction_of_validation_set=fraction_of_validation_set,
             random_state=random_state,
             stopping_metric=stopping_metric,
@@ -1121,6 +1180,9 @@ class SSGLM:
         decay_rate: float = None,
         l2_lambda: float = None,
         infeed_batch_size_limit: int = 8000000,
+        infeed_prefetch_depth: int = 1,
+        batch_cache_policy: str = 'keep_first',
+        batch_cache_max_bytes: int = 0,
         fraction_of_validation_set: float = 0.2,
         random_state: int = 1212,
         stopping_metric: str = 'deviance',
@@ -1168,6 +1230,13 @@ class SSGLM:
                 decay learning rate, learning_rate * (decay_rate ** floor(epoch / decay_epoch)). None disable
             l2_lambda: float, default=None
                 the coefficient of L2 regularization loss is 1/2 * l2_lambda. It needs to be greater than 0.
+            infeed_prefetch_depth: int, default=1. how many following infeed batches are sliced and shared to spu
+                while spu is computing the current batch. 0 disable.
+            batch_cache_policy: str, default='keep_first'. how infeed batches shared to spu are cached between epochs,
+                'keep_first' pins the first batches within batch_cache_max_bytes, the others are shared again
+                on every use and still prefetched,
+                'recompute' shares batches again on every use.
+            batch_cache_max_bytes: int, default=0. budget of the estimated share bytes cached by each spu party, 0 means no limit.
             fraction_of_validation_set : float, default=0.2.
             random_state: int, default=1212. random state for validation split.
             stopping_rounds: int, default=0. The moving average is calculated over the last stopping_rounds rounds,
@@ -1194,6 +1263,9 @@ class SSGLM:
             decay_rate=decay_rate,
             l2_lambda=l2_lambda,
             infeed_batch_size_limit=infeed_batch_size_limit,
+            infeed_prefetch_depth=infeed_prefetch_depth,
+            batch_cache_policy=batch_cache_policy,
+            batch_cache_max_bytes=batch_cache_max_bytes,
             fraction_of_validation_set=fraction_of_validation_set,
             random_state=random_state,
             stopping_metric=stopping_metric,
@@ -16,6 +16,7 @@ import logging
 import math
 import time
 from enum import Enum, unique
+from functools import partial
 from typing import Callable, Dict, List, NoReturn, Tuple, Union
 
 import jax.lax
@@ -34,6 +35,11 @@ from secretflow.device import (
     wait,
 )
 from secretflow.device.driver import reveal
+from secretflow.ml.linear.batch_cache import (
+    SPUBatchCache,
+    drop_spu_cached_var,
+    spu_share_bytes,
+)
 from secretflow.ml.linear.linear_model import LinearModel, RegType
 from secretflow.utils.sigmoid import SigType, sigmoid
 
@@ -430,6 +436,50 @@ class SSRegression:
         lr_total_batch = math.floor(rows / self.lr_batch_size)
         return ds[being:end], lr_total_batch
 
+    def _build_batch_cache(self, infeed_step: int, prefetch: bool = False):
+        if prefetch and infeed_step in self.batch_cache:
+            return None
+        cached = self.batch_cache.get(infeed_step)
+        if cached is not None:
+            return cached
+
+        rows = min(
+            self.infeed_batch_size, self.samples - infeed_step * self.infeed_batch_size
+        )
+        # x padded with ones and y.
+        nbytes = spu_share_bytes(self.spu, rows * (self.num_feat + 2))
+        will_cache = self.batch_cache.will_cache(nbytes)
+
+        x, lr_total_batch = self._next_infeed_batch(self.x, infeed_step)
+        y, lr_total_batch = self._next_infeed_batch(self.y, infeed_step)
+        spu_x = self.spu(
+            _concatenate,
+            static_argnames=('axis', 'enable_spu_cache', 'pad_ones'),
+        )(
+            [x.partitions[pyu].to(self.spu) for pyu in x.partitions],
+            axis=1,
+            pad_ones=True,
+            # batches shared again on every use are not worth a spu cached var.
+            enable_spu_cache=self.enable_spu_cache and will_cache,
+        )
+        spu_y = [y.partitions[pyu].to(self.spu) for pyu in y.partitions][0]
+        batch = (spu_x, spu_y, lr_total_batch)
+        if will_cache:
+            self.batch_cache.put(infeed_step, batch, nbytes)
+        elif prefetch:
+            # not cached, but still infeed ahead and used once.
+            self.batch_cache.hold(infeed_step, batch)
+        return batch
+
+    def _prefetch_batch_cache(self, infeed_step: int):
+        """Start slicing and sharing the next infeed_prefetch_depth batches,
+        so they are infeed while spu is computing the current batch."""
+        last_step = min(
+            infeed_step + self.infeed_prefetch_depth, self.infeed_total_batch - 1
+        )
+        for step in range(infeed_step + 1, last_step + 1):
+            self._build_batch_cache(step, prefetch=True)
+
     def _get_sgd_learning_rate(self, epoch_idx: int):
         if self.decay_rate is not None:
             rate = self.decay_rate ** math.floor(epoch_idx / self.decay_epoch)
@@ -453,22 +503,7 @@ class SSRegression:
         learning_rate = self._get_sgd_learning_rate(epoch_idx)
 
         for infeed_step in range(self.infeed_total_batch):
-            if infeed_step in self.batch_cache:
-                spu_x, spu_y, lr_total_batch = self.batch_cache[infeed_step]
-            else:
-                x, lr_total_batch = self._next_infeed_batch(self.x, infeed_step)
-                y, lr_total_batch = self._next_infeed_batch(self.y, infeed_step)
-                spu_x = self.spu(
-                    _concatenate,
-                    static_argnames=('axis', 'enable_spu_cache', 'pad_ones'),
-                )(
-                    [x.partitions[pyu].to(self.spu) for pyu in x.partitions],
-                    axis=1,
-                    pad_ones=True,
-                    enable_spu_cache=self.enable_spu_cache,
-                )
-                spu_y = [y.partitions[pyu].to(self.spu) for pyu in y.partitions][0]
-                self.batch_cache[infeed_step] = (spu_x, spu_y, lr_total_batch)
+            spu_x, spu_y, lr_total_batch = self._build_batch_cache(infeed_step)
 
             spu_w, dk_arr = self.spu(
                 _batch_update_w,
@@ -499,6 +534,7 @@ class SSRegression:
                 enable_spu_cache=self.enable_spu_cache,
             )
             self.dk_norm_dict[infeed_step] = dk_arr
+            self._prefetch_batch_cache(infeed_step)
 
         return spu_w
 
@@ -549,6 +585,9 @@ class SSRegression:
         strategy: str = 'naive_sgd',
         epoch_callback: Callable[[int, Tuple[Dict, List[SPUObject]]], NoReturn] = None,
         recovery_checkpoint: Tuple[Dict, List[SPUObject]] = None,
+        infeed_prefetch_depth: int = 1,
+        batch_cache_policy: str = 'keep_first',
+        batch_cache_max_bytes: int = 0,
     ) -> None:
         """
         Fit the model according to the given training data.
@@ -585,6 +624,16 @@ class SSRegression:
                   policy_sgd(LR only) will scale the learning_rate in each update like adam but with unify factor,
                 so the batch_size can be larger and the early stop strategy can be more aggressive, which accelerates
                 training in most scenery(But not recommend for training with large regularization).
+            infeed_prefetch_depth : int, default=1
+                how many following infeed batches are sliced and shared to spu
+                while spu is computing the current batch. 0 disable.
+            batch_cache_policy : str, default=keep_first
+                how infeed batches shared to spu are cached between epochs,
+                  keep_first pins the first batches within batch_cache_max_bytes,
+                  the others are shared again on every use and still prefetched.
+                  recompute shares batches again on every use.
+            batch_cache_max_bytes : int, default=0
+                budget of the estimated share bytes cached by each spu party, 0 means no limit.
         Return:
             Final weights in SPUObject.
         """
@@ -603,6 +652,10 @@ class SSRegression:
             decay_rate,
             strategy,
         )
+        assert (
+            infeed_prefetch_depth >= 0
+        ), f"infeed_prefetch_depth should >= 0, got {infeed_prefetch_depth}"
+        self.infeed_prefetch_depth = infeed_prefetch_depth
         if recovery_checkpoint:
             start_idx = self._recovery_from_checkpoint(recovery_checkpoint)
         else:
@@ -610,7 +663,12 @@ class SSRegression:
                 base=0, num_feat=self.num_feat
             )
             start_idx = 0
-        self.batch_cache = {}
+        self.batch_cache = SPUBatchCache(
+            batch_cache_policy,
+            batch_cache_max_bytes,
+            # not a bound method, which would be a reference cycle with the model.
+            partial(drop_spu_cached_var, self.spu) if self.enable_spu_cache else None,
+        )
         self.dk_norm_dict = {}
 
         for epoch_idx in range(start_idx, epochs):
@@ -625,11 +683,8 @@ class SSRegression:
             if epoch_callback is not None:
                 self._epoch_callback(epoch_idx, epoch_callback)
 
-        if self.enable_spu_cache:
-            for s in self.batch_cache.values():
-                wait(self.spu(lambda x: spu.experimental.drop_cached_var(x))(s[0]))
-
-        self.batch_cache = {}
+        self.batch_cache.report()
+        self.batch_cache.clear()
         self.dk_norm_dict = {}
 
     def save_model(self) -> LinearModel:
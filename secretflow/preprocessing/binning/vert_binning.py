@@ -38,6 +38,7 @@ class VertBinning:
         binning_method: str = "eq_range",
         bin_num: int = 10,
         bin_names: Dict[PYU, List[str]] = {},
+        split_edges: Dict[PYU, PYUObject] = None,
     ):
         """
         Build bin substitution rules base on vdata.
@@ -56,6 +57,10 @@ class VertBinning:
                 Default: 10
             bin_names (Dict[PYU, List[str]]): which features should be binned.
                 Default: {}
+            split_edges (Dict[PYU, PYUObject]): if set, "quantile" split points are the equal frequency edges
+                of number features at each party, e.g. from quantile sketches built over batches of a reader,
+                instead of sorting each feature. PYUObject contains a Dict[str, np.ndarray].
+                Default: None
 
         Return:
             Dict[PYU, PYUObject], PYUObject contain a dict for all features' rule in this party.
@@ -100,6 +105,11 @@ class VertBinning:
                 binning_method,
                 bin_num,
                 bin_names[device],
+                (
+                    split_edges[device].data
+                    if split_edges and device in split_edges
+                    else None
+                ),
                 device=device,
             )
 
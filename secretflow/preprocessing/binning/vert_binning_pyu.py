@@ -20,6 +20,10 @@ import pyarrow as pa
 import pyarrow.compute as pc
 
 from secretflow.device import PYUObject, proxy
+from secretflow.stats.core.quantile_sketch import sketch_cut
+
+# rows of a chunk cut by split edges.
+_CUT_BATCH_ROWS = 1 << 16
 
 
 @proxy(PYUObject)
@@ -35,6 +39,7 @@ class VertBinningPyuWorker:
         binning_method: str,
         bin_num: int,
         bin_names: List[str],
+        split_edges: Dict[str, np.ndarray] = None,
     ):
         data_columns = data.column_names
         assert isinstance(
@@ -49,15 +54,18 @@ class VertBinningPyuWorker:
         self.bin_names = bin_names
         self.bin_num = bin_num
         self.binning_method = binning_method
+        self.split_edges = split_edges or {}
 
     def _build_feature_bin(
-        self, f_data: pa.ChunkedArray
+        self, f_data: pa.ChunkedArray, edges: np.ndarray = None
     ) -> Tuple[List[np.ndarray], Union[np.ndarray, List[str]], np.ndarray]:
         '''
         split one feature column into {bin_num} bins.
 
         Attributes:
             f_data: feature column to be split.
+            edges: equal frequency edges of the column for "quantile" binning, e.g. from a quantile sketch,
+                None for exact quantiles.
 
         Return:
             First: sample indices for each bins.
@@ -79,7 +87,10 @@ class VertBinningPyuWorker:
             # for number type col, first binning by pd.qcut.
             bin_num = self.bin_num
 
-            if self.binning_method == "quantile":
+            if self.binning_method == "quantile" and edges is not None:
+                split_points = edges
+                bins = sketch_cut(f_data, split_points, _CUT_BATCH_ROWS)
+            elif self.binning_method == "quantile":
                 bins, split_points = pd.qcut(
                     f_data, bin_num, labels=False, duplicates='drop', retbins=True
                 )
@@ -129,7 +140,9 @@ class VertBinningPyuWorker:
         assert isinstance(data, pa.Table), type(data)
         for f_name in self.bin_names:
             f_data = data[f_name]
-            bin_idx, split_point, else_bin = self._build_feature_bin(f_data)
+            bin_idx, split_point, else_bin = self._build_feature_bin(
+                f_data, self.split_edges.get(f_name)
+            )
             if isinstance(split_point, list):
                 # use List[str] for string column
                 # split_point means categories, so length of it need equal to bin_idx
@@ -83,6 +83,7 @@ class VertWoeBinning:
         chimerge_target_bins: int = 10,
         chimerge_target_pvalue: float = 0.1,
         audit_log_path: Dict[str, str] = {},
+        split_edges: Dict[PYU, PYUObject] = None,
     ):
         """
         Build woe substitution rules base on vdata.
@@ -117,6 +118,11 @@ class VertWoeBinning:
                 example: {'alice': '/path/to/alice/audit/filename', 'bob': 'bob/audit/filename'}
                 NOTICE: Please !!DO NOT!! touch this options, leave it empty and disabled.
                         Unless you really know this option's meaning and accept its risk.
+            split_edges: if set, equal frequency split points of "quantile" and the initialization of
+                "chimerge" are these edges of number features at each party, e.g. from quantile sketches
+                built over batches of a reader, instead of sorting each feature.
+                PYUObject contains a Dict[str, np.ndarray].
+                Default: None
 
         Return:
             Dict[PYU, PYUObject], PYUObject contain a dict for all features' rule in this party.
@@ -210,6 +216,11 @@ class VertWoeBinning:
                 chimerge_init_bins,
                 chimerge_target_bins,
                 chimerge_target_pvalue,
+                (
+                    split_edges[device].data
+                    if split_edges and device in split_edges
+                    else None
+                ),
                 device=device,
             )
 
@@ -224,7 +235,8 @@ class VertWoeBinning:
         if isinstance(self.secure_device, SPU):
             secure_label = label.to(self.secure_device)
         elif isinstance(self.secure_device, HEU):
-            secure_label = label.to(
+            # bucket sum works on a column of label.
+            secure_label = label_holder_device(lambda l: l.reshape(-1, 1))(label).to(
                 self.secure_device,
                 HEUMoveConfig(heu_audit_log=label_holder_audit_log_path),
             )
@@ -252,12 +264,13 @@ class VertWoeBinning:
                     )
                 move_config = HEUMoveConfig()
                 move_config.heu_encoder = phe.BigintEncoderParams()
-                bin_indices = worker.participant_build_sum_indices(
+                # positive samples of all bins are summed in one batch by bin codes.
+                select, bin_codes, bucket_num = worker.participant_build_bin_codes(
                     vdata.partitions[device].data
                 )
-                bins_positive = secure_label.batch_select_sum(bin_indices).to(
-                    label_holder_device
-                )
+                bucket_sums = secure_label.batch_feature_wise_bucket_sum(
+                    select, bin_codes, bucket_num, False
+                ).to(label_holder_device)
             else:
                 bin_select = worker.participant_build_sum_select(
                     vdata.partitions[device].data
@@ -271,11 +284,22 @@ class VertWoeBinning:
                 ).to(label_holder_device)
 
             bim_sum_info = worker.get_bin_sum_info().to(label_holder_device)
-            (
-                bin_stats,
-                total_counts,
-                merged_split_point_indices,
-            ) = label_holder_worker.label_holder_sum_bin(bins_positive, bim_sum_info)
+            if isinstance(self.secure_device, HEU):
+                (
+                    bin_stats,
+                    total_counts,
+                    merged_split_point_indices,
+                ) = label_holder_worker.label_holder_sum_buckets(
+                    bucket_sums, bim_sum_info
+                )
+            else:
+                (
+                    bin_stats,
+                    total_counts,
+                    merged_split_point_indices,
+                ) = label_holder_worker.label_holder_sum_bin(
+                    bins_positive, bim_sum_info
+                )
             worker.participant_update_info(
                 total_counts.to(device), merged_split_point_indices.to(device)
             )
@@ -288,7 +312,7 @@ class VertWoeBinning:
             )
             # label_holder process and save the ivs, calculate the feature_ivs
             label_holder_worker.label_holder_collect_iv_for_participant(
-                ivs, bim_sum_info
+                ivs, bim_sum_info, merged_split_point_indices
             )
             report = worker.participant_build_report(
                 woes.to(device), pos_rates.to(device), total_rates.to(device)
@@ -24,9 +24,21 @@ import pyarrow.compute as pc
 from scipy.stats import chi2
 
 from secretflow.device import PYUObject, proxy
+from secretflow.stats.core.quantile_sketch import sketch_cut
 
 from .kernels.chi_merge import apply_chimerge, update_split_points
 
+# rows of a chunk cut by split edges.
+_CUT_BATCH_ROWS = 1 << 16
+
+
+def _code_dtype(bin_count: int) -> np.dtype:
+    # np.nan values are coded by bin_count.
+    for dtype in (np.uint8, np.uint16):
+        if bin_count <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint32
+
 
 @proxy(PYUObject)
 class VertWoeBinningPyuWorker:
@@ -46,6 +58,7 @@ class VertWoeBinningPyuWorker:
         chimerge_init_bins: int,
         chimerge_target_bins: int,
         chimerge_target_pvalue: float,
+        split_edges: Dict[str, np.ndarray] = None,
     ):
         data_columns = data.column_names
         data_columns = [data_columns] if isinstance(data_columns, str) else data_columns
@@ -68,34 +81,36 @@ class VertWoeBinningPyuWorker:
         self.chimerge_init_bins = chimerge_init_bins
         self.chimerge_target_bins = chimerge_target_bins
         self.chimerge_target_chi = chi2.ppf(1 - chimerge_target_pvalue, df=1)
+        self.split_edges = split_edges or {}
         # iv results
         self.iv_results = []
 
-    def _build_feature_bin(
-        self, f_data: pa.ChunkedArray
-    ) -> Tuple[List[np.ndarray], Union[np.ndarray, List[str]], np.ndarray]:
+    def _build_feature_codes(
+        self, f_data: pa.ChunkedArray, edges: np.ndarray = None
+    ) -> Tuple[np.ndarray, Union[np.ndarray, List[str]], int]:
         '''
         split one feature column into {bin_num} bins.
 
         Attributes:
             f_data: feature column to be split.
+            edges: equal frequency edges of the column, e.g. from a quantile sketch,
+                None for exact quantiles.
 
         Return:
-            First: sample indices for each bins.
+            First: bin code of each sample, bins are coded by [0, bin count),
+                   and np.nan values are coded by bin count.
             Second: split points for number column (np.array) or
                     categories for string column (List[str])
-            Third: sample indices for np.nan values.
+            Third: bin count.
         '''
         if pa.types.is_string(f_data.type):
             # for string type col, split into bins by categories.
             categories = pc.drop_null(pc.unique(f_data)).to_pylist()
             split_points = sorted(categories)
-            bin_indices = list()
-            for b in split_points:
-                bin_index = pc.indices_nonzero(pc.equal(b, f_data)).to_numpy()
-                bin_indices.append(bin_index)
-            na_index = pc.indices_nonzero(pc.is_null(f_data)).to_numpy()
-            return bin_indices, split_points, na_index
+            bin_count = len(split_points)
+            bins = pc.index_in(f_data, value_set=pa.array(split_points, f_data.type))
+            codes = pc.fill_null(bins, bin_count).to_numpy()
+            return codes.astype(_code_dtype(bin_count)), split_points, bin_count
         else:
             # for number type col, first binning by pd.qcut.
             bin_num = (
@@ -110,70 +125,83 @@ class VertWoeBinningPyuWorker:
                 bins, split_points = pd.cut(
                     f_data, bin_num, labels=False, duplicates='drop', retbins=True
                 )
+            elif edges is not None:
+                split_points = edges
+                bins = sketch_cut(f_data, split_points, _CUT_BATCH_ROWS)
             else:
                 bins, split_points = pd.qcut(
                     f_data, bin_num, labels=False, duplicates='drop', retbins=True
                 )
-            bin_indices = list()
             assert split_points.size >= 2, f"split_points.size {split_points.size}"
-            empty_bins = [0, split_points.size - 1]
-            for b in range(split_points.size - 1):
-                bin = np.flatnonzero(bins == b)
-                if bin.size == 0:
-                    # Then, remove empty bin in pd.qcut's result.
-                    empty_bins.append(b + 1)
-                else:
-                    bin_indices.append(bin)
+            na_mask = pc.is_null(f_data, nan_is_null=True).to_numpy(
+                zero_copy_only=False
+            )
+            bins = np.asarray(bins, dtype=np.float64)
+            bins = np.where(na_mask, 0, bins).astype(np.int64)
+            # Then, remove empty bins in pd.qcut's result.
+            counts = np.bincount(bins[~na_mask], minlength=split_points.size - 1)
+            non_empty = counts > 0
+            bin_count = int(non_empty.sum())
+            remap = np.cumsum(non_empty) - 1
+            codes = np.where(na_mask, bin_count, remap[bins])
+            empty_bins = [0, split_points.size - 1] + [
+                b + 1 for b in np.flatnonzero(~non_empty)
+            ]
 
             return (
-                bin_indices,
+                codes.astype(_code_dtype(bin_count)),
                 # remove start/end value & empty bins in pd.qcut's range result.
                 # remain only left-open right-close split points
                 np.delete(split_points, empty_bins),
-                pc.indices_nonzero(pc.is_null(f_data, nan_is_null=True)).to_numpy(),
+                bin_count,
             )
 
-    def _build_feature_bins(
+    def _build_bin_codes(
         self, data: pa.Table
-    ) -> Tuple[List[np.ndarray], List[Union[np.ndarray, List[str]]], List[np.ndarray]]:
+    ) -> Tuple[np.ndarray, List[Union[np.ndarray, List[str]]], List[int]]:
         '''
         split all columns into {bin_num} bins.
         Attributes:
             data: dataset to be split.
 
         Return:
-            First: sample indices for each bins in all features.
+            First: bin code matrix of shape (samples, features), see _build_feature_codes.
             Second: split points for number column (np.array) or
                     categories for string column (List[str]) for all features.
-            Third: sample indices for np.nan values in all features.
+            Third: bin count of all features.
         '''
-        ret_bins_idx = list()
-        ret_points = list()
-        ret_else_bins = list()
         assert isinstance(data, pa.Table), type(data)
+        ret_codes = list()
+        ret_points = list()
+        ret_counts = list()
         for f_name in self.bin_names:
             f_data = data[f_name]
-            bin_idx, split_point, else_bin = self._build_feature_bin(f_data)
+            codes, split_point, bin_count = self._build_feature_codes(
+                f_data, self.split_edges.get(f_name)
+            )
             if isinstance(split_point, list):
                 # use List[str] for string column
-                # split_point means categories, so length of it need equal to bin_idx
-                assert len(bin_idx) == len(split_point), (
-                    f"len(bin_idx) {len(bin_idx)},"
-                    f" len(split_point) {len(split_point)}"
+                # split_point means categories, so length of it need equal to bin count
+                assert bin_count == len(split_point), (
+                    f"bin_count {bin_count}," f" len(split_point) {len(split_point)}"
                 )
             else:
                 # use np.array for number column
                 # split_point contain left-open right-close split points between each bins.
-                # so length of it need equal to len(bin_idx) - 1
-                assert len(bin_idx) == split_point.size + 1, (
-                    f"len(bin_idx) {len(bin_idx)},"
-                    f" split_point.size {split_point.size}"
+                # so length of it need equal to bin count - 1
+                assert bin_count == split_point.size + 1, (
+                    f"bin_count {bin_count}," f" split_point.size {split_point.size}"
                 )
-            ret_bins_idx += bin_idx
+            ret_codes.append(codes)
             ret_points.append(split_point)
-            ret_else_bins.append(else_bin)
+            ret_counts.append(bin_count)
+
+        dtype = _code_dtype(max(ret_counts, default=0))
+        bin_codes = np.empty((data.num_rows, len(ret_codes)), dtype=dtype, order='F')
+        for i, codes in enumerate(ret_codes):
+            bin_codes[:, i] = codes
 
-        return ret_bins_idx, ret_points, ret_else_bins
+        return bin_codes, ret_points, ret_counts
 
     def _get_label(self, data: pa.Table) -> np.array:
         '''
@@ -242,7 +270,7 @@ class VertWoeBinningPyuWorker:
         Attributes:
             woes: woe values for each bins in feature.
             f_name: feature name.
-            split_points: see _build_feature_bin.
+            split_points: see _build_feature_codes.
             else_woe: woe for np.nan values in feature.
             total_counts: total samples in each bins.
             else_counts: total samples for np.nan values.
@@ -384,7 +412,7 @@ class VertWoeBinningPyuWorker:
         '''
         Attributes:
             woes: woe values for all features' bins.
-            split_points: see _build_feature_bin.
+            split_points: see _build_feature_codes.
             else_woe: woe values for all features' np.nan bin.
             total_counts: total samples all features' bins.
             else_counts: np.nan samples in all features.
@@ -470,7 +498,7 @@ class VertWoeBinningPyuWorker:
         Return:
             Tuple[label, report for this party]
         '''
-        bins_idx, split_points, else_bins = self._build_feature_bins(data)
+        bin_codes, split_points, bin_sizes = self._build_bin_codes(data)
         label = self._get_label(data)
         self.total_labels = label.size
         self.total_positives = round(label.sum())
@@ -478,12 +506,17 @@ class VertWoeBinningPyuWorker:
             self.total_positives != 0 and self.total_positives != self.total_labels
         ), "All label values are the same event"
 
-        def sum_bin(bin):
-            total_count = bin.size
-            positive_count = round(label[bin].sum())
-            return (total_count, positive_count)
-
-        bins_stat = [sum_bin(b) for b in bins_idx]
+        # count samples and positive samples of all bins in one pass for each feature,
+        # the last count of each feature is for np.nan values.
+        bins_stat = list()
+        else_stats = list()
+        for f_idx, f_bin_size in enumerate(bin_sizes):
+            codes = bin_codes[:, f_idx]
+            totals = np.bincount(codes, minlength=f_bin_size + 1)
+            positives = np.bincount(codes, weights=label, minlength=f_bin_size + 1)
+            stats = [(int(t), round(p)) for t, p in zip(totals, positives)]
+            bins_stat.extend(stats[:f_bin_size])
+            else_stats.append(stats[f_bin_size])
 
         if self.binning_method == "chimerge":
             bins_stat, merged_split_point_indices = apply_chimerge(
@@ -508,15 +541,10 @@ class VertWoeBinningPyuWorker:
             )
             woes, bin_ivs = tuple(zip(*[self._calc_bin_woe_iv(*b) for b in bins_stat]))
             else_woes, else_ivs = tuple(
-                zip(*[self._calc_bin_woe_iv(*sum_bin(b)) for b in else_bins])
+                zip(*[self._calc_bin_woe_iv(*b) for b in else_stats])
             )
             else_pos_rates, else_total_rates = tuple(
-                zip(
-                    *[
-                        self._calc_rates(*sum_bin(b), total_sample_count)
-                        for b in else_bins
-                    ]
-                )
+                zip(*[self._calc_rates(*b, total_sample_count) for b in else_stats])
             )
         else:
             pos_rates, total_rates = [], []
@@ -525,7 +553,7 @@ class VertWoeBinningPyuWorker:
             else_pos_rates, else_total_rates = [], []
 
         total_counts = [b[0] for b in bins_stat]
-        else_counts = [b.size for b in else_bins]
+        else_counts = [b[0] for b in else_stats]
 
         self.accumulate_iv_info(
             bin_ivs, self.bin_names, else_ivs, self.get_split_points_sizes(split_points)
@@ -545,19 +573,35 @@ class VertWoeBinningPyuWorker:
             ),
         )
 
-    def participant_build_sum_indices(self, data: pa.Table) -> List[List[int]]:
+    def _participant_build_bins(self, data: pa.Table):
+        self.bin_codes, self.split_points, self.bin_sizes = self._build_bin_codes(data)
+        counts = [
+            np.bincount(self.bin_codes[:, i], minlength=n + 1)
+            for i, n in enumerate(self.bin_sizes)
+        ]
+        self.total_counts = [
+            int(c) for n, cnt in zip(self.bin_sizes, counts) for c in cnt[:n]
+        ]
+        self.else_counts = [int(cnt[n]) for n, cnt in zip(self.bin_sizes, counts)]
+
+    def participant_build_bin_codes(
+        self, data: pa.Table
+    ) -> Tuple[List[np.ndarray], np.ndarray, int]:
         '''
-        build sum indices for driver to calculate positive samples by HE.
+        build bin codes for driver to calculate positive samples of all bins
+        by HE bucket sum in one batch.
         Attributes:
             data: full dataset for this party.
 
         Return:
-            bin indices.
+            First: subgroup map of all samples.
+            Second: bin code matrix, see _build_bin_codes.
+            Third: bucket number, max bin count plus one for np.nan values.
         '''
-        bins_idx, self.split_points, else_bins_idx = self._build_feature_bins(data)
-        self.total_counts = [b.size for b in bins_idx]
-        self.else_counts = [b.size for b in else_bins_idx]
-        return [*bins_idx, *[e for e in else_bins_idx if e.size]]
+        self._participant_build_bins(data)
+        select = [np.ones((1, data.num_rows), dtype=np.int8)]
+        bucket_num = max(self.bin_sizes, default=0) + 1
+        return select, self.bin_codes, bucket_num
 
     def participant_build_sum_select(self, data: pa.Table) -> np.ndarray:
         '''
@@ -568,23 +612,51 @@ class VertWoeBinningPyuWorker:
         Return:
             sparse select matrix.
         '''
-        bins_idx, self.split_points, else_bins_idx = self._build_feature_bins(data)
-        self.total_counts = [b.size for b in bins_idx]
-        self.else_counts = [b.size for b in else_bins_idx]
+        self._participant_build_bins(data)
+
+        # bins of all features first, then np.nan values of features which have any.
+        offsets = np.cumsum([0] + self.bin_sizes[:-1])
+        else_features = [i for i, c in enumerate(self.else_counts) if c]
+        else_columns = np.full(len(self.bin_sizes), -1)
+        else_columns[else_features] = sum(self.bin_sizes) + np.arange(
+            len(else_features)
+        )
 
-        samples = data.shape[0]
-        select = np.zeros((samples, len(bins_idx)), np.float32)
-        for i in range(len(bins_idx)):
-            select[bins_idx[i], i] = 1.0
+        samples = data.num_rows
+        select = np.zeros(
+            (samples, sum(self.bin_sizes) + len(else_features)), np.float32
+        )
+        rows = np.arange(samples)
+        for i, n in enumerate(self.bin_sizes):
+            codes = self.bin_codes[:, i]
+            columns = np.where(codes < n, offsets[i] + codes, else_columns[i])
+            mask = columns >= 0
+            select[rows[mask], columns[mask]] = 1.0
 
-        else_select = list()
-        for i in range(len(else_bins_idx)):
-            if else_bins_idx[i].size:
-                s = np.zeros((samples, 1), np.float32)
-                s[else_bins_idx[i]] = 1.0
-                else_select.append(s)
+        return select
 
-        return np.concatenate((select, *else_select), axis=1)
+    def label_holder_sum_buckets(
+        self,
+        bucket_sums: List[np.ndarray],
+        bin_sum_info: 'ParticipantTransactionInfo',
+    ) -> Tuple[List[Tuple[int, int]], List[int], List[Union[None, int]]]:
+        """pick positive samples of bins from bucket sums, then same as label_holder_sum_bin.
+
+        Args:
+            bucket_sums (List[np.ndarray]): bucket sums of shape (features * bucket_num, 1).
+            bin_sum_info ParticipantTransactionInfo: information participant give to label_holder.
+        Returns:
+            same as label_holder_sum_bin
+        """
+        bin_sizes = bin_sum_info.split_points_sizes
+        sums = np.asarray(bucket_sums[0]).reshape(len(bin_sizes), -1)
+        bins_positive = [p for f, n in enumerate(bin_sizes) for p in sums[f, :n]]
+        else_positive = [
+            sums[f, n]
+            for f, n in enumerate(bin_sizes)
+            if bin_sum_info.else_counts[f] > 0
+        ]
+        return self.label_holder_sum_bin(bins_positive + else_positive, bin_sum_info)
 
     def _is_string_features(self):
         return self.is_string_features(self.split_points)
@@ -722,14 +794,24 @@ class VertWoeBinningPyuWorker:
         return woes, bin_ivs
 
     def label_holder_collect_iv_for_participant(
-        self, ivs: Tuple[float], transaction_info: 'ParticipantTransactionInfo'
+        self,
+        ivs: Tuple[float],
+        transaction_info: 'ParticipantTransactionInfo',
+        merged_split_point_indices: List[Union[None, List[int]]] = None,
     ):
         f_count = len(transaction_info.bin_names)
+        split_points_sizes = transaction_info.split_points_sizes
+        if merged_split_point_indices is not None:
+            # bins of number features are fewer after chimerge.
+            split_points_sizes = [
+                n if idx is None else n - len(idx)
+                for n, idx in zip(split_points_sizes, merged_split_point_indices)
+            ]
         self.accumulate_iv_info(
             ivs[:-f_count],
             transaction_info.bin_names,
             ivs[-f_count:],
-            transaction_info.split_points_sizes,
+            split_points_sizes,
         )
 
     def generate_iv_report(self, report_dict: Dict) -> Dict:
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+from typing import List, Tuple
+
+import numpy as np
 
 
 def is_nesting_list(data: List) -> bool:
@@ -26,3 +28,38 @@ def is_nesting_list(data: List) -> bool:
             data[0]
         ), f'Lengths of datum in data are different.'
     return is_list
+
+
+def flatten_arrays(data) -> Tuple[np.ndarray, Tuple]:
+    """Flatten an array or a list of arrays into one contiguous 1-D buffer.
+
+    Returns:
+        the buffer and a spec to restore the data with :py:func:`unflatten_arrays`.
+    """
+    is_list = isinstance(data, (list, tuple))
+    arrays = [np.asarray(datum) for datum in (data if is_list else [data])]
+    assert arrays, 'Data should not be None or empty.'
+    flat = np.empty(sum(arr.size for arr in arrays), dtype=np.result_type(*arrays))
+    offset = 0
+    for arr in arrays:
+        flat[offset : offset + arr.size] = arr.ravel()
+        offset += arr.size
+    spec = (is_list, tuple((arr.shape, arr.dtype.str) for arr in arrays))
+    return flat, spec
+
+
+def unflatten_arrays(flat, spec: Tuple, cast: bool = True):
+    """Restore the data flattened by :py:func:`flatten_arrays`.
+
+    Works on both numpy and jax arrays. The dtypes of the original arrays are
+    restored only if cast is True.
+    """
+    is_list, arrays = spec
+    results = []
+    offset = 0
+    for shape, dtype in arrays:
+        size = int(np.prod(shape, dtype=np.int64))
+        arr = flat[offset : offset + size].reshape(shape)
+        results.append(arr.astype(dtype) if cast else arr)
+        offset += size
+    return results if is_list else results[0]
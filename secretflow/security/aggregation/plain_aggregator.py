@@ -13,14 +13,52 @@
 # limitations under the License.
 
 
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 
-from secretflow.device import PYU, DeviceObject, PYUObject
+from secretflow.device import PYU, DeviceObject, PYUObject, wait
+from secretflow.security.aggregation._utils import flatten_arrays, unflatten_arrays
 from secretflow.security.aggregation.aggregator import Aggregator
 
 
+def _leaf_state(data, weight=None, average=False) -> Tuple[Tuple, Tuple]:
+    """Flatten the data of a party into an accumulator state (weighted sum, weight sum)."""
+    flat, spec = flatten_arrays(data)
+    if average:
+        weight = 1 if weight is None else weight
+        flat = np.multiply(flat, weight, dtype=np.result_type(flat, np.float64))
+    return (flat, 1 if weight is None else weight), spec
+
+
+def _merge_state(acc, state):
+    if acc is None:
+        return state
+    acc_sum, acc_weight = acc
+    state_sum, state_weight = state
+    assert (
+        acc_sum.shape == state_sum.shape
+    ), f'Data to aggregate have different sizes: {acc_sum.shape} vs {state_sum.shape}.'
+    # np.add allocates only one new buffer, the inputs are read-only object refs.
+    return np.add(acc_sum, state_sum), acc_weight + state_weight
+
+
+def _finalize_state(state, spec, average):
+    total, weight = state
+    if average:
+        total = total / weight
+        # keep the float average of integers like np.average, restore float dtypes only.
+        is_list, arrays = spec
+        spec = (
+            is_list,
+            tuple(
+                (shape, dtype if np.dtype(dtype).kind == 'f' else total.dtype.str)
+                for shape, dtype in arrays
+            ),
+        )
+    return unflatten_arrays(total, spec)
+
+
 class PlainAggregator(Aggregator):
     """Plaintext aggregator.
 
@@ -49,9 +87,90 @@ class PlainAggregator(Aggregator):
 
     """
 
-    def __init__(self, device: PYU):
+    def __init__(
+        self,
+        device: PYU,
+        streaming: bool = False,
+        tree_arity: int = None,
+        max_inflight: int = 2,
+    ):
+        """
+        Args:
+            device: the PYU device to aggregate on.
+            streaming: optional, whether to aggregate in streaming mode. Every party
+                flattens its data into one contiguous buffer, which is folded into a
+                running sum on the device one by one instead of stacking the data of
+                all parties, so the memory of the device does not grow with the number
+                of parties. Only takes effect when axis is 0 and weights are None or
+                one scalar per party, otherwise falls back to stacking.
+            tree_arity: optional, aggregate in a tree of the given arity, implies
+                streaming. Parties are grouped by tree_arity and the first party of
+                each group pre-aggregates the group, then the device receives at most
+                tree_arity buffers. Note that parties see the data of their groups.
+            max_inflight: optional, the max number of buffers sent to a device but not
+                folded yet in streaming mode, which bounds the memory of the device.
+        """
         assert isinstance(device, PYU), f'Accepts PYU only but got {type(device)}.'
+        assert (
+            tree_arity is None or tree_arity >= 2
+        ), f'Tree arity should be at least 2 but got {tree_arity}.'
+        assert max_inflight >= 1, f'Max inflight should be positive: {max_inflight}.'
         self.device = device
+        self.streaming = streaming or tree_arity is not None
+        self.tree_arity = tree_arity
+        self.max_inflight = max_inflight
+
+    def _can_stream(self, data: List[DeviceObject], axis, weights) -> bool:
+        if not self.streaming or axis != 0:
+            return False
+        if weights is None:
+            return True
+        return (
+            isinstance(weights, (list, tuple))
+            and len(weights) == len(data)
+            and all(isinstance(w, DeviceObject) or np.isscalar(w) for w in weights)
+        )
+
+    def _reduce_states(self, device: PYU, states: List[PYUObject]) -> PYUObject:
+        acc = None
+        pending = []
+        for state in states:
+            if len(pending) >= self.max_inflight:
+                # the buffer of a party is not sent until a former one is folded.
+                wait(pending.pop(0))
+            acc = device(_merge_state)(acc, state.to(device))
+            pending.append(acc)
+        return acc
+
+    def _stream(self, data: List[DeviceObject], weights, average) -> PYUObject:
+        if weights is None:
+            weights = [None] * len(data)
+        states = []
+        spec = None
+        for datum, weight in zip(data, weights):
+            party = datum.device if isinstance(datum.device, PYU) else self.device
+            if isinstance(weight, DeviceObject):
+                weight = weight.to(party)
+            state, datum_spec = party(_leaf_state, num_returns=2)(
+                datum.to(party), weight, average=average
+            )
+            states.append(state)
+            if spec is None:
+                spec = datum_spec
+
+        if self.tree_arity:
+            # pre-aggregate on the first party of each group, level by level.
+            while len(states) > self.tree_arity:
+                states = [
+                    self._reduce_states(
+                        states[i].device, states[i : i + self.tree_arity]
+                    )
+                    for i in range(0, len(states), self.tree_arity)
+                ]
+        state = self._reduce_states(self.device, states)
+        return self.device(_finalize_state)(
+            state, spec.to(self.device), average=average
+        )
 
     def sum(self, data: List[DeviceObject], axis=None) -> PYUObject:
         """Sum of array elements over a given axis.
@@ -64,6 +183,8 @@ class PlainAggregator(Aggregator):
             a device object holds the sum.
         """
         assert data, 'Data to aggregate should not be None or empty!'
+        if self._can_stream(data, axis, None):
+            return self._stream(data, None, average=False)
         data = [d.to(self.device) for d in data]
 
         def _sum(*data, axis):
@@ -86,6 +207,8 @@ class PlainAggregator(Aggregator):
             a device object holds the weighted average.
         """
         assert data, 'Data to aggregate should not be None or empty!'
+        if self._can_stream(data, axis, weights):
+            return self._stream(data, weights, average=True)
         data = [d.to(self.device) for d in data]
         if isinstance(weights, (list, tuple)):
             weights = [
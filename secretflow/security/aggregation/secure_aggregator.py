@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Tuple, Union
 
 import numpy as np
@@ -24,26 +25,81 @@ from secretflow.security.aggregation._utils import is_nesting_list
 from secretflow.security.diffie_hellman import DiffieHellman
 
 
+def gen_net_mask(
+    party: str, seeds: Dict[str, int], round_id: int, size: int
+) -> np.ndarray:
+    """Generate the net mask of a party for the given round.
+
+    The mask with every peer is generated by a counter-based PRG (Philox) keyed by
+    the secret they negotiated, the round is encoded into the counter, so the masks
+    of any round could be generated independently. Masks with peers larger than the
+    party are added and those with smaller ones are subtracted, then the masks are
+    cancelled out after aggregation.
+
+    Args:
+        party: the party name.
+        seeds: the secrets negotiated with peers, keyed by party name of peers.
+        round_id: the aggregation round.
+        size: the number of elements to mask.
+
+    Returns:
+        the net mask in uint64, which is added to the uint64/int64 data modulo 2^64.
+    """
+    net_mask = np.zeros(size, dtype=np.uint64)
+    for peer, seed in seeds.items():
+        if peer == party:
+            continue
+        # every round starts from a fresh block of 2^64 counters.
+        mask = np.random.Philox(seed, counter=[0, round_id, 0, 0]).random_raw(size)
+        if peer > party:
+            net_mask += mask
+        else:
+            net_mask -= mask
+    return net_mask
+
+
 @proxy(PYUObject)
 class _Masker:
-    def __init__(self, party, fxp_bits: int):
+    def __init__(self, party, fxp_bits: int, precompute: bool = True):
         self._party = party
         self._dh = DiffieHellman()
         self._pub_key, self._pri_key = self._dh.generate_key_pair()
         self._fxp_bits = fxp_bits
+        self._precompute = precompute
+        self._executor = ThreadPoolExecutor(max_workers=1) if precompute else None
+        self._pending = None
 
     def pub_key(self) -> int:
         return self._pub_key
 
     def gen_rng(self, pub_keys: Dict[str, int]) -> None:
         assert pub_keys, f'Public keys is None or empty.'
-        self._rngs = {
-            party: np.random.default_rng(
-                int(self._dh.generate_secret(self._pri_key, peer_pub_key), base=16)
-            )
+        self._seeds = {
+            party: int(self._dh.generate_secret(self._pri_key, peer_pub_key), base=16)
             for party, peer_pub_key in pub_keys.items()
             if party != self._party
         }
+        self._round = 0
+        self._pending = None
+
+    def _next_net_mask(self, size: int) -> np.ndarray:
+        round_id = self._round
+        self._round += 1
+        pending, self._pending = self._pending, None
+        if pending is not None and pending[0] == size:
+            net_mask = pending[1].result()
+        else:
+            net_mask = gen_net_mask(self._party, self._seeds, round_id, size)
+        if self._precompute:
+            # precompute the mask of next round in background, the sizes of
+            # data are usually same in every round, e.g. the model weights.
+            self._pending = (
+                size,
+                self._executor.submit(
+                    gen_net_mask, self._party, self._seeds, round_id + 1, size
+                ),
+            )
+        return net_mask
 
     def mask(
         self,
@@ -86,20 +142,23 @@ class _Masker:
                 if is_float
                 else datum * weight
             )
-            for party, rng in self._rngs.items():
-                if party == self._party:
-                    continue
-                mask = rng.integers(
-                    low=np.iinfo(np.int64).min,
-                    high=np.iinfo(np.int64).max,
-                    size=masked_datum.shape,
-                ).astype(masked_datum.dtype)
-                if party > self._party:
-                    masked_datum += mask
-                else:
-                    masked_datum -= mask
-
+            # The masks are added modulo 2^64, which is exact on 64-bit integers only.
+            assert masked_datum.dtype in (
+                np.int64,
+                np.uint64,
+            ), f'Integer data should have integer weight but got {type(weight)}.'
             masked_data.append(masked_datum)
+
+        # The masks of all peers are combined into one net mask.
+        net_mask = self._next_net_mask(sum(d.size for d in masked_data))
+        offset = 0
+        for masked_datum in masked_data:
+            masked_datum += (
+                net_mask[offset : offset + masked_datum.size]
+                .view(masked_datum.dtype)
+                .reshape(masked_datum.shape)
+            )
+            offset += masked_datum.size
         if is_list:
             return masked_data, dtype
         else:
@@ -144,13 +203,15 @@ class SecureAggregator(Aggregator):
         and does not support client dropping. For more information, please refer to
         `Practical Secure Aggregation for Privacy-Preserving Machine Learning <https://eprint.iacr.org/2017/281.pdf>`_
 
+    The masks of a round are generated by a counter-based PRG and combined into
+    one net mask per participant, and the net mask of next round is precomputed in
+    background after each round, so masking only needs one addition in a round.
+
     Warnings:
-        The SecureAggregator uses :py:meth:`numpy.random.PCG64`. There are many
-        discussions of whether PCG is a CSPRNG
-        (e.g. https://crypto.stackexchange.com/questions/77101/is-the-pcg-prng-a-csprng-or-why-not),
-        we prefer a conservative strategy unless a further security analysis came
-        up. Therefore we recommend users to use a standardized CSPRNG in industrial
-        scenarios.
+        The SecureAggregator uses :py:meth:`numpy.random.Philox`. Philox is a
+        counter-based PRG but not a standardized CSPRNG, we prefer a conservative
+        strategy unless a further security analysis came up. Therefore we recommend
+        users to use a standardized CSPRNG in industrial scenarios.
 
     Examples:
         >>> # Alice and bob are both pyu instances.
@@ -170,7 +231,22 @@ class SecureAggregator(Aggregator):
         dtype=float32)
     """
 
-    def __init__(self, device: PYU, participants: List[PYU], fxp_bits: int = 18):
+    def __init__(
+        self,
+        device: PYU,
+        participants: List[PYU],
+        fxp_bits: int = 18,
+        precompute_mask: bool = True,
+    ):
+        """
+        Args:
+            device: the PYU device to aggregate on.
+            participants: the PYU devices of participants.
+            fxp_bits: the fraction bits to encode float data.
+            precompute_mask: optional, whether to precompute the masks of next round
+                in background, which costs an extra buffer of the data size in every
+                participant.
+        """
         assert len(set(participants)) == len(
             participants
         ), 'Should not have duplicated devices.'
@@ -178,7 +254,8 @@ class SecureAggregator(Aggregator):
         self._participants = set(participants)
         self._fxp_bits = fxp_bits
         self._maskers = {
-            pyu: _Masker(pyu.party, self._fxp_bits, device=pyu) for pyu in participants
+            pyu: _Masker(pyu.party, self._fxp_bits, precompute_mask, device=pyu)
+            for pyu in participants
         }
         pub_keys = reveal(
             {pyu.party: masker.pub_key() for pyu, masker in self._maskers.items()}
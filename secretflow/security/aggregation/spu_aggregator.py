@@ -16,11 +16,34 @@
 from typing import List
 
 import jax.numpy as jnp
+import numpy as np
 
-from secretflow.device import SPU, DeviceObject, SPUObject
+from secretflow.device import PYU, SPU, DeviceObject, SPUObject, reveal, wait
+from secretflow.security.aggregation._utils import flatten_arrays, unflatten_arrays
 from secretflow.security.aggregation.aggregator import Aggregator
 
 
+def _fold(flat, weight=None, acc=None):
+    """Fold the flattened data of a party into the running (weighted sum, weight sum)."""
+    if weight is None:
+        weight = 1
+    else:
+        flat = flat * weight
+    if acc is None:
+        return flat, weight
+    acc_sum, acc_weight = acc
+    return acc_sum + flat, acc_weight + weight
+
+
+def _finalize(state, spec, average, count=None):
+    total, weight = state
+    if average:
+        # divide by the public count is more precise than the secret weight sum.
+        total = total / (count if count else weight)
+        return unflatten_arrays(total, spec, cast=False)
+    return unflatten_arrays(total, spec)
+
+
 class SPUAggregator(Aggregator):
     """Aggregator based on SPU.
 
@@ -46,9 +69,59 @@ class SPUAggregator(Aggregator):
 
     """
 
-    def __init__(self, device: SPU):
+    def __init__(self, device: SPU, streaming: bool = False, max_inflight: int = 2):
+        """
+        Args:
+            device: the SPU device to aggregate on.
+            streaming: optional, whether to aggregate in streaming mode. Every party
+                flattens its data into one contiguous buffer, which is folded into a
+                running sum on the SPU one by one instead of stacking the data of all
+                parties. Only takes effect when axis is 0 and weights are None or one
+                scalar per party, otherwise falls back to stacking.
+            max_inflight: optional, the max number of buffers sent to the SPU but not
+                folded yet in streaming mode, which bounds the memory of the SPU.
+        """
         assert isinstance(device, SPU), f'Accepts SPU only but got {type(self.device)}.'
+        assert max_inflight >= 1, f'Max inflight should be positive: {max_inflight}.'
         self.device = device
+        self.streaming = streaming
+        self.max_inflight = max_inflight
+
+    def _can_stream(self, data: List[DeviceObject], axis, weights) -> bool:
+        if not self.streaming or axis != 0:
+            return False
+        if not all(isinstance(d.device, PYU) for d in data):
+            return False
+        if weights is None:
+            return True
+        return (
+            isinstance(weights, (list, tuple))
+            and len(weights) == len(data)
+            and all(isinstance(w, DeviceObject) or np.isscalar(w) for w in weights)
+        )
+
+    def _stream(self, data: List[DeviceObject], weights, average) -> SPUObject:
+        count = len(data) if weights is None else None
+        if weights is None:
+            weights = [None] * len(data)
+        acc = None
+        spec = None
+        pending = []
+        for datum, weight in zip(data, weights):
+            if len(pending) >= self.max_inflight:
+                # the buffer of a party is not sent until a former one is folded.
+                wait(pending.pop(0))
+            flat, datum_spec = datum.device(flatten_arrays, num_returns=2)(datum)
+            if spec is None:
+                # the shapes are required to restore the data inside SPU.
+                spec = reveal(datum_spec)
+            if isinstance(weight, DeviceObject):
+                weight = weight.to(self.device)
+            acc = self.device(_fold)(flat.to(self.device), weight, acc)
+            pending.append(acc)
+        return self.device(_finalize, static_argnames=('spec', 'average', 'count'))(
+            acc, spec=spec, average=average, count=count
+        )
 
     def sum(self, data: List[DeviceObject], axis=None) -> SPUObject:
         """Sum of array elements over a given axis.
@@ -61,6 +134,8 @@ class SPUAggregator(Aggregator):
             a device object holds the sum.
         """
         assert data, 'Data to aggregate should not be None or empty!'
+        if self._can_stream(data, axis, None):
+            return self._stream(data, None, average=False)
         data = [d.to(self.device) for d in data]
 
         def _sum(*data, axis):
@@ -85,6 +160,8 @@ class SPUAggregator(Aggregator):
             a device object holds the weighted average.
         """
         assert data, 'Data to aggregate should not be None or empty!'
+        if self._can_stream(data, axis, weights):
+            return self._stream(data, weights, average=True)
         data = [d.to(self.device) for d in data]
         if isinstance(weights, (list, tuple)):
             weights = [
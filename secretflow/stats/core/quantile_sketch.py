@@ -0,0 +1,257 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+from typing import Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+
+
+class QuantileSketch:
+    """A mergeable streaming quantile sketch (KLL).
+
+    Values are kept in compactors, an item of level h stands for 2^h values.
+    A full compactor is sorted and every other item, from a random offset, is
+    promoted to the next level. The memory is O(k log(n / k)) items, and the
+    rank error of quantiles is about eps with high probability.
+
+    NaN and null values are ignored. Sketches built with the same eps, e.g. on
+    horizontal partitions, could be merged.
+
+    Args:
+        eps: the rank error bound, in (0, 1).
+        seed: seed of the random offsets.
+    """
+
+    def __init__(self, eps: float = 0.01, seed: int = None):
+        assert 0 < eps < 1, f"eps should in (0, 1), got {eps}"
+        self.eps = eps
+        self.k = max(int(math.ceil(3 / eps)), 8)
+        self.count = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.compactors: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                if items.size % 2:
+                    # the odd one stays at this level.
+                    self.compactors[level] = items[-1:]
+                    items = items[:-1]
+                else:
+                    self.compactors[level] = items[:0]
+                promoted = items[self._rng.integers(2) :: 2]
+                self.compactors[level + 1] = np.concatenate(
+                    [self.compactors[level + 1], promoted]
+                )
+            level += 1
+
+    def update(self, values: Union[np.ndarray, pa.Array, pa.ChunkedArray, Iterable]):
+        """Add a batch of values."""
+        if isinstance(values, (pa.Array, pa.ChunkedArray)):
+            values = values.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.min = np.fmin(self.min, values.min())
+        self.max = np.fmax(self.max, values.max())
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Merge other into this sketch, returns self."""
+        assert (
+            self.k == other.k
+        ), f"can not merge sketches of eps {self.eps}, {other.eps}"
+        if other.count == 0:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.count += other.count
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self._compress()
+        return self
+
+    @property
+    def num_retained(self) -> int:
+        return sum(c.size for c in self.compactors)
+
+    def _weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate(
+            [np.full(c.size, 1 << level) for level, c in enumerate(self.compactors)]
+        )
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q: Union[float, List[float], np.ndarray]) -> np.ndarray:
+        """Approximate quantiles, like np.quantile with linear interpolation
+        when nothing has been compacted yet."""
+        qs = np.asarray(q, dtype=np.float64)
+        assert np.all((qs >= 0) & (qs <= 1)), f"quantiles should in [0, 1], got {q}"
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+        if len(self.compactors) == 1:
+            return np.quantile(self.compactors[0], qs)
+        items, cum_weights = self._weighted_items()
+        idx = np.searchsorted(cum_weights, qs * self.count, side='left')
+        ret = items[np.minimum(idx, items.size - 1)]
+        # min and max are exact.
+        ret = np.where(qs == 0, self.min, ret)
+        ret = np.where(qs == 1, self.max, ret)
+        return ret
+
+    def rank(self, x: float) -> float:
+        """Approximate normalized rank of x, i.e. the fraction of values <= x."""
+        if self.count == 0:
+            return np.nan
+        items, cum_weights = self._weighted_items()
+        idx = np.searchsorted(items, x, side='right')
+        return 0.0 if idx == 0 else cum_weights[idx - 1] / self.count
+
+
+def build_sketches(
+    batches: Iterable[pa.Table], columns: List[str], eps: float = 0.01
+) -> Dict[str, QuantileSketch]:
+    """Build a sketch for each column in one streaming pass over record batches."""
+    sketches = {c: QuantileSketch(eps) for c in columns}
+    for batch in batches:
+        for c in columns:
+            sketches[c].update(batch[c])
+    return sketches
+
+
+def update_sketches(
+    sketches: Union[None, Dict[str, QuantileSketch]],
+    batch: pa.Table,
+    columns: List[str],
+    eps: float = 0.01,
+) -> Dict[str, QuantileSketch]:
+    """Merge the sketches of a batch into sketches, None means no batch before.
+
+    So sketches could be built remotely batch by batch, e.g. over batches of a reader,
+    and only the sketches are kept between batches.
+    """
+    batch_sketches = build_sketches([batch], columns, eps)
+    if sketches is None:
+        return batch_sketches
+    for c in columns:
+        sketches[c].merge(batch_sketches[c])
+    return sketches
+
+
+def merge_sketches(sketches: Iterable[QuantileSketch]) -> QuantileSketch:
+    """Merge sketches of the same column, e.g. from horizontal partitions."""
+    sketches = list(sketches)
+    assert len(sketches) > 0, "nothing to merge"
+    merged = QuantileSketch(sketches[0].eps)
+    for s in sketches:
+        merged.merge(s)
+    return merged
+
+
+def _float_chunks(
+    x: Union[np.ndarray, pa.Array, pa.ChunkedArray], batch_size: int
+) -> Iterable[np.ndarray]:
+    """Yield x as float64 arrays of at most batch_size values, only one chunk is converted at a time."""
+    if isinstance(x, pa.Array):
+        x = pa.chunked_array([x])
+    if isinstance(x, pa.ChunkedArray):
+        for chunk in x.chunks:
+            for start in range(0, len(chunk), batch_size):
+                yield chunk.slice(start, batch_size).cast(pa.float64()).to_numpy(
+                    zero_copy_only=False
+                )
+    else:
+        x = np.asarray(x).ravel()
+        for start in range(0, x.size, batch_size):
+            yield np.asarray(x[start : start + batch_size], dtype=np.float64)
+
+
+def sketch_edges(sketch: QuantileSketch, bin_num: int) -> np.ndarray:
+    """Equal frequency bin edges from a sketch, duplicated edges are dropped like pd.qcut."""
+    return np.unique(sketch.quantile(np.linspace(0, 1, bin_num + 1)))
+
+
+def sketches_edges(
+    sketches: Union[None, Dict[str, QuantileSketch]], bin_num: int
+) -> Dict[str, np.ndarray]:
+    """sketch_edges of each column, an empty dict if no sketch."""
+    if sketches is None:
+        return {}
+    return {c: sketch_edges(s, bin_num) for c, s in sketches.items()}
+
+
+def sketch_cut(
+    x: Union[np.ndarray, pa.Array, pa.ChunkedArray],
+    edges: np.ndarray,
+    batch_size: int = 1 << 16,
+) -> np.ndarray:
+    """Bins of each value by edges of sketch_edges, NaN for NaN values.
+
+    x is cut chunk by chunk, so only the float64 bins of the whole column are allocated.
+    """
+    bins = np.empty(len(x), dtype=np.float64)
+    if edges.size < 2:
+        # all values are the same, pd.qcut gives no bins either.
+        bins.fill(np.nan)
+        return bins
+    start = 0
+    for chunk in _float_chunks(x, batch_size):
+        # right-closed bins, the first one includes the min, like pd.qcut.
+        b = np.searchsorted(edges, chunk, side='left') - 1
+        b = np.clip(b, 0, edges.size - 2).astype(np.float64)
+        b[np.isnan(chunk)] = np.nan
+        bins[start : start + chunk.size] = b
+        start += chunk.size
+    return bins
+
+
+def sketch_qcut(
+    x: Union[np.ndarray, pa.Array, pa.ChunkedArray],
+    bin_num: int,
+    eps: float = 0.01,
+    batch_size: int = 1 << 16,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Equal frequency binning like pd.qcut(x, bin_num, labels=False, duplicates='drop', retbins=True),
+    but the bin edges are quantiles of a sketch, so x is not sorted.
+
+    x is read in chunks of batch_size values twice, once to build the sketch and
+    once to cut.
+
+    Returns:
+        bins of each value, NaN for NaN values, and the bin edges.
+    """
+    sketch = QuantileSketch(eps)
+    for chunk in _float_chunks(x, batch_size):
+        sketch.update(chunk)
+    edges = sketch_edges(sketch, bin_num)
+    return sketch_cut(x, edges, batch_size), edges
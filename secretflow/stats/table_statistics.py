@@ -12,18 +12,244 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Union
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from secretflow.data.vertical import VDataFrame
+from secretflow.device import PYU, PYUObject, reveal
+from secretflow.stats.core.quantile_sketch import QuantileSketch
 
+# elements of the numeric block processed at once, about 8MB of float64.
+_BLOCK_ELEMENTS = 1 << 20
 
-def table_statistics(table: Union[pd.DataFrame, VDataFrame]) -> pd.DataFrame:
+_QUANTILES = [0.25, 0.5, 0.75]
+
+# sums of x^k and of (x - pilot)^k, k = 1..4.
+_RAW_SUMS = ["s1", "s2", "s3", "s4"]
+_SHIFTED_SUMS = ["d1", "d2", "d3", "d4"]
+
+
+def _block_rows(num_cols: int, block_rows: int = None) -> int:
+    if block_rows is None:
+        block_rows = _BLOCK_ELEMENTS // max(num_cols, 1)
+    return max(block_rows, 1)
+
+
+def _pandas_blocks(
+    df: pd.DataFrame, numeric_idx: List[int], block_rows: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    for start in range(0, df.shape[0], block_rows):
+        block = df.iloc[start : start + block_rows]
+        yield (
+            # row major, so the sums of a column do not depend on the other columns.
+            np.ascontiguousarray(
+                block.iloc[:, numeric_idx].to_numpy(dtype=np.float64, na_value=np.nan)
+            ),
+            block.isna().sum().to_numpy(),
+        )
+
+
+def _arrow_blocks(
+    table: pa.Table, numeric_idx: List[int], block_rows: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    for batch in table.to_batches(max_chunksize=block_rows):
+        values = np.empty((batch.num_rows, len(numeric_idx)), dtype=np.float64)
+        for j, i in enumerate(numeric_idx):
+            values[:, j] = (
+                batch.column(i).cast(pa.float64()).to_numpy(zero_copy_only=False)
+            )
+        na = np.array([batch.column(i).null_count for i in range(batch.num_columns)])
+        # NaN of float columns is not null in arrow, but NA in pandas.
+        na[numeric_idx] = np.isnan(values).sum(axis=0)
+        yield values, na
+
+
+def _arrow_numeric(t: pa.DataType) -> bool:
+    return (
+        pa.types.is_integer(t)
+        or pa.types.is_floating(t)
+        or pa.types.is_boolean(t)
+        or pa.types.is_decimal(t)
+    )
+
+
+def _column_values(data: Union[pd.DataFrame, pa.Table], i: int) -> np.ndarray:
+    if isinstance(data, pd.DataFrame):
+        values = data.iloc[:, i].to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        values = data.column(i).cast(pa.float64()).to_numpy(zero_copy_only=False)
+    return values[~np.isnan(values)]
+
+
+class _Summarizer:
+    """Accumulate the partial summary of a partition batch by batch, see _summarize.
+
+    Only counts, extrema, power sums and sketches are kept between batches, so a
+    partition could be summarized over batches of a reader if quantile_sketch_eps
+    is given, otherwise exact quantiles need the whole partition in summary.
+    """
+
+    def __init__(self, block_rows: int = None, quantile_sketch_eps: float = None):
+        self.block_rows = block_rows
+        self.quantile_sketch_eps = quantile_sketch_eps
+        self.columns = None
+
+    def _begin(self, data):
+        if isinstance(data, pd.DataFrame):
+            self.columns = list(data.columns)
+            self.dtypes = list(data.dtypes)
+            self.numeric = [
+                pd.api.types.is_numeric_dtype(t)
+                and not pd.api.types.is_complex_dtype(t)
+                for t in self.dtypes
+            ]
+            self.number = [
+                n and not pd.api.types.is_bool_dtype(t)
+                for n, t in zip(self.numeric, self.dtypes)
+            ]
+        else:
+            types = [f.type for f in data.schema]
+            self.columns = data.column_names
+            self.dtypes = [np.dtype(t.to_pandas_dtype()) for t in types]
+            self.numeric = [_arrow_numeric(t) for t in types]
+            self.number = [
+                n and not pa.types.is_boolean(t) for n, t in zip(self.numeric, types)
+            ]
+        self.numeric_idx = [i for i, n in enumerate(self.numeric) if n]
+        k = len(self.numeric_idx)
+        self.rows = 0
+        self.count_na = np.zeros(len(self.columns), dtype=np.int64)
+        self.vmin = np.full(k, np.nan)
+        self.vmax = np.full(k, np.nan)
+        self.pilot = np.full(k, np.nan)
+        self.sums = np.zeros((len(_RAW_SUMS) + len(_SHIFTED_SUMS), k))
+        self.sketches = (
+            [QuantileSketch(self.quantile_sketch_eps) for _ in range(k)]
+            if self.quantile_sketch_eps
+            else None
+        )
+
+    def update(self, data) -> '_Summarizer':
+        """accumulate a batch, batches must have the same columns."""
+        if not isinstance(data, (pd.DataFrame, pa.Table)):
+            data = data.to_arrow()
+        if self.columns is None:
+            self._begin(data)
+        blocks = _pandas_blocks if isinstance(data, pd.DataFrame) else _arrow_blocks
+        numeric_idx, k = self.numeric_idx, len(self.numeric_idx)
+        block_rows = _block_rows(len(self.columns), self.block_rows)
+        # arrays of a summarizer passed between remote calls are read-only.
+        self.count_na = self.count_na.copy()
+        self.sums = self.sums.copy()
+        for values, na in blocks(data, numeric_idx, block_rows):
+            self.rows += values.shape[0]
+            self.count_na += na
+            if values.shape[0] == 0 or k == 0:
+                continue
+            mask = ~np.isnan(values)
+            if self.sketches:
+                for j, sketch in enumerate(self.sketches):
+                    sketch.update(values[:, j])
+            self.vmin = np.fmin(self.vmin, np.fmin.reduce(values, axis=0))
+            self.vmax = np.fmax(self.vmax, np.fmax.reduce(values, axis=0))
+            # shift by the first valid value, so central moments derived from power
+            # sums do not suffer from cancellation when the mean is far from zero.
+            first = values[mask.argmax(axis=0), np.arange(k)]
+            self.pilot = np.where(np.isnan(self.pilot), first, self.pilot)
+            sums = self.sums
+            for offset, x in ((0, values), (len(_RAW_SUMS), values - self.pilot)):
+                x = np.where(mask, x, 0)
+                x2 = x * x
+                sums[offset] += x.sum(axis=0)
+                sums[offset + 1] += x2.sum(axis=0)
+                sums[offset + 2] += (x2 * x).sum(axis=0)
+                sums[offset + 3] += (x2 * x2).sum(axis=0)
+        return self
+
+    def summary(self, data=None) -> pd.DataFrame:
+        """the partial summary, data is the whole partition for exact quantiles."""
+        assert self.columns is not None, "no batch is summarized"
+        numeric_idx = self.numeric_idx
+        quantiles = np.full((len(numeric_idx), len(_QUANTILES)), np.nan)
+        for j, i in enumerate(numeric_idx):
+            if self.sketches:
+                quantiles[j] = self.sketches[j].quantile(_QUANTILES)
+            elif self.count_na[i] < self.rows:
+                assert data is not None, "exact quantiles need the whole partition"
+                if not isinstance(data, (pd.DataFrame, pa.Table)):
+                    data = data.to_arrow()
+                quantiles[j] = np.quantile(_column_values(data, i), _QUANTILES)
+
+        summary = pd.DataFrame(index=pd.Index(self.columns))
+        summary["datatype"] = pd.Series(self.dtypes, index=summary.index, dtype=object)
+        summary["numeric"] = self.numeric
+        summary["number"] = self.number
+        summary["count"] = self.rows - self.count_na
+        summary["count_na"] = self.count_na
+        for name, value in [("min", self.vmin), ("max", self.vmax)] + list(
+            zip(_RAW_SUMS + _SHIFTED_SUMS, self.sums)
+        ):
+            summary[name] = np.nan
+            summary.iloc[numeric_idx, summary.columns.get_loc(name)] = value
+        for j in range(len(_QUANTILES)):
+            name = f"q{j + 1}"
+            summary[name] = np.nan
+            summary.iloc[numeric_idx, summary.columns.get_loc(name)] = quantiles[:, j]
+        return summary
+
+
+def _summarize(
+    data, block_rows: int = None, quantile_sketch_eps: float = None
+) -> pd.DataFrame:
+    """Summarize each column of a partition in one pass over row blocks.
+
+    Counts, extrema and power sums are accumulated block by block, only a block
+    of the numeric columns is converted to float64 at a time. Quantiles are
+    computed in a second pass, one column at a time, or by quantile sketches
+    in the same pass if quantile_sketch_eps is given.
+
+    Args:
+        data: pd.DataFrame, pa.Table or a dataframe with to_arrow, e.g. polars.
+        block_rows: rows of a block, defaults to fit _BLOCK_ELEMENTS.
+        quantile_sketch_eps: rank error of approximate quantiles, None for exact quantiles.
+
+    Returns:
+        a pd.DataFrame indexed by column names, with the partial results
+        which are combined by table_statistics.
+    """
+    if not isinstance(data, (pd.DataFrame, pa.Table)):
+        data = data.to_arrow()
+    return _Summarizer(block_rows, quantile_sketch_eps).update(data).summary(data)
+
+
+def _update_summarizer(
+    summarizer: Union[None, _Summarizer], data, quantile_sketch_eps: float
+) -> _Summarizer:
+    if summarizer is None:
+        summarizer = _Summarizer(quantile_sketch_eps=quantile_sketch_eps)
+    return summarizer.update(data)
+
+
+def _zero_out_fperr(x: np.ndarray) -> np.ndarray:
+    return np.where(np.abs(x) < 1e-14, 0, x)
+
+
+def table_statistics(
+    table: Union[pd.DataFrame, VDataFrame], quantile_sketch_eps: float = None
+) -> pd.DataFrame:
     """Get table statistics for a pd.DataFrame or VDataFrame.
 
+    All statistics of a partition are summarized by a fused kernel in one
+    remote call, i.e. a single pass over row blocks for counts, extrema and
+    power sums, plus a pass for quantiles.
+
     Args:
         table: Union[pd.DataFrame, VDataFrame]
+        quantile_sketch_eps: if set, q1, q2 and q3 are approximated by quantile sketches
+            with this rank error in the single pass, instead of sorting each column.
     Returns:
         table_statistics: pd.DataFrame
             including each column's datatype, total_count, count, count_na, na_ratio, min, max, mean
@@ -39,47 +265,118 @@ def table_statistics(table: Union[pd.DataFrame, VDataFrame]) -> pd.DataFrame:
     assert isinstance(
         table, (pd.DataFrame, VDataFrame)
     ), "table must be a pd.DataFrame or VDataFrame"
-    index = table.columns
-    result = pd.DataFrame(index=index)
-    result["datatype"] = table.dtypes
-    result["total_count"] = table.shape[0]
-    result["count(non-NA count)"] = table.count()
-    result["count_na(NA count)"] = table.isna().sum()
-    result["na_ratio"] = table.isna().sum() / table.shape[0]
-    result["min"] = table.min(numeric_only=True)
-    result["max"] = table.max(numeric_only=True)
-    result["mean"] = table.mean(numeric_only=True)
-    result["var(variance)"] = table.var(numeric_only=True)
-    result["std(standard deviation)"] = table.std(numeric_only=True)
-    result["sem(standard error)"] = table.sem(numeric_only=True)
-    result["skew"] = table.skew(numeric_only=True)
-    result["kurtosis"] = table.kurtosis(numeric_only=True)
-    result["q1(first quartile)"] = table.quantile(0.25)
-    result["q2(second quartile, median)"] = table.quantile(0.5)
-    result["q3(third quartile)"] = table.quantile(0.75)
-    result["moment_2"] = table.select_dtypes("number").pow(2).mean(numeric_only=True)
-    result["moment_3"] = table.select_dtypes("number").pow(3).mean(numeric_only=True)
-    result["moment_4"] = table.select_dtypes("number").pow(4).mean(numeric_only=True)
-    result["central_moment_2"] = (
-        table.subtract(result["mean"])
-        .select_dtypes("number")
-        .pow(2)
-        .mean(numeric_only=True)
-    )
-    result["central_moment_3"] = (
-        table.subtract(result["mean"])
-        .select_dtypes("number")
-        .pow(3)
-        .mean(numeric_only=True)
-    )
-    result["central_moment_4"] = (
-        table.subtract(result["mean"])
-        .select_dtypes("number")
-        .pow(4)
-        .mean(numeric_only=True)
+    if isinstance(table, pd.DataFrame):
+        summary = _summarize(table, quantile_sketch_eps=quantile_sketch_eps)
+    else:
+        summary = pd.concat(
+            reveal(
+                [
+                    p.reduce_func(_summarize, quantile_sketch_eps=quantile_sketch_eps)
+                    for p in table.partitions.values()
+                ]
+            )
+        )
+    return _combine(summary, table.columns)
+
+
+def table_statistics_from_batches(
+    batches: Iterable[Dict[PYU, PYUObject]],
+    columns: List[str],
+    quantile_sketch_eps: float,
+) -> pd.DataFrame:
+    """Get table statistics of a vertical table read batch by batch, e.g. by a reader.
+
+    Each party keeps only the partial summary of its partition between batches,
+    so the table is never fully resident. Quantiles are approximated by quantile
+    sketches, since exact quantiles need the whole partition.
+
+    Args:
+        batches: aligned batches, {party: pa.Table or pd.DataFrame of the batch at party}.
+        columns: columns of the result in order.
+        quantile_sketch_eps: rank error of the quantile sketches, should > 0.
+    Returns:
+        the same as table_statistics.
+    """
+    assert (
+        quantile_sketch_eps and quantile_sketch_eps > 0
+    ), f"quantile_sketch_eps should > 0, got {quantile_sketch_eps}"
+    summarizers = {}
+    for batch in batches:
+        for pyu, data in batch.items():
+            summarizers[pyu] = pyu(_update_summarizer)(
+                summarizers.get(pyu), data, quantile_sketch_eps
+            )
+    assert summarizers, "no batch is read"
+    summary = pd.concat(
+        reveal([pyu(lambda s: s.summary())(s) for pyu, s in summarizers.items()])
     )
-    result["sum"] = table.sum(numeric_only=True)
-    result["sum_2"] = table.select_dtypes("number").pow(2).sum(numeric_only=True)
-    result["sum_3"] = table.select_dtypes("number").pow(3).sum(numeric_only=True)
-    result["sum_4"] = table.select_dtypes("number").pow(4).sum(numeric_only=True)
+    return _combine(summary, columns)
+
+
+def _combine(summary: pd.DataFrame, index) -> pd.DataFrame:
+    summary = summary.reindex(index)
+
+    numeric = summary["numeric"].to_numpy(dtype=bool)
+    number = summary["number"].to_numpy(dtype=bool)
+    n = summary["count"].to_numpy(dtype=np.float64)
+    s1, s2, s3, s4 = (summary[c].to_numpy(dtype=np.float64) for c in _RAW_SUMS)
+    d1, d2, d3, d4 = (summary[c].to_numpy(dtype=np.float64) for c in _SHIFTED_SUMS)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # sums of (x - mean)^k derived from the shifted power sums.
+        m2 = np.maximum(d2 - d1 * d1 / n, 0)
+        m3 = d3 - 3 * d1 * d2 / n + 2 * d1**3 / n**2
+        m4 = d4 - 4 * d1 * d3 / n + 6 * d1**2 * d2 / n**2 - 3 * d1**4 / n**3
+        mean = s1 / n
+        var = np.where(n > 1, m2 / (n - 1), np.nan)
+        std = np.sqrt(var)
+        sem = std / np.sqrt(n)
+
+        # bias corrected, the same as pandas.
+        zm2, zm3 = _zero_out_fperr(m2), _zero_out_fperr(m3)
+        skew = (n * (n - 1) ** 0.5 / (n - 2)) * (zm3 / zm2**1.5)
+        skew = np.where(zm2 == 0, 0, skew)
+        skew = np.where(n < 3, np.nan, skew)
+        numer = _zero_out_fperr(n * (n + 1) * (n - 1) * m4)
+        denom = _zero_out_fperr((n - 2) * (n - 3) * m2**2)
+        adj = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        kurt = np.where(denom == 0, 0, numer / denom - adj)
+        kurt = np.where(n < 4, np.nan, kurt)
+        moments = [s / n for s in (s2, s3, s4)]
+        central_moments = [m / n for m in (m2, m3, m4)]
+
+    def _numeric(x):
+        return np.where(numeric, x, np.nan)
+
+    def _number(x):
+        return np.where(number, x, np.nan)
+
+    total_count = summary["count"] + summary["count_na"]
+    result = pd.DataFrame(index=index)
+    result["datatype"] = summary["datatype"]
+    result["total_count"] = total_count
+    result["count(non-NA count)"] = summary["count"]
+    result["count_na(NA count)"] = summary["count_na"]
+    result["na_ratio"] = summary["count_na"] / total_count
+    result["min"] = summary["min"]
+    result["max"] = summary["max"]
+    result["mean"] = _numeric(mean)
+    result["var(variance)"] = _numeric(var)
+    result["std(standard deviation)"] = _numeric(std)
+    result["sem(standard error)"] = _numeric(sem)
+    result["skew"] = _numeric(skew)
+    result["kurtosis"] = _numeric(kurt)
+    result["q1(first quartile)"] = summary["q1"]
+    result["q2(second quartile, median)"] = summary["q2"]
+    result["q3(third quartile)"] = summary["q3"]
+    result["moment_2"] = _number(moments[0])
+    result["moment_3"] = _number(moments[1])
+    result["moment_4"] = _number(moments[2])
+    result["central_moment_2"] = _numeric(central_moments[0])
+    result["central_moment_3"] = _numeric(central_moments[1])
+    result["central_moment_4"] = _numeric(central_moments[2])
+    result["sum"] = _numeric(s1)
+    result["sum_2"] = _number(s2)
+    result["sum_3"] = _number(s3)
+    result["sum_4"] = _number(s4)
     return result
@@ -0,0 +1,90 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Profile the import time of a module, and report the cumulative cost of each package.
+
+The module is imported in a new python process with `-X importtime`, the self time of
+every imported module is summed up to its package, e.g. secretflow.device or jax, so
+the cost of each package is not counted twice like the cumulative time of importtime.
+
+Usage:
+    python -m secretflow.utils.import_profile secretflow.device --depth 2 --top 20
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+_IMPORTTIME_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def _package_of(module: str, depth: int) -> str:
+    parts = module.split('.')
+    # only split secretflow into sub packages, third-party packages are reported as a whole.
+    if parts[0] in ('secretflow', 'secretflow_fl'):
+        return '.'.join(parts[:depth])
+    return parts[0]
+
+
+def parse_importtime(output: str, depth: int = 2) -> Dict[str, float]:
+    """Sum up the self time in seconds of modules by package from -X importtime output."""
+    costs = defaultdict(float)
+    for line in output.splitlines():
+        m = _IMPORTTIME_PATTERN.match(line)
+        if m:
+            costs[_package_of(m[3], depth)] += int(m[1]) / 1e6
+    return dict(costs)
+
+
+def profile_import(
+    module: str, depth: int = 2
+) -> Tuple[float, List[Tuple[str, float]]]:
+    """Import module in a new process.
+
+    Returns:
+        total import time in seconds and the cost of each package in descending order.
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f'import {module} fail: {proc.stderr[-2000:]}')
+    costs = parse_importtime(proc.stderr, depth)
+    total = sum(costs.values())
+    return total, sorted(costs.items(), key=lambda x: x[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('module', nargs='?', default='secretflow')
+    parser.add_argument(
+        '--depth', type=int, default=2, help='depth of secretflow packages'
+    )
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    total, costs = profile_import(args.module, args.depth)
+    print(f'import {args.module}: {total * 1e3:.1f}ms')
+    print(f'{"package":<48} {"ms":>10} {"%":>6}')
+    for package, cost in costs[: args.top]:
+        print(f'{package:<48} {cost * 1e3:>10.1f} {cost / total * 100:>6.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -279,7 +279,11 @@ if __name__ == "__main__":
         package_data=package_data,
         install_requires=install_requires,
         ext_modules=ext_modules,
-        extras_require={"dev": ["pylint"]},
+        extras_require={
+            "dev": ["pylint"],
+            # optional codecs of cross-silo message compression.
+            "compression": ["lz4", "zstandard"],
+        },
         cmdclass=dict(
             build_ext=BuildBazelExtension, clean=CleanCommand, cleanall=CleanCommand
         ),
@@ -0,0 +1,93 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from secretflow.component.core import make_storage
+from secretflow.component.core.checkpoint import Checkpoint
+from secretflow.device import PYU
+from secretflow.spec.v1.data_pb2 import DistData, StorageConfig
+
+
+def test_checkpoint(sf_simulation_setup_devices, tmp_path):
+    storage = make_storage(
+        StorageConfig(
+            type="local_fs", local_fs=StorageConfig.LocalFSConfig(wd=str(tmp_path))
+        )
+    )
+    parties = ["alice", "bob"]
+    args = {"epochs": 3, "learning_rate": 0.1}
+
+    def _payload(step: int) -> DistData:
+        refs = []
+        for party in parties:
+            uri = f"model_{step}/{party}"
+            with storage.get_writer(uri) as f:
+                f.write(f"{party}_{step}".encode())
+            refs.append(DistData.DataRef(uri=uri, party=party, format="pickle"))
+        return DistData(name=f"model_{step}", type="test", data_refs=refs)
+
+    cp = Checkpoint("cp", args, parties, keep_last=2)
+    assert cp.load(storage) is None
+    for step in range(4):
+        cp.dump(storage, step, _payload(step))
+    cp.wait()
+
+    # expired steps and their payloads are removed.
+    for step in range(4):
+        expired = step < 2
+        assert storage.exists(f"cp_{step}") != expired
+        for party in parties:
+            assert storage.exists(f"model_{step}/{party}") != expired
+
+    payload = Checkpoint("cp", dict(args), parties).load(storage)
+    assert payload.name == "model_3"
+
+    # a checkpoint of other args is not used.
+    assert Checkpoint("cp", {**args, "epochs": 4}, parties).load(storage) is None
+
+    # steps after a new dumped step are stale.
+    cp = Checkpoint("cp", args, parties, keep_last=0)
+    cp.dump(storage, 2, _payload(2))
+    assert cp.load(storage).name == "model_2"
+
+
+def test_checkpoint_keep_all_and_saved(sf_simulation_setup_devices, tmp_path):
+    storage = make_storage(
+        StorageConfig(
+            type="local_fs", local_fs=StorageConfig.LocalFSConfig(wd=str(tmp_path))
+        )
+    )
+    parties = ["alice", "bob"]
+    args = {"epochs": 3}
+
+    def _write(uri: str, data: bytes):
+        with storage.get_writer(uri) as f:
+            f.write(data)
+
+    # all steps are kept by default, and payload files are saved in background.
+    cp = Checkpoint("cp", args, parties)
+    for step in range(4):
+        refs, saved = [], []
+        for party in parties:
+            uri = f"model_{step}/{party}"
+            saved.append(PYU(party)(_write)(uri, f"{party}_{step}".encode()))
+            refs.append(DistData.DataRef(uri=uri, party=party, format="pickle"))
+        payload = DistData(name=f"model_{step}", type="test", data_refs=refs)
+        cp.dump(storage, step, payload, saved)
+    cp.wait()
+
+    for step in range(4):
+        assert storage.exists(f"cp_{step}")
+        for party in parties:
+            assert storage.exists(f"model_{step}/{party}")
+    assert Checkpoint("cp", args, parties).load(storage).name == "model_3"
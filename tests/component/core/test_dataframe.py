@@ -0,0 +1,169 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from secretflow.component.core import (
+    CompPartition,
+    CompVDataFrame,
+    CompVDataFrameReader,
+    ParquetWriteOptions,
+    VTable,
+    VTableField,
+    VTableFieldKind,
+    VTableFormat,
+    VTableParty,
+    VTableSchema,
+    make_storage,
+    write_orc,
+)
+from secretflow.component.core.dataframe_io import new_reader_proxy
+from secretflow.device.driver import reveal
+from secretflow.error_system.exceptions import DataFormatError, NotSupportedError
+from secretflow.spec.v1.data_pb2 import StorageConfig
+
+
+def test_load_columns(sf_simulation_setup_devices, tmp_path):
+    storage = make_storage(
+        StorageConfig(
+            type="local_fs", local_fs=StorageConfig.LocalFSConfig(wd=str(tmp_path))
+        )
+    )
+    datas = {
+        "alice": {"a1": [1.0, 2.0], "a2": [3.0, 4.0], "a3": [5.0, 6.0]},
+        "bob": {"b1": [7.0, 8.0], "b2": [9.0, 10.0]},
+    }
+    parties = []
+    for party, data in datas.items():
+        uri = f"test_load_columns/{party}.orc"
+        write_orc(pa.table(data), storage.get_writer(uri))
+        schema = VTableSchema(
+            [VTableField(c, "float", VTableFieldKind.FEATURE) for c in data]
+        )
+        parties.append(VTableParty(party, uri, "orc", schema=schema))
+    vtbl = VTable("test_load_columns", parties, line_count=2)
+
+    # only the selected columns are read.
+    df = CompVDataFrame.load(storage, vtbl, columns=["a3", "a1"])
+    assert df.columns == ["a3", "a1"]
+    assert df.unloaded_columns == ["a2", "b1", "b2"]
+
+    df = df.load_columns(["b2"])
+    assert df.columns == ["a3", "a1", "b2"]
+    assert df.unloaded_columns == ["a2", "b1"]
+
+    # the order of source table is kept after all columns are read.
+    df = df.load_columns()
+    assert df.columns == ["a1", "a2", "a3", "b1", "b2"]
+    assert df.unloaded_columns == []
+    for pyu, p in df.partitions.items():
+        assert reveal(p.obj).to_pydict() == datas[pyu.party]
+
+    # a full load has nothing to read later.
+    assert CompVDataFrame.load(storage, vtbl).unloaded_columns == []
+
+
+def test_reader_aligned(sf_simulation_setup_devices, tmp_path):
+    storage = make_storage(
+        StorageConfig(
+            type="local_fs", local_fs=StorageConfig.LocalFSConfig(wd=str(tmp_path))
+        )
+    )
+    parties = []
+    for party, rows in [("alice", 3), ("bob", 5)]:
+        uri = f"test_reader_aligned/{party}.orc"
+        write_orc(pa.table({party: [1.0] * rows}), storage.get_writer(uri))
+        schema = VTableSchema([VTableField(party, "float", VTableFieldKind.FEATURE)])
+        parties.append(VTableParty(party, uri, "orc", schema=schema))
+    vtbl = VTable("test_reader_aligned", parties, line_count=5)
+
+    # rows of each batch are checked before any transform.
+    with CompVDataFrameReader(storage, None, vtbl, batch_size=4) as reader:
+        with pytest.raises(DataFormatError):
+            reader.read_next()
+
+
+def test_parquet_row_groups(sf_simulation_setup_devices, tmp_path):
+    storage = make_storage(
+        StorageConfig(
+            type="local_fs", local_fs=StorageConfig.LocalFSConfig(wd=str(tmp_path))
+        )
+    )
+    alice = sf_simulation_setup_devices.alice
+    data = {"id": list(range(100)), "v": [float(i) for i in range(100)]}
+    schema = VTableSchema(
+        [
+            VTableField("id", "int", VTableFieldKind.ID),
+            VTableField("v", "float", VTableFieldKind.FEATURE),
+        ]
+    ).to_arrow()
+    df = CompVDataFrame(
+        {alice: CompPartition(alice(lambda: pa.table(data, schema=schema))())},
+        system_info=None,
+    )
+    uri = "test_parquet_row_groups/alice.parquet"
+    dd = df.dump(
+        storage, uri, VTableFormat.PARQUET, ParquetWriteOptions(row_group_size=10)
+    )
+    assert pq.ParquetFile(storage.get_reader(uri)).metadata.num_row_groups == 10
+
+    filters = [("id", ">=", 35), ("id", "<", 52)]
+    vtbl = VTable.from_distdata(dd)
+    reader = new_reader_proxy(alice, storage, "parquet", uri, schema, filters=filters)
+    # row groups which can not match are skipped by their statistics.
+    assert reveal(reader.get_row_groups()) == [3, 4, 5]
+    reader.close()
+
+    expected = {k: v[35:52] for k, v in data.items()}
+    loaded = CompVDataFrame.load(storage, vtbl, filters=filters)
+    assert reveal(loaded.partitions[alice].obj).to_pydict() == expected
+
+    # columns only used by filters are not kept.
+    loaded = CompVDataFrame.load(storage, vtbl, columns=["v"], filters=filters)
+    assert loaded.columns == ["v"]
+    loaded = loaded.load_columns()
+    assert reveal(loaded.partitions[alice].obj).to_pydict() == expected
+
+    with CompVDataFrameReader(storage, None, vtbl, batch_size=4, filters=filters) as r:
+        ids = [
+            i for df in r for i in reveal(df.partitions[alice].obj)["id"].to_pylist()
+        ]
+    assert ids == expected["id"]
+
+
+def test_filters_not_supported(sf_simulation_setup_devices, tmp_path):
+    storage = make_storage(
+        StorageConfig(
+            type="local_fs", local_fs=StorageConfig.LocalFSConfig(wd=str(tmp_path))
+        )
+    )
+    parties = []
+    for party in ["alice", "bob"]:
+        uri = f"test_filters_not_supported/{party}.orc"
+        write_orc(pa.table({party: [1.0, 2.0]}), storage.get_writer(uri))
+        schema = VTableSchema([VTableField(party, "float", VTableFieldKind.FEATURE)])
+        parties.append(VTableParty(party, uri, "orc", schema=schema))
+    filters = [("alice", ">", 1.0)]
+
+    # parties of a vertical table would filter their rows independently.
+    vtbl = VTable("test_filters_not_supported", parties, line_count=2)
+    with pytest.raises(NotSupportedError):
+        CompVDataFrame.load(storage, vtbl, filters=filters)
+
+    # only parquet has row group statistics.
+    vtbl = VTable("test_filters_not_supported", parties[:1], line_count=2)
+    with pytest.raises(NotSupportedError):
+        CompVDataFrame.load(storage, vtbl, filters=filters)
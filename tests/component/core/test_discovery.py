@@ -0,0 +1,82 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+
+from secretflow.component.core import Registry, load_component_modules
+
+_COMP_CODE = '''
+from secretflow.component.core import Component, Context, register
+
+
+@register(domain="test_lazy", version="1.0.0", name="{name}")
+class {cls}(Component):
+    def evaluate(self, ctx: Context) -> None:
+        pass
+'''
+
+_DYNAMIC_CODE = '''
+from secretflow.component.core import Component, Context, register
+
+DOMAIN = "test_lazy"
+
+
+@register(domain=DOMAIN, version="1.0.0")
+class DynamicComp(Component):
+    def evaluate(self, ctx: Context) -> None:
+        pass
+'''
+
+
+def test_lazy_discovery(tmp_path, monkeypatch):
+    monkeypatch.setenv("COMPONENT_INDEX_CACHE_DIR", str(tmp_path / "cache"))
+    root = tmp_path / "lazy_comps"
+    os.makedirs(root / "comps")
+    with open(root / "__init__.py", "w") as f:
+        f.write("")
+    with open(root / "comps" / "comp_a.py", "w") as f:
+        f.write(_COMP_CODE.format(name="comp_a", cls="CompA"))
+    with open(root / "comps" / "comp_b.py", "w") as f:
+        f.write(_COMP_CODE.format(name="", cls="CompB"))
+    with open(root / "comps" / "comp_c.py", "w") as f:
+        f.write(_DYNAMIC_CODE)
+    with open(root / "comps" / "helper.py", "w") as f:
+        f.write("import os\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    try:
+        load_component_modules(str(root), "lazy_comps")
+        # components could not be found by scanning are imported at loading.
+        assert "lazy_comps.comps.comp_c" in sys.modules
+        assert "lazy_comps.comps.comp_a" not in sys.modules
+        assert "lazy_comps.comps.comp_b" not in sys.modules
+        assert "test_lazy/comp_a:1" in Registry.get_definition_keys()
+        assert "test_lazy/comp_b:1" in Registry.get_definition_keys()
+        assert os.listdir(tmp_path / "cache")
+
+        d = Registry.get_definition("test_lazy", "comp_a", "1.0.0")
+        assert d.component_id == "test_lazy/comp_a:1.0.0"
+        assert "lazy_comps.comps.comp_a" in sys.modules
+        assert "lazy_comps.comps.comp_b" not in sys.modules
+
+        # loading again with the cached index is a no-op.
+        load_component_modules(str(root), "lazy_comps")
+        assert Registry.get_definition_by_id("test_lazy/comp_b:1.0.0")
+        assert "lazy_comps.comps.helper" not in sys.modules
+    finally:
+        for name in ["comp_a", "comp_b", "dynamic_comp"]:
+            Registry.unregister("test_lazy", name, "1.0.0")
+        for m in [m for m in sys.modules if m.startswith("lazy_comps")]:
+            del sys.modules[m]
@@ -23,11 +23,17 @@ from secretflow.component.core import (
     ORCReader,
     ORCReadOptions,
     ORCWriter,
+    ParquetReader,
+    ParquetReadOptions,
+    ParquetWriteOptions,
+    ParquetWriter,
     convert_io,
     read_csv,
     read_orc,
+    read_parquet,
     write_csv,
     write_orc,
+    write_parquet,
 )
 
 
@@ -116,3 +122,66 @@ def test_orc():
     assert (
         out_buffer.getvalue() == excepted_data
     ), f"output:\n {repr(out_buffer.getvalue())}, except:\n {repr(excepted_data)}"
+
+
+def test_parquet():
+    data = {
+        'column1': [1, None, 3],
+        'column2': ['a', 'b', None],
+        'column3': [3.5, None, 5.5],
+    }
+
+    tbl = pa.table(data)
+    buffer = io.BytesIO()
+    write_parquet(tbl, buffer)
+    out_tbl = read_parquet(buffer)
+    assert tbl == out_tbl
+
+    schema = pa.schema(
+        [
+            pa.field("column3", pa.float64()),
+            pa.field("column1", pa.int64()),
+        ]
+    )
+    out_tbl = read_parquet(buffer, schema=schema)
+    assert out_tbl == tbl.select(["column3", "column1"])
+
+    # test batch_size
+    reader = ParquetReader(buffer, options=ParquetReadOptions(batch_size=1))
+    for batch_tbl in reader:
+        assert batch_tbl.num_rows == 1
+
+    # test write empty table by schema
+    w = ParquetWriter(io.BytesIO(), schema=schema)
+    w.close()
+
+    # test convert_io
+    out_buffer = io.StringIO()
+    convert_io(
+        "parquet", buffer, None, "csv", out_buffer, CSVWriteOptions(na_rep="NULL"), None
+    )
+    excepted_data = "column1,column2,column3\n1,a,3.5\nNULL,b,NULL\n3,NULL,5.5\n"
+    assert out_buffer.getvalue() == excepted_data
+
+
+def test_parquet_pushdown():
+    tbl = pa.table({'id': list(range(100)), 'x': [i * 0.5 for i in range(100)]})
+    buffer = io.BytesIO()
+    write_parquet(tbl, buffer, ParquetWriteOptions(row_group_size=10))
+
+    # row groups are pruned by statistics, the remained rows are filtered exactly.
+    schema = pa.schema([pa.field("x", pa.float64())])
+    options = ParquetReadOptions(filters=[("id", ">=", 35), ("id", "<", 52)])
+    reader = ParquetReader(buffer, schema, options)
+    assert reader.num_row_groups == 10
+    assert reader.row_groups == [3, 4, 5]
+    assert reader.read_all() == tbl.slice(35, 17).select(["x"])
+
+    # disjunctive filters, read by batches.
+    options = ParquetReadOptions(
+        batch_size=4, filters=[[("id", "in", [1, 2])], [("id", ">", 97)]]
+    )
+    reader = ParquetReader(buffer, options=options)
+    assert reader.row_groups == [0, 9]
+    out_tbl = pa.concat_tables(list(reader))
+    assert out_tbl["id"].to_pylist() == [1, 2, 98, 99]
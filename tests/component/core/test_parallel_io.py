@@ -0,0 +1,146 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import threading
+
+import pyarrow as pa
+import pytest
+
+from secretflow.component.core import read_csv, read_orc, write_csv, write_orc
+from secretflow.component.core.storage.parallel_io import (
+    MultipartUploader,
+    ParallelMultipartWriter,
+    ParallelRangeReader,
+    parallel_download,
+    parallel_upload,
+)
+
+
+class LocalObjectStore(MultipartUploader):
+    """an in-memory stand-in of one s3 object"""
+
+    def __init__(self, data: bytes = b"") -> None:
+        self.data = data
+        self.fetches = []
+        self.uploads = {}
+        self.aborted = []
+        self._lock = threading.Lock()
+
+    def fetch(self, start: int, end: int) -> bytes:
+        with self._lock:
+            self.fetches.append((start, end))
+        return self.data[start:end]
+
+    def create(self) -> str:
+        upload_id = str(len(self.uploads))
+        self.uploads[upload_id] = {}
+        return upload_id
+
+    def upload_part(self, upload_id: str, part_number: int, data: bytes) -> str:
+        with self._lock:
+            self.uploads[upload_id][part_number] = data
+        return f"etag-{part_number}"
+
+    def complete(self, upload_id: str, etags: list[str]) -> None:
+        parts = self.uploads.pop(upload_id)
+        assert etags == [f"etag-{i}" for i in range(1, len(parts) + 1)]
+        self.data = b"".join(parts[i] for i in sorted(parts))
+
+    def abort(self, upload_id: str) -> None:
+        self.uploads.pop(upload_id)
+        self.aborted.append(upload_id)
+
+    def put(self, data: bytes) -> None:
+        self.data = data
+
+
+def test_range_reader():
+    store = LocalObjectStore(os.urandom(1000))
+    reader = ParallelRangeReader(
+        store.fetch, len(store.data), part_size=64, concurrency=4, prefetch_parts=2
+    )
+    assert reader.read(10) == store.data[:10]
+    # the next parts are read ahead.
+    assert (64, 128) in store.fetches and (128, 192) in store.fetches
+    assert reader.read(100) == store.data[10:110]
+
+    reader.seek(-30, io.SEEK_END)
+    assert reader.read() == store.data[-30:]
+    assert reader.read(10) == b""
+    reader.seek(500)
+    buf = bytearray(70)
+    assert reader.readinto(buf) == 70 and bytes(buf) == store.data[500:570]
+    reader.close()
+
+    # every byte is fetched once when read sequentially.
+    store.fetches.clear()
+    with ParallelRangeReader(store.fetch, len(store.data), part_size=64) as reader:
+        assert reader.read() == store.data
+    assert sorted(store.fetches) == [(s, min(s + 64, 1000)) for s in range(0, 1000, 64)]
+
+
+def test_multipart_writer():
+    store = LocalObjectStore()
+    data = os.urandom(1000)
+    with ParallelMultipartWriter(store, part_size=64, concurrency=3) as w:
+        for i in range(0, len(data), 37):
+            w.write(data[i : i + 37])
+    assert store.data == data and not store.uploads
+
+    # small objects are put in one request.
+    with ParallelMultipartWriter(store, part_size=64) as w:
+        w.write(b"abc")
+    assert store.data == b"abc" and not store.uploads
+
+
+def test_multipart_writer_abort():
+    class FailedStore(LocalObjectStore):
+        def upload_part(self, upload_id, part_number, data):
+            if part_number == 3:
+                raise IOError("upload failed")
+            return super().upload_part(upload_id, part_number, data)
+
+    store = FailedStore()
+    w = ParallelMultipartWriter(store, part_size=8, concurrency=2)
+    with pytest.raises(IOError):
+        w.write(os.urandom(100))
+        w.close()
+    # nothing is uploaded after the failure.
+    w.close()
+    assert store.aborted == ["0"] and store.data == b""
+
+
+def test_read_write_tables():
+    tbl = pa.table({"a": list(range(2000)), "b": [str(i) for i in range(2000)]})
+
+    for write_fn, read_fn in [(write_orc, read_orc), (write_csv, read_csv)]:
+        store = LocalObjectStore()
+        with ParallelMultipartWriter(store, part_size=1024) as w:
+            write_fn(tbl, w)
+        reader = ParallelRangeReader(store.fetch, len(store.data), part_size=1024)
+        assert read_fn(reader, tbl.schema) == tbl
+
+
+def test_parallel_download_upload(tmp_path):
+    store = LocalObjectStore(os.urandom(1000))
+    local_path = str(tmp_path / "sub" / "object")
+    parallel_download(store.fetch, len(store.data), local_path, part_size=64)
+    with open(local_path, "rb") as f:
+        assert f.read() == store.data
+
+    uploaded = LocalObjectStore()
+    parallel_upload(uploaded, local_path, part_size=64, concurrency=4)
+    assert uploaded.data == store.data
@@ -0,0 +1,391 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+from xml.etree import ElementTree
+
+import pytest
+
+from secretflow.component.core.storage.s3 import (
+    S3_MIN_UPLOAD_PART_SIZE,
+    S3Storage,
+    _S3MultipartUploader,
+)
+from secretflow.spec.v1.data_pb2 import StorageConfig
+
+_BUCKET = "sf-test"
+_PREFIX = "prefix"
+_MiB = 1024 * 1024
+
+
+def _etag(data: bytes) -> str:
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+
+class _S3Stub(BaseHTTPRequestHandler):
+    """a path-style s3 endpoint with the requests used by S3Storage"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def state(self) -> "LocalS3Server":
+        return self.server.state
+
+    def _parse(self):
+        url = urlparse(self.path)
+        query = {
+            k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()
+        }
+        bucket, _, key = unquote(url.path).lstrip("/").partition("/")
+        return bucket, key, query
+
+    def _body(self) -> bytes:
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if "aws-chunked" in self.headers.get("Content-Encoding", ""):
+            # hex-size[;ext]\r\n payload \r\n ... 0\r\n trailers \r\n\r\n
+            out, pos = bytearray(), 0
+            while True:
+                eol = data.index(b"\r\n", pos)
+                size = int(data[pos:eol].split(b";")[0], 16)
+                if size == 0:
+                    break
+                out += data[eol + 2 : eol + 2 + size]
+                pos = eol + 2 + size + 2
+            data = bytes(out)
+        return data
+
+    def _send(self, status: int, body: bytes = b"", headers: dict = None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _xml(self, body: str):
+        self._send(200, body.encode(), {"Content-Type": "application/xml"})
+
+    def _error(self, status: int, code: str):
+        body = f"<Error><Code>{code}</Code><Message>{code}</Message></Error>"
+        self._send(status, body.encode(), {"Content-Type": "application/xml"})
+
+    def do_HEAD(self):
+        bucket, key, _ = self._parse()
+        data = self.state.objects.get(key)
+        if bucket != _BUCKET or data is None:
+            return self._send(404)
+        self._send(
+            200,
+            data,
+            {
+                "ETag": _etag(data),
+                "Last-Modified": "Thu, 01 Feb 2024 00:00:00 GMT",
+                "Content-Type": "binary/octet-stream",
+            },
+        )
+
+    def do_GET(self):
+        bucket, key, query = self._parse()
+        if not key:
+            return self._list(bucket, query)
+        data = self.state.objects.get(key)
+        if data is None:
+            return self._error(404, "NoSuchKey")
+        headers = {"ETag": _etag(data)}
+        m = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if m is None:
+            return self._send(200, data, headers)
+        start = int(m.group(1))
+        end = int(m.group(2)) + 1 if m.group(2) else len(data)
+        end = min(end, len(data))
+        self.state.record("get", key, (start, end))
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{len(data)}"
+        self._send(206, data[start:end], headers)
+
+    def _list(self, bucket: str, query: dict):
+        if bucket != _BUCKET:
+            return self._error(404, "NoSuchBucket")
+        prefix = query.get("prefix", "")
+        delimiter = query.get("delimiter", "")
+        contents, prefixes = [], set()
+        for key, data in sorted(self.state.objects.items()):
+            if not key.startswith(prefix):
+                continue
+            rest = key[len(prefix) :]
+            if delimiter and delimiter in rest:
+                prefixes.add(prefix + rest.split(delimiter)[0] + delimiter)
+                continue
+            contents.append(
+                f"<Contents><Key>{key}</Key><Size>{len(data)}</Size>"
+                f"<ETag>{_etag(data)}</ETag>"
+                "<LastModified>2024-02-01T00:00:00.000Z</LastModified>"
+                "<StorageClass>STANDARD</StorageClass></Contents>"
+            )
+        common = "".join(
+            f"<CommonPrefixes><Prefix>{p}</Prefix></CommonPrefixes>"
+            for p in sorted(prefixes)
+        )
+        self._xml(
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>{bucket}</Name><Prefix>{prefix}</Prefix>"
+            f"<KeyCount>{len(contents) + len(prefixes)}</KeyCount>"
+            "<MaxKeys>1000</MaxKeys><IsTruncated>false</IsTruncated>"
+            f"{''.join(contents)}{common}</ListBucketResult>"
+        )
+
+    def do_PUT(self):
+        _, key, query = self._parse()
+        data = self._body()
+        if "uploadId" not in query:
+            self.state.record("put", key, len(data))
+            self.state.objects[key] = data
+            return self._send(200, headers={"ETag": _etag(data)})
+        upload_id, part_number = query["uploadId"], int(query["partNumber"])
+        if upload_id not in self.state.uploads:
+            return self._error(404, "NoSuchUpload")
+        delay = self.state.part_delays.get(part_number, 0)
+        if delay:
+            time.sleep(delay)
+        if part_number == self.state.fail_part:
+            self.state.record("upload_part_failed", key, part_number)
+            return self._error(403, "AccessDenied")
+        self.state.record("upload_part", key, (part_number, len(data)))
+        self.state.uploads[upload_id][part_number] = data
+        self._send(200, headers={"ETag": _etag(data)})
+
+    def do_POST(self):
+        _, key, query = self._parse()
+        body = self._body()
+        if "uploads" in query:
+            upload_id = uuid.uuid4().hex
+            self.state.uploads[upload_id] = {}
+            self.state.record("create", key, upload_id)
+            return self._xml(
+                "<InitiateMultipartUploadResult>"
+                f"<Bucket>{_BUCKET}</Bucket><Key>{key}</Key>"
+                f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+            )
+        upload_id = query["uploadId"]
+        parts = self.state.uploads.pop(upload_id)
+        root = ElementTree.fromstring(body)
+        listed = [
+            (int(p.findtext("{*}PartNumber")), p.findtext("{*}ETag"))
+            for p in root.iter()
+            if p.tag.endswith("}Part") or p.tag == "Part"
+        ]
+        self.state.record("complete", key, [n for n, _ in listed])
+        numbers = [n for n, _ in listed]
+        if numbers != sorted(numbers) or any(
+            n not in parts or _etag(parts[n]) != e for n, e in listed
+        ):
+            return self._error(400, "InvalidPartOrder")
+        data = b"".join(parts[n] for n in numbers)
+        self.state.objects[key] = data
+        self._xml(
+            "<CompleteMultipartUploadResult>"
+            f"<Bucket>{_BUCKET}</Bucket><Key>{key}</Key><ETag>{_etag(data)}</ETag>"
+            "</CompleteMultipartUploadResult>"
+        )
+
+    def do_DELETE(self):
+        _, key, query = self._parse()
+        if "uploadId" in query:
+            self.state.uploads.pop(query["uploadId"], None)
+            self.state.record("abort", key, query["uploadId"])
+        else:
+            self.state.objects.pop(key, None)
+        self._send(204)
+
+
+class LocalS3Server:
+    """an in-process s3 endpoint which records requests"""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.requests = []
+        self.fail_part: int = None
+        self.part_delays: dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _S3Stub)
+        self._server.daemon_threads = True
+        self._server.state = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def record(self, op: str, key: str, arg):
+        with self._lock:
+            self.requests.append((op, key, arg))
+
+    def ops(self, op: str) -> list:
+        with self._lock:
+            return [arg for o, _, arg in self.requests if o == op]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def s3_server():
+    server = LocalS3Server()
+    yield server
+    server.close()
+
+
+def _make_storage(server: LocalS3Server, **kwargs) -> S3Storage:
+    config = StorageConfig(
+        type="s3",
+        s3=StorageConfig.S3Config(
+            endpoint=server.endpoint,
+            bucket=_BUCKET,
+            prefix=_PREFIX,
+            access_key_id="sf_test_aaa",
+            access_key_secret="sf_test_sss",
+            virtual_host=False,
+        ),
+    )
+    return S3Storage(config, **kwargs)
+
+
+def _data(size: int) -> bytes:
+    return os.urandom(size)
+
+
+def test_s3_writer_part_sizing_and_order(s3_server):
+    # range requests use part_size, parts of uploads are raised to the s3 minimum.
+    storage = _make_storage(s3_server, part_size=_MiB, concurrency=4)
+    data = _data(2 * S3_MIN_UPLOAD_PART_SIZE + 3 * _MiB)
+    # the first part finishes last, the upload still lists parts in order.
+    s3_server.part_delays[1] = 0.5
+
+    with storage.get_writer("a/obj") as w:
+        for start in range(0, len(data), 3 * _MiB):
+            w.write(data[start : start + 3 * _MiB])
+
+    key = f"{_PREFIX}/a/obj"
+    assert s3_server.objects[key] == data
+    assert len(s3_server.ops("create")) == 1
+    assert sorted(s3_server.ops("upload_part")) == [
+        (1, S3_MIN_UPLOAD_PART_SIZE),
+        (2, S3_MIN_UPLOAD_PART_SIZE),
+        (3, 3 * _MiB),
+    ]
+    assert s3_server.ops("upload_part")[-1][0] == 1
+    assert s3_server.ops("complete") == [[1, 2, 3]]
+    assert not s3_server.ops("put") and not s3_server.uploads
+
+    # a small object is put in one request.
+    with storage.get_writer("a/small") as w:
+        w.write(b"hello")
+    assert s3_server.objects[f"{_PREFIX}/a/small"] == b"hello"
+    assert s3_server.ops("put") == [5]
+    assert len(s3_server.ops("create")) == 1
+
+
+def test_s3_writer_abort_on_failure(s3_server):
+    storage = _make_storage(s3_server, concurrency=2)
+    data = _data(3 * S3_MIN_UPLOAD_PART_SIZE + 1)
+    s3_server.fail_part = 2
+
+    with pytest.raises(PermissionError):
+        with storage.get_writer("b/obj") as w:
+            for start in range(0, len(data), _MiB):
+                w.write(data[start : start + _MiB])
+
+    upload_ids = s3_server.ops("create")
+    assert len(upload_ids) == 1
+    assert s3_server.ops("abort") == upload_ids
+    assert s3_server.ops("upload_part_failed") == [2]
+    assert not s3_server.ops("complete")
+    assert f"{_PREFIX}/b/obj" not in s3_server.objects and not s3_server.uploads
+    assert not storage.exists("b/obj")
+
+
+def test_s3_uploader(s3_server):
+    # drive the uploader directly, e.g. parts uploaded out of order.
+    storage = _make_storage(s3_server)
+    uploader = _S3MultipartUploader(storage._s3_client, storage.get_full_path("c/obj"))
+    parts = [_data(S3_MIN_UPLOAD_PART_SIZE), _data(10)]
+    upload_id = uploader.create()
+    etags = [None, None]
+    etags[1] = uploader.upload_part(upload_id, 2, parts[1])
+    etags[0] = uploader.upload_part(upload_id, 1, parts[0])
+    uploader.complete(upload_id, etags)
+    assert s3_server.objects[f"{_PREFIX}/c/obj"] == b"".join(parts)
+    assert storage.get_size("c/obj") == sum(len(p) for p in parts)
+
+    upload_id = uploader.create()
+    uploader.upload_part(upload_id, 1, parts[0])
+    uploader.abort(upload_id)
+    assert s3_server.ops("abort") == [upload_id] and not s3_server.uploads
+
+
+def test_s3_reader_and_files(s3_server, tmp_path):
+    storage = _make_storage(s3_server, part_size=_MiB, concurrency=3, prefetch_parts=2)
+    data = _data(5 * _MiB + 17)
+    s3_server.objects[f"{_PREFIX}/d/obj"] = data
+
+    with storage.get_reader("d/obj") as r:
+        assert r.read(10) == data[:10]
+        r.seek(3 * _MiB + 5)
+        assert r.read(_MiB) == data[3 * _MiB + 5 : 4 * _MiB + 5]
+        r.seek(0)
+        assert r.read() == data
+    ranges = s3_server.ops("get")
+    assert ranges and all(e - s <= _MiB for s, e in ranges)
+    assert all(s % _MiB == 0 for s, _ in ranges)
+
+    local = str(tmp_path / "d" / "obj")
+    s3_server.requests.clear()
+    storage.download_file("d/obj", local)
+    with open(local, "rb") as f:
+        assert f.read() == data
+    assert sorted(s3_server.ops("get")) == [
+        (s, min(s + _MiB, len(data))) for s in range(0, len(data), _MiB)
+    ]
+
+    # files larger than a part are uploaded by multipart uploads.
+    big = str(tmp_path / "big")
+    with open(big, "wb") as f:
+        f.write(_data(S3_MIN_UPLOAD_PART_SIZE + 1))
+    small = str(tmp_path / "small")
+    with open(small, "wb") as f:
+        f.write(b"hello")
+    storage.upload_file(big, "e/big")
+    storage.upload_file(small, "e/small")
+    with open(big, "rb") as f:
+        assert s3_server.objects[f"{_PREFIX}/e/big"] == f.read()
+    assert s3_server.objects[f"{_PREFIX}/e/small"] == b"hello"
+    assert sorted(s3_server.ops("upload_part")) == [
+        (1, S3_MIN_UPLOAD_PART_SIZE),
+        (2, 1),
+    ]
+    assert s3_server.ops("complete") == [[1, 2]]
+    assert s3_server.ops("put") == [5]
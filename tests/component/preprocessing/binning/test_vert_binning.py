@@ -125,3 +125,76 @@ def test_vert_binning(comp_prod_sf_cluster_config):
         ).to_pandas()
 
         assert np.isclose(bin_output_df.values, sub_output_df.values).all()
+
+
+def test_vert_binning_quantile_sketch(comp_prod_sf_cluster_config):
+    alice_path = "test_vert_binning_sketch/x_alice.csv"
+    bob_path = "test_vert_binning_sketch/x_bob.csv"
+
+    storage_config, sf_cluster_config = comp_prod_sf_cluster_config
+    self_party = sf_cluster_config.private_config.self_party
+    storage = make_storage(storage_config)
+
+    ds = load_breast_cancer()
+    x = ds["data"]
+    if self_party == "alice":
+        ds = pd.DataFrame(x[:, :15], columns=[f"a{i}" for i in range(15)])
+        ds.to_csv(storage.get_writer(alice_path), index=False)
+    elif self_party == "bob":
+        ds = pd.DataFrame(x[:, 15:], columns=[f"b{i}" for i in range(15)])
+        ds.to_csv(storage.get_writer(bob_path), index=False)
+
+    input_tbl = VTable(
+        name="input_data",
+        parties=[
+            VTableParty.from_dict(
+                uri=alice_path,
+                party="alice",
+                format="csv",
+                features={f"a{i}": "float32" for i in range(15)},
+            ),
+            VTableParty.from_dict(
+                uri=bob_path,
+                party="bob",
+                format="csv",
+                features={f"b{i}": "float32" for i in range(15)},
+            ),
+        ],
+    )
+
+    def run(name: str, quantile_sketch_eps: float) -> pd.DataFrame:
+        param = build_node_eval_param(
+            domain="preprocessing",
+            name="vert_binning",
+            version="1.0.0",
+            attrs={
+                "input/input_ds/feature_selects": [f"a{i}" for i in range(15)]
+                + [f"b{i}" for i in range(15)],
+                "binning_method": "quantile",
+                "quantile_sketch_eps": quantile_sketch_eps,
+            },
+            inputs=[input_tbl],
+            output_uris=[
+                f"test_vert_binning_sketch/{name}_data",
+                f"test_vert_binning_sketch/{name}_rule",
+                f"test_vert_binning_sketch/{name}_report",
+            ],
+        )
+        res = comp_eval(
+            param=param,
+            storage_config=storage_config,
+            cluster_config=sf_cluster_config,
+        )
+        if self_party not in ["alice", "bob"]:
+            return None
+        out = VTable.from_distdata(res.outputs[0])
+        return orc.read_table(storage.get_reader(out.party(self_party).uri)).to_pandas()
+
+    exact = run("exact", 0.0)
+    # sketches are exact for 569 rows with this rank error, so are the bins.
+    sketch = run("sketch", 0.005)
+    if self_party in ["alice", "bob"]:
+        # the order of output columns is not kept.
+        pd.testing.assert_frame_equal(
+            exact.sort_index(axis=1), sketch.sort_index(axis=1)
+        )
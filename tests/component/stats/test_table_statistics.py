@@ -15,6 +15,7 @@
 import logging
 
 import pandas as pd
+import pytest
 
 from secretflow.component.core import DistDataType, build_node_eval_param, make_storage
 from secretflow.component.entry import comp_eval
@@ -41,7 +42,8 @@ def check_report(dd: DistData, target_names=['a', 'b', 'c', 'd']):
     assert row_names == target_names
 
 
-def test_table_statistics_comp(comp_prod_sf_cluster_config):
+@pytest.mark.parametrize("quantile_sketch_eps", [0.0, 0.01])
+def test_table_statistics_comp(comp_prod_sf_cluster_config, quantile_sketch_eps):
     """
     This test shows that table statistics works on both pandas and VDataFrame,
         i.e. all APIs align and the result is correct.
@@ -69,7 +71,10 @@ def test_table_statistics_comp(comp_prod_sf_cluster_config):
         domain="stats",
         name="table_statistics",
         version="1.0.0",
-        attrs={"input/input_ds/features": ["a", "b", "c", "d"]},
+        attrs={
+            "input/input_ds/features": ["a", "b", "c", "d"],
+            "quantile_sketch_eps": quantile_sketch_eps,
+        },
         inputs=[
             DistData(
                 name="input_data",
@@ -104,7 +109,10 @@ def test_table_statistics_comp(comp_prod_sf_cluster_config):
     check_report(res.outputs[0])
 
 
-def test_table_statistics_individual_comp(comp_prod_sf_cluster_config):
+@pytest.mark.parametrize("quantile_sketch_eps", [0.0, 0.01])
+def test_table_statistics_individual_comp(
+    comp_prod_sf_cluster_config, quantile_sketch_eps
+):
     """
     This test shows that table statistics works on both pandas and VDataFrame,
         i.e. all APIs align and the result is correct.
@@ -128,7 +136,10 @@ def test_table_statistics_individual_comp(comp_prod_sf_cluster_config):
         domain="stats",
         name="table_statistics",
         version="1.0.0",
-        attrs={"input/input_ds/features": ["a", "b", "c", "d"]},
+        attrs={
+            "input/input_ds/features": ["a", "b", "c", "d"],
+            "quantile_sketch_eps": quantile_sketch_eps,
+        },
         inputs=[
             DistData(
                 name="input_data",
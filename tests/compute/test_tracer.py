@@ -0,0 +1,89 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import secretflow.compute as sc
+from secretflow.compute.tracer import _TracePlan
+
+
+def _trace(table: pa.Table) -> sc.Table:
+    t = sc.Table.from_pyarrow(table)
+    # the same cast and coalesce are used by several features.
+    a = sc.coalesce(sc.cast(t.column("a"), pa.float64()), 0.0)
+    t = t.append_column("a_x2", sc.multiply(a, 2.0))
+    a = sc.coalesce(sc.cast(t.column("a"), pa.float64()), 0.0)
+    t = t.append_column("a_p1", sc.add(a, 1.0))
+    t = t.append_column("tmp", sc.multiply(t.column("b"), 3))
+    t = t.set_column(
+        t.column_names.index("b"),
+        "b",
+        sc.if_else(sc.is_null(t.column("b")), 0, t.column("b")),
+    )
+    # tmp is never used in output.
+    t = t.remove_column("tmp")
+    t = t.set_column(0, "a", sc.cast(t.column("a"), pa.float64()))
+    return t
+
+
+def test_trace_runner():
+    rows = 1000
+    a = np.arange(rows, dtype=np.int32)
+    b = np.where(a % 3 == 0, None, a * 2).tolist()
+    table = pa.table({"a": a, "b": pa.array(b, type=pa.int64())})
+    a_null = pa.array(np.where(a % 7 == 0, None, a).tolist(), type=pa.int32())
+    table = table.set_column(0, "a", a_null)
+
+    t = _trace(table)
+    runner = t.dump_runner()
+
+    plan = _TracePlan(runner.dag)
+    ops = [n.operate for n in plan.nodes]
+    # cast/coalesce are computed once and multiply for tmp is dropped.
+    assert ops.count("cast") == 1 and ops.count("coalesce") == 1
+    assert ops.count("multiply") == 1
+
+    expected = t.to_table()
+    for batch_size in [64, 1000, 4096]:
+        ret = runner.run(table, batch_size=batch_size)
+        assert ret.schema == expected.schema
+        assert ret.equals(expected)
+
+    assert runner.run(table.slice(0, 0)).num_rows == 0
+    assert runner.dump_serving_pb("test") == t.dump_serving_pb("test")
+
+    # plan is rebuilt after unpickled.
+    runner = pickle.loads(pickle.dumps(runner))
+    assert runner.run(table, batch_size=100).equals(expected)
+
+
+def test_trace_runner_options():
+    table = pa.table({"s": ["a", "bb", None, "ccc"] * 10})
+    t = sc.Table.from_pyarrow(table)
+    t = t.append_column("in", sc.is_in(t.column("s"), value_set=pa.array(["a", "bb"])))
+    t = t.append_column(
+        "in2",
+        sc.is_in(
+            t.column("s"), options=pc.SetLookupOptions(value_set=pa.array(["ccc"]))
+        ),
+    )
+    t = t.append_column("len", sc.utf8_length(t.column("s")))
+    runner = t.dump_runner()
+
+    assert len(_TracePlan(runner.dag).nodes) == 3
+    assert runner.run(table, batch_size=7).equals(t.to_table())
@@ -0,0 +1,174 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import tempfile
+from unittest import mock
+
+import jax.numpy as jnp
+import numpy as np
+import spu
+
+import secretflow as sf
+from secretflow.device.device.spu import SPUValueMeta, _spu_compile
+from secretflow.device.device.spu_compile_cache import (
+    SPUCompileCache,
+    compile_cache_key,
+    set_compile_cache,
+)
+
+
+def _meta(shape, dtype=np.float32, vtype=spu.Visibility.VIS_SECRET):
+    return SPUValueMeta(
+        shape, np.dtype(dtype), vtype, spu.spu_pb2.SEMI2K, spu.spu_pb2.FM64, 18
+    )
+
+
+def _step(x, w, lr):
+    return x - lr * w
+
+
+_SCALE = np.ones(3)
+
+
+def _scale(x):
+    return x * _SCALE
+
+
+def test_compile_cache_key():
+    copts = spu.spu_pb2.CompilerOptions()
+    key = compile_cache_key(_step, copts, [_meta((3, 2)), _meta((3, 2))], {})
+    assert key is not None
+    assert key == compile_cache_key(_step, copts, [_meta((3, 2)), _meta((3, 2))], {})
+
+    # shape, dtype and visibility are part of the key.
+    assert key != compile_cache_key(_step, copts, [_meta((4, 2)), _meta((3, 2))], {})
+    assert key != compile_cache_key(
+        _step, copts, [_meta((3, 2), np.int64), _meta((3, 2))], {}
+    )
+    assert key != compile_cache_key(
+        _step,
+        copts,
+        [_meta((3, 2), vtype=spu.Visibility.VIS_PUBLIC), _meta((3, 2))],
+        {},
+    )
+
+    # static args.
+    k1 = compile_cache_key(
+        functools.partial(_step, lr=0.1), copts, [_meta((3, 2)), _meta((3, 2))], {}
+    )
+    k2 = compile_cache_key(
+        functools.partial(_step, lr=0.2), copts, [_meta((3, 2)), _meta((3, 2))], {}
+    )
+    assert k1 != k2
+
+    # closure.
+    def make(c):
+        return lambda x: x + c
+
+    k1 = compile_cache_key(make(np.ones(3)), copts, [_meta((3,))], {})
+    k2 = compile_cache_key(make(np.zeros(3)), copts, [_meta((3,))], {})
+    assert k1 != k2
+
+    # non-function globals.
+    global _SCALE
+    k1 = compile_cache_key(_scale, copts, [_meta((3,))], {})
+    _SCALE = np.zeros(3)
+    try:
+        k2 = compile_cache_key(_scale, copts, [_meta((3,))], {})
+    finally:
+        _SCALE = np.ones(3)
+    assert k1 != k2
+
+    # secretflow version.
+    with mock.patch('secretflow.device.device.spu_compile_cache.sf_version', '0.0.0'):
+        assert key != compile_cache_key(
+            _step, copts, [_meta((3, 2)), _meta((3, 2))], {}
+        )
+
+    # compiler options.
+    copts2 = spu.spu_pb2.CompilerOptions()
+    copts2.enable_optimize_denominator_with_broadcast = True
+    assert key != compile_cache_key(_step, copts2, [_meta((3, 2)), _meta((3, 2))], {})
+
+
+def test_compile_cache_lru():
+    cache = SPUCompileCache(capacity=2)
+    cache.put('a', (b'a', None))
+    cache.put('b', (b'b', None))
+    assert cache.get('a') == (b'a', None)
+    cache.put('c', (b'c', None))
+    # 'b' is the least recently used one.
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    stats = cache.stats()
+    assert stats['hits'] == 3
+    assert stats['misses'] == 1
+    assert stats['size'] == 2
+
+
+def test_compile_cache_disk():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        SPUCompileCache(cache_dir=cache_dir).put('a', (b'a', [1, 2]))
+
+        cache = SPUCompileCache(cache_dir=cache_dir)
+        assert cache.get('a') == (b'a', [1, 2])
+        assert cache.get('a') == (b'a', [1, 2])
+        stats = cache.stats()
+        assert stats['disk_hits'] == 1
+        assert stats['hits'] == 1
+
+
+def test_spu_compile_hit():
+    cache = SPUCompileCache()
+    set_compile_cache(cache)
+    try:
+        copts = spu.spu_pb2.CompilerOptions()
+
+        def fn(x, y):
+            return jnp.matmul(x, y)
+
+        meta = [_meta((3, 4)), _meta((4, 2))]
+        executable, out = _spu_compile(fn, copts, 'fn', *meta)
+        cached_executable, cached_out = _spu_compile(fn, copts, 'fn', *meta)
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        assert executable.code == cached_executable.code
+        assert out.shape == cached_out.shape
+    finally:
+        set_compile_cache(None)
+
+
+def _test_compile_cache_stats(devices):
+    def add(x, y):
+        return x + y
+
+    x = devices.alice(lambda: np.random.rand(3, 4))()
+    y = devices.bob(lambda: np.random.rand(3, 4))()
+    expected = sf.reveal(x) + sf.reveal(y)
+    for _ in range(2):
+        z = devices.spu(add)(x, y)
+        np.testing.assert_almost_equal(sf.reveal(z), expected, decimal=4)
+
+    stats = devices.spu.compile_cache_stats()
+    assert stats['hits'] + stats['disk_hits'] + stats['misses'] > 0
+
+
+def test_compile_cache_stats_prod(sf_production_setup_devices):
+    _test_compile_cache_stats(sf_production_setup_devices)
+
+
+def test_compile_cache_stats_sim(sf_simulation_setup_devices):
+    _test_compile_cache_stats(sf_simulation_setup_devices)
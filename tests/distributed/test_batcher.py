@@ -0,0 +1,69 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+
+from secretflow.distributed.fed.proxy.batcher import SendBatcher
+
+
+def test_batch_by_count():
+    flushed = []
+    lock = threading.Lock()
+
+    def flush(dest, items):
+        with lock:
+            flushed.append((dest, list(items)))
+
+    batcher = SendBatcher(flush, max_delay_ms=10000, max_bytes=1000, max_count=3)
+    futures = [batcher.submit('bob', i, 1) for i in range(3)]
+    for f in futures:
+        assert f.result(timeout=5)
+    assert flushed == [('bob', [0, 1, 2])]
+    batcher.stop()
+
+
+def test_batch_by_bytes_and_delay():
+    flushed = []
+    lock = threading.Lock()
+
+    def flush(dest, items):
+        with lock:
+            flushed.append((dest, list(items)))
+
+    batcher = SendBatcher(flush, max_delay_ms=50, max_bytes=10, max_count=100)
+    f1 = batcher.submit('bob', 'a', 6)
+    # exceeds max bytes, flush the pending batch first.
+    f2 = batcher.submit('bob', 'b', 6)
+    f3 = batcher.submit('carol', 'c', 1)
+    f1.result(timeout=5)
+    # flushed by delay.
+    f2.result(timeout=5)
+    f3.result(timeout=5)
+    batcher.stop()
+    assert sorted(flushed) == [('bob', ['a']), ('bob', ['b']), ('carol', ['c'])]
+
+
+def test_batch_error():
+    def flush(dest, items):
+        raise RuntimeError('failed')
+
+    batcher = SendBatcher(flush, max_delay_ms=10, max_bytes=10, max_count=100)
+    future = batcher.submit('bob', 'a', 1)
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    batcher.stop()
+    with pytest.raises(RuntimeError):
+        batcher.submit('bob', 'a', 1)
@@ -0,0 +1,117 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import multiprocess
+import numpy as np
+
+from secretflow.distributed.fed.proxy.brpc_link.brpc_link import BrpcLinkProxy
+from secretflow.utils.testing import unused_tcp_port
+
+
+def _run_party(addresses, party, queue):
+    proxy = BrpcLinkProxy(addresses, party, 'test_job', None, {'compression': 'zlib'})
+    # start waits for the handshake with peers.
+    proxy.start()
+    data = [np.zeros(100000), 'x' * 10000]
+    try:
+        if party == 'alice':
+            proxy.send('bob', data, 1)
+            queue.put(proxy.codec_stats()['bob'])
+        else:
+            received = proxy.recv('alice', 1)
+            np.testing.assert_equal(received[0], data[0])
+            queue.put(received[1] == data[1])
+        # wait for peer before closing the link.
+        peer = 'bob' if party == 'alice' else 'alice'
+        proxy.send(peer, None, 2)
+        proxy.recv(peer, 2)
+    finally:
+        proxy.stop()
+
+
+def test_send_recv_compressed():
+    addresses = {
+        'alice': f'127.0.0.1:{unused_tcp_port()}',
+        'bob': f'127.0.0.1:{unused_tcp_port()}',
+    }
+    queue = multiprocess.Queue()
+    processes = [
+        multiprocess.Process(target=_run_party, args=(addresses, party, queue))
+        for party in addresses
+    ]
+    for p in processes:
+        p.start()
+    results = [queue.get(timeout=60) for _ in processes]
+    for p in processes:
+        p.join(timeout=60)
+
+    stats = [r for r in results if isinstance(r, dict)][0]
+    assert stats['bytes_after'] < stats['bytes_before'] / 4
+    assert True in results
+
+
+def _run_party_without_handshake(addresses, party, queue):
+    if party == 'alice':
+        config = {'compression': 'zlib', 'compression_negotiate_timeout_ms': 1000}
+    else:
+        # bob doesn't enable compression, so never sends the handshake.
+        config = {}
+    proxy = BrpcLinkProxy(addresses, party, 'test_job', None, config)
+    start = time.monotonic()
+    proxy.start()
+    data = np.zeros(100000)
+    try:
+        if party == 'alice':
+            queue.put(time.monotonic() - start)
+            proxy.send('bob', data, 1)
+            queue.put(proxy.codec_stats())
+            np.testing.assert_equal(proxy.recv('bob', 2), data)
+        else:
+            np.testing.assert_equal(proxy.recv('alice', 1), data)
+            proxy.send('alice', data, 2)
+        # wait for peer before closing the link.
+        peer = 'bob' if party == 'alice' else 'alice'
+        proxy.send(peer, None, 3)
+        proxy.recv(peer, 3)
+        queue.put(True)
+    finally:
+        proxy.stop()
+
+
+def test_negotiate_timeout():
+    addresses = {
+        'alice': f'127.0.0.1:{unused_tcp_port()}',
+        'bob': f'127.0.0.1:{unused_tcp_port()}',
+    }
+    queue = multiprocess.Queue()
+    processes = [
+        multiprocess.Process(
+            target=_run_party_without_handshake, args=(addresses, party, queue)
+        )
+        for party in addresses
+    ]
+    for p in processes:
+        p.start()
+    results = [queue.get(timeout=60) for _ in range(4)]
+    for p in processes:
+        p.join(timeout=60)
+
+    start_seconds = [r for r in results if isinstance(r, float)][0]
+    assert start_seconds < 30
+    stats = [r for r in results if isinstance(r, dict)][0]
+    # messages are not compressed without the handshake.
+    assert 'bob' not in stats
+    assert results.count(True) == 2
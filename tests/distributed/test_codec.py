@@ -0,0 +1,69 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import pytest
+
+from secretflow.distributed.fed.proxy import codec
+from secretflow.distributed.fed.proxy.codec import MessageCodec
+
+
+@pytest.mark.parametrize('name', codec.available_codecs())
+def test_encode_decode(name):
+    c = MessageCodec(name, threshold_bytes=0)
+    c.negotiate('bob', codec.available_codecs())
+    arr = np.arange(100000, dtype=np.float64)
+    frame = c.encode('bob', arr, arr.itemsize)
+    assert codec.is_frame(frame)
+    np.testing.assert_equal(np.frombuffer(codec.decode(frame)), arr)
+    if name != codec.CODEC_NONE:
+        assert len(frame) < arr.nbytes / 2
+
+    data = b'abc' * 1000
+    assert codec.decode(c.encode('bob', data)) == data
+
+
+def test_negotiate():
+    c = MessageCodec('zlib', threshold_bytes=0)
+    assert c.peer_codec('bob') == codec.CODEC_NONE
+    assert c.negotiate('bob', [codec.CODEC_NONE]) == codec.CODEC_NONE
+    assert c.negotiate('carol', ['zlib']) == 'zlib'
+
+    data = b'0' * 10000
+    assert len(c.encode('bob', data)) > len(data)
+    assert len(c.encode('carol', data)) < len(data)
+
+    with pytest.raises(ValueError):
+        MessageCodec('unknown')
+
+
+def test_adaptive():
+    c = MessageCodec('zlib', threshold_bytes=100)
+    c.negotiate('bob', ['zlib'])
+    # below threshold.
+    small = b'0' * 10
+    assert len(c.encode('bob', small)) > len(small)
+
+    # incompressible, sent raw and skip compression for a while.
+    random_bytes = os.urandom(10000)
+    frame = c.encode('bob', random_bytes)
+    assert codec.decode(frame) == random_bytes
+    compressible = b'0' * 10000
+    assert len(c.encode('bob', compressible)) > len(compressible)
+
+    stats = c.stats()['bob']
+    assert stats['messages'] == 3
+    assert stats['bytes_before'] == 20010
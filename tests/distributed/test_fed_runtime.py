@@ -0,0 +1,105 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+import multiprocess
+import pytest
+
+from secretflow.distributed import fed as sf_fed
+from secretflow.distributed.op_strategy import DebugStrategy
+from secretflow.utils.testing import unused_tcp_port
+
+
+def _run_party(addresses, party, runtime, queue):
+    sf_fed.init(
+        addresses=addresses,
+        party=party,
+        config={
+            'cross_silo_comm_backend': 'grpc',
+            'cross_silo_comm': {},
+            'runtime': runtime,
+        },
+        job_name='test_job',
+    )
+    try:
+
+        @sf_fed.remote
+        def inc(x):
+            return x + 1
+
+        @sf_fed.remote
+        def add(*xs):
+            return sum(xs)
+
+        # fan-out with many objects pending across parties.
+        xs = [inc.party('alice').remote(i) for i in range(200)]
+        ys = [inc.party('bob').remote(x) for x in xs]
+        total = add.party('alice').remote(*ys)
+
+        async def _get():
+            return await sf_fed.get_async([ys[0], total])
+
+        queue.put((party, sf_fed.get(total), asyncio.run(_get())))
+    finally:
+        sf_fed.shutdown(on_error=False)
+
+
+@pytest.mark.parametrize('runtime', ['thread', 'asyncio'])
+def test_fed_runtime(runtime):
+    addresses = {
+        'alice': f'127.0.0.1:{unused_tcp_port()}',
+        'bob': f'127.0.0.1:{unused_tcp_port()}',
+    }
+    queue = multiprocess.Queue()
+    processes = [
+        multiprocess.Process(target=_run_party, args=(addresses, party, runtime, queue))
+        for party in addresses
+    ]
+    for p in processes:
+        p.start()
+    results = [queue.get(timeout=120) for _ in processes]
+    for p in processes:
+        p.join(timeout=60)
+
+    expected = sum(range(2, 202))
+    for _, result, async_result in results:
+        assert result == expected
+        assert async_result == [2, expected]
+
+
+def test_default_get_async_does_not_block_loop():
+    class _SlowStrategy(DebugStrategy):
+        def get(self, object_refs):
+            time.sleep(0.5)
+            return object_refs
+
+    async def _main():
+        ticks = 0
+
+        async def _tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(_tick())
+        result = await _SlowStrategy().get_async([1, 2])
+        ticker.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(_main())
+    assert result == [1, 2]
+    assert ticks > 10
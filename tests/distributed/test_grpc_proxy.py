@@ -0,0 +1,225 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from secretflow.distributed.fed.proxy.grpc.grpc import (
+    GrpcProxy,
+    _assemble_stream_chunks,
+    _dumps_out_of_band,
+    _iter_stream_chunks,
+)
+from secretflow.utils import secure_pickle
+from secretflow.utils.testing import unused_tcp_port
+
+
+@pytest.fixture
+def grpc_proxies():
+    addresses = {
+        'alice': f'127.0.0.1:{unused_tcp_port()}',
+        'bob': f'127.0.0.1:{unused_tcp_port()}',
+    }
+    proxy_config = {'stream_chunk_size_bytes': 1024 * 1024}
+    proxies = {
+        party: GrpcProxy(addresses, party, 'test_job', None, proxy_config)
+        for party in addresses
+    }
+    for proxy in proxies.values():
+        proxy.start()
+    yield proxies
+    for proxy in proxies.values():
+        proxy.stop()
+
+
+def test_stream_chunks():
+    data = {'a': np.arange(1024 * 1024, dtype=np.int64), 'b': [1, 'x']}
+    pickled, buffers, itemsizes = _dumps_out_of_band(data)
+    # the large array is kept out-of-band.
+    assert len(buffers) == 1
+    assert itemsizes == [8]
+    assert len(pickled) < 1024
+
+    chunks = _iter_stream_chunks(1, 'job', [memoryview(pickled)] + buffers, 1000)
+    header = next(chunks)
+    assert header.seq_id == 1
+    received = _assemble_stream_chunks(header.buffer_sizes, chunks)
+    restored = secure_pickle.loads(
+        received[0],
+        buffers=received[1:],
+        filter_type=secure_pickle.FilterType.BLACKLIST,
+    )
+    np.testing.assert_equal(restored['a'], data['a'])
+    assert restored['b'] == data['b']
+
+    chunks = _iter_stream_chunks(1, 'job', [memoryview(pickled)] + buffers, 1000)
+    header = next(chunks)
+    with pytest.raises(ValueError):
+        _assemble_stream_chunks(list(header.buffer_sizes) + [1], chunks)
+
+
+def test_send_recv(grpc_proxies):
+    small = {'x': 1, 'y': np.ones(10)}
+    large = [np.random.rand(1024, 1024), np.arange(10)]
+    assert grpc_proxies['alice'].send('bob', small, 1)
+    assert grpc_proxies['alice'].send('bob', large, 2)
+
+    received = grpc_proxies['bob'].recv('alice', 2)
+    np.testing.assert_equal(received[0], large[0])
+    np.testing.assert_equal(received[1], large[1])
+    received = grpc_proxies['bob'].recv('alice', 1)
+    assert received['x'] == 1
+    np.testing.assert_equal(received['y'], small['y'])
+
+
+def test_send_recv_batched():
+    addresses = {
+        'alice': f'127.0.0.1:{unused_tcp_port()}',
+        'bob': f'127.0.0.1:{unused_tcp_port()}',
+    }
+    proxy_config = {
+        'batch_max_delay_ms': 50,
+        'batch_max_count': 8,
+        'batch_max_bytes': None,
+    }
+    proxies = {
+        party: GrpcProxy(addresses, party, 'test_job', None, proxy_config)
+        for party in addresses
+    }
+    batch_sizes = []
+    send_batch = proxies['alice']._send_batch
+
+    def _send_batch(dest_party, items):
+        batch_sizes.append(len(items))
+        send_batch(dest_party, items)
+
+    proxies['alice']._send_batch = _send_batch
+    for proxy in proxies.values():
+        proxy.start()
+    try:
+        # send does not block on the batch, so messages from one thread coalesce.
+        futures = [proxies['alice'].send('bob', {'i': i}, i) for i in range(32)]
+        assert all(isinstance(f, Future) for f in futures)
+        assert all(f.result() for f in futures)
+        assert sum(batch_sizes) == 32 and max(batch_sizes) > 1
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = list(
+                executor.map(
+                    lambda i: proxies['alice'].send('bob', {'i': i}, i), range(32, 64)
+                )
+            )
+        assert all(f.result() for f in futures)
+        # a large message is not batched.
+        large = np.random.rand(1024, 1024)
+        assert proxies['alice'].send('bob', large, 100) is True
+        for i in range(64):
+            assert proxies['bob'].recv('alice', i) == {'i': i}
+        np.testing.assert_equal(proxies['bob'].recv('alice', 100), large)
+    finally:
+        for proxy in proxies.values():
+            proxy.stop()
+
+
+def test_send_recv_compressed():
+    addresses = {
+        'alice': f'127.0.0.1:{unused_tcp_port()}',
+        'bob': f'127.0.0.1:{unused_tcp_port()}',
+    }
+    proxies = {
+        'alice': GrpcProxy(
+            addresses, 'alice', 'test_job', None, {'compression': 'zlib'}
+        ),
+        # bob doesn't compress, but could decode.
+        'bob': GrpcProxy(addresses, 'bob', 'test_job', None, {}),
+    }
+    for proxy in proxies.values():
+        proxy.start()
+    try:
+        data = [np.arange(1024 * 1024, dtype=np.int64), 'x' * 10000]
+        assert proxies['alice'].send('bob', data, 1)
+        assert proxies['bob'].send('alice', data, 2)
+        for party, peer, seq_id in [('bob', 'alice', 1), ('alice', 'bob', 2)]:
+            received = proxies[party].recv(peer, seq_id)
+            np.testing.assert_equal(received[0], data[0])
+            assert received[1] == data[1]
+
+        stats = proxies['alice'].codec_stats()['bob']
+        assert stats['bytes_after'] < stats['bytes_before'] / 4
+        assert proxies['bob'].codec_stats() == {}
+    finally:
+        for proxy in proxies.values():
+            proxy.stop()
+
+
+def test_send_recv_spilled():
+    addresses = {
+        'alice': f'127.0.0.1:{unused_tcp_port()}',
+        'bob': f'127.0.0.1:{unused_tcp_port()}',
+    }
+    proxy_config = {
+        'stream_chunk_size_bytes': 1024 * 1024,
+        'recv_buffer_memory_bytes': 1024 * 1024,
+        'recv_buffer_spill_bytes': 64 * 1024 * 1024,
+    }
+    proxies = {
+        party: GrpcProxy(addresses, party, 'test_job', None, proxy_config)
+        for party in addresses
+    }
+    for proxy in proxies.values():
+        proxy.start()
+    try:
+        data = [np.random.rand(1024, 1024) for _ in range(4)]
+        for i, arr in enumerate(data):
+            assert proxies['alice'].send('bob', arr, i)
+        stats = proxies['bob'].buffer_stats()['alice']
+        assert stats['messages'] == 4
+        assert stats['spilled_bytes'] > 0
+        for i, arr in enumerate(data):
+            received = proxies['bob'].recv('alice', i)
+            np.testing.assert_equal(received, arr)
+            received[0, 0] = 0
+        assert proxies['bob'].buffer_stats() == {}
+    finally:
+        for proxy in proxies.values():
+            proxy.stop()
+
+
+def test_send_backpressure():
+    addresses = {
+        'alice': f'127.0.0.1:{unused_tcp_port()}',
+        'bob': f'127.0.0.1:{unused_tcp_port()}',
+    }
+    proxy_config = {'recv_buffer_memory_bytes': 1024 * 1024}
+    proxies = {
+        party: GrpcProxy(addresses, party, 'test_job', None, proxy_config)
+        for party in addresses
+    }
+    for proxy in proxies.values():
+        proxy.start()
+    try:
+        first = np.random.rand(100, 1024)
+        second = np.random.rand(100, 1024)
+        assert proxies['alice'].send('bob', first, 1)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # the buffer of bob is full, so alice retries until it's consumed.
+            future = executor.submit(proxies['alice'].send, 'bob', second, 2)
+            assert not future.done()
+            np.testing.assert_equal(proxies['bob'].recv('alice', 1), first)
+            assert future.result()
+        np.testing.assert_equal(proxies['bob'].recv('alice', 2), second)
+    finally:
+        for proxy in proxies.values():
+            proxy.stop()
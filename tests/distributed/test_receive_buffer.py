@@ -0,0 +1,70 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+
+import numpy as np
+
+from secretflow.distributed.fed.proxy.receive_buffer import BufferTier, ReceiveBuffer
+
+
+def test_receive_buffer_tiers():
+    with tempfile.TemporaryDirectory() as spill_dir:
+        buffer = ReceiveBuffer(100, 200, spill_dir)
+        assert buffer.reserve(80) == BufferTier.MEMORY
+        buffer.put(1, 'alice', BufferTier.MEMORY, [b'a' * 30, b'b' * 50], False)
+        assert buffer.reserve(80) == BufferTier.DISK
+        data = np.arange(10, dtype=np.int64).tobytes()
+        buffer.put(2, 'bob', BufferTier.DISK, [b'c' * 0, data], True)
+        # both tiers are full.
+        assert buffer.reserve(150) is None
+        assert buffer.reserve(150, force=True) == BufferTier.DISK
+        buffer.release(BufferTier.DISK, 150)
+
+        assert buffer.stats() == {
+            'alice': {'messages': 1, 'memory_bytes': 80, 'spilled_bytes': 0},
+            'bob': {'messages': 1, 'memory_bytes': 0, 'spilled_bytes': 80},
+        }
+
+        buffers, encoded = buffer.pop(2)
+        assert encoded
+        assert len(buffers) == 2 and len(buffers[0]) == 0
+        arr = np.frombuffer(buffers[1], dtype=np.int64)
+        np.testing.assert_equal(arr, np.arange(10))
+        # spilled buffers are copy-on-write, so they are writable.
+        arr = np.frombuffer(buffers[1], dtype=np.int64)
+        arr[0] = 100
+        assert buffer.stats() == {
+            'alice': {'messages': 1, 'memory_bytes': 80, 'spilled_bytes': 0}
+        }
+
+        buffers, encoded = buffer.pop(1)
+        assert not encoded
+        assert buffers == [b'a' * 30, b'b' * 50]
+        assert buffer.reserve(100) == BufferTier.MEMORY
+
+        buffer.close()
+        assert os.listdir(spill_dir) == []
+
+
+def test_receive_buffer_without_spill():
+    buffer = ReceiveBuffer(10)
+    assert buffer.reserve(10) == BufferTier.MEMORY
+    assert buffer.reserve(1) is None
+    # a message which is waited for is never refused.
+    assert buffer.reserve(1, force=True) == BufferTier.MEMORY
+
+    unbounded = ReceiveBuffer()
+    assert unbounded.reserve(1 << 40) == BufferTier.MEMORY
@@ -0,0 +1,127 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+from sklearn.datasets import load_breast_cancer
+
+from secretflow.data import FedNdarray, PartitionWay
+from secretflow.device.driver import reveal
+from secretflow.ml.boost.sgb_v import Sgb
+from secretflow.ml.boost.sgb_v.core.distributed_tree.distributed_tree import (
+    predict_trees,
+)
+from secretflow.ml.boost.sgb_v.core.distributed_tree.split_tree import (
+    SplitTree,
+    predict_leaf_bitsets,
+)
+from secretflow.ml.boost.sgb_v.core.pure_numpy_ops.pred import (
+    predict_tree_weight,
+    predict_trees_weight_from_bitsets,
+)
+
+
+def _split_tree(features, values):
+    # a full tree of depth 2, split nodes not owned by the party have feature -1.
+    tree = SplitTree()
+    for index, (feature, value) in enumerate(zip(features, values)):
+        tree.insert_split_node(feature, value, index, 0)
+    tree.extend_leaf_indices([3, 4, 5, 6])
+    return tree
+
+
+def test_predict_trees_weight_from_bitsets():
+    rng = np.random.default_rng(42)
+    x_alice = rng.random((1000, 2))
+    x_bob = rng.random((1000, 2))
+    inf = float('inf')
+    trees_alice = [
+        _split_tree([0, -1, 1], [0.5, inf, 0.3]),
+        _split_tree([-1, 0, -1], [inf, 0.6, inf]),
+    ]
+    trees_bob = [
+        _split_tree([-1, 1, -1], [inf, 0.2, inf]),
+        _split_tree([1, -1, 0], [0.4, inf, 0.7]),
+    ]
+    weights = [rng.random((4, 1)), rng.random((4, 1))]
+
+    expected = sum(
+        predict_tree_weight(
+            [alice.predict_leaf_select(x_alice), bob.predict_leaf_select(x_bob)],
+            weight,
+        )
+        for alice, bob, weight in zip(trees_alice, trees_bob, weights)
+    )
+    pred = np.concatenate(
+        [
+            predict_trees_weight_from_bitsets(
+                [
+                    predict_leaf_bitsets(trees_alice, x_alice, start, start + 97),
+                    predict_leaf_bitsets(trees_bob[::-1], x_bob, start, start + 97),
+                ],
+                [[0, 1], [1, 0]],
+                weights,
+                min(97, 1000 - start),
+            )
+            for start in range(0, 1000, 97)
+        ]
+    )
+    np.testing.assert_almost_equal(pred, expected)
+
+    # a tree without bitsets of any party selects all leaves.
+    pred = predict_trees_weight_from_bitsets(
+        [predict_leaf_bitsets(trees_alice[:1], x_alice, 0, 1000)],
+        [[0]],
+        weights,
+        1000,
+    )
+    expected = (
+        predict_tree_weight([trees_alice[0].predict_leaf_select(x_alice)], weights[0])
+        + weights[1].sum()
+    )
+    np.testing.assert_almost_equal(pred, expected)
+
+
+def test_batch_predict(sf_simulation_setup_devices):
+    devices = sf_simulation_setup_devices
+    x, y = load_breast_cancer(return_X_y=True)
+    v_data = FedNdarray(
+        {
+            devices.alice: devices.alice(lambda: x[:, :15])(),
+            devices.bob: devices.bob(lambda: x[:, 15:])(),
+        },
+        partition_way=PartitionWay.VERTICAL,
+    )
+    label_data = FedNdarray(
+        {devices.alice: devices.alice(lambda: y)()},
+        partition_way=PartitionWay.VERTICAL,
+    )
+    params = {
+        'num_boost_round': 3,
+        'max_depth': 3,
+        'sketch_eps': 0.25,
+        'objective': 'linear',
+        'seed': 42,
+    }
+    model = Sgb(devices.heu).train(params, v_data, label_data)
+    expected = model.base + sum(
+        reveal(tree.predict(v_data.partitions)) for tree in model.get_trees()
+    )
+    pred = reveal(model.predict(v_data))
+    np.testing.assert_almost_equal(pred, expected.reshape(-1, 1), decimal=5)
+
+    # more blocks than in flight.
+    pred = reveal(predict_trees(model.get_trees(), v_data.partitions, block_rows=50))
+    np.testing.assert_almost_equal(
+        pred, expected.reshape(-1, 1) - model.base, decimal=5
+    )
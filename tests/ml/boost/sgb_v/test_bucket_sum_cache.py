@@ -0,0 +1,77 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+from sklearn.datasets import load_breast_cancer
+
+from secretflow.data import FedNdarray, PartitionWay
+from secretflow.device.driver import reveal
+from secretflow.ml.boost.sgb_v import Sgb
+from secretflow.ml.boost.sgb_v.factory.components.cache.node_bucket_sum_cache_internal import (
+    NodeCache,
+)
+
+
+def test_node_cache_subtraction_and_eviction():
+    cache = NodeCache()
+    cache.collect_node_bucket_sum(0, 10)
+    # the right child is the parent minus the left child, parent is dropped.
+    cache.collect_node_bucket_sum(1, 4)
+    assert cache.get_node(2) == 6
+    assert not cache.has_node(0)
+
+    cache.collect_node_bucket_sum(6, 1)
+    assert cache.get_node(5) == 5
+    assert not cache.has_node(2)
+    # node 1 is the least recently used.
+    cache.evict(2)
+    assert not cache.has_node(1)
+    assert cache.has_node(5) and cache.has_node(6)
+
+    cache.evict(0)
+    assert cache.has_node(5) and cache.has_node(6)
+
+
+@pytest.mark.parametrize('tree_growing_method', ['level', 'leaf'])
+def test_bucket_sum_cache_budget(sf_simulation_setup_devices, tree_growing_method):
+    devices = sf_simulation_setup_devices
+    x, y = load_breast_cancer(return_X_y=True)
+    v_data = FedNdarray(
+        {
+            devices.alice: devices.alice(lambda: x[:, :15])(),
+            devices.bob: devices.bob(lambda: x[:, 15:])(),
+        },
+        partition_way=PartitionWay.VERTICAL,
+    )
+    label_data = FedNdarray(
+        {devices.alice: devices.alice(lambda: y)()},
+        partition_way=PartitionWay.VERTICAL,
+    )
+    params = {
+        'num_boost_round': 2,
+        'max_depth': 4,
+        'max_leaf': 10,
+        'sketch_eps': 0.25,
+        'objective': 'logistic',
+        'tree_growing_method': tree_growing_method,
+        'seed': 42,
+        'enable_quantization': False,
+    }
+    sgb = Sgb(devices.heu)
+    yhat = reveal(sgb.train(params, v_data, label_data).predict(v_data))
+    # children of evicted nodes are computed directly, results are the same.
+    params['bucket_sum_cache_max_nodes'] = 1
+    yhat_bounded = reveal(sgb.train(params, v_data, label_data).predict(v_data))
+    np.testing.assert_almost_equal(yhat, yhat_bounded, decimal=6)
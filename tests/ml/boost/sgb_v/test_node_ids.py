@@ -0,0 +1,145 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+from sklearn.datasets import load_breast_cancer
+
+from secretflow.data import FedNdarray, PartitionWay
+from secretflow.device.driver import reveal
+from secretflow.ml.boost.sgb_v import Sgb
+from secretflow.ml.boost.sgb_v.core.pure_numpy_ops.boost import (
+    compute_weight_from_node_ids,
+    compute_weight_from_node_select,
+)
+from secretflow.ml.boost.sgb_v.core.pure_numpy_ops.node_select import (
+    get_child_node_ids,
+    get_child_select,
+    partition_by_node_ids,
+    root_node_ids,
+    root_select,
+)
+from secretflow.ml.boost.sgb_v.factory.components.node_selector.node_selector import (
+    pick_children_node_ids,
+    pick_children_node_ss,
+)
+
+
+def _selects_of(node_ids, node_indices):
+    return [
+        (node_ids == node_index).astype(np.int8).reshape(1, -1)
+        for node_index in node_indices
+    ]
+
+
+def test_node_ids_match_node_selects():
+    rng = np.random.default_rng(42)
+    samples = 1000
+    node_ids = root_node_ids(samples)
+    selects = list(root_select(samples))
+    node_indices = [0]
+    leaf_selects, leaf_indices = [], []
+    for level in range(4):
+        # the left children of nodes split by two parties.
+        owners = rng.integers(0, 2, len(node_indices))
+        goes_left = rng.integers(0, 2, samples).astype(np.uint8)
+        gain_is_cost_effective = [
+            bool(g) for g in rng.integers(0, 4, len(node_indices))
+        ]
+        if level == 0:
+            gain_is_cost_effective = [True]
+
+        children, is_lefts, node_num = pick_children_node_ss(selects)
+        children_indices, is_lefts_ids, node_num_ids = pick_children_node_ids(
+            node_ids, node_indices
+        )
+        assert is_lefts == is_lefts_ids and node_num == node_num_ids
+        for child, child_index in zip(children, children_indices):
+            np.testing.assert_array_equal(
+                child.reshape(-1), (node_ids == child_index).astype(np.int8)
+            )
+
+        masks = [np.zeros(samples, dtype=np.uint8) for _ in range(2)]
+        lchild_ss = [[], []]
+        for i, (node_index, owner) in enumerate(zip(node_indices, owners)):
+            in_node = node_ids == node_index
+            masks[owner][in_node] = goes_left[in_node]
+            if not gain_is_cost_effective[i]:
+                continue
+            lchild_ss[owner].append(goes_left.reshape(1, -1))
+            lchild_ss[1 - owner].append(np.array([], dtype=np.uint8))
+
+        selects, next_indices, pruned_s, pruned_indices = get_child_select(
+            selects, lchild_ss, gain_is_cost_effective, node_indices
+        )
+        node_ids, next_indices_ids, pruned_indices_ids = get_child_node_ids(
+            node_ids, masks, gain_is_cost_effective, node_indices
+        )
+        assert next_indices == next_indices_ids
+        assert pruned_indices == pruned_indices_ids
+        for s, s_ids in zip(selects, _selects_of(node_ids, next_indices)):
+            np.testing.assert_array_equal(s.reshape(-1), s_ids.reshape(-1))
+        leaf_selects.extend(pruned_s)
+        leaf_indices.extend(pruned_indices)
+        node_indices = next_indices
+
+    leaf_selects.extend(selects)
+    leaf_indices.extend(node_indices)
+    g = rng.random((samples, 1))
+    h = rng.random((samples, 1))
+    np.testing.assert_almost_equal(
+        compute_weight_from_node_ids(node_ids, leaf_indices, g, h, 0.1, 0.3),
+        compute_weight_from_node_select(
+            np.concatenate(leaf_selects, axis=0), g, h, 0.1, 0.3
+        ),
+    )
+
+
+def test_partition_by_node_ids():
+    node_ids = np.array([3, 0, 4, 3, 6, 4, 3], dtype=np.int32)
+    partitions = partition_by_node_ids(node_ids, [3, 4, 5])
+    np.testing.assert_array_equal(partitions[0], [0, 3, 6])
+    np.testing.assert_array_equal(partitions[1], [2, 5])
+    assert partitions[2].size == 0
+
+
+def test_node_id_vector_training(sf_simulation_setup_devices):
+    devices = sf_simulation_setup_devices
+    x, y = load_breast_cancer(return_X_y=True)
+    v_data = FedNdarray(
+        {
+            devices.alice: devices.alice(lambda: x[:, :15])(),
+            devices.bob: devices.bob(lambda: x[:, 15:])(),
+        },
+        partition_way=PartitionWay.VERTICAL,
+    )
+    label_data = FedNdarray(
+        {devices.alice: devices.alice(lambda: y)()},
+        partition_way=PartitionWay.VERTICAL,
+    )
+    params = {
+        'num_boost_round': 2,
+        'max_depth': 4,
+        'sketch_eps': 0.25,
+        'objective': 'logistic',
+        'reg_lambda': 0.1,
+        'gamma': 1,
+        'rowsample_by_tree': 0.9,
+        'seed': 42,
+        'enable_quantization': False,
+    }
+    sgb = Sgb(devices.heu)
+    yhat = reveal(sgb.train(params, v_data, label_data).predict(v_data))
+    params['enable_node_id_vector'] = True
+    yhat_ids = reveal(sgb.train(params, v_data, label_data).predict(v_data))
+    np.testing.assert_almost_equal(yhat, yhat_ids, decimal=6)
@@ -0,0 +1,187 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+from sklearn.datasets import load_breast_cancer
+
+from secretflow.component.core import (
+    ParquetWriteOptions,
+    VTable,
+    VTableField,
+    VTableFieldKind,
+    VTableParty,
+    VTableSchema,
+    make_storage,
+    write_parquet,
+)
+from secretflow.data import FedNdarray, PartitionWay
+from secretflow.device.driver import reveal
+from secretflow.ml.boost.sgb_v import Sgb, VTableRowBlocks
+from secretflow.ml.boost.sgb_v.factory.components.order_map_manager.bin_matrix import (
+    BinMatrix,
+)
+from secretflow.spec.v1.data_pb2 import StorageConfig
+
+
+def test_bin_matrix():
+    rng = np.random.default_rng(42)
+    expected = rng.integers(0, 10, (10000, 6)).astype(np.int8)
+    with tempfile.TemporaryDirectory() as tmp:
+        m = BinMatrix.create(tmp, expected.shape)
+        for col in range(expected.shape[1]):
+            m.set_column(col, expected[:, col])
+
+        np.testing.assert_array_equal(m[10:30], expected[10:30])
+        np.testing.assert_array_equal(m[:, 3], expected[:, 3])
+        rows = np.sort(rng.choice(10000, 40, replace=False))
+        np.testing.assert_array_equal(m[rows, 2], expected[rows, 2])
+
+        # lazy views compose like numpy.
+        cols = np.array([1, 4, 5])
+        view = m[rows, :][:, cols]
+        assert view.shape == (40, 3)
+        np.testing.assert_array_equal(view[5:25], expected[rows][:, cols][5:25])
+        np.testing.assert_array_equal(view[:, 1], expected[rows, 4])
+
+        # slices with steps and boolean masks.
+        np.testing.assert_array_equal(m[100:10:-3], expected[100:10:-3])
+        np.testing.assert_array_equal(view[::2], expected[rows][:, cols][::2])
+        sliced = m[10:50:2, :][:, 1:5]
+        assert sliced.shape == (20, 4)
+        np.testing.assert_array_equal(sliced[0:20], expected[10:50:2, 1:5])
+        mask = np.arange(10000) % 3 == 0
+        np.testing.assert_array_equal(m[mask, 5], expected[mask, 5])
+        np.testing.assert_array_equal(
+            m[mask, :][:, cols][:, 2], expected[mask][:, cols][:, 2]
+        )
+
+        # only the path and the selection are pickled.
+        loaded = pickle.loads(pickle.dumps(view))
+        assert len(pickle.dumps(view)) < expected.nbytes
+        np.testing.assert_array_equal(loaded[0:40], expected[rows][:, cols])
+
+        m.remove()
+        assert not os.path.exists(m.path)
+
+
+def test_out_of_core_training(sf_simulation_setup_devices):
+    devices = sf_simulation_setup_devices
+    x, y = load_breast_cancer(return_X_y=True)
+    v_data = FedNdarray(
+        {
+            devices.alice: devices.alice(lambda: x[:, :15])(),
+            devices.bob: devices.bob(lambda: x[:, 15:])(),
+        },
+        partition_way=PartitionWay.VERTICAL,
+    )
+    label_data = FedNdarray(
+        {devices.alice: devices.alice(lambda: y)()},
+        partition_way=PartitionWay.VERTICAL,
+    )
+    params = {
+        'num_boost_round': 2,
+        'max_depth': 3,
+        'sketch_eps': 0.25,
+        'objective': 'logistic',
+        'rowsample_by_tree': 0.9,
+        'colsample_by_tree': 0.8,
+        'seed': 42,
+        'enable_quantization': False,
+    }
+    sgb = Sgb(devices.heu)
+    yhat = reveal(sgb.train(params, v_data, label_data).predict(v_data))
+    with tempfile.TemporaryDirectory() as tmp:
+        params['out_of_core_dir'] = tmp
+        params['out_of_core_block_rows'] = 100
+        yhat_ooc = reveal(sgb.train(params, v_data, label_data).predict(v_data))
+        # order map files are removed after training.
+        assert os.listdir(tmp) == []
+    np.testing.assert_almost_equal(yhat, yhat_ooc, decimal=6)
+
+
+class _CheckedRowBlocks(VTableRowBlocks):
+    """checks that no party ever gets more rows than a batch."""
+
+    def __iter__(self):
+        for block in super().__iter__():
+            shapes = reveal([b.device(lambda b: b.shape)(b) for b in block.values()])
+            assert all(shape[0] <= self.batch_size for shape in shapes), shapes
+            yield block
+
+
+def test_train_from_row_blocks(sf_simulation_setup_devices, tmp_path):
+    devices = sf_simulation_setup_devices
+    storage = make_storage(
+        StorageConfig(
+            type="local_fs", local_fs=StorageConfig.LocalFSConfig(wd=str(tmp_path))
+        )
+    )
+    x, y = load_breast_cancer(return_X_y=True)
+    # sketches are exact for so few rows, so split points are the same as qcut.
+    x, y = x[:300], y[:300]
+    parties = []
+    for party, cols in [("alice", range(0, 15)), ("bob", range(15, 30))]:
+        names = [f"f{i}" for i in cols]
+        uri = f"row_blocks/{party}.parquet"
+        write_parquet(
+            pa.table({n: x[:, i] for n, i in zip(names, cols)}),
+            storage.get_writer(uri),
+            ParquetWriteOptions(row_group_size=64),
+        )
+        schema = VTableSchema(
+            [VTableField(n, "float", VTableFieldKind.FEATURE) for n in names]
+        )
+        parties.append(VTableParty(party, uri, "parquet", schema=schema))
+    blocks = _CheckedRowBlocks(
+        storage, VTable("row_blocks", parties, line_count=300), batch_size=64
+    )
+
+    v_data = FedNdarray(
+        {
+            devices.alice: devices.alice(lambda: x[:, :15])(),
+            devices.bob: devices.bob(lambda: x[:, 15:])(),
+        },
+        partition_way=PartitionWay.VERTICAL,
+    )
+    label_data = FedNdarray(
+        {devices.alice: devices.alice(lambda: y)()},
+        partition_way=PartitionWay.VERTICAL,
+    )
+    params = {
+        'num_boost_round': 3,
+        'max_depth': 3,
+        'sketch_eps': 0.1,
+        'objective': 'logistic',
+        'rowsample_by_tree': 0.9,
+        'colsample_by_tree': 0.8,
+        'seed': 42,
+        'enable_quantization': False,
+    }
+    sgb = Sgb(devices.heu)
+    yhat = reveal(sgb.train(params, v_data, label_data).predict(v_data))
+
+    ooc_dir = tmp_path / "ooc"
+    ooc_dir.mkdir()
+    params['out_of_core_dir'] = str(ooc_dir)
+    params['out_of_core_block_rows'] = 100
+    model = sgb.train(params, blocks, label_data)
+    # order map files are removed after training.
+    assert os.listdir(ooc_dir) == []
+    yhat_blocks = reveal(model.predict(v_data))
+    np.testing.assert_almost_equal(yhat, yhat_blocks, decimal=6)
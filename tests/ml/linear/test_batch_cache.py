@@ -0,0 +1,44 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from secretflow.ml.linear.batch_cache import SPUBatchCache
+
+
+def test_keep_first():
+    evicted = []
+    cache = SPUBatchCache('keep_first', 25, evicted.append)
+    # batches are used in order every epoch, the first ones are pinned.
+    for _ in range(2):
+        for step in range(3):
+            if cache.get(step) is None:
+                cache.put(step, f'batch{step}', 10)
+    assert 0 in cache and 1 in cache and 2 not in cache
+    assert (cache.hits, cache.misses) == (2, 4) and cache.cached_bytes == 20
+
+    # a prefetched batch which is not cached is used once.
+    cache.hold(2, 'batch2')
+    assert 2 in cache and cache.get(2) == 'batch2'
+    assert 2 not in cache and cache.get(2) is None
+
+    unlimited = SPUBatchCache('keep_first')
+    assert all(unlimited.put(step, step, 10) for step in range(3))
+
+    cache.clear()
+    assert evicted == ['batch0', 'batch1']
+    assert len(cache) == 0 and cache.cached_bytes == 0
+
+
+def test_recompute():
+    recompute = SPUBatchCache('recompute')
+    assert not recompute.put(0, 0, 10) and len(recompute) == 0
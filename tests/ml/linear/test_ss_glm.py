@@ -21,6 +21,7 @@ from sklearn.preprocessing import StandardScaler
 
 from secretflow.data import FedNdarray, PartitionWay
 from secretflow.device.driver import reveal, wait
+from secretflow.ml.linear.batch_cache import spu_share_bytes
 from secretflow.ml.linear.ss_glm import SSGLM
 from secretflow.ml.linear.ss_glm.core import get_dist
 
@@ -290,3 +291,64 @@ def test_gamma_data(sf_production_setup_devices_aby3):
 #     yhat = reveal(spu_yhat)
 #     logging.info(f"main predict time: {time.time() - start}")
 #     logging.info(f"main auc: {roc_auc_score(y, yhat)}")
+
+
+def _fit_predict_in_batches(devices, **kwargs):
+    from sklearn.datasets import load_breast_cancer
+
+    ds = load_breast_cancer()
+    x, y = _transform(ds['data']), ds['target']
+    v_data = FedNdarray(
+        partitions={
+            devices.alice: devices.alice(lambda: x[:, :15])(),
+            devices.bob: devices.bob(lambda: x[:, 15:])(),
+        },
+        partition_way=PartitionWay.VERTICAL,
+    )
+    label_data = FedNdarray(
+        partitions={devices.alice: devices.alice(lambda: y)()},
+        partition_way=PartitionWay.VERTICAL,
+    )
+    model = SSGLM(devices.spu)
+    # 5 infeed batches of 128 rows.
+    model.fit_sgd(
+        v_data,
+        label_data,
+        None,
+        None,
+        2,
+        'Logit',
+        'Bernoulli',
+        iter_start_irls=1,
+        batch_size=64,
+        infeed_batch_size_limit=3000,
+        **kwargs,
+    )
+    assert model.infeed_total_batch == 5
+    return model, reveal(model.predict(v_data))
+
+
+def test_infeed_prefetch(sf_simulation_setup_devices):
+    _, yhat = _fit_predict_in_batches(
+        sf_simulation_setup_devices, infeed_prefetch_depth=0
+    )
+    _, yhat_prefetch = _fit_predict_in_batches(
+        sf_simulation_setup_devices, infeed_prefetch_depth=2
+    )
+    np.testing.assert_almost_equal(yhat, yhat_prefetch, decimal=3)
+
+
+def test_bounded_batch_cache(sf_simulation_setup_devices):
+    model, yhat = _fit_predict_in_batches(sf_simulation_setup_devices)
+    assert model.batch_cache.misses == 5
+
+    # each batch has 128 rows * 32 columns.
+    batch_bytes = spu_share_bytes(sf_simulation_setup_devices.spu, 128 * 32)
+    for policy in ['keep_first', 'recompute']:
+        model, yhat_bounded = _fit_predict_in_batches(
+            sf_simulation_setup_devices,
+            batch_cache_policy=policy,
+            batch_cache_max_bytes=2 * batch_bytes,
+        )
+        np.testing.assert_almost_equal(yhat, yhat_bounded, decimal=3)
+        assert model.batch_cache.misses > 5
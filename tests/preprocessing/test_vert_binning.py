@@ -16,6 +16,7 @@ from io import StringIO
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pytest
 
 import secretflow.distributed as sfd
@@ -31,6 +32,7 @@ from secretflow.data.vertical.dataframe import VDataFrame
 from secretflow.device.driver import reveal
 from secretflow.preprocessing.binning.vert_binning import VertBinning
 from secretflow.preprocessing.binning.vert_woe_binning import VertWoeBinning
+from secretflow.stats.core.quantile_sketch import sketches_edges, update_sketches
 from secretflow.utils import secure_pickle as pickle
 from secretflow.utils.simulation.datasets import dataset
 
@@ -372,3 +374,186 @@ def test_binning_normal_eq_range(prod_env_and_data):
     woe_almost_equal(ss_alice, he_alice)
     woe_almost_equal(ss_bob, he_alice)
     woe_almost_equal(he_bob, he_alice)
+
+
+def test_binning_quantile_sketch(sf_memory_setup_devices):
+    env = sf_memory_setup_devices
+    # nothing is compacted with so few values, so sketches give exact split points.
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "x1": rng.normal(size=200),
+            "x2": rng.integers(0, 5, size=200).astype(float),
+            "s": rng.choice(["a", "b", "c"], size=200),
+            "y": rng.integers(0, 2, size=200),
+        }
+    )
+    df.loc[::17, "x1"] = np.nan
+    schema = VTableSchema(
+        [
+            VTableField("x1", "float", VTableFieldKind.FEATURE),
+            VTableField("x2", "float", VTableFieldKind.FEATURE),
+            VTableField("s", "str", VTableFieldKind.FEATURE),
+            VTableField("y", "int", VTableFieldKind.LABEL),
+        ]
+    )
+    vdata = CompVDataFrame.from_pandas(
+        VDataFrame({env.alice: partition(data=env.alice(lambda: df)())}),
+        schemas={"alice": schema},
+    )
+    bin_names = {env.alice: ["x1", "x2", "s"]}
+
+    def split_edges(bin_num):
+        # sketches are built batch by batch, like over batches of a reader.
+        def build(t):
+            sketches = None
+            for batch in t.select(["x1", "x2"]).to_batches(max_chunksize=64):
+                sketches = update_sketches(
+                    sketches, pa.Table.from_batches([batch]), ["x1", "x2"], 0.01
+                )
+            return sketches_edges(sketches, bin_num)
+
+        return {env.alice: env.alice(build)(vdata.partitions[env.alice].data)}
+
+    exact = VertBinning().binning(vdata, "quantile", 8, bin_names)
+    approx = VertBinning().binning(vdata, "quantile", 8, bin_names, split_edges(8))
+    woe_almost_equal(reveal(approx[env.alice]), reveal(exact[env.alice]))
+
+    for method in ["quantile", "chimerge"]:
+        woe_exact = VertWoeBinning(env.heu).binning(
+            vdata, method, 8, bin_names, "y", "1"
+        )
+        # chimerge is initialized by chimerge_init_bins.
+        woe_approx = VertWoeBinning(env.heu).binning(
+            vdata,
+            method,
+            8,
+            bin_names,
+            "y",
+            "1",
+            split_edges=split_edges(8 if method == "quantile" else 100),
+        )
+        woe_almost_equal(reveal(woe_approx[env.alice]), reveal(woe_exact[env.alice]))
+
+
+def _woe_iv_reference(variable, column: pd.Series, y: np.ndarray):
+    # counts, woe and iv of the bins in the rule from plain labels.
+    positives, negatives = y.sum(), y.size - y.sum()
+
+    def woe_iv(total, positive):
+        negative = total - positive
+        if positive == 0 or negative == 0:
+            p, n = (positive + 0.5) / positives, (negative + 0.5) / negatives
+        else:
+            p, n = positive / positives, negative / negatives
+        woe = np.log(p / n)
+        return woe, (p - n) * woe
+
+    def rates(total, positive):
+        if total < 5 or positive == 0 or positive == total:
+            return np.nan, np.nan
+        return positive / total, total / y.size
+
+    if variable["type"] == "string":
+        bin_count = len(variable["categories"])
+        index = {c: i for i, c in enumerate(variable["categories"])}
+        na = column.isna().to_numpy()
+        codes = np.array([index.get(v, -1) for v in column.fillna("")])
+        assert (codes[~na] >= 0).all()
+    else:
+        split_points = np.array(variable["split_points"])
+        bin_count = split_points.size + 1
+        values = column.to_numpy(dtype=np.float64)
+        na = np.isnan(values)
+        # split points are left-open right-close.
+        codes = np.searchsorted(split_points, values, side="left")
+    totals = np.bincount(codes[~na], minlength=bin_count)
+    bin_positives = np.bincount(codes[~na], weights=y[~na], minlength=bin_count)
+    stats = list(zip(totals, bin_positives)) + [(na.sum(), y[na].sum())]
+
+    assert variable["total_counts"] == totals.tolist()
+    assert variable["else_counts"] == na.sum()
+    woes, ivs = zip(*[woe_iv(*s) for s in stats])
+    pos_rates, total_rates = zip(*[rates(*s) for s in stats])
+    np.testing.assert_almost_equal(variable["filling_values"], woes[:-1])
+    np.testing.assert_almost_equal(variable["else_filling_value"], woes[-1])
+    np.testing.assert_almost_equal(variable["postive_rates"], pos_rates[:-1])
+    np.testing.assert_almost_equal(variable["total_rates"], total_rates[:-1])
+    np.testing.assert_almost_equal(variable["else_positive_rate"], pos_rates[-1])
+    np.testing.assert_almost_equal(variable["else_total_rate"], total_rates[-1])
+    return list(ivs[:-1]), ivs[-1]
+
+
+@pytest.mark.parametrize("method", ["quantile", "chimerge", "eq_range"])
+def test_woe_binning_he_participant(sf_memory_setup_devices, method):
+    env = sf_memory_setup_devices
+    rng = np.random.default_rng(1)
+    rows = 300
+    y = rng.integers(0, 2, size=rows)
+    # features of bob depend on the label, so bins differ in woe.
+    alice_df = pd.DataFrame({"a1": rng.normal(size=rows) + y, "y": y})
+    bob_df = pd.DataFrame(
+        {
+            "x1": rng.normal(size=rows) - y,
+            "x2": rng.integers(0, 5, size=rows).astype(float),
+            "s": rng.choice(["a", "b", "c"], size=rows).astype(object),
+        }
+    )
+    bob_df.loc[::13, "x1"] = np.nan
+    bob_df.loc[::29, "s"] = None
+    schemas = {
+        "alice": VTableSchema(
+            [
+                VTableField("a1", "float", VTableFieldKind.FEATURE),
+                VTableField("y", "int", VTableFieldKind.LABEL),
+            ]
+        ),
+        "bob": VTableSchema(
+            [
+                VTableField("x1", "float", VTableFieldKind.FEATURE),
+                VTableField("x2", "float", VTableFieldKind.FEATURE),
+                VTableField("s", "str", VTableFieldKind.FEATURE),
+            ]
+        ),
+    }
+    vdata = CompVDataFrame.from_pandas(
+        VDataFrame(
+            {
+                env.alice: partition(data=env.alice(lambda: alice_df)()),
+                env.bob: partition(data=env.bob(lambda: bob_df)()),
+            }
+        ),
+        schemas=schemas,
+    )
+
+    # alice holds the label and the secret key, so bins of bob are summed by HE.
+    rules = VertWoeBinning(env.heu).binning(
+        vdata,
+        method,
+        8,
+        {env.alice: ["a1"], env.bob: ["x1", "x2", "s"]},
+        "y",
+        "1",
+        chimerge_init_bins=20,
+        chimerge_target_bins=4,
+    )
+    alice_rule, bob_rule = reveal(rules[env.alice]), reveal(rules[env.bob])
+    ivs = {f["name"]: f for f in alice_rule["feature_iv_info"]}
+    assert set(ivs) == {"a1", "x1", "x2", "s"}
+
+    for rule, df in [(alice_rule, alice_df), (bob_rule, bob_df)]:
+        for variable in rule["variables"]:
+            bin_ivs, else_iv = _woe_iv_reference(
+                variable, df[variable["name"]], y.astype(np.float64)
+            )
+            iv = ivs[variable["name"]]
+            np.testing.assert_almost_equal(iv["ivs"], bin_ivs)
+            np.testing.assert_almost_equal(iv["else_iv"], else_iv)
+            np.testing.assert_almost_equal(iv["feature_iv"], sum(bin_ivs))
+    if method == "chimerge":
+        # bins are merged by their positive samples from HE.
+        assert all(
+            len(v["split_points"]) + 1 <= 4
+            for v in bob_rule["variables"]
+            if v["type"] == "numeric"
+        )
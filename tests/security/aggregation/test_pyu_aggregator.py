@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import pytest
 
+import secretflow as sf
 from secretflow.security.aggregation.plain_aggregator import PlainAggregator
 from secretflow_fl.security.aggregation.sparse_plain_aggregator import (
     SparsePlainAggregator,
@@ -29,6 +31,57 @@ class TestPlainAggregator(AggregatorBase):
         )
 
 
+class TestStreamingPlainAggregator(AggregatorBase):
+    @pytest.fixture()
+    def env_and_aggregator(self, sf_production_setup_devices_ray):
+        yield sf_production_setup_devices_ray, PlainAggregator(
+            sf_production_setup_devices_ray.carol, streaming=True
+        )
+
+
+class TestTreePlainAggregator(AggregatorBase):
+    @pytest.fixture()
+    def env_and_aggregator(self, sf_production_setup_devices_ray):
+        yield sf_production_setup_devices_ray, PlainAggregator(
+            sf_production_setup_devices_ray.carol, tree_arity=2
+        )
+
+    def test_average_on_tree_should_ok(self, env_and_aggregator):
+        env, aggregator = env_and_aggregator
+        # GIVEN
+        parties = [env.alice, env.bob, env.carol, env.davy]
+        data = [
+            [np.full((2, 3), i, dtype=np.float32), np.arange(4) * i]
+            for i in range(1, 6)
+        ]
+        objs = [parties[i % 4](lambda d=d: d)() for i, d in enumerate(data)]
+        weights = [parties[i % 4](lambda i=i: i + 1)() for i in range(5)]
+
+        # WHEN
+        avg = sf.reveal(aggregator.average(objs, axis=0, weights=weights))
+
+        # THEN
+        expected = [
+            np.average([d[0] for d in data], axis=0, weights=range(1, 6)),
+            np.average([d[1] for d in data], axis=0, weights=range(1, 6)),
+        ]
+        np.testing.assert_almost_equal(avg[0], expected[0], decimal=5)
+        assert avg[0].dtype == np.float32
+        np.testing.assert_almost_equal(avg[1], expected[1])
+
+    def test_average_of_int_should_be_float(self, env_and_aggregator):
+        env, aggregator = env_and_aggregator
+        # GIVEN
+        a = env.alice(lambda: np.array([1, 2]))()
+        b = env.bob(lambda: np.array([2, 2]))()
+
+        # WHEN
+        avg = sf.reveal(aggregator.average([a, b], axis=0))
+
+        # THEN
+        np.testing.assert_almost_equal(avg, np.array([1.5, 2.0]))
+
+
 class TestSparsePlainAggregator(AggregatorBase):
     @pytest.fixture()
     def env_and_aggregator(self, sf_production_setup_devices_ray):
@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import pytest
 
-from secretflow.security.aggregation.secure_aggregator import SecureAggregator
+import secretflow as sf
+from secretflow.security.aggregation.secure_aggregator import (
+    SecureAggregator,
+    gen_net_mask,
+)
 from tests.security.aggregation.test_aggregator_base import AggregatorBase
 
 
@@ -28,3 +33,57 @@ class TestSecureAggregator(AggregatorBase):
                 sf_production_setup_devices_ray.bob,
             ],
         )
+
+    def test_sum_in_multiple_rounds_should_ok(self, env_and_aggregator):
+        env, aggregator = env_and_aggregator
+        # the masks of rounds after the first one are precomputed, unless the size
+        # of data changes.
+        for shape in [(2, 3), (2, 3), (2, 3), (4, 5), (4, 5)]:
+            # GIVEN
+            arr0 = np.random.rand(*shape)
+            arr1 = np.random.rand(*shape)
+            a = env.alice(lambda: [arr0, arr0 * 2])()
+            b = env.bob(lambda: [arr1, arr1 * 2])()
+
+            # WHEN
+            sum = sf.reveal(aggregator.sum([a, b], axis=0))
+
+            # THEN
+            np.testing.assert_almost_equal(sum[0], arr0 + arr1, decimal=4)
+            np.testing.assert_almost_equal(sum[1], (arr0 + arr1) * 2, decimal=4)
+
+    def test_average_int_with_float_weights_should_fail(self, env_and_aggregator):
+        env, aggregator = env_and_aggregator
+        # GIVEN
+        a = env.alice(lambda: np.array([1, 2, 3]))()
+        b = env.bob(lambda: np.array([4, 5, 6]))()
+
+        # WHEN & THEN
+        with pytest.raises(Exception):
+            sf.reveal(aggregator.average([a, b], axis=0, weights=[0.5, 1.5]))
+
+
+def test_gen_net_mask_should_cancel_out():
+    parties = ['alice', 'bob', 'carol']
+    seeds = {
+        ('alice', 'bob'): 1 << 200,
+        ('alice', 'carol'): 12345,
+        ('bob', 'carol'): 67890,
+    }
+
+    def peer_seeds(party):
+        return {
+            peer: seed
+            for (u, v), seed in seeds.items()
+            for peer in (u, v)
+            if party in (u, v) and peer != party
+        }
+
+    for round_id in range(3):
+        masks = [gen_net_mask(p, peer_seeds(p), round_id, 100) for p in parties]
+        assert all(np.any(mask != 0) for mask in masks)
+        np.testing.assert_equal(np.sum(masks, axis=0, dtype=np.uint64), 0)
+    assert np.any(
+        gen_net_mask('alice', peer_seeds('alice'), 0, 100)
+        != gen_net_mask('alice', peer_seeds('alice'), 1, 100)
+    )
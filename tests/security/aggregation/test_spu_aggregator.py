@@ -24,3 +24,11 @@ class TestSPUAggregator(AggregatorBase):
         yield sf_production_setup_devices_ray, SPUAggregator(
             sf_production_setup_devices_ray.spu
         )
+
+
+class TestStreamingSPUAggregator(AggregatorBase):
+    @pytest.fixture()
+    def env_and_aggregator(self, sf_production_setup_devices_ray):
+        yield sf_production_setup_devices_ray, SPUAggregator(
+            sf_production_setup_devices_ray.spu, streaming=True
+        )
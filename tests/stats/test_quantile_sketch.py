@@ -0,0 +1,95 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from secretflow.stats.core.quantile_sketch import (
+    QuantileSketch,
+    build_sketches,
+    merge_sketches,
+    sketch_cut,
+    sketch_edges,
+    sketch_qcut,
+)
+
+
+def _max_rank_error(sketch, x):
+    x = np.sort(x)
+    qs = np.linspace(0, 1, 101)
+    estimated = sketch.quantile(qs)
+    ranks = np.searchsorted(x, estimated, side='right') / x.size
+    return np.max(np.abs(ranks - qs))
+
+
+def test_rank_error():
+    x = np.random.default_rng(1).normal(size=1_000_000)
+    for eps in [0.05, 0.01]:
+        sketch = QuantileSketch(eps, seed=2)
+        for start in range(0, x.size, 1 << 16):
+            sketch.update(x[start : start + (1 << 16)])
+        assert sketch.count == x.size
+        assert sketch.num_retained < x.size // 100
+        assert _max_rank_error(sketch, x) <= eps
+        assert sketch.quantile(0) == x.min() and sketch.quantile(1) == x.max()
+
+
+def test_merge():
+    x = np.random.default_rng(3).exponential(size=200_000)
+    x[::100] = np.nan
+    # e.g. sketches of two horizontal partitions.
+    halves = [
+        build_sketches([pa.table({'a': x[:100_000]})], ['a'], 0.01)['a'],
+        build_sketches([pa.table({'a': x[100_000:]})], ['a'], 0.01)['a'],
+    ]
+    merged = merge_sketches(halves + [QuantileSketch(0.01)])
+    assert merged.count == np.count_nonzero(~np.isnan(x))
+    assert _max_rank_error(merged, x[~np.isnan(x)]) <= 0.01
+
+
+def test_sketch_qcut_align_pandas():
+    # nothing is compacted with so few values, the edges are exact.
+    x = np.random.default_rng(4).integers(0, 20, size=200).astype(float)
+    x[7] = np.nan
+    bins, edges = sketch_qcut(x, 8, eps=0.01)
+    expected_bins, expected_edges = pd.qcut(
+        x, 8, labels=False, duplicates='drop', retbins=True
+    )
+    np.testing.assert_array_equal(edges, expected_edges)
+    np.testing.assert_array_equal(bins, expected_bins)
+
+    bins, edges = sketch_qcut(pa.chunked_array([[1.0, 1.0], [1.0]]), 4)
+    assert edges.size == 1 and np.all(np.isnan(bins))
+
+
+def test_sketch_cut_by_chunks():
+    # nothing is compacted with so few values, so the edges are exact.
+    x = np.random.default_rng(5).normal(size=250)
+    x[::37] = np.nan
+    chunked = pa.chunked_array([x[:100], x[100:101], x[101:]])
+    batches = pa.table({'a': chunked}).to_batches(max_chunksize=30)
+    sketch = build_sketches(batches, ['a'], 0.01)['a']
+    edges = sketch_edges(sketch, 10)
+    expected_bins, expected_edges = pd.qcut(
+        x, 10, labels=False, duplicates='drop', retbins=True
+    )
+    np.testing.assert_array_equal(edges, expected_edges)
+
+    for batch_size in [7, 30, 1 << 16]:
+        np.testing.assert_array_equal(
+            sketch_cut(chunked, edges, batch_size), expected_bins
+        )
+        bins, _ = sketch_qcut(chunked, 10, eps=0.01, batch_size=batch_size)
+        np.testing.assert_array_equal(bins, expected_bins)
@@ -12,24 +12,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pytest
 from sklearn.datasets import load_iris
 
 from secretflow.data import partition
 from secretflow.data.vertical.dataframe import VDataFrame
 from secretflow.stats import table_statistics
+from secretflow.stats.table_statistics import _summarize, table_statistics_from_batches
 
 
-@pytest.fixture(scope='module')
-def prod_env_and_data(sf_production_setup_devices):
+def _iris_data():
     iris = load_iris(as_frame=True)
     data = pd.concat([iris.data, iris.target], axis=1)
     data.iloc[1, 1] = None
     data.iloc[100, 1] = None
-
     # Restore target to its original name.
     data['target'] = data['target'].map({0: 'setosa', 1: 'versicolor', 2: 'virginica'})
+    return data
+
+
+@pytest.fixture(scope='module')
+def prod_env_and_data(sf_production_setup_devices):
+    data = _iris_data()
     # Vertical partitioning.
     v_alice, v_bob = data.iloc[:, :2], data.iloc[:, 2:]
     df_v = VDataFrame(
@@ -65,3 +72,107 @@ def test_table_statistics(prod_env_and_data):
                 assert (
                     correct_summary.iloc[i, j] == summary.iloc[i, j]
                 ), "row {}, col {} mismatch".format(i, summary.columns[j])
+
+
+def test_fused_statistics_align_pandas():
+    data = _iris_data()
+    # far from zero, power sums are shifted before central moments are derived.
+    data['id'] = np.arange(data.shape[0]) + 10**6
+    summary = table_statistics(data)
+    numeric = data.select_dtypes('number')
+    expected = {
+        'count(non-NA count)': data.count(),
+        'min': data.min(numeric_only=True),
+        'mean': data.mean(numeric_only=True),
+        'var(variance)': data.var(numeric_only=True),
+        'sem(standard error)': data.sem(numeric_only=True),
+        'skew': data.skew(numeric_only=True),
+        'kurtosis': data.kurtosis(numeric_only=True),
+        'q3(third quartile)': data.quantile(0.75, numeric_only=True),
+        'moment_2': numeric.pow(2).mean(),
+        'central_moment_3': numeric.subtract(numeric.mean()).pow(3).mean(),
+        'central_moment_4': numeric.subtract(numeric.mean()).pow(4).mean(),
+        'sum': data.sum(numeric_only=True),
+    }
+    for name, value in expected.items():
+        pd.testing.assert_series_equal(
+            summary[name],
+            value.reindex(data.columns),
+            check_names=False,
+            check_dtype=False,
+            rtol=1e-9,
+        )
+
+
+def test_fused_statistics_blocks():
+    data = _iris_data()
+    summary = _summarize(data)
+    # row blocks of pandas and record batches of arrow give the same summary.
+    for blocked in (
+        _summarize(data, block_rows=7),
+        _summarize(pa.Table.from_pandas(data, preserve_index=False), block_rows=7),
+    ):
+        pd.testing.assert_frame_equal(
+            blocked.drop(columns='datatype'), summary.drop(columns='datatype')
+        )
+
+
+def test_sketch_quantiles():
+    data = _iris_data()
+    exact = table_statistics(data)
+    # quantiles are within the rank error, the other statistics are exact.
+    approx = table_statistics(data, quantile_sketch_eps=0.05)
+    quantile_cols = {
+        0.25: 'q1(first quartile)',
+        0.5: 'q2(second quartile, median)',
+        0.75: 'q3(third quartile)',
+    }
+    numeric = data.select_dtypes('number')
+    for q, col in quantile_cols.items():
+        for c in numeric.columns:
+            # iris has many ties, so the rank of a value is an interval.
+            value = approx.loc[c, col]
+            assert (numeric[c] < value).mean() <= q + 0.05
+            assert (numeric[c] <= value).mean() >= q - 0.05
+    pd.testing.assert_frame_equal(
+        approx.drop(columns=list(quantile_cols.values())),
+        exact.drop(columns=list(quantile_cols.values())),
+    )
+
+
+def test_statistics_from_batches(sf_simulation_setup_devices):
+    alice, bob = sf_simulation_setup_devices.alice, sf_simulation_setup_devices.bob
+    data = _iris_data()
+    parts = {alice: data.iloc[:, :2], bob: data.iloc[:, 2:]}
+
+    def _batches(batch_rows):
+        for start in range(0, data.shape[0], batch_rows):
+            yield {
+                pyu: pyu(lambda df: pa.Table.from_pandas(df, preserve_index=False))(
+                    df.iloc[start : start + batch_rows]
+                )
+                for pyu, df in parts.items()
+            }
+
+    exact = table_statistics(data)
+    # only a partial summary of each party is kept between batches.
+    summary = table_statistics_from_batches(
+        _batches(32), list(data.columns), quantile_sketch_eps=0.05
+    )
+    assert summary.index.tolist() == list(data.columns)
+    quantile_cols = {
+        0.25: 'q1(first quartile)',
+        0.5: 'q2(second quartile, median)',
+        0.75: 'q3(third quartile)',
+    }
+    numeric = data.select_dtypes('number')
+    for q, col in quantile_cols.items():
+        for c in numeric.columns:
+            value = summary.loc[c, col]
+            assert (numeric[c] < value).mean() <= q + 0.05
+            assert (numeric[c] <= value).mean() >= q - 0.05
+    pd.testing.assert_frame_equal(
+        summary.drop(columns=list(quantile_cols.values())),
+        exact.drop(columns=list(quantile_cols.values())),
+        check_dtype=False,
+    )
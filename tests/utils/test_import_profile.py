@@ -0,0 +1,57 @@
+# Copyright 2024 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+
+import pytest
+
+from secretflow.utils.import_profile import parse_importtime, profile_import
+
+
+def test_parse_importtime():
+    output = '\n'.join(
+        [
+            'import time: self [us] | cumulative | imported package',
+            'import time:       100 |        100 |     jax._src',
+            'import time:       200 |        300 |   jax',
+            'import time:        50 |         50 |     secretflow.device.driver',
+            'import time:        10 |        360 |   secretflow.device',
+            'import time:         5 |        365 | secretflow',
+        ]
+    )
+    costs = parse_importtime(output)
+    assert costs == pytest.approx(
+        {'jax': 300e-6, 'secretflow.device': 60e-6, 'secretflow': 5e-6}
+    )
+
+
+def test_lazy_import():
+    script = '''
+import sys
+
+import secretflow as sf
+
+heavy = ["jax", "spu", "heu", "pandas", "secretflow.device", "secretflow.component"]
+assert not [m for m in heavy if m in sys.modules], sys.modules.keys()
+assert sf.PYU is sf.device.PYU
+# HEU, SPU and their kernels are not imported for PYU.
+assert "secretflow.device.device.spu" not in sys.modules
+assert "pandas" not in sys.modules
+assert sf.SPU.__name__ == "SPU" and sf.stats is not None
+'''
+    subprocess.run([sys.executable, '-c', script], check=True)
+
+    total, costs = profile_import('secretflow')
+    assert total > 0 and costs